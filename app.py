@@ -29,7 +29,7 @@ CURRENT_AI_PROVIDER_CONFIG = get_ai_provider_config()
 
 # Database path is now configured in models.py via intelligent detection
 
-from models import engine, User, Prayer, InviteToken, Session as SessionModel, PrayerMark, PrayerSkip, AuthenticationRequest, AuthApproval, AuthAuditLog, SecurityLog, PrayerAttribute, PrayerActivityLog
+from models import engine, read_engine, User, Prayer, InviteToken, Session as SessionModel, PrayerMark, PrayerSkip, AuthenticationRequest, AuthApproval, AuthAuditLog, SecurityLog, PrayerAttribute, PrayerActivityLog
 from sqlmodel import text
 import sqlite3
 
@@ -117,12 +117,21 @@ from app_helpers.routes.archive_routes import router as archive_router
 from app_helpers.routes.file_routes import router as file_router
 from app_helpers.routes.email_settings_routes import router as email_settings_router
 from app_helpers.routes.public_routes import router as public_router
+from app_helpers.utils.request_metrics import install_query_hooks, request_metrics_middleware
+from app_helpers.services.database_maintenance_service import install_lock_wait_hooks
 
 app = FastAPI()
 
+# Per-request query count, DB time, archive writes and template time (Server-Timing header)
+install_query_hooks(engine)
+install_query_hooks(read_engine)
+# Write-lock waits and "database is locked" errors (shown on /admin/debug/requests)
+install_lock_wait_hooks(engine)
+app.middleware("http")(request_metrics_middleware)
+
 # Health check endpoint for deployment monitoring
 @app.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint that verifies database connectivity"""
     try:
         # Check database connectivity
@@ -360,6 +369,79 @@ def startup():
     
     # Start the cleanup task
     asyncio.create_task(daily_cleanup())
+
+    async def auth_request_expiry():
+        """Periodic task to mark overdue authentication requests as expired"""
+        interval = int(os.getenv('AUTH_REQUEST_EXPIRY_INTERVAL_SECONDS', '900'))
+        while True:
+            try:
+                # Run in a worker thread - batched UPDATEs and audit inserts hit the database
+                expired_count = await asyncio.to_thread(cleanup_expired_requests)
+                if expired_count > 0:
+                    print(f"⌛ Expired {expired_count} authentication requests")
+            except Exception as e:
+                print(f"⚠️ Error in authentication request expiry: {e}")
+            await asyncio.sleep(interval)
+
+    asyncio.create_task(auth_request_expiry())
+    
+    async def archive_compaction():
+        """Daily task to pack old prayer archive files into monthly compressed bundles"""
+        from app_helpers.services.archive_compression_service import compact_prayer_archives
+        while True:
+            try:
+                # Run in a worker thread - compaction reads and rewrites archive files
+                stats = await asyncio.to_thread(compact_prayer_archives)
+                if stats['files_compressed'] > 0:
+                    print(f"🗜️ Compressed {stats['files_compressed']} prayer archives into monthly bundles")
+                await asyncio.sleep(86400)  # 24 hours
+            except Exception as e:
+                print(f"⚠️ Error in archive compaction: {e}")
+                await asyncio.sleep(3600)  # Retry in 1 hour if error occurs
+    
+    if TEXT_ARCHIVE_ENABLED and TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS > 0:
+        asyncio.create_task(archive_compaction())
+
+    async def email_outbox_sender():
+        """Drain queued verification/recovery emails over a reused SMTP connection"""
+        from app_helpers.services.email_outbox_service import get_email_outbox_service, EMAIL_OUTBOX_POLL_SECONDS
+        outbox = get_email_outbox_service()
+        while True:
+            try:
+                # Run in a worker thread - SMTP round trips are blocking
+                stats = await asyncio.to_thread(outbox.drain)
+                if stats['sent'] or stats['failed']:
+                    print(f"📧 Email outbox: {stats['sent']} sent, {stats['retried']} retrying, {stats['failed']} failed")
+            except Exception as e:
+                print(f"⚠️ Error in email outbox sender: {e}")
+            await asyncio.sleep(EMAIL_OUTBOX_POLL_SECONDS)
+
+    # Same condition EmailManagementService uses to decide whether to queue
+    from app_helpers.services.email_outbox_service import EMAIL_OUTBOX_ENABLED, outbox_delivery_enabled
+    if outbox_delivery_enabled():
+        asyncio.create_task(email_outbox_sender())
+    elif EMAIL_OUTBOX_ENABLED and os.getenv('EMAIL_AUTH_ENABLED', 'false').lower() == 'true':
+        print("⚠️ EMAIL_ENCRYPTION_KEY not set - email outbox disabled, sending email synchronously")
+
+    from app_helpers.services.database_maintenance_service import (
+        run_database_maintenance, DB_MAINTENANCE_INTERVAL_SECONDS
+    )
+
+    async def database_maintenance():
+        """Periodic WAL checkpoint and PRAGMA optimize"""
+        while True:
+            await asyncio.sleep(DB_MAINTENANCE_INTERVAL_SECONDS)
+            try:
+                # Run in a worker thread - the checkpoint copies WAL pages into the database file
+                result = await asyncio.to_thread(run_database_maintenance)
+                if result['busy']:
+                    print(f"⚠️ WAL checkpoint incomplete: {result['checkpointed_pages']}/{result['wal_pages']} pages")
+            except Exception as e:
+                print(f"⚠️ Error in database maintenance: {e}")
+
+    from models import DATABASE_PATH
+    if DATABASE_PATH != ':memory:' and DB_MAINTENANCE_INTERVAL_SECONDS > 0:
+        asyncio.create_task(database_maintenance())
     
     # Auto-migration on startup (if enabled and using file-based database)
     from models import DATABASE_PATH
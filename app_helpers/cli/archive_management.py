@@ -175,12 +175,15 @@ else:
         return False
 
 
-def export_all_database_data() -> bool:
+def export_all_database_data(parallel: bool = False) -> bool:
     """
     Export absolutely all server data to text archives.
     
     This includes everything in the database organized in unified archive structure.
     
+    Args:
+        parallel: If True, export table groups concurrently in worker threads
+        
     Returns:
         True if successful, False otherwise
     """
@@ -192,7 +195,7 @@ def export_all_database_data() -> bool:
     try:
         # Use the clean export service
         from app_helpers.services.export_service import export_all_database_data
-        return export_all_database_data()
+        return export_all_database_data(parallel)
     except ImportError as e:
         print(f"❌ Error importing export service: {e}")
         return False
@@ -222,6 +225,51 @@ def import_all_database_data(dry_run: bool = False) -> bool:
         return False
 
 
+def compress_archives(dry_run: bool = False) -> bool:
+    """
+    Pack prayer archive files older than TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS
+    into per-month compressed bundles.
+    
+    Args:
+        dry_run: If True, report what would be compressed without changing anything
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    print("🗜️ Compressing Prayer Archives")
+    print("=" * 30)
+    
+    if not validate_project_directory():
+        print("❌ app.py not found in current directory")
+        print("Please run this command from your ThyWill project directory")
+        return False
+    
+    try:
+        from app_helpers.services.archive_compression_service import ArchiveCompressionService
+        
+        service = ArchiveCompressionService()
+        if not service.enabled:
+            print("⚠️  Compression disabled (TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS=0)")
+            return True
+        
+        print(f"Threshold: files untouched for {service.compress_after_days} days")
+        stats = service.compact(dry_run=dry_run)
+        
+        action = "Would compress" if dry_run else "Compressed"
+        print(f"{action} {stats['files_compressed']} files across {stats['months_processed']} months")
+        if not dry_run and stats['files_compressed']:
+            print(f"Size: {stats['bytes_before']:,} bytes → {stats['bytes_after']:,} bytes")
+        
+        for error in stats['errors']:
+            print(f"❌ {error}")
+        
+        return not stats['errors']
+        
+    except Exception as e:
+        print(f"❌ Archive compression failed: {e}")
+        return False
+
+
 def main():
     """Main entry point for archive management commands."""
     if len(sys.argv) < 2:
@@ -231,8 +279,10 @@ def main():
         print("  sync-archives    - Interactive archive synchronization")
         print("  validate-archives - Validate archive integrity")
         print("  export-all       - Export all database data")
+        print("  export-all --parallel - Export table groups in parallel threads")
         print("  import-all       - Import all database data")
         print("  import-all --dry-run - Preview import changes")
+        print("  compress-archives [--dry-run] - Pack old prayer files into monthly bundles")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -244,10 +294,14 @@ def main():
     elif command == "validate-archives":
         success = validate_archives()
     elif command == "export-all":
-        success = export_all_database_data()
+        parallel = "--parallel" in sys.argv
+        success = export_all_database_data(parallel)
     elif command == "import-all":
         dry_run = "--dry-run" in sys.argv
         success = import_all_database_data(dry_run)
+    elif command == "compress-archives":
+        dry_run = "--dry-run" in sys.argv
+        success = compress_archives(dry_run)
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -59,10 +59,40 @@ def validate_archives() -> bool:
         return False
 
 
-def test_recovery() -> bool:
+def compare_recovered_database(recovered_db: str, production_db: str = None) -> bool:
+    """
+    Compare a recovered database against production with exact range checksums.
+    
+    Args:
+        recovered_db: Database produced by a recovery run
+        production_db: Reference database (defaults to DATABASE_PATH or thywill.db)
+        
+    Returns:
+        True if the databases hold identical data, False otherwise
+    """
+    production_db = production_db or os.getenv('DATABASE_PATH') or 'thywill.db'
+    
+    print()
+    print('🔢 Comparing recovered database against production (range checksums)...')
+    result = subprocess.run([
+        sys.executable,
+        "scripts/utils/compare_databases.py",
+        production_db,
+        recovered_db,
+        "--checksum",
+        "--detailed"
+    ])
+    return result.returncode == 0
+
+
+def test_recovery(compare_db: str = None, against_db: str = None) -> bool:
     """
     Test recovery capabilities by simulating recovery process.
     
+    Args:
+        compare_db: Optional recovered database to verify against production afterwards
+        against_db: Reference database for compare_db (defaults to production)
+    
     Returns:
         True if test passes, False otherwise
     """
@@ -94,6 +124,10 @@ def test_recovery() -> bool:
                 for error in stats['errors']:
                     print(f'  • {error}')
             
+            if compare_db and not compare_recovered_database(compare_db, against_db):
+                print('❌ Recovered database differs from production')
+                return False
+            
             print()
             print('💡 Use "thywill full-recovery" to perform actual recovery')
             return True
@@ -245,7 +279,18 @@ def main():
             sys.exit(1)
             
     elif command == "test-recovery":
-        if test_recovery():
+        compare_db = None
+        against_db = None
+        if "--compare" in sys.argv[2:]:
+            index = sys.argv.index("--compare")
+            compare_db = sys.argv[index + 1] if index + 1 < len(sys.argv) else None
+            if not compare_db:
+                print("Usage: python archive_validation.py test-recovery --compare <recovered.db> [--against <db>]")
+                sys.exit(1)
+        if "--against" in sys.argv[2:]:
+            index = sys.argv.index("--against")
+            against_db = sys.argv[index + 1] if index + 1 < len(sys.argv) else None
+        if test_recovery(compare_db, against_db):
             sys.exit(0)
         else:
             sys.exit(1)
@@ -8,10 +8,11 @@ Can be run independently or called from the CLI script.
 
 import sys
 import os
-import subprocess
 import hashlib
 from typing import Dict, Any
 
+from app_helpers.services.database_backup_service import verify_database
+
 
 def verify_backup(backup_file: str) -> Dict[str, Any]:
     """
@@ -64,20 +65,11 @@ def verify_backup(backup_file: str) -> Dict[str, Any]:
             results['errors'].append(f"Checksum verification error: {e}")
     
     # Check database integrity
-    try:
-        result = subprocess.run([
-            'sqlite3', backup_file, 'PRAGMA integrity_check;'
-        ], capture_output=True, text=True, check=True)
-        
-        if 'ok' in result.stdout.lower():
-            results['database_integrity_ok'] = True
-        else:
-            results['errors'].append("Database integrity check failed")
-            
-    except subprocess.CalledProcessError as e:
-        results['errors'].append(f"Database integrity check error: {e}")
-    except FileNotFoundError:
-        results['errors'].append("sqlite3 command not found - cannot verify database integrity")
+    integrity_ok, messages = verify_database(backup_file)
+    if integrity_ok:
+        results['database_integrity_ok'] = True
+    else:
+        results['errors'].append(f"Database integrity check failed: {'; '.join(messages[:5])}")
     
     return results
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Statistics Rollup CLI Module
+
+Rebuilds the daily_stats rollup behind admin analytics from the source tables.
+The rollup is kept current on every write, so this is only needed after bulk
+imports, restores or direct SQL edits.
+"""
+
+import sys
+from datetime import datetime
+from sqlmodel import Session
+from models import engine
+from app_helpers.services.statistics_service import StatisticsService
+
+
+def rebuild_stats(from_day=None) -> bool:
+    """Rebuild rollups for all days, or for days on or after from_day."""
+    scope = f"from {from_day.isoformat()}" if from_day else "for all history"
+    print(f"📊 Rebuilding daily statistics {scope}...")
+    try:
+        with Session(engine) as session:
+            days = StatisticsService(session).rebuild_daily_rollups(from_day)
+        print(f"✅ Rebuilt {days} day(s) of statistics")
+        return True
+    except Exception as e:
+        print(f"❌ Statistics rebuild failed: {e}")
+        return False
+
+
+def main():
+    """Main entry point for statistics rollup commands."""
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m app_helpers.cli.statistics_rollup rebuild [--from YYYY-MM-DD]")
+        sys.exit(1)
+
+    from_day = None
+    if "--from" in sys.argv:
+        index = sys.argv.index("--from")
+        try:
+            from_day = datetime.strptime(sys.argv[index + 1], "%Y-%m-%d").date()
+        except (IndexError, ValueError):
+            print("❌ --from expects a date in YYYY-MM-DD format")
+            sys.exit(1)
+
+    sys.exit(0 if rebuild_stats(from_day) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional
 
 # Import models
-from models import engine
+from models import read_engine
 
 # Import helper functions
 from app_helpers.services.auth_helpers import current_user, is_admin
@@ -29,7 +29,7 @@ def require_admin(user_session: tuple = Depends(current_user)):
 
 
 @router.get("/api/statistics/prayers")
-async def get_prayer_statistics(
+def get_prayer_statistics(
     period: str = Query(..., regex="^(daily|weekly|monthly|yearly)$"),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -61,7 +61,7 @@ async def get_prayer_statistics(
     
     # Get statistics
     try:
-        with Session(engine) as session:
+        with Session(read_engine) as session:
             stats_service = StatisticsService(session)
             
             prayer_counts = stats_service.get_prayer_counts_by_period(
@@ -76,6 +76,14 @@ async def get_prayer_statistics(
                 period, start_date_obj, end_date_obj
             )
             
+            answered_counts = stats_service.get_answered_counts_by_period(
+                period, start_date_obj, end_date_obj
+            )
+            
+            prayer_user_counts = stats_service.get_active_prayer_user_counts_by_period(
+                period, start_date_obj, end_date_obj
+            )
+            
             summary = stats_service.get_summary_statistics()
             
             return {
@@ -85,6 +93,8 @@ async def get_prayer_statistics(
                 "prayer_counts": prayer_counts,
                 "user_counts": user_counts,
                 "prayer_marks_counts": prayer_marks_counts,
+                "answered_counts": answered_counts,
+                "prayer_user_counts": prayer_user_counts,
                 "summary": summary
             }
         
@@ -95,13 +105,13 @@ async def get_prayer_statistics(
 
 
 @router.get("/api/statistics/summary")
-async def get_summary_statistics(
+def get_summary_statistics(
     current_user=Depends(require_admin)
 ) -> Dict[str, int]:
     """Get summary statistics for dashboard overview"""
     
     try:
-        with Session(engine) as session:
+        with Session(read_engine) as session:
             stats_service = StatisticsService(session)
             return stats_service.get_summary_statistics()
     except Exception as e:
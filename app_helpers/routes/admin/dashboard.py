@@ -20,7 +20,7 @@ from app_helpers.timezone_utils import get_user_timezone_from_request
 
 # Import helper functions
 from app_helpers.services.auth_helpers import (
-    current_user, is_admin, cleanup_expired_requests, log_auth_action
+    current_user, is_admin, log_auth_action
 )
 from app_helpers.services.membership_application_service import MembershipApplicationService
 import os
@@ -50,8 +50,6 @@ def admin(request: Request, user_session: tuple = Depends(current_user), success
     if not is_admin(user):
         raise HTTPException(403)
     
-    cleanup_expired_requests()  # Clean up old requests
-    
     with Session(engine) as s:
         # Join Prayer and User tables to get author display names for flagged prayers
         stmt = (
@@ -81,6 +79,7 @@ def admin(request: Request, user_session: tuple = Depends(current_user), success
             .join(User, AuthenticationRequest.user_id == User.display_name)
             .outerjoin(AuthApproval, AuthenticationRequest.id == AuthApproval.auth_request_id)
             .where(AuthenticationRequest.status == "pending")
+            .where(AuthenticationRequest.expires_at > datetime.utcnow())
             .group_by(
                 AuthenticationRequest.id,
                 AuthenticationRequest.user_id,
@@ -1,18 +1,24 @@
 # app_helpers/routes/admin/debug_routes.py
 """
-Admin debug routes for checking environment configuration.
+Admin debug routes for checking environment configuration and per-route
+request metrics (query counts, DB/template time, archive writes, SQLite
+write-lock waits).
 Only accessible to admin users for troubleshooting production issues.
 """
 
 import os
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlmodel import Session
 
 from app_helpers.services.auth_helpers import current_user, is_admin
 from models import InviteToken, engine
 from app_helpers.shared_templates import templates
+from app_helpers.utils.request_metrics import (
+    REQUEST_METRICS_ENABLED, REPEATED_STATEMENT_THRESHOLD, request_metrics_registry
+)
+from app_helpers.services.database_maintenance_service import lock_wait_metrics
 from app_helpers.services.ai_providers import (
     AIConfigurationError,
     get_ai_provider_config,
@@ -106,3 +112,40 @@ def debug_environment(request: Request, user_session: tuple = Depends(current_us
         "user": user,
         "debug_info": debug_info
     })
+
+
+@router.get("/admin/debug/requests", response_class=HTMLResponse)
+def debug_request_metrics(request: Request, user_session: tuple = Depends(current_user)):
+    """
+    Per-route query counts, DB time, archive writes and template render time
+    collected by the request metrics middleware. Only accessible to admin users.
+    """
+    user, session = user_session
+    if not session.is_fully_authenticated:
+        raise HTTPException(403, "Full authentication required")
+    
+    if not is_admin(user):
+        raise HTTPException(403, "Admin access required")
+    
+    return templates.TemplateResponse("admin_request_metrics.html", {
+        "request": request,
+        "user": user,
+        "metrics_enabled": REQUEST_METRICS_ENABLED,
+        "collecting_since": request_metrics_registry.since,
+        "routes": request_metrics_registry.route_summaries(),
+        "recent_requests": request_metrics_registry.recent_requests(),
+        "repeated_threshold": REPEATED_STATEMENT_THRESHOLD,
+        "lock_waits": lock_wait_metrics.snapshot()
+    })
+
+
+@router.post("/admin/debug/requests/reset")
+def reset_request_metrics(user_session: tuple = Depends(current_user)):
+    """Clear collected request metrics"""
+    user, session = user_session
+    if not session.is_fully_authenticated or not is_admin(user):
+        raise HTTPException(403, "Admin access required")
+    
+    request_metrics_registry.reset()
+    lock_wait_metrics.reset()
+    return RedirectResponse("/admin/debug/requests", 303)
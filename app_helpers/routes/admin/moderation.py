@@ -13,6 +13,7 @@ from models import engine, Prayer
 
 # Import helper functions
 from app_helpers.services.auth_helpers import current_user, is_admin
+from app_helpers.services.activity_timeline_service import set_prayer_activity_hidden
 
 # Create router for this module
 router = APIRouter()
@@ -41,6 +42,7 @@ def flag_prayer(prayer_id: str, request: Request, user_session: tuple = Depends(
         
         prayer.flagged = True
         s.add(prayer)
+        set_prayer_activity_hidden(s, prayer_id, True)
         s.commit()
         
         # Note: Prayer flagging is logged through the flagged field change
@@ -73,6 +75,7 @@ def unflag_prayer(prayer_id: str, request: Request, user_session: tuple = Depend
         
         prayer.flagged = False
         s.add(prayer)
+        set_prayer_activity_hidden(s, prayer_id, False)
         s.commit()
         
         # Note: Prayer unflagging is logged through the flagged field change
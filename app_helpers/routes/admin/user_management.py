@@ -4,13 +4,14 @@ Admin User Management Routes
 Contains routes for managing users including deactivation, reactivation, and status checking.
 """
 
-from fastapi import APIRouter, Request, Depends, HTTPException, Form
+from typing import Optional
+from fastapi import APIRouter, Request, Depends, HTTPException, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session, select, func
 
 # Import models
-from models import engine, User, Prayer, PrayerMark, InviteToken, Role, UserRole
+from models import engine, read_engine, User, Prayer, PrayerMark, InviteToken, Role, UserRole
 
 # Import helper functions
 from app_helpers.services.auth_helpers import current_user, is_admin
@@ -19,6 +20,8 @@ from app_helpers.utils.user_management import (
     get_user_deactivation_info, UserManagementError
 )
 from app_helpers.services.token_service import create_user_login_token
+from app_helpers.services.profile_data_service import ProfileDataService
+from app_helpers.services.user_directory_service import UserDirectoryService, DIRECTORY_PAGE_SIZE
 from app_helpers.utils.username_helpers import find_users_with_equivalent_usernames
 from app_helpers.timezone_utils import get_user_timezone_from_request
 from datetime import datetime
@@ -32,12 +35,17 @@ router = APIRouter()
 
 
 @router.get("/admin/users", response_class=HTMLResponse)
-def admin_users(request: Request, user_session: tuple = Depends(current_user)):
+def admin_users(
+    request: Request,
+    page: int = Query(1, ge=1),
+    q: Optional[str] = Query(None, max_length=100),
+    user_session: tuple = Depends(current_user)
+):
     """
     Admin User Management
     
     Displays user management interface for administrators including:
-    - List of all users with their statistics
+    - Paginated, searchable list of all users with their statistics
     - User activity and engagement metrics
     - Admin controls for user management
     
@@ -47,71 +55,14 @@ def admin_users(request: Request, user_session: tuple = Depends(current_user)):
     if not is_admin(user):
         raise HTTPException(403)
     
-    with Session(engine) as s:
-        # Get all users with basic stats
-        users_stmt = select(User).order_by(User.created_at.desc())
-        all_users = s.exec(users_stmt).all()
-        
-        users_with_stats = []
-        for profile_user in all_users:
-            # Get prayer counts
-            prayers_authored = s.exec(
-                select(func.count(Prayer.id))
-                .where(Prayer.author_username == profile_user.display_name)
-                .where(Prayer.flagged == False)
-            ).first() or 0
-            
-            prayers_marked = s.exec(
-                select(func.count(PrayerMark.id))
-                .where(PrayerMark.username == profile_user.display_name)
-            ).first() or 0
-
-            distinct_prayers_marked = s.exec(
-                select(func.count(func.distinct(PrayerMark.prayer_id)))
-                .where(PrayerMark.username == profile_user.display_name)
-            ).first() or 0
-
-            # Determine last activity based on latest prayer or mark
-            last_activity = None
-            last_prayer_mark = s.exec(
-                select(PrayerMark.created_at)
-                .where(PrayerMark.username == profile_user.display_name)
-                .order_by(PrayerMark.created_at.desc())
-                .limit(1)
-            ).first()
-
-            last_prayer_request = s.exec(
-                select(Prayer.created_at)
-                .where(Prayer.author_username == profile_user.display_name)
-                .where(Prayer.flagged == False)
-                .order_by(Prayer.created_at.desc())
-                .limit(1)
-            ).first()
-
-            if last_prayer_mark and last_prayer_request:
-                last_activity = max(last_prayer_mark, last_prayer_request)
-            elif last_prayer_mark:
-                last_activity = last_prayer_mark
-            elif last_prayer_request:
-                last_activity = last_prayer_request
-            
-            # Check deactivation status
-            is_deactivated = is_user_deactivated(profile_user.display_name, s)
-            deactivation_info = None
-            if is_deactivated:
-                deactivation_info = get_user_deactivation_info(profile_user.display_name, s)
-            
-            users_with_stats.append({
-                'user': profile_user,
-                'prayers_authored': prayers_authored,
-                'prayers_marked': prayers_marked,
-                'distinct_prayers_marked': distinct_prayers_marked,
-                'last_activity': last_activity,
-                'is_me': profile_user.display_name == user.display_name,
-                'is_admin': profile_user.has_role("admin", s),
-                'is_deactivated': is_deactivated,
-                'deactivation_info': deactivation_info
-            })
+    with Session(read_engine) as s:
+        # Get one page of users (including deactivated) with bulk-computed stats
+        users_with_stats, total_count = UserDirectoryService.get_directory_page(
+            s, user.display_name, page=page, search=q,
+            include_deactivated=True, include_deactivation_info=True
+        )
+        pagination = ProfileDataService.get_pagination_info(total_count, page, DIRECTORY_PAGE_SIZE)
+        community_stats = UserDirectoryService.get_community_totals(s, include_deactivated=True)
 
     user_timezone = get_user_timezone_from_request(request)
 
@@ -119,6 +70,9 @@ def admin_users(request: Request, user_session: tuple = Depends(current_user)):
         "users.html", {
             "request": request,
             "users": users_with_stats,
+            "pagination": pagination,
+            "community_stats": community_stats,
+            "search_query": q or "",
             "me": user,
             "session": session,
             "user_timezone": user_timezone,
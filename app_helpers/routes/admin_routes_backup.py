@@ -26,7 +26,7 @@ from models import (
 
 # Import helper functions
 from app_helpers.services.auth_helpers import (
-    current_user, is_admin, cleanup_expired_requests, log_auth_action
+    current_user, is_admin, log_auth_action
 )
 from app_helpers.utils.user_management import (
     deactivate_user, reactivate_user, is_user_deactivated, 
@@ -57,8 +57,6 @@ def admin(request: Request, user_session: tuple = Depends(current_user)):
     if not is_admin(user):
         raise HTTPException(403)
     
-    cleanup_expired_requests()  # Clean up old requests
-    
     with Session(engine) as s:
         # Join Prayer and User tables to get author display names for flagged prayers
         stmt = (
@@ -106,7 +106,7 @@ async def download_community_archive(
         raise HTTPException(status_code=500, detail=f"Community archive creation failed: {str(e)}")
 
 @router.get("/prayer/{prayer_id}/file")
-async def get_prayer_archive_file(
+def get_prayer_archive_file(
     prayer_id: str,
     current_session_user = Depends(require_full_auth)
 ):
@@ -23,8 +23,7 @@ from models import (
 
 # Import helper functions
 from app_helpers.services.auth_helpers import (
-    create_session, check_rate_limit, cleanup_expired_requests,
-    create_auth_request
+    create_session, check_rate_limit, create_auth_request
 )
 from app_helpers.utils.invite_tree_validation import (
     validate_new_user_invite_relationship, 
@@ -35,6 +34,7 @@ from app_helpers.services.token_service import TOKEN_EXP_H
 from app_helpers.utils.time_formatting import format_validity_message
 from app_helpers.utils.user_management import is_user_deactivated
 from app_helpers.services.archive_first_service import create_user_with_text_archive
+from app_helpers.services.invite_helpers import invalidate_invite_tree_cache
 from app_helpers.utils.username_helpers import (
     normalize_username, 
     normalize_username_for_lookup, 
@@ -402,6 +402,7 @@ def claim_post(token: str, display_name: str = Form(...), request: Request = Non
             
             s.add(inv)
             s.commit()
+            invalidate_invite_tree_cache()
             
             # Extract device info for session creation
             device_info = request.headers.get("User-Agent", "Unknown") if request else "Unknown"
@@ -484,6 +485,7 @@ def claim_post(token: str, display_name: str = Form(...), request: Request = Non
             grant_admin_role_for_system_token(user.display_name, token, s)
             
             s.commit()
+            invalidate_invite_tree_cache()
 
             # Extract device info for session creation
             device_info = request.headers.get("User-Agent", "Unknown") if request else "Unknown"
@@ -575,8 +577,6 @@ def login_post(username: str = Form(...), request: Request = None):
             }
         )
     
-    cleanup_expired_requests()  # Clean up old requests
-    
     device_info = request.headers.get("User-Agent", "Unknown") if request else "Unknown"
     ip_address = request.client.host if request else "Unknown"
     
@@ -637,6 +637,7 @@ def login_post(username: str = Form(...), request: Request = None):
             .where(AuthenticationRequest.ip_address == ip_address)
             .where(AuthenticationRequest.device_info == device_info)
             .where(AuthenticationRequest.status == "pending")
+            .where(AuthenticationRequest.expires_at > datetime.utcnow())
             .where(AuthenticationRequest.created_at > datetime.utcnow() - timedelta(hours=1))
         ).first()
         
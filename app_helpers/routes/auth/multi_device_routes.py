@@ -23,7 +23,7 @@ from app_helpers.timezone_utils import get_user_timezone_from_request
 
 # Import helper functions
 from app_helpers.services.auth_helpers import (
-    create_session, current_user, is_admin, cleanup_expired_requests,
+    create_session, current_user, is_admin, effective_request_status,
     create_auth_request, approve_auth_request, get_pending_requests_for_approval,
     log_auth_action, check_rate_limit
 )
@@ -63,8 +63,6 @@ def create_authentication_request(display_name: str = Form(...), request: Reques
     if not MULTI_DEVICE_AUTH_ENABLED:
         raise HTTPException(404, "Multi-device authentication is disabled")
     
-    cleanup_expired_requests()  # Clean up old requests
-    
     device_info = request.headers.get("User-Agent", "Unknown") if request else "Unknown"
     ip_address = request.client.host if request else "Unknown"
     
@@ -87,6 +85,7 @@ def create_authentication_request(display_name: str = Form(...), request: Reques
             .where(AuthenticationRequest.user_id == existing_user.display_name)
             .where(AuthenticationRequest.ip_address == ip_address)
             .where(AuthenticationRequest.status == "pending")
+            .where(AuthenticationRequest.expires_at > datetime.utcnow())
             .where(AuthenticationRequest.created_at > datetime.utcnow() - timedelta(hours=1))
         ).first()
         
@@ -154,7 +153,6 @@ def pending_requests(request: Request, user_session: tuple = Depends(current_use
         HTTPException: 403 if not fully authenticated
     """
     user, session = user_session
-    cleanup_expired_requests()
     
     # Check if user exists
     if not user:
@@ -247,7 +245,7 @@ def reject_request(request_id: str, user_session: tuple = Depends(current_user))
     
     with Session(engine) as db:
         auth_req = db.get(AuthenticationRequest, request_id)
-        if not auth_req or auth_req.status != "pending":
+        if not auth_req or effective_request_status(auth_req) != "pending":
             raise HTTPException(400, "Request not found or already processed")
         
         auth_req.status = "rejected"
@@ -296,7 +294,6 @@ def my_auth_requests(request: Request, user_session: tuple = Depends(current_use
         HTTPException: 403 if not fully authenticated
     """
     user, session = user_session
-    cleanup_expired_requests()
     
     # Only fully authenticated users can view
     if not session.is_fully_authenticated:
@@ -330,6 +327,7 @@ def my_auth_requests(request: Request, user_session: tuple = Depends(current_use
             
             requests_with_approvals.append({
                 'request': auth_req,
+                'status': effective_request_status(auth_req),
                 'approvals': approval_info,
                 'approval_count': len(approval_info)
             })
@@ -42,7 +42,7 @@ class SessionInfoResponse(BaseModel):
 
 
 @router.get("/api/session/info", response_model=SessionInfoResponse)
-async def get_session_info(request: Request):
+def get_session_info(request: Request):
     """
     Get current session information for backup purposes.
     
@@ -80,7 +80,7 @@ async def get_session_info(request: Request):
 
 
 @router.post("/api/session/backup")
-async def backup_session_data(
+def backup_session_data(
     backup_request: SessionBackupRequest,
     request: Request
 ):
@@ -112,7 +112,7 @@ async def backup_session_data(
 
 
 @router.post("/api/session/restore") 
-async def restore_session_cookie(
+def restore_session_cookie(
     restore_request: SessionRestoreRequest,
     request: Request
 ):
@@ -188,7 +188,7 @@ async def restore_session_cookie(
 
 
 @router.delete("/api/session/clear")
-async def clear_session_data(request: Request):
+def clear_session_data(request: Request):
     """
     Clear session data (logout).
     
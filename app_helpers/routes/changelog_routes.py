@@ -21,7 +21,7 @@ router = APIRouter()
 from app_helpers.shared_templates import templates
 
 @router.get("/changelog", response_class=HTMLResponse)
-async def changelog(request: Request):
+def changelog(request: Request):
     """Display the user-friendly changelog page"""
     # Check if debug mode is enabled
     debug_mode = os.getenv('CHANGELOG_DEBUG', 'false').lower() == 'true'
@@ -85,7 +85,7 @@ async def changelog(request: Request):
     })
 
 @router.get("/api/changelog")
-async def api_changelog():
+def api_changelog():
     """JSON API endpoint for changelog data"""
     # Refresh changelog if there are new commits
     refresh_changelog_if_needed()
@@ -107,7 +107,7 @@ async def api_changelog():
     return JSONResponse(changelog_data)
 
 @router.get("/admin/changelog/refresh")
-async def admin_refresh_changelog():
+def admin_refresh_changelog():
     """Admin endpoint to manually refresh changelog (requires admin auth)"""
     # Note: This should include admin authentication check
     # For now, just refresh and return status
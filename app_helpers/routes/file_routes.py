@@ -9,6 +9,7 @@ Provides URLs that mirror the file system structure:
 from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import PlainTextResponse
 from app_helpers.services.auth_helpers import require_full_auth
+from app_helpers.services.archive_compression_service import read_archive_text
 from sqlmodel import Session, select
 from models import engine, Prayer
 from pathlib import Path
@@ -69,21 +70,17 @@ def read_archive_file(file_path: str) -> str:
         FileNotFoundError: If file doesn't exist
         HTTPException: If file can't be read
     """
-    path = Path(file_path)
-    
-    # First try to read uncompressed file
-    if path.exists():
-        try:
-            return path.read_text(encoding='utf-8')
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to read file: {str(e)}")
-    
-    # TODO: Add compressed file reading when compression is implemented
-    raise FileNotFoundError(f"Archive file not found: {file_path}")
+    try:
+        # Falls back to the month's compressed bundle once the file has been packed
+        return read_archive_text(file_path)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read file: {str(e)}")
 
 
 @router.get("/prayers/{year}/{month}/{filename}")
-async def get_prayer_file(
+def get_prayer_file(
     year: str,
     month: str, 
     filename: str,
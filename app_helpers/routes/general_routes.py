@@ -61,7 +61,7 @@ def donate(request: Request, user_session: tuple = Depends(current_user)):
     )
 
 @router.post("/dismiss-welcome")
-async def dismiss_welcome(user_session: tuple = Depends(current_user)):
+def dismiss_welcome(user_session: tuple = Depends(current_user)):
     """Dismiss the welcome message for the current user"""
     user, session = user_session
     
@@ -10,7 +10,7 @@ from sqlmodel import Session
 
 from models import engine, InviteToken
 from app_helpers.services.auth_helpers import current_user
-from app_helpers.services.invite_helpers import get_invite_tree, get_invite_stats, get_user_invite_path
+from app_helpers.services.invite_helpers import get_invite_tree, get_user_invite_path
 from app_helpers.services.token_service import create_invite_token
 
 # Use shared templates instance with filters registered
@@ -94,8 +94,8 @@ def invite_tree(request: Request, user_session: tuple = Depends(current_user)):
     # Get the complete tree data
     tree_data = get_invite_tree()
     
-    # Get invite statistics
-    stats = get_invite_stats()
+    # Invite statistics are computed (and cached) alongside the tree
+    stats = tree_data["stats"]
     
     # Get current user's invite path
     user_path = get_user_invite_path(user.display_name)
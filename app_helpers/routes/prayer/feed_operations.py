@@ -22,6 +22,8 @@ from models import (
 from app_helpers.services.auth_helpers import current_user
 from app_helpers.services.prayer_helpers import get_feed_counts, todays_prompt, is_daily_priority, get_daily_priority_date
 from app_helpers.services.auth.validation_helpers import is_admin
+from app_helpers.services.username_display_service import username_display_service
+from app_helpers.services.feed_version_service import get_feed_version, feed_etag, conditional_headers, not_modified
 from app_helpers.timezone_utils import get_user_timezone_from_request
 # Note: Avoiding imports from app.py to prevent circular imports
 # Using os.getenv directly for feature flags
@@ -56,6 +58,15 @@ def feed(request: Request, feed_type: str = "all", category: Optional[str] = Non
         feed_type = "all"
         
     with Session(engine) as s:
+        # Answer revalidations from idle tabs and back-navigation without re-rendering
+        etag = feed_etag(
+            request, get_feed_version(s, user.display_name),
+            user.display_name, session.id, session.is_fully_authenticated, is_admin(user)
+        )
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        
         prayers_with_authors = []
         
         # Base filter to exclude archived prayers for public feeds
@@ -240,6 +251,9 @@ def feed(request: Request, feed_type: str = "all", category: Optional[str] = Non
         distinct_user_counts_results = s.exec(distinct_user_counts_stmt).all()
         distinct_user_counts = {prayer_id: count for prayer_id, count in distinct_user_counts_results}
         
+        # Load supporter data for every author in one query (shared with the username_display filter)
+        username_display_service.preload((result[1] for result in results), s)
+        
         # Create a list of prayers with author names and mark data
         for result in results:
             if len(result) == 3:  # most_prayed query includes mark_count
@@ -248,7 +262,7 @@ def feed(request: Request, feed_type: str = "all", category: Optional[str] = Non
                 prayer, author_name = result
                 
             # Get author user object for supporter badge
-            author_user = s.exec(select(User).where(User.display_name == author_name)).first()
+            author_user = username_display_service.get_user_display_data(author_name, s).get('user_object')
             
             prayer_dict = {
                 'id': prayer.id,
@@ -297,5 +311,6 @@ def feed(request: Request, feed_type: str = "all", category: Optional[str] = Non
          "HIGH_SAFETY_FILTER_ENABLED": os.getenv('HIGH_SAFETY_FILTER_ENABLED', 'false').lower() == 'true',
          "SAFETY_BADGES_VISIBLE": os.getenv('SAFETY_BADGES_VISIBLE', 'false').lower() == 'true',
          "CATEGORY_FILTER_DROPDOWN_ENABLED": os.getenv('CATEGORY_FILTER_DROPDOWN_ENABLED', 'false').lower() == 'true',
-         "FILTER_PERSISTENCE_ENABLED": os.getenv('FILTER_PERSISTENCE_ENABLED', 'false').lower() == 'true'}
+         "FILTER_PERSISTENCE_ENABLED": os.getenv('FILTER_PERSISTENCE_ENABLED', 'false').lower() == 'true'},
+        headers=conditional_headers(etag)
     )
\ No newline at end of file
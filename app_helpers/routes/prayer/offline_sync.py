@@ -0,0 +1,41 @@
+# app_helpers/routes/prayer/offline_sync.py
+"""
+JSON delta sync for the PWA's offline prayer store.
+
+Contains the endpoint offline-data.js polls to keep its IndexedDB copy of the
+feed current without re-downloading feed HTML.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlmodel import Session
+
+from models import read_engine
+
+# Import helper functions
+from app_helpers.services.auth_helpers import current_user
+from app_helpers.services.offline_sync_service import (
+    get_prayer_delta, decode_sync_cursor, SYNC_PAGE_SIZE, MAX_SYNC_PAGE_SIZE
+)
+
+# Create router for offline sync operations
+router = APIRouter()
+
+
+@router.get("/api/sync/prayers")
+def sync_prayers(
+    since: Optional[str] = None,
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=MAX_SYNC_PAGE_SIZE),
+    user_session: tuple = Depends(current_user)
+):
+    """
+    Get feed prayers changed since the client's cursor.
+
+    Omit `since` for a full download. Keep requesting with the returned cursor
+    while has_more is true; when reset is true, clear the local store first.
+    """
+    user, session = user_session
+    with Session(read_engine) as s:
+        delta = get_prayer_delta(s, user.display_name, decode_sync_cursor(since), limit)
+    return JSONResponse(delta, headers={"Cache-Control": "private, no-store"})
@@ -18,7 +18,7 @@ from fastapi.templating import Jinja2Templates
 from sqlmodel import Session, select, func, desc
 
 from models import (
-    engine, User, Prayer, PrayerMark, PrayerSkip, PrayerAttribute
+    engine, User, Prayer, PrayerMark, PrayerSkip, PrayerAttribute, PrayerModeSession
 )
 
 # Import helper functions
@@ -70,54 +70,81 @@ def get_prayer_age_text(prayer_created_at: datetime) -> str:
             return f"{years} years ago"
 
 
-def initialize_prayer_queue(session: Session, user: User, feed_type: str = "new_unprayed") -> List[str]:
-    """Initialize prayer queue with smart sorting based on user's prayer and skip history."""
-    
+PRAYER_MODE_QUEUE_SIZE = 10  # Prayers queued per batch (quick mode)
+PRAYER_MODE_REFILL_THRESHOLD = 3  # Refill when this few queued prayers remain ahead of the cursor
+PRAYER_MODE_SNAPSHOT_SIZE = 200  # Ranked candidates kept on the session for refills
+PRAYER_MODE_SESSION_MINUTES = 60  # Idle time before a session lapses; each view extends it
+
+
+def score_prayer_candidates(session: Session, user: User, exclude_ids=()) -> List[tuple]:
+    """
+    Score every eligible prayer for a user's prayer mode queue.
+
+    Mark and skip history is aggregated in grouped queries rather than per prayer.
+
+    Returns:
+        List of (prayer_id, score) tuples, highest score first
+    """
+    now = datetime.utcnow()
+    excluded = set(exclude_ids)
+
     # Base filter to exclude archived prayers for public feeds
     def exclude_archived():
         return ~Prayer.id.in_(
             select(PrayerAttribute.prayer_id)
             .where(PrayerAttribute.attribute_name == 'archived')
         )
-    
+
     # Get all eligible prayers
-    base_stmt = (
-        select(Prayer)
+    prayers = session.exec(
+        select(Prayer.id, Prayer.created_at)
         .where(Prayer.flagged == False)
         .where(exclude_archived())
-    )
-    
-    prayers = session.exec(base_stmt).all()
-    
+    ).all()
+
+    global_counts = dict(session.exec(
+        select(PrayerMark.prayer_id, func.count(PrayerMark.id))
+        .group_by(PrayerMark.prayer_id)
+    ).all())
+
+    user_marks = {
+        prayer_id: (count, latest)
+        for prayer_id, count, latest in session.exec(
+            select(PrayerMark.prayer_id, func.count(PrayerMark.id), func.max(PrayerMark.created_at))
+            .where(PrayerMark.username == user.display_name)
+            .group_by(PrayerMark.prayer_id)
+        ).all()
+    }
+
+    user_skips = {
+        prayer_id: (count, latest)
+        for prayer_id, count, latest in session.exec(
+            select(PrayerSkip.prayer_id, func.count(PrayerSkip.id), func.max(PrayerSkip.created_at))
+            .where(PrayerSkip.user_id == user.display_name)
+            .group_by(PrayerSkip.prayer_id)
+        ).all()
+    }
+
     # Calculate sorting scores for each prayer
     prayer_scores = []
-    
-    for prayer in prayers:
+
+    for prayer_id, created_at in prayers:
+        if prayer_id in excluded:
+            continue
         score = 0
-        
+
         # Base score: newer prayers get higher score
-        days_old = (datetime.utcnow() - prayer.created_at).days
+        days_old = (now - created_at).days
         score += max(0, 30 - days_old)  # Up to 30 points for newness
-        
+
         # Global prayer count: less prayed prayers get higher score
-        global_prayer_count = session.exec(
-            select(func.count(PrayerMark.id)).where(PrayerMark.prayer_id == prayer.id)
-        ).one()
-        score += max(0, 20 - global_prayer_count)  # Up to 20 points for being less prayed
-        
+        score += max(0, 20 - global_counts.get(prayer_id, 0))  # Up to 20 points for being less prayed
+
         # User's prayer history: recently prayed prayers get lower score
-        user_prayer_marks = session.exec(
-            select(PrayerMark).where(
-                PrayerMark.prayer_id == prayer.id,
-                PrayerMark.username == user.display_name
-            ).order_by(PrayerMark.created_at.desc())
-        ).all()
-        
-        if user_prayer_marks:
-            # Most recent prayer mark
-            latest_mark = user_prayer_marks[0]
-            days_since_prayed = (datetime.utcnow() - latest_mark.created_at).days
-            
+        if prayer_id in user_marks:
+            mark_count, latest_mark = user_marks[prayer_id]
+            days_since_prayed = (now - latest_mark).days
+
             # Penalty for recently prayed prayers
             if days_since_prayed < 1:
                 score -= 50  # Heavy penalty for same day
@@ -125,22 +152,15 @@ def initialize_prayer_queue(session: Session, user: User, feed_type: str = "new_
                 score -= 30  # Medium penalty for recent
             elif days_since_prayed < 7:
                 score -= 15  # Light penalty for this week
-            
+
             # Additional penalty for multiple prayer marks
-            score -= min(10, len(user_prayer_marks) * 2)
-        
+            score -= min(10, mark_count * 2)
+
         # User's skip history: recently skipped prayers get lower score
-        user_skips = session.exec(
-            select(PrayerSkip).where(
-                PrayerSkip.prayer_id == prayer.id,
-                PrayerSkip.user_id == user.display_name
-            ).order_by(PrayerSkip.created_at.desc())
-        ).all()
-        
-        if user_skips:
-            latest_skip = user_skips[0]
-            days_since_skipped = (datetime.utcnow() - latest_skip.created_at).days
-            
+        if prayer_id in user_skips:
+            skip_count, latest_skip = user_skips[prayer_id]
+            days_since_skipped = (now - latest_skip).days
+
             # Penalty for recently skipped prayers
             if days_since_skipped < 1:
                 score -= 25  # Penalty for same day skip
@@ -148,51 +168,136 @@ def initialize_prayer_queue(session: Session, user: User, feed_type: str = "new_
                 score -= 15  # Medium penalty for recent skip
             elif days_since_skipped < 7:
                 score -= 8   # Light penalty for this week
-            
+
             # Additional penalty for multiple skips
-            score -= min(8, len(user_skips) * 1)
-        
-        prayer_scores.append((prayer.id, score))
-    
-    # Sort by score (highest first) and take top 10 for quick mode
+            score -= min(8, skip_count * 1)
+
+        prayer_scores.append((prayer_id, score))
+
+    # Sort by score (highest first)
     prayer_scores.sort(key=lambda x: x[1], reverse=True)
-    return [prayer_id for prayer_id, score in prayer_scores[:10]]
+    return prayer_scores
+
+
+def initialize_prayer_queue(session: Session, user: User, feed_type: str = "new_unprayed") -> List[str]:
+    """Initialize prayer queue with smart sorting based on user's prayer and skip history."""
+    # Take top 10 for quick mode
+    return [prayer_id for prayer_id, score in score_prayer_candidates(session, user)[:PRAYER_MODE_QUEUE_SIZE]]
+
+
+def start_prayer_mode_session(session: Session, user: User) -> PrayerModeSession:
+    """Score the eligible prayers once and store the queue plus a ranked snapshot for refills."""
+    ranked = score_prayer_candidates(session, user)
+    now = datetime.utcnow()
+
+    mode_session = session.get(PrayerModeSession, user.display_name)
+    if mode_session is None:
+        mode_session = PrayerModeSession(user_id=user.display_name, expires_at=now)
+    mode_session.queue = json.dumps([prayer_id for prayer_id, _ in ranked[:PRAYER_MODE_QUEUE_SIZE]])
+    mode_session.candidates = json.dumps(
+        ranked[PRAYER_MODE_QUEUE_SIZE:PRAYER_MODE_QUEUE_SIZE + PRAYER_MODE_SNAPSHOT_SIZE]
+    )
+    mode_session.created_at = now
+    move_prayer_mode_cursor(mode_session, 0, now)
+    session.add(mode_session)
+    session.commit()
+    return mode_session
+
+
+def move_prayer_mode_cursor(mode_session: PrayerModeSession, position: int, now: Optional[datetime] = None) -> None:
+    """Record the viewed position and slide the expiry so an active session never lapses mid-queue."""
+    now = now or datetime.utcnow()
+    mode_session.cursor = position
+    mode_session.updated_at = now
+    mode_session.expires_at = now + timedelta(minutes=PRAYER_MODE_SESSION_MINUTES)
+
+
+def get_prayer_mode_session(session: Session, user: User) -> Optional[PrayerModeSession]:
+    """Return the user's prayer mode session if it has not expired."""
+    mode_session = session.get(PrayerModeSession, user.display_name)
+    if mode_session is None or mode_session.expires_at < datetime.utcnow():
+        return None
+    return mode_session
+
+
+def refill_prayer_queue(session: Session, user: User, mode_session: PrayerModeSession, position: int) -> List[str]:
+    """
+    Top up the queue when few prayers remain ahead of position.
+
+    Refills come from the ranked snapshot taken when the session started; once
+    that is used up the remaining prayers are re-scored, excluding those already queued.
+    """
+    queue = json.loads(mode_session.queue)
+    if len(queue) - position > PRAYER_MODE_REFILL_THRESHOLD:
+        return queue
+
+    candidates = json.loads(mode_session.candidates)
+    if not candidates:
+        candidates = score_prayer_candidates(session, user, exclude_ids=queue)[:PRAYER_MODE_SNAPSHOT_SIZE]
+
+    queued = set(queue)
+    batch = [prayer_id for prayer_id, _ in candidates[:PRAYER_MODE_QUEUE_SIZE] if prayer_id not in queued]
+    queue.extend(batch)
+    mode_session.queue = json.dumps(queue)
+    mode_session.candidates = json.dumps(candidates[PRAYER_MODE_QUEUE_SIZE:])
+    return queue
 
 
 @router.get("/prayer-mode", response_class=HTMLResponse)
 def prayer_mode(
     request: Request, 
     position: int = 0,
-    user_session: tuple = Depends(current_user)
+    user_session: tuple = Depends(current_user),
+    restart: bool = False
 ):
     """
-    Initialize prayer mode session with smart sorting.
-    
+    Show one prayer from the user's prayer mode session.
+
+    An unexpired session's stored queue is reused at every position (so the
+    resume prompt on the first page lands where the user left off) and
+    navigating costs a single prayer fetch. A new session with smart sorting is
+    scored when none is active or when restart is requested.
+
     Args:
         position: Current position in prayer queue (for navigation)
+        restart: Discard the active session and score a fresh queue
     """
     user, _ = user_session
     
     with Session(engine) as s:
-        # Initialize prayer queue with smart sorting
-        prayer_queue = initialize_prayer_queue(s, user)
+        mode_session = None if restart else get_prayer_mode_session(s, user)
+        if mode_session is None:
+            position = 0
+            mode_session = start_prayer_mode_session(s, user)
+
+        prayer_queue = refill_prayer_queue(s, user, mode_session, position)
         
+        # Validate position
+        if position < 0 or position >= len(prayer_queue):
+            position = 0
+
+        # Prayers flagged or removed since they were queued drop out of the session
+        current_prayer = None
+        while prayer_queue and current_prayer is None:
+            position = min(position, len(prayer_queue) - 1)
+            current_prayer = s.get(Prayer, prayer_queue[position])
+            if current_prayer is None or current_prayer.flagged:
+                current_prayer = None
+                prayer_queue.pop(position)
+                mode_session.queue = json.dumps(prayer_queue)
+
         if not prayer_queue:
+            s.commit()
             # No prayers available, redirect to feed
             return templates.TemplateResponse("error.html", {
                 "request": request,
                 "error_message": "No prayers available for prayer mode",
                 "user": user
             })
-        
-        # Validate position
-        if position < 0 or position >= len(prayer_queue):
-            position = 0
-        
-        # Get current prayer
-        current_prayer = s.get(Prayer, prayer_queue[position])
-        if not current_prayer:
-            raise HTTPException(status_code=404, detail="Prayer not found")
+
+        move_prayer_mode_cursor(mode_session, position)
+        s.add(mode_session)
+        s.commit()
         
         # Check if user has already prayed this prayer
         user_has_prayed = False
@@ -228,7 +333,8 @@ def prayer_mode(
             "prayer_count": prayer_count,
             "distinct_users": distinct_users,
             "prayer_queue": prayer_queue,
-            "position": position
+            "position": position,
+            "session_minutes": PRAYER_MODE_SESSION_MINUTES
         })
 
 
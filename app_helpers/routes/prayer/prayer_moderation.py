@@ -15,6 +15,7 @@ from models import engine, User, Prayer, PrayerMark
 
 # Import helper functions
 from app_helpers.services.auth_helpers import current_user, is_admin
+from app_helpers.services.activity_timeline_service import set_prayer_activity_hidden
 
 # Initialize templates
 # Use shared templates instance with filters registered
@@ -52,7 +53,9 @@ def flag_prayer(pid: str, request: Request, user_session: tuple = Depends(curren
             raise HTTPException(403, "Only admins can unflag content")
             
         p.flagged = not p.flagged
-        s.add(p); s.commit()
+        s.add(p)
+        set_prayer_activity_hidden(s, p.id, p.flagged)
+        s.commit()
         
         # If this is an HTMX request, return appropriate content
         if request.headers.get("HX-Request"):
@@ -6,6 +6,7 @@ Contains prayer submission, preview, and core operational endpoints.
 Extracted from prayer_routes.py for better maintainability.
 """
 
+import re
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
@@ -22,10 +23,16 @@ from app_helpers.timezone_utils import get_user_timezone_from_request
 from app_helpers.services.auth_helpers import current_user
 from app_helpers.services.prayer_helpers import generate_prayer, find_compatible_prayer_partner
 from app_helpers.services.archive_first_service import submit_prayer_archive_first
+from app_helpers.services.username_display_service import username_display_service
+from app_helpers.services.activity_timeline_service import get_activity_page
+from app_helpers.services.feed_version_service import get_feed_version, feed_etag, conditional_headers, not_modified
 
 # Use shared templates instance with filters registered
 from app_helpers.shared_templates import templates
 
+# Format of ComposedPrompt.prompt_hash (truncated sha256 hex digest)
+PROMPT_HASH_PATTERN = re.compile(r'[0-9a-f]{16}')
+
 # Create router for CRUD operations
 router = APIRouter()
 
@@ -58,6 +65,7 @@ def preview_prayer(text: str = Form(...),
         "original_text": text,
         "generated_prayer": prayer_result['prayer'],
         "service_status": prayer_result['service_status'],
+        "prompt_hash": prayer_result.get('prompt_hash'),
         "preview_token": preview_token
     }
 
@@ -65,6 +73,7 @@ def preview_prayer(text: str = Form(...),
 @router.post("/prayers")
 def submit_prayer(text: str = Form(...),
                   generated_prayer: Optional[str] = Form(None),
+                  prompt_hash: Optional[str] = Form(None),
                   user_session: tuple = Depends(current_user)):
     """
     Submit a new prayer request.
@@ -72,6 +81,7 @@ def submit_prayer(text: str = Form(...),
     Args:
         text: The prayer request text (max 500 chars)
         generated_prayer: Pre-generated prayer from preview (optional)
+        prompt_hash: Prompt hash returned with the preview (optional)
         user_session: Current authenticated user session
     
     Returns:
@@ -84,15 +94,19 @@ def submit_prayer(text: str = Form(...),
     # Use pre-generated prayer if provided, otherwise generate new one
     if generated_prayer:
         final_prayer = generated_prayer
+        # Only keep a well-formed hash; anything else is treated as unknown
+        final_prompt_hash = prompt_hash if prompt_hash and PROMPT_HASH_PATTERN.fullmatch(prompt_hash) else None
     else:
         prayer_result = generate_prayer(text)
         final_prayer = prayer_result['prayer']
+        final_prompt_hash = prayer_result.get('prompt_hash')
     
     # Use archive-first approach: write text file FIRST, then database
     prayer = submit_prayer_archive_first(
         text=text,
         author=user,
-        generated_prayer=final_prayer
+        generated_prayer=final_prayer,
+        prompt_hash=final_prompt_hash
     )
     
     return RedirectResponse("/", 303)
@@ -116,6 +130,11 @@ def prayer_marks(prayer_id: str, request: Request, user_session: tuple = Depends
     """
     user, session = user_session
     with Session(engine) as s:
+        etag = feed_etag(request, get_feed_version(s, user.display_name), user.display_name, session.id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        
         # Get the prayer
         prayer = s.get(Prayer, prayer_id)
         if not prayer:
@@ -152,7 +171,8 @@ def prayer_marks(prayer_id: str, request: Request, user_session: tuple = Depends
         "prayer_marks.html",
         {"request": request, "prayer": prayer, "marks": marks_with_users, "me": user, 
          "session": session, "total_marks": total_marks, "distinct_users": distinct_users, 
-         "user_timezone": user_timezone, "TEXT_ARCHIVE_ENABLED": TEXT_ARCHIVE_ENABLED}
+         "user_timezone": user_timezone, "TEXT_ARCHIVE_ENABLED": TEXT_ARCHIVE_ENABLED},
+        headers=conditional_headers(etag)
     )
 
 
@@ -269,55 +289,45 @@ def answered_celebration(request: Request, user_session: tuple = Depends(current
 
 
 @router.get("/activity", response_class=HTMLResponse)
-def recent_activity(request: Request, user_session: tuple = Depends(current_user)):
+def recent_activity(request: Request, before: Optional[str] = None, user_session: tuple = Depends(current_user)):
     """
     Display recent prayer activity feed.
     
-    Shows chronological list of recent prayer marks across the community
-    to encourage prayer participation and show community engagement.
+    Shows a chronological timeline of new prayers, prayer marks, answered
+    prayers and testimonies across the community to encourage prayer
+    participation and show community engagement. Pages are fetched by cursor
+    so the list can be infinite-scrolled.
     
     Args:
         request: FastAPI request object
+        before: Cursor of the last event already shown (next page)
         user_session: Current authenticated user session
     
     Returns:
-        HTML page showing recent prayer activity feed
+        HTML page showing recent prayer activity feed, or just the next
+        page of items for HTMX requests
     """
     user, session = user_session
     with Session(engine) as s:
-        # Get recent prayer marks with prayer and user info
-        recent_marks_stmt = (
-            select(PrayerMark)
-            .join(Prayer, PrayerMark.prayer_id == Prayer.id)
-            .where(Prayer.flagged == False)
-            .order_by(PrayerMark.created_at.desc())
-            .limit(100)
-        )
-        recent_marks = s.exec(recent_marks_stmt).all()
+        events, next_cursor = get_activity_page(s, before=before)
         
-        activity_items = []
-        for mark in recent_marks:
-            # Get prayer info
-            prayer = s.get(Prayer, mark.prayer_id)
-            # Get marker name
-            marker = s.get(User, mark.username)
-            # Get author name
-            author = s.get(User, prayer.author_username)
-            
-            activity_items.append({
-                'mark': mark,
-                'prayer': prayer,
-                'marker_name': marker.display_name if marker else None,
-                'author_name': author.display_name if author else None,
-                'marker': marker,  # Add user object for supporter badge
-                'author': author,  # Add user object for supporter badge
-                'is_my_mark': mark.username == user.display_name,
-                'is_my_prayer': prayer.author_username == user.display_name
-            })
+        activity_items = [
+            {
+                'event': event,
+                'is_my_action': event.actor_username == user.display_name,
+                'is_my_prayer': event.author_username == user.display_name
+            }
+            for event in events
+        ]
+        
+        # Warm the username_display filter for every name on the page in one query
+        username_display_service.preload(
+            [e.actor_username for e in events] + [e.author_username for e in events], s
+        )
     
     user_timezone = get_user_timezone_from_request(request)
-    return templates.TemplateResponse(
-        "activity.html",
-        {"request": request, "activity_items": activity_items, "me": user, "session": session, 
-         "user_timezone": user_timezone}
-    )
\ No newline at end of file
+    context = {"request": request, "activity_items": activity_items, "next_cursor": next_cursor,
+               "me": user, "session": session, "user_timezone": user_timezone}
+    if before and request.headers.get("HX-Request"):
+        return templates.TemplateResponse("components/activity_items.html", context)
+    return templates.TemplateResponse("activity.html", context)
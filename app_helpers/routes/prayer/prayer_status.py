@@ -6,20 +6,23 @@ Contains functionality for marking prayers, archiving, and answering prayers.
 Extracted from prayer_routes.py for better maintainability.
 """
 
+import asyncio
 import os
 from datetime import datetime, timezone
 from json import JSONDecodeError
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
+from pydantic import BaseModel
+from sqlalchemy import case
 from sqlmodel import Session, select, func
 
 from models import engine, Prayer, PrayerMark
 
 # Import helper functions
 from app_helpers.services.auth_helpers import current_user, is_admin
-from app_helpers.services.archive_first_service import append_prayer_activity_with_archive
+from app_helpers.services.archive_first_service import append_prayer_activity_with_archive, append_prayer_marks_with_archive
 from app_helpers.services.prayer_helpers import set_daily_priority, remove_daily_priority, get_daily_priority_date
 
 # Initialize templates
@@ -29,6 +32,18 @@ from app_helpers.shared_templates import templates
 # Create router for status operations
 router = APIRouter()
 
+# Largest offline queue accepted in one /api/marks/batch request
+MAX_MARK_BATCH = 500
+
+
+class QueuedMark(BaseModel):
+    prayer_id: str
+    prayed_at: Optional[str] = None
+
+
+class MarkBatchRequest(BaseModel):
+    marks: List[QueuedMark]
+
 
 def _parse_iso_timestamp(value: Optional[str]) -> Optional[datetime]:
     if not value:
@@ -83,6 +98,14 @@ async def mark_prayer(prayer_id: str, request: Request, user_session: tuple = De
     prayed_at_dt = _parse_iso_timestamp(prayed_at_iso)
     if not session.is_fully_authenticated:
         raise HTTPException(403, "Full authentication required to mark prayers")
+    # Body parsing needs the event loop; the database and fsync'd archive writes run in a worker thread
+    return await asyncio.to_thread(
+        _record_prayer_mark, prayer_id, bool(request.headers.get("HX-Request")), user, session, prayed_at_dt
+    )
+
+
+def _record_prayer_mark(prayer_id: str, hx_request: bool, user, session, prayed_at_dt: Optional[datetime]):
+    """Blocking part of mark_prayer: archive + database write and the HTMX fragment"""
     with Session(engine) as s:
         # Check if prayer exists
         prayer = s.get(Prayer, prayer_id)
@@ -93,7 +116,7 @@ async def mark_prayer(prayer_id: str, request: Request, user_session: tuple = De
         append_prayer_activity_with_archive(prayer_id, "prayed", user, timestamp=prayed_at_dt)
         
         # If this is an HTMX request, return just the updated prayer mark section
-        if request.headers.get("HX-Request"):
+        if hx_request:
             # Get updated mark count for all users (total times)
             mark_count_stmt = select(func.count(PrayerMark.id)).where(PrayerMark.prayer_id == prayer_id)
             total_mark_count = s.exec(mark_count_stmt).first()
@@ -150,6 +173,53 @@ async def mark_prayer(prayer_id: str, request: Request, user_session: tuple = De
     return RedirectResponse(f"/#prayer-{prayer_id}", 303)
 
 
+@router.post("/api/marks/batch")
+def mark_prayers_batch(batch: MarkBatchRequest, user_session: tuple = Depends(current_user)):
+    """
+    Record a queue of prayer marks made offline in one request.
+    
+    Each mark is deduplicated on its offline timestamp, so replaying a queue
+    that was partly delivered is safe. All marks are written in one transaction
+    with one archive append per prayer.
+    
+    Returns:
+        JSON with a status per mark ('recorded', 'duplicate', 'not_found') and
+        updated counts for each prayer in the batch
+    """
+    user, session = user_session
+    if not session.is_fully_authenticated:
+        raise HTTPException(403, "Full authentication required to mark prayers")
+    if len(batch.marks) > MAX_MARK_BATCH:
+        raise HTTPException(400, f"At most {MAX_MARK_BATCH} marks per batch")
+    
+    results = append_prayer_marks_with_archive(
+        user,
+        [(mark.prayer_id, _parse_iso_timestamp(mark.prayed_at)) for mark in batch.marks]
+    )
+    
+    # Updated counts so the client can refresh badges without re-fetching pages
+    prayer_ids = {result['prayer_id'] for result in results if result['status'] != 'not_found'}
+    counts = {}
+    if prayer_ids:
+        with Session(engine) as s:
+            rows = s.exec(
+                select(
+                    PrayerMark.prayer_id,
+                    func.count(PrayerMark.id),
+                    func.count(func.distinct(PrayerMark.username)),
+                    func.sum(case((PrayerMark.username == user.display_name, 1), else_=0))
+                )
+                .where(PrayerMark.prayer_id.in_(prayer_ids))
+                .group_by(PrayerMark.prayer_id)
+            ).all()
+        counts = {
+            prayer_id: {'mark_count': total, 'distinct_user_count': people, 'user_mark_count': mine}
+            for prayer_id, total, people, mine in rows
+        }
+    
+    return JSONResponse({'success': True, 'results': results, 'prayers': counts})
+
+
 @router.post("/prayer/{prayer_id}/archive")
 def archive_prayer(prayer_id: str, request: Request, user_session: tuple = Depends(current_user)):
     """
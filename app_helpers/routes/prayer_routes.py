@@ -7,6 +7,7 @@ This module has been refactored into focused sub-modules for better maintainabil
 - prayer/prayer_operations.py - Prayer submission, preview, and core operations  
 - prayer/prayer_status.py - Status management (marking, archiving, answering)
 - prayer/prayer_moderation.py - Moderation and flagging operations
+- prayer/offline_sync.py - JSON delta sync for the offline prayer store
 
 All routes maintain exact same signatures and logic as original implementation
 for 100% backward compatibility.
@@ -32,10 +33,12 @@ from .prayer.prayer_operations import router as crud_router
 from .prayer.prayer_status import router as status_router
 from .prayer.prayer_moderation import router as moderation_router
 from .prayer.prayer_mode import router as prayer_mode_router
+from .prayer.offline_sync import router as offline_sync_router
 
 # Include all sub-routers to maintain all existing routes
 router.include_router(feed_router)
 router.include_router(crud_router)
 router.include_router(status_router)
 router.include_router(moderation_router)
-router.include_router(prayer_mode_router)
\ No newline at end of file
+router.include_router(prayer_mode_router)
+router.include_router(offline_sync_router)
\ No newline at end of file
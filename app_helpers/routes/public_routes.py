@@ -5,16 +5,17 @@ Provides API endpoints for public prayer access with rate limiting.
 """
 
 from fastapi import APIRouter, Request, HTTPException, Query
-from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse, Response
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from sqlmodel import Session, select, func
-from models import engine, SecurityLog, User, Session as SessionModel
+from models import engine, read_engine, SecurityLog, User, Session as SessionModel
 from app_helpers.shared_templates import templates
-from app_helpers.services.public_prayer_service import PublicPrayerService
+from app_helpers.services.public_prayer_service import PublicPrayerService, get_cached_public_payload
 from app_helpers.services.auth_helpers import current_user
-from app_helpers.services.username_display_service import UsernameDisplayService
+from app_helpers.services.username_display_service import username_display_service
 from app_helpers.services.membership_application_service import MembershipApplicationService
 import os
 
@@ -130,6 +131,34 @@ def check_application_rate_limit(request: Request) -> bool:
         return True
 
 
+def _is_not_modified(request: Request, entry: dict) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against a cached payload"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return entry["etag"] in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return entry["last_modified"] <= since
+    return False
+
+
+def cached_json_response(request: Request, entry: dict) -> Response:
+    """JSON response for a cached public payload, or 304 when the client's copy is current"""
+    headers = {
+        "ETag": entry["etag"],
+        "Last-Modified": format_datetime(entry["last_modified"].replace(tzinfo=timezone.utc), usegmt=True),
+        # Browsers revalidate every time; the 304 path skips the page build entirely
+        "Cache-Control": "public, no-cache",
+    }
+    if _is_not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
 def is_user_authenticated(request: Request) -> bool:
     """
     Check if user is authenticated without raising exceptions.
@@ -159,7 +188,7 @@ def is_user_authenticated(request: Request) -> bool:
 
 
 @router.get("/nicene-creed", response_class=HTMLResponse)
-async def nicene_creed_page(request: Request):
+def nicene_creed_page(request: Request):
     """Render the Nicene Creed page for both public visitors and authenticated members."""
     user = None
     session_model = None
@@ -178,7 +207,7 @@ async def nicene_creed_page(request: Request):
 
 
 @router.get("/", response_class=HTMLResponse)
-async def public_homepage_or_redirect(request: Request, show: str = None):
+def public_homepage_or_redirect(request: Request, show: str = None):
     """
     Root route that serves public homepage for unauthenticated users
     and redirects authenticated users to their feed.
@@ -204,7 +233,7 @@ async def public_homepage_or_redirect(request: Request, show: str = None):
 
 
 @router.get("/apply", response_class=HTMLResponse)
-async def membership_application_page(request: Request):
+def membership_application_page(request: Request):
     """
     Direct link to membership application form.
     Redirects authenticated users to feed.
@@ -228,8 +257,48 @@ async def membership_application_page(request: Request):
         )
 
 
+def _build_public_prayers_payload(page: int, page_size: int) -> dict:
+    """Build the /api/public/prayers payload (cached across visitors)"""
+    # Get prayers from service
+    result = PublicPrayerService.get_public_prayers(page=page, page_size=page_size)
+    
+    # Format prayers for JSON response with user display names
+    formatted_prayers = []
+    with Session(read_engine) as session:
+        username_service = username_display_service
+        username_service.preload((prayer.author_username for prayer in result['prayers']), session)
+        
+        for prayer in result['prayers']:
+            # Get formatted username with supporter badges
+            display_name = username_service.render_username_with_badge(
+                prayer.author_username, session
+            )
+            
+            # Get statistics for this prayer
+            prayer_stats = result['statistics'].get(prayer.id, {})
+            
+            formatted_prayer = {
+                'id': prayer.id,
+                'text': prayer.text,
+                'generated_prayer': prayer.generated_prayer,
+                'author_username': prayer.author_username,
+                'author_display_name': display_name,
+                'created_at': prayer.created_at.isoformat(),
+                'project_tag': prayer.project_tag,
+                'total_prayers': prayer_stats.get('total_prayers', 0),
+                'unique_people': prayer_stats.get('unique_people', 0)
+            }
+            formatted_prayers.append(formatted_prayer)
+    
+    return {
+        'success': True,
+        'prayers': formatted_prayers,
+        'pagination': result['pagination']
+    }
+
+
 @router.get("/api/public/prayers")
-async def get_public_prayers_api(
+def get_public_prayers_api(
     request: Request,
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     page_size: int = Query(20, ge=1, le=50, description="Number of prayers per page (max 50)")
@@ -247,42 +316,11 @@ async def get_public_prayers_api(
         )
     
     try:
-        # Get prayers from service
-        result = PublicPrayerService.get_public_prayers(page=page, page_size=page_size)
-        
-        # Format prayers for JSON response with user display names
-        formatted_prayers = []
-        with Session(engine) as session:
-            username_service = UsernameDisplayService()
-            
-            for prayer in result['prayers']:
-                # Get formatted username with supporter badges
-                display_name = username_service.render_username_with_badge(
-                    prayer.author_username, session
-                )
-                
-                # Get statistics for this prayer
-                prayer_stats = result['statistics'].get(prayer.id, {})
-                
-                formatted_prayer = {
-                    'id': prayer.id,
-                    'text': prayer.text,
-                    'generated_prayer': prayer.generated_prayer,
-                    'author_username': prayer.author_username,
-                    'author_display_name': display_name,
-                    'created_at': prayer.created_at.isoformat(),
-                    'project_tag': prayer.project_tag,
-                    'total_prayers': prayer_stats.get('total_prayers', 0),
-                    'unique_people': prayer_stats.get('unique_people', 0)
-                }
-                formatted_prayers.append(formatted_prayer)
-        
-        # Return formatted response
-        return JSONResponse({
-            'success': True,
-            'prayers': formatted_prayers,
-            'pagination': result['pagination']
-        })
+        entry = get_cached_public_payload(
+            ("prayers", page, page_size),
+            lambda: _build_public_prayers_payload(page, page_size)
+        )
+        return cached_json_response(request, entry)
         
     except Exception as e:
         # Log error but don't expose details
@@ -322,8 +360,41 @@ async def public_prayer_page(
     )
 
 
+def _build_public_prayer_payload(prayer_id: str) -> dict:
+    """Build the /api/public/prayer/{prayer_id} payload (cached across visitors)"""
+    # Get prayer with user data
+    result = PublicPrayerService.get_public_prayer_with_user(prayer_id)
+    
+    if not result:
+        raise HTTPException(
+            status_code=404,
+            detail="Prayer not found or not available for public display"
+        )
+    
+    prayer, user = result
+    
+    # Format prayer for JSON response
+    with Session(read_engine) as session:
+        display_name = username_display_service.render_username_with_badge(user.display_name, session)
+    
+    formatted_prayer = {
+        'id': prayer.id,
+        'text': prayer.text,
+        'generated_prayer': prayer.generated_prayer,
+        'author_username': prayer.author_username,
+        'author_display_name': display_name,
+        'created_at': prayer.created_at.isoformat(),
+        'project_tag': prayer.project_tag
+    }
+    
+    return {
+        'success': True,
+        'prayer': formatted_prayer
+    }
+
+
 @router.get("/api/public/prayer/{prayer_id}")
-async def get_public_prayer_api(
+def get_public_prayer_api(
     prayer_id: str,
     request: Request
 ):
@@ -340,36 +411,8 @@ async def get_public_prayer_api(
         )
     
     try:
-        # Get prayer with user data
-        result = PublicPrayerService.get_public_prayer_with_user(prayer_id)
-        
-        if not result:
-            raise HTTPException(
-                status_code=404,
-                detail="Prayer not found or not available for public display"
-            )
-        
-        prayer, user = result
-        
-        # Format prayer for JSON response
-        with Session(engine) as session:
-            username_service = UsernameDisplayService()
-            display_name = username_service.render_username_with_badge(user.display_name, session)
-        
-        formatted_prayer = {
-            'id': prayer.id,
-            'text': prayer.text,
-            'generated_prayer': prayer.generated_prayer,
-            'author_username': prayer.author_username,
-            'author_display_name': display_name,
-            'created_at': prayer.created_at.isoformat(),
-            'project_tag': prayer.project_tag
-        }
-        
-        return JSONResponse({
-            'success': True,
-            'prayer': formatted_prayer
-        })
+        entry = get_cached_public_payload(("prayer", prayer_id), lambda: _build_public_prayer_payload(prayer_id))
+        return cached_json_response(request, entry)
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
@@ -394,7 +437,7 @@ async def get_public_prayer_api(
 # Duplicate route removed - already defined above at line 198
 
 @router.get("/api/public/prayer/{prayer_id}/statistics")
-async def get_public_prayer_statistics_api(
+def get_public_prayer_statistics_api(
     prayer_id: str,
     request: Request
 ):
@@ -425,8 +468,9 @@ async def get_public_prayer_statistics_api(
         statistics = PublicPrayerService.get_prayer_statistics(prayer_id)
         
         # Format statistics with username display service for supporter badges
-        with Session(engine) as session:
-            username_service = UsernameDisplayService()
+        with Session(read_engine) as session:
+            username_service = username_display_service
+            username_service.preload((record['username'] for record in statistics['prayer_records']), session)
             
             # Add display names with supporter badges to prayer records
             for record in statistics['prayer_records']:
@@ -466,7 +510,7 @@ async def get_public_prayer_statistics_api(
 
 
 @router.post("/api/membership/apply")
-async def submit_membership_application(
+def submit_membership_application(
     application_request: MembershipApplicationRequest,
     request: Request
 ):
@@ -600,7 +644,7 @@ def membership_application_status_page(request: Request):
 
 
 @router.post("/api/membership/status")
-async def get_membership_application_status(
+def get_membership_application_status(
     status_request: dict,
     request: Request
 ):
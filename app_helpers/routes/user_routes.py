@@ -7,11 +7,11 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session, select, func
 
-from models import engine, User, Prayer, PrayerMark, Session as SessionModel
+from models import engine, read_engine, User, Prayer, PrayerMark, Session as SessionModel
 from app_helpers.services.auth_helpers import current_user
 from app_helpers.services.auth.validation_helpers import log_security_event, is_admin
 from app_helpers.services.profile_data_service import ProfileDataService
-from app_helpers.utils.user_management import is_user_deactivated
+from app_helpers.services.user_directory_service import UserDirectoryService, DIRECTORY_PAGE_SIZE
 from app_helpers.timezone_utils import get_user_timezone_from_request
 
 # Use shared templates instance with filters registered
@@ -148,84 +148,41 @@ def user_profile(request: Request, user_id: str, user_session: tuple = Depends(c
         )
 
 @router.get("/users", response_class=HTMLResponse)
-def users_list(request: Request, user_session: tuple = Depends(current_user)):
+def users_list(
+    request: Request,
+    page: int = Query(1, ge=1),
+    q: Optional[str] = Query(None, max_length=100),
+    user_session: tuple = Depends(current_user)
+):
     user, session = user_session
-    with Session(engine) as s:
-        # Get all users with their statistics
-        users_stmt = select(User).order_by(User.created_at.desc())
-        all_users = s.exec(users_stmt).all()
-        
-        users_with_stats = []
-        for profile_user in all_users:
-            # Get statistics for each user
-            prayers_authored = s.exec(
-                select(func.count(Prayer.id))
-                .where(Prayer.author_username == profile_user.display_name)
-                .where(Prayer.flagged == False)
-            ).first() or 0
-            
-            prayers_marked = s.exec(
-                select(func.count(PrayerMark.id))
-                .where(PrayerMark.username == profile_user.display_name)
-            ).first() or 0
-            
-            distinct_prayers_marked = s.exec(
-                select(func.count(func.distinct(PrayerMark.prayer_id)))
-                .where(PrayerMark.username == profile_user.display_name)
-            ).first() or 0
-            
-            # Get last activity
-            last_activity = None
-            last_prayer_mark = s.exec(
-                select(PrayerMark.created_at)
-                .where(PrayerMark.username == profile_user.display_name)
-                .order_by(PrayerMark.created_at.desc())
-                .limit(1)
-            ).first()
-            
-            last_prayer_request = s.exec(
-                select(Prayer.created_at)
-                .where(Prayer.author_username == profile_user.display_name)
-                .where(Prayer.flagged == False)
-                .order_by(Prayer.created_at.desc())
-                .limit(1)
-            ).first()
-            
-            if last_prayer_mark and last_prayer_request:
-                last_activity = max(last_prayer_mark, last_prayer_request)
-            elif last_prayer_mark:
-                last_activity = last_prayer_mark
-            elif last_prayer_request:
-                last_activity = last_prayer_request
-            
-            # Check if user is deactivated
-            is_deactivated = is_user_deactivated(profile_user.display_name, s)
-            
-            # For regular users, filter out deactivated users (except themselves)
-            if is_deactivated and profile_user.display_name != user.display_name:
-                continue
-            
-            users_with_stats.append({
-                'user': profile_user,
-                'prayers_authored': prayers_authored,
-                'prayers_marked': prayers_marked,
-                'distinct_prayers_marked': distinct_prayers_marked,
-                'last_activity': last_activity,
-                'is_me': profile_user.display_name == user.display_name,
-                'is_deactivated': is_deactivated,
-                'is_admin': profile_user.has_role("admin", s)
-            })
+    with Session(read_engine) as s:
+        # Get one page of users with their statistics (deactivated users hidden, except yourself)
+        users_with_stats, total_count = UserDirectoryService.get_directory_page(
+            s, user.display_name, page=page, search=q
+        )
+        pagination = ProfileDataService.get_pagination_info(total_count, page, DIRECTORY_PAGE_SIZE)
+        community_stats = UserDirectoryService.get_community_totals(s)
         
         user_timezone = get_user_timezone_from_request(request)
         
         return templates.TemplateResponse(
             "users.html",
-            {"request": request, "users": users_with_stats, "me": user, "session": session, "is_admin": is_admin(user), "user_timezone": user_timezone}
+            {
+                "request": request,
+                "users": users_with_stats,
+                "pagination": pagination,
+                "community_stats": community_stats,
+                "search_query": q or "",
+                "me": user,
+                "session": session,
+                "is_admin": is_admin(user),
+                "user_timezone": user_timezone
+            }
         )
 
 
 @router.post("/logout")
-async def logout(request: Request, user_session: tuple = Depends(current_user)):
+def logout(request: Request, user_session: tuple = Depends(current_user)):
     """Log out the current user by clearing their session"""
     user, session = user_session
     
@@ -263,7 +220,7 @@ def user_profile_prayers(
     """Display paginated list of prayer requests by a specific user"""
     user, session = user_session
     
-    with Session(engine) as s:
+    with Session(read_engine) as s:
         # Get the profile user
         profile_user = s.get(User, user_id)
         if not profile_user:
@@ -307,7 +264,7 @@ def user_profile_prayed(
     """Display paginated list of prayers the user has marked/prayed for"""
     user, session = user_session
     
-    with Session(engine) as s:
+    with Session(read_engine) as s:
         # Get the profile user
         profile_user = s.get(User, user_id)
         if not profile_user:
@@ -351,7 +308,7 @@ def user_profile_unique(
     """Display unique prayers information and breakdown for the user"""
     user, session = user_session
     
-    with Session(engine) as s:
+    with Session(read_engine) as s:
         # Get the profile user
         profile_user = s.get(User, user_id)
         if not profile_user:
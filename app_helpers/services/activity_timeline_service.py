@@ -0,0 +1,159 @@
+# app_helpers/services/activity_timeline_service.py
+"""
+Community activity timeline for the /activity page.
+
+Events (new prayer, prayed, answered, testimony) are appended in the same
+transaction as the record they describe, with the names and prayer snippet
+copied in, so a page of activity is a single range scan over
+(created_at, id) with keyset pagination. The table is derived data and can be
+rebuilt from prayers, marks and attributes at any time.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text, tuple_, update
+from sqlmodel import Session, select
+
+from models import ActivityEvent, Prayer
+
+
+ACTIVITY_PAGE_SIZE = 50
+SNIPPET_LENGTH = 150
+
+
+def make_snippet(value: Optional[str]) -> str:
+    value = value or ""
+    return value[:SNIPPET_LENGTH] + ("..." if len(value) > SNIPPET_LENGTH else "")
+
+
+def record_activity(
+    session: Session,
+    event_type: str,
+    prayer: Prayer,
+    actor_username: str,
+    created_at: Optional[datetime] = None,
+    snippet_text: Optional[str] = None
+) -> ActivityEvent:
+    """
+    Add a timeline event to the session; the caller commits it with the
+    mark/prayer/attribute it describes.
+
+    Args:
+        snippet_text: Text to show instead of the prayer (e.g. a testimony)
+    """
+    if snippet_text is not None:
+        snippet, snippet_is_prayer = make_snippet(snippet_text), False
+    elif prayer.generated_prayer:
+        snippet, snippet_is_prayer = make_snippet(prayer.generated_prayer), True
+    else:
+        snippet, snippet_is_prayer = make_snippet(prayer.text), False
+
+    event = ActivityEvent(
+        event_type=event_type,
+        prayer_id=prayer.id,
+        actor_username=actor_username,
+        author_username=prayer.author_username,
+        snippet=snippet,
+        snippet_is_prayer=snippet_is_prayer,
+        hidden=bool(prayer.flagged),
+        created_at=created_at or datetime.utcnow()
+    )
+    session.add(event)
+    return event
+
+
+def set_prayer_activity_hidden(session: Session, prayer_id: str, hidden: bool) -> None:
+    """Hide or show a prayer's events when it is flagged or unflagged (caller commits)"""
+    session.execute(
+        update(ActivityEvent)
+        .where(ActivityEvent.prayer_id == prayer_id)
+        .values(hidden=hidden)
+    )
+
+
+def encode_cursor(event: ActivityEvent) -> str:
+    return f"{event.created_at.isoformat()}_{event.id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        created_at, event_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(event_id)
+    except ValueError:
+        return None
+
+
+def get_activity_page(
+    session: Session,
+    before: Optional[str] = None,
+    limit: int = ACTIVITY_PAGE_SIZE
+) -> Tuple[List[ActivityEvent], Optional[str]]:
+    """
+    Get visible events newest first, starting after the `before` cursor.
+
+    Returns:
+        Tuple of (events, cursor for the next page or None at the end)
+    """
+    stmt = select(ActivityEvent).where(ActivityEvent.hidden == False)
+    position = decode_cursor(before)
+    if position:
+        stmt = stmt.where(tuple_(ActivityEvent.created_at, ActivityEvent.id) < position)
+    events = session.exec(
+        stmt.order_by(ActivityEvent.created_at.desc(), ActivityEvent.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+    return events[:limit], next_cursor
+
+
+_SNIPPET_SQL = (
+    "substr({value}, 1, " + str(SNIPPET_LENGTH) + ") || "
+    "CASE WHEN length({value}) > " + str(SNIPPET_LENGTH) + " THEN '...' ELSE '' END"
+)
+_PRAYER_TEXT = "COALESCE(NULLIF(p.generated_prayer, ''), p.text)"
+
+REBUILD_STATEMENTS = [
+    "DELETE FROM activity_timeline",
+    f"""INSERT INTO activity_timeline
+        (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+        SELECT 'prayer', p.id, p.author_username, p.author_username, {_SNIPPET_SQL.format(value=_PRAYER_TEXT)},
+               NULLIF(p.generated_prayer, '') IS NOT NULL, p.flagged, p.created_at
+        FROM prayer p""",
+    f"""INSERT INTO activity_timeline
+        (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+        SELECT 'prayed', p.id, m.username, p.author_username, {_SNIPPET_SQL.format(value=_PRAYER_TEXT)},
+               NULLIF(p.generated_prayer, '') IS NOT NULL, p.flagged, m.created_at
+        FROM prayermark m JOIN prayer p ON p.id = m.prayer_id""",
+    f"""INSERT INTO activity_timeline
+        (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+        SELECT 'answered', p.id, COALESCE(a.created_by, p.author_username), p.author_username,
+               {_SNIPPET_SQL.format(value=_PRAYER_TEXT)}, NULLIF(p.generated_prayer, '') IS NOT NULL,
+               p.flagged, a.created_at
+        FROM prayer_attributes a JOIN prayer p ON p.id = a.prayer_id
+        WHERE a.attribute_name = 'answered'""",
+    f"""INSERT INTO activity_timeline
+        (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+        SELECT 'testimony', p.id, COALESCE(a.created_by, p.author_username), p.author_username,
+               {_SNIPPET_SQL.format(value="a.attribute_value")}, 0, p.flagged, a.created_at
+        FROM prayer_attributes a JOIN prayer p ON p.id = a.prayer_id
+        WHERE a.attribute_name = 'answer_testimony'""",
+]
+
+
+def rebuild_activity_timeline(session: Session) -> int:
+    """
+    Regenerate the timeline from prayers, marks and answer attributes.
+
+    Used after bulk imports, which write rows without going through the
+    archive-first activity path.
+
+    Returns:
+        Number of events written
+    """
+    for statement in REBUILD_STATEMENTS:
+        session.execute(text(statement))
+    session.commit()
+    return session.execute(text("SELECT COUNT(*) FROM activity_timeline")).scalar()
@@ -0,0 +1,378 @@
+"""
+Archive Compression Service
+
+Packs prayer archive files that have not changed for TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS
+into per-month ZIP bundles and serves reads from those bundles transparently.
+
+Bundle layout:
+- Loose file: prayers/YYYY/MM/2024_06_15_prayer_at_1030.txt
+- Bundle:     prayers/YYYY/MM_prayers.zip (member: 2024_06_15_prayer_at_1030.txt)
+
+The ZIP central directory is the bundle's offset index: each member records its
+offset and size, so reading one prayer seeks straight to it without touching the
+rest of the month. Database records keep pointing at the loose-file path; callers
+resolve that path through read_archive_text() / archive_exists().
+
+A loose file always takes precedence over its bundled copy. Appending activity to a
+bundled prayer restores the loose file first (see restore_from_bundle), and the next
+compaction run folds the updated copy back into the bundle.
+"""
+
+import os
+import fcntl
+import zipfile
+import threading
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import configuration (will be set when app starts)
+try:
+    from app import TEXT_ARCHIVE_BASE_DIR, TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS
+except ImportError:
+    # Fallback defaults for testing - NEVER use production directory
+    TEXT_ARCHIVE_BASE_DIR = os.getenv('TEXT_ARCHIVE_BASE_DIR', '/tmp/test_archives_fallback')
+    TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS = int(os.getenv('TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS', '365'))
+
+BUNDLE_SUFFIX = "_prayers.zip"
+LOCK_SUFFIX = "_prayers.lock"
+
+# Open bundles keyed by path, reused until the bundle file changes on disk
+_open_bundles: Dict[str, tuple] = {}
+_open_bundles_lock = threading.Lock()
+
+
+def bundle_path_for(file_path) -> Path:
+    """Return the monthly bundle that would hold a loose prayer file"""
+    path = Path(file_path)
+    return path.parent.parent / f"{path.parent.name}{BUNDLE_SUFFIX}"
+
+
+def _bundle_lock_path(bundle: Path) -> Path:
+    return bundle.with_name(bundle.name[:-len(BUNDLE_SUFFIX)] + LOCK_SUFFIX)
+
+
+def _open_bundle(bundle: Path) -> Optional[zipfile.ZipFile]:
+    """Get a shared ZipFile for a bundle, reopening it if it was rewritten"""
+    try:
+        stat = bundle.stat()
+    except FileNotFoundError:
+        return None
+
+    key = str(bundle)
+    signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with _open_bundles_lock:
+        cached = _open_bundles.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        try:
+            zf = zipfile.ZipFile(bundle, 'r')
+        except (zipfile.BadZipFile, OSError) as e:
+            logger.error(f"Failed to open archive bundle {bundle}: {e}")
+            return None
+        # Readers still holding the previous ZipFile keep their own reference
+        _open_bundles[key] = (signature, zf)
+        return zf
+
+
+def bundle_members(bundle: Path) -> List[str]:
+    """List member filenames stored in a bundle"""
+    zf = _open_bundle(Path(bundle))
+    return zf.namelist() if zf else []
+
+
+def _read_bundled(file_path) -> Optional[bytes]:
+    path = Path(file_path)
+    zf = _open_bundle(bundle_path_for(path))
+    if zf is None:
+        return None
+    try:
+        return zf.read(path.name)
+    except KeyError:
+        return None
+
+
+def bundled_member_info(file_path) -> Optional[zipfile.ZipInfo]:
+    """Get the bundle index entry for a packed prayer file, if it has one"""
+    path = Path(file_path)
+    zf = _open_bundle(bundle_path_for(path))
+    if zf is None:
+        return None
+    try:
+        return zf.getinfo(path.name)
+    except KeyError:
+        return None
+
+
+def archive_exists(file_path) -> bool:
+    """Check whether an archive file exists either on disk or inside its bundle"""
+    if not file_path:
+        return False
+    return Path(file_path).exists() or bundled_member_info(file_path) is not None
+
+
+def archive_mtime(file_path) -> Optional[float]:
+    """
+    Last modification time of an archive file, from disk or its bundle entry.
+
+    Bundled files keep the mtime they had when they were packed.
+
+    Returns:
+        POSIX timestamp, or None if the file is neither on disk nor bundled
+    """
+    try:
+        return Path(file_path).stat().st_mtime
+    except FileNotFoundError:
+        pass
+    info = bundled_member_info(file_path)
+    if info is None:
+        return None
+    return datetime(*info.date_time).timestamp()
+
+
+def read_archive_text(file_path) -> str:
+    """
+    Read an archive file, falling back to its compressed monthly bundle.
+
+    Raises:
+        FileNotFoundError: If the file is neither on disk nor bundled
+    """
+    path = Path(file_path)
+    try:
+        return path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        pass
+
+    data = _read_bundled(path)
+    if data is None:
+        raise FileNotFoundError(f"Archive file not found: {file_path}")
+    return data.decode('utf-8')
+
+
+def restore_from_bundle(file_path) -> bool:
+    """
+    Write a bundled prayer file back to its loose path so it can be appended to.
+
+    Returns:
+        True if the loose file exists afterwards, False if nothing was bundled
+    """
+    path = Path(file_path)
+    bundle = bundle_path_for(path)
+    if not bundle.exists():
+        return path.exists()
+
+    with open(_bundle_lock_path(bundle), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        if path.exists():
+            return True
+
+        data = _read_bundled(path)
+        if data is None:
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = str(path) + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(temp_path, path)
+
+    logger.info(f"Restored prayer archive from bundle: {path}")
+    return True
+
+
+def list_month_prayer_files(month_dir) -> List[Path]:
+    """List prayer files for one month, including those packed into its bundle"""
+    month_dir = Path(month_dir)
+    files = sorted(month_dir.glob("*.txt")) if month_dir.is_dir() else []
+    seen = {f.name for f in files}
+
+    bundle = month_dir.parent / f"{month_dir.name}{BUNDLE_SUFFIX}"
+    for name in sorted(bundle_members(bundle)):
+        if name not in seen:
+            files.append(month_dir / name)
+    return files
+
+
+def list_prayer_archive_files(prayers_dir) -> List[Path]:
+    """List every prayer file under prayers/YYYY/MM, loose or bundled"""
+    prayers_dir = Path(prayers_dir)
+    if not prayers_dir.exists():
+        return []
+
+    files = []
+    for year_dir in sorted(prayers_dir.iterdir()):
+        if not year_dir.is_dir():
+            continue
+        months = set()
+        for entry in year_dir.iterdir():
+            if entry.is_dir():
+                months.add(entry.name)
+            elif entry.name.endswith(BUNDLE_SUFFIX):
+                months.add(entry.name[:-len(BUNDLE_SUFFIX)])
+        for month in sorted(months):
+            files.extend(list_month_prayer_files(year_dir / month))
+    return files
+
+
+class ArchiveCompressionService:
+    """Compacts old prayer archive files into per-month bundles"""
+
+    def __init__(self, base_dir: str = None, compress_after_days: int = None):
+        self.base_dir = Path(base_dir or TEXT_ARCHIVE_BASE_DIR)
+        self.compress_after_days = (
+            TEXT_ARCHIVE_COMPRESSION_AFTER_DAYS if compress_after_days is None else compress_after_days
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.compress_after_days > 0
+
+    def find_candidates(self, now: datetime = None) -> Dict[Path, List[Path]]:
+        """Find loose prayer files untouched since the cutoff, grouped by month directory"""
+        prayers_dir = self.base_dir / "prayers"
+        if not self.enabled or not prayers_dir.exists():
+            return {}
+
+        cutoff = ((now or datetime.now()) - timedelta(days=self.compress_after_days)).timestamp()
+        candidates = {}
+        for year_dir in sorted(prayers_dir.iterdir()):
+            if not (year_dir.is_dir() and year_dir.name.isdigit()):
+                continue
+            for month_dir in sorted(year_dir.iterdir()):
+                if not (month_dir.is_dir() and month_dir.name.isdigit()):
+                    continue
+                old_files = [
+                    f for f in sorted(month_dir.glob("*.txt"))
+                    if f.stat().st_mtime < cutoff
+                ]
+                if old_files:
+                    candidates[month_dir] = old_files
+        return candidates
+
+    def compact(self, dry_run: bool = False, now: datetime = None) -> Dict:
+        """
+        Pack eligible prayer files into their monthly bundles.
+
+        Args:
+            dry_run: Report what would be compressed without changing anything
+            now: Reference time for the age cutoff (defaults to current time)
+
+        Returns:
+            Statistics about the compaction run
+        """
+        stats = {
+            'months_processed': 0,
+            'files_compressed': 0,
+            'bytes_before': 0,
+            'bytes_after': 0,
+            'dry_run': dry_run,
+            'errors': []
+        }
+
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=self.compress_after_days)).timestamp()
+
+        for month_dir, files in self.find_candidates(now).items():
+            if dry_run:
+                stats['months_processed'] += 1
+                stats['files_compressed'] += len(files)
+                stats['bytes_before'] += sum(f.stat().st_size for f in files)
+                continue
+
+            try:
+                month_stats = self._compact_month(month_dir, files, cutoff)
+            except Exception as e:
+                error_msg = f"Failed to compact {month_dir}: {e}"
+                logger.error(error_msg)
+                stats['errors'].append(error_msg)
+                continue
+
+            if month_stats['files_compressed']:
+                stats['months_processed'] += 1
+                stats['files_compressed'] += month_stats['files_compressed']
+                stats['bytes_before'] += month_stats['bytes_before']
+                stats['bytes_after'] += month_stats['bytes_after']
+
+        if stats['files_compressed'] and not dry_run:
+            logger.info(
+                f"Compressed {stats['files_compressed']} prayer archives across "
+                f"{stats['months_processed']} months"
+            )
+        return stats
+
+    def _compact_month(self, month_dir: Path, files: List[Path], cutoff: float) -> Dict:
+        """Rewrite one month's bundle with the given files folded in, then remove them"""
+        bundle = month_dir.parent / f"{month_dir.name}{BUNDLE_SUFFIX}"
+        month_stats = {'files_compressed': 0, 'bytes_before': 0, 'bytes_after': 0}
+
+        with open(_bundle_lock_path(bundle), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+            # Hold each file's append lock until it is unlinked so no activity
+            # line can land in a file that is being packed
+            locked = []
+            try:
+                contents = {}
+                for path in files:
+                    try:
+                        f = open(path, 'rb')
+                    except FileNotFoundError:
+                        continue
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                    stat = os.fstat(f.fileno())
+                    if stat.st_nlink == 0 or stat.st_mtime >= cutoff:
+                        # Removed or appended to since the candidate scan
+                        f.close()
+                        continue
+                    locked.append((path, f))
+                    contents[path.name] = (f.read(), stat.st_mtime)
+
+                if not contents:
+                    return month_stats
+
+                previous_size = bundle.stat().st_size if bundle.exists() else 0
+                temp_bundle = bundle.with_name(bundle.name + '.tmp')
+                with zipfile.ZipFile(temp_bundle, 'w', zipfile.ZIP_DEFLATED) as out:
+                    if bundle.exists():
+                        with zipfile.ZipFile(bundle, 'r') as existing:
+                            for info in existing.infolist():
+                                if info.filename not in contents:
+                                    out.writestr(info, existing.read(info))
+                    for name in sorted(contents):
+                        data, mtime = contents[name]
+                        info = zipfile.ZipInfo(name, date_time=datetime.fromtimestamp(mtime).timetuple()[:6])
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        out.writestr(info, data)
+
+                with open(temp_bundle, 'rb') as f:
+                    os.fsync(f.fileno())
+                os.replace(temp_bundle, bundle)
+
+                for path, _ in locked:
+                    path.unlink()
+
+                month_stats['files_compressed'] = len(contents)
+                month_stats['bytes_before'] = sum(len(data) for data, _ in contents.values())
+                month_stats['bytes_after'] = bundle.stat().st_size - previous_size
+            finally:
+                for _, f in locked:
+                    f.close()
+
+        # Drop the month directory once everything in it has been bundled
+        try:
+            month_dir.rmdir()
+        except OSError:
+            pass
+
+        logger.info(f"Compressed {month_stats['files_compressed']} prayer archives into {bundle}")
+        return month_stats
+
+
+def compact_prayer_archives(dry_run: bool = False) -> Dict:
+    """Run one compaction pass over the configured archive directory"""
+    return ArchiveCompressionService().compact(dry_run=dry_run)
@@ -8,6 +8,7 @@ import os
 import json
 from sqlmodel import Session
 from models import engine, User, Prayer, PrayerMark, PrayerAttribute
+from app_helpers.services.archive_compression_service import archive_exists, read_archive_text
 
 
 class ArchiveDownloadService:
@@ -34,7 +35,7 @@ class ArchiveDownloadService:
                 personal_dir.mkdir()
                 
                 # Copy user registration file if exists
-                if user.text_file_path and Path(user.text_file_path).exists():
+                if user.text_file_path and archive_exists(user.text_file_path):
                     registration_content = self._extract_user_registration(user)
                     (personal_dir / "registration.txt").write_text(registration_content, encoding='utf-8')
                 
@@ -44,7 +45,7 @@ class ArchiveDownloadService:
                 
                 user_prayers = db.query(Prayer).filter_by(author_username=user_id).all()
                 for prayer in user_prayers:
-                    if prayer.text_file_path and Path(prayer.text_file_path).exists():
+                    if prayer.text_file_path and archive_exists(prayer.text_file_path):
                         # Read from archive (handles compressed files)
                         content = self._read_archive_file(prayer.text_file_path)
                         filename = f"prayer_{prayer.id}_{prayer.created_at.strftime('%Y_%m_%d')}.txt"
@@ -198,7 +199,7 @@ class ArchiveDownloadService:
                     "created_at": prayer.created_at.isoformat() if prayer.created_at else None,
                     "project_tag": prayer.project_tag,
                     "text_file_path": prayer.text_file_path,
-                    "archive_exists": prayer.text_file_path and Path(prayer.text_file_path).exists()
+                    "archive_exists": prayer.text_file_path and archive_exists(prayer.text_file_path)
                 }
                 metadata["prayers"].append(prayer_info)
             
@@ -209,7 +210,7 @@ class ArchiveDownloadService:
                     "prayer_id": mark.prayer_id,
                     "created_at": mark.created_at.isoformat() if mark.created_at else None,
                     "text_file_path": mark.text_file_path,
-                    "archive_exists": mark.text_file_path and Path(mark.text_file_path).exists()
+                    "archive_exists": mark.text_file_path and archive_exists(mark.text_file_path)
                 }
                 metadata["activities"].append(activity_info)
             
@@ -330,14 +331,7 @@ class ArchiveDownloadService:
     def _read_archive_file(self, file_path: str) -> str:
         """Read archive file, handling both uncompressed and compressed"""
         
-        path = Path(file_path)
-        
-        # First try to read uncompressed file
-        if path.exists():
-            return path.read_text(encoding='utf-8')
-        
-        # TODO: Add compressed file reading when compression is implemented
-        raise FileNotFoundError(f"Archive file not found: {file_path}")
+        return read_archive_text(file_path)
 
     def _extract_user_registration(self, user: User) -> str:
         """Extract user registration info from monthly file"""
@@ -8,11 +8,12 @@ This ensures text files are always the authoritative source of truth.
 
 import json
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from sqlmodel import Session, select
 
 from models import engine, Prayer, User, PrayerMark, PrayerAttribute, PrayerActivityLog
 from app_helpers.services.text_archive_service import text_archive_service
+from app_helpers.services.activity_timeline_service import record_activity
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ def create_prayer_with_text_archive(prayer_data: Dict) -> Tuple[Prayer, str]:
         - generated_prayer: LLM-generated prayer
         - project_tag: Optional project tag
         - created_at: Optional timestamp (defaults to now)
+        - prompt_hash: Optional hash of the system prompt that generated the prayer
     
     Returns:
         Tuple of (Prayer record, archive file path)
@@ -72,6 +74,16 @@ def create_prayer_with_text_archive(prayer_data: Dict) -> Tuple[Prayer, str]:
             subject_category=categorization.get('subject_category', 'general')
         )
         s.add(prayer)
+        if prayer_data.get('prompt_hash'):
+            # Record which prompt version produced the prayer, in the same commit
+            s.add(PrayerAttribute(
+                prayer_id=prayer.id,
+                attribute_name='prompt_hash',
+                attribute_value=prayer_data['prompt_hash'],
+                created_by=prayer_data['author_username'],
+                created_at=prayer.created_at
+            ))
+        record_activity(s, "prayer", prayer, prayer.author_username, created_at=prayer.created_at)
         s.commit()
         s.refresh(prayer)  # Get the actual database ID
     
@@ -104,6 +116,40 @@ def create_prayer_with_text_archive(prayer_data: Dict) -> Tuple[Prayer, str]:
     return prayer, temp_file_path
 
 
+def _ensure_prayer_archive(s: Session, prayer: Prayer) -> None:
+    """Create the missing archive file (or a placeholder path) for a legacy/test prayer"""
+    logger.info(f"Prayer {prayer.id} missing text archive - creating one now")
+    
+    # Get prayer author for archive
+    author = s.get(User, prayer.author_username)
+    author_name = author.display_name if author else "Unknown"
+    
+    # Create archive data from database prayer
+    archive_data = {
+        'id': prayer.id,
+        'author': author_name,
+        'text': prayer.text,
+        'generated_prayer': prayer.generated_prayer,
+        'project_tag': prayer.project_tag,
+        'created_at': prayer.created_at
+    }
+    
+    # Create the archive file (if text archives are enabled)
+    if text_archive_service.enabled:
+        archive_file_path = text_archive_service.create_prayer_archive(archive_data)
+        
+        # Update prayer record with archive path (committed with the caller's write)
+        prayer.text_file_path = archive_file_path
+        s.add(prayer)
+        
+        logger.info(f"Created archive file for prayer {prayer.id}: {archive_file_path}")
+    else:
+        # In test environment or when archives are disabled, just set a placeholder
+        prayer.text_file_path = f"disabled_archive_for_prayer_{prayer.id}"
+        s.add(prayer)
+        logger.info(f"Text archives disabled - set placeholder path for prayer {prayer.id}")
+
+
 def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User, extra: str = "", timestamp: datetime | None = None) -> None:
     """
     Append prayer activity using archive-first approach:
@@ -124,39 +170,7 @@ def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User,
             raise ValueError(f"Prayer {prayer_id} not found")
         
         if not prayer.text_file_path:
-            # Create missing archive file for legacy/test prayers
-            logger.info(f"Prayer {prayer_id} missing text archive - creating one now")
-            
-            # Get prayer author for archive
-            author = s.get(User, prayer.author_username)
-            author_name = author.display_name if author else "Unknown"
-            
-            # Create archive data from database prayer
-            archive_data = {
-                'id': prayer.id,
-                'author': author_name,
-                'text': prayer.text,
-                'generated_prayer': prayer.generated_prayer,
-                'project_tag': prayer.project_tag,
-                'created_at': prayer.created_at
-            }
-            
-            # Create the archive file (if text archives are enabled)
-            if text_archive_service.enabled:
-                archive_file_path = text_archive_service.create_prayer_archive(archive_data)
-                
-                # Update prayer record with archive path
-                prayer.text_file_path = archive_file_path
-                s.add(prayer)
-                s.commit()
-                
-                logger.info(f"Created archive file for prayer {prayer_id}: {archive_file_path}")
-            else:
-                # In test environment or when archives are disabled, just set a placeholder
-                prayer.text_file_path = f"disabled_archive_for_prayer_{prayer_id}"
-                s.add(prayer)
-                s.commit()
-                logger.info(f"Text archives disabled - set placeholder path for prayer {prayer_id}")
+            _ensure_prayer_archive(s, prayer)
         
         activity_time = timestamp or datetime.now()
 
@@ -201,6 +215,7 @@ def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User,
                 created_at=activity_time
             )
             s.add(prayer_mark)
+            record_activity(s, "prayed", prayer, user.display_name, created_at=activity_time)
 
         elif action in ["answered", "archived", "flagged"]:
             # Create or update PrayerAttribute
@@ -210,6 +225,7 @@ def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User,
             if action == "answered":
                 answer_date = datetime.now().isoformat()
                 prayer.set_attribute("answer_date", answer_date, user.display_name, s)
+                record_activity(s, "answered", prayer, user.display_name)
             
             # Set testimony if provided with answered action
             if action == "answered" and extra:
@@ -235,6 +251,7 @@ def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User,
                     created_at=datetime.now()
                 )
                 s.add(testimony_log)
+                record_activity(s, "testimony", prayer, user.display_name, snippet_text=extra)
                 
         elif action == "restored":
             # Remove archived attribute
@@ -286,6 +303,104 @@ def append_prayer_activity_with_archive(prayer_id: str, action: str, user: User,
         )
 
 
+def append_prayer_marks_with_archive(user: User, marks: List[Tuple[str, Optional[datetime]]]) -> List[Dict]:
+    """
+    Record many prayer marks by one user (e.g. an offline queue being replayed)
+    using the archive-first approach in one pass:
+    1. Append each prayer's new lines to its archive in a single write
+    2. Create all mark, timeline and activity-log records in one transaction
+    
+    Marks carrying a timestamp that the user already has for that prayer (or
+    that repeat within the batch) are skipped, as in append_prayer_activity_with_archive.
+    
+    Args:
+        user: User who prayed
+        marks: (prayer_id, prayed_at) pairs; prayed_at None means now
+    
+    Returns:
+        One {'prayer_id', 'prayed_at', 'status'} dict per input mark, status being
+        'recorded', 'duplicate' or 'not_found'
+    """
+    now = datetime.now()
+    results = []
+    
+    with Session(engine) as s:
+        prayer_ids = {prayer_id for prayer_id, _ in marks}
+        prayers = {
+            prayer.id: prayer
+            for prayer in s.exec(select(Prayer).where(Prayer.id.in_(prayer_ids))).all()
+        } if prayer_ids else {}
+        
+        # Offline timestamps already recorded for these prayers
+        timestamps = {prayed_at for _, prayed_at in marks if prayed_at}
+        seen = set(s.exec(
+            select(PrayerMark.prayer_id, PrayerMark.created_at)
+            .where(
+                PrayerMark.username == user.display_name,
+                PrayerMark.prayer_id.in_(prayer_ids),
+                PrayerMark.created_at.in_(timestamps)
+            )
+        ).all()) if timestamps else set()
+        
+        accepted = []
+        for prayer_id, prayed_at in marks:
+            activity_time = prayed_at or now
+            if prayer_id not in prayers:
+                status = 'not_found'
+            elif prayed_at and (prayer_id, prayed_at) in seen:
+                status = 'duplicate'
+            else:
+                status = 'recorded'
+                if prayed_at:
+                    seen.add((prayer_id, prayed_at))
+                accepted.append((prayers[prayer_id], activity_time))
+            results.append({'prayer_id': prayer_id, 'prayed_at': activity_time.isoformat(), 'status': status})
+        
+        if not accepted:
+            return results
+        
+        for prayer in {prayer.id: prayer for prayer, _ in accepted}.values():
+            if not prayer.text_file_path:
+                _ensure_prayer_archive(s, prayer)
+        
+        # Step 1: Write to text archives FIRST, one append per prayer file
+        if text_archive_service.enabled:
+            by_file = {}
+            for prayer, activity_time in accepted:
+                if not prayer.text_file_path.startswith("disabled_archive_"):
+                    by_file.setdefault(prayer.text_file_path, []).append(activity_time)
+            for file_path, activity_times in by_file.items():
+                text_archive_service.append_prayer_marks_with_timestamps(file_path, user.display_name, activity_times)
+        
+        # Step 2: Create database records with the same archive references
+        for prayer, activity_time in accepted:
+            s.add(PrayerMark(
+                prayer_id=prayer.id,
+                username=user.display_name,
+                text_file_path=prayer.text_file_path,
+                created_at=activity_time
+            ))
+            record_activity(s, "prayed", prayer, user.display_name, created_at=activity_time)
+            s.add(PrayerActivityLog(
+                prayer_id=prayer.id,
+                user_id=user.display_name,
+                action="prayed",
+                old_value=None,
+                new_value="true",
+                text_file_path=prayer.text_file_path,
+                created_at=activity_time
+            ))
+        monthly_activities = [(f"prayed for prayer {prayer.id}", prayer.id, "") for prayer, _ in accepted]
+        s.commit()
+        
+    logger.info(f"Added {len(accepted)} of {len(marks)} batched prayer marks by {user.display_name}")
+    
+    # Log to monthly activity
+    text_archive_service.append_monthly_activities(user.display_name, monthly_activities)
+    
+    return results
+
+
 def create_user_with_text_archive(user_data: Dict, user_id: str = None) -> Tuple[User, str]:
     """
     Create user using archive-first approach:
@@ -440,7 +555,8 @@ def validate_archive_database_consistency(prayer_id: str) -> Dict:
 # Convenience function for backward compatibility
 def submit_prayer_archive_first(text: str, author: User,
                                generated_prayer: str = None, 
-                               ai_response: str = None) -> Prayer:
+                               ai_response: str = None,
+                               prompt_hash: str = None) -> Prayer:
     """
     Submit prayer using archive-first approach with categorization - convenience wrapper.
     
@@ -449,6 +565,7 @@ def submit_prayer_archive_first(text: str, author: User,
         author: User submitting the prayer
         generated_prayer: Pre-generated prayer text
         ai_response: AI response containing both prayer and categorization
+        prompt_hash: Hash of the composed system prompt the prayer was generated with
     
     Returns:
         Created Prayer record
@@ -486,8 +603,11 @@ def submit_prayer_archive_first(text: str, author: User,
         'author_display_name': author.display_name,
         'text': text,
         'generated_prayer': generated_prayer,
-        'categorization': categorization
+        'categorization': categorization,
+        'prompt_hash': prompt_hash
     }
     
     prayer, _ = create_prayer_with_text_archive(prayer_data)
+    if prompt_hash:
+        logger.info(f"Prayer {prayer.id} generated with prompt {prompt_hash}")
     return prayer
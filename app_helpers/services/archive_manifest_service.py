@@ -0,0 +1,233 @@
+"""
+Archive Manifest Service
+
+Keeps a content-hash manifest of prayer archive files so archive/database consistency
+checks only re-parse files that changed since the previous run.
+
+Each manifest entry records the file's size, mtime, SHA-256 and the fields parsed
+from it (prayer id, author, hash of the original request). A file whose size and
+mtime still match its entry is trusted without being opened; everything else is
+hashed and parsed in parallel worker threads.
+
+The manifest lives at <archive_dir>/consistency_manifest.json and is rewritten
+atomically after each refresh. Deleting it simply forces a full re-parse.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from sqlmodel import Session, select, func
+
+from models import engine, Prayer, User
+from app_helpers.services.archive_compression_service import (
+    bundled_member_info, list_prayer_archive_files
+)
+from app_helpers.services.text_archive_service import TextArchiveService
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "consistency_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _file_signature(path: str) -> Optional[Dict]:
+    """Size/mtime of a loose file, or size/mtime/crc of its bundled copy"""
+    try:
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+    except FileNotFoundError:
+        pass
+
+    info = bundled_member_info(path)
+    if info is None:
+        return None
+    mtime = int(datetime(*info.date_time).timestamp() * 1_000_000_000)
+    return {'size': info.file_size, 'mtime': mtime, 'crc': info.CRC}
+
+
+class ArchiveManifest:
+    """Content-hash manifest of prayer archive files"""
+
+    def __init__(self, archive_dir: str, archive_service: TextArchiveService = None):
+        self.archive_dir = Path(archive_dir)
+        self.manifest_path = self.archive_dir / MANIFEST_FILENAME
+        self.archive_service = archive_service or TextArchiveService(base_dir=str(self.archive_dir))
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'files_reused': 0, 'files_parsed': 0, 'files_removed': 0}
+
+    @staticmethod
+    def key_for(file_path: str) -> str:
+        return os.path.abspath(file_path)
+
+    def load(self):
+        """Load the manifest from disk, starting empty if it is missing or stale"""
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable consistency manifest {self.manifest_path}: {e}")
+            return
+
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('files', {})
+
+    def save(self):
+        """Write the manifest atomically"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'generated_at': datetime.now().isoformat(),
+            'files': self.entries
+        }
+        temp_path = str(self.manifest_path) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(temp_path, self.manifest_path)
+
+    def refresh(self, file_paths: Iterable[str], workers: int = None) -> Dict[str, Dict]:
+        """
+        Bring manifest entries for the given files up to date.
+
+        Unchanged files keep their entry; new or modified ones are re-hashed and
+        re-parsed in parallel. Entries for files that no longer exist are dropped.
+
+        Returns:
+            Mapping of manifest key to entry for every file that exists
+        """
+        refreshed = {}
+        to_parse = []
+
+        for file_path in file_paths:
+            key = self.key_for(file_path)
+            if key in refreshed:
+                continue
+            signature = _file_signature(key)
+            if signature is None:
+                continue
+
+            entry = self.entries.get(key)
+            if entry and all(entry.get(field) == value for field, value in signature.items()):
+                refreshed[key] = entry
+                self.stats['files_reused'] += 1
+            else:
+                refreshed[key] = None
+                to_parse.append((key, signature))
+
+        if to_parse:
+            with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 4)) as pool:
+                for key, entry in zip(
+                    (key for key, _ in to_parse),
+                    pool.map(lambda item: self._parse_file(*item), to_parse)
+                ):
+                    refreshed[key] = entry
+            self.stats['files_parsed'] += len(to_parse)
+
+        self.stats['files_removed'] += len(set(self.entries) - set(refreshed))
+        self.entries = refreshed
+        return refreshed
+
+    def _parse_file(self, key: str, signature: Dict) -> Dict:
+        """Hash and parse one prayer archive file into a manifest entry"""
+        entry = dict(signature)
+        try:
+            content = self.archive_service.read_archive_file(key)
+        except Exception as e:
+            entry['error'] = f"read failed: {e}"
+            return entry
+
+        entry['sha256'] = _sha256(content)
+        try:
+            parsed_data, _ = self.archive_service.parse_prayer_archive(key)
+            prayer_id = parsed_data.get('id')
+            entry['prayer_id'] = str(prayer_id) if prayer_id is not None else None
+            entry['author'] = parsed_data.get('author')
+            original_request = parsed_data.get('original_request')
+            entry['text_sha256'] = _sha256(original_request) if original_request is not None else None
+        except Exception as e:
+            entry['error'] = str(e)
+        return entry
+
+
+def validate_incremental_consistency(archive_dir: str, archive_service: TextArchiveService = None,
+                                     workers: int = None) -> Dict:
+    """
+    Check prayers against their archive files using the content-hash manifest.
+
+    Produces the same result shape as TextImporterService.validate_import_consistency(),
+    plus manifest statistics and the authors found in prayer archives.
+    """
+    manifest = ArchiveManifest(archive_dir, archive_service)
+    manifest.load()
+
+    validation_results = {
+        'prayers_checked': 0,
+        'users_checked': 0,
+        'inconsistencies': [],
+        'missing_archives': [],
+        'missing_db_records': [],
+        'archive_prayer_files': 0,
+        'archive_authors': set(),
+    }
+
+    with Session(engine) as s:
+        # Only the columns needed for comparison - no full ORM objects
+        prayer_rows = s.exec(select(Prayer.id, Prayer.text, Prayer.text_file_path)).all()
+        users_without_archive = s.exec(
+            select(User.display_name).where(User.text_file_path.is_(None))
+        ).all()
+        validation_results['users_checked'] = s.exec(select(func.count()).select_from(User)).one()
+
+    archive_files = [str(p) for p in list_prayer_archive_files(manifest.archive_dir / "prayers")]
+    referenced_files = [row.text_file_path for row in prayer_rows if row.text_file_path]
+    entries = manifest.refresh(archive_files + referenced_files, workers=workers)
+    manifest.save()
+
+    archive_keys = {ArchiveManifest.key_for(path) for path in archive_files}
+    validation_results['archive_prayer_files'] = len(archive_keys & set(entries))
+    validation_results['archive_authors'] = {
+        entries[key]['author'] for key in archive_keys
+        if entries.get(key) and entries[key].get('author') and entries[key]['author'] != 'None'
+    }
+
+    for prayer_id, text, text_file_path in prayer_rows:
+        validation_results['prayers_checked'] += 1
+
+        if not text_file_path:
+            validation_results['missing_archives'].append(f"Prayer {prayer_id} has no archive file reference")
+            continue
+
+        entry = entries.get(ArchiveManifest.key_for(text_file_path))
+        if entry is None:
+            validation_results['missing_archives'].append(f"Prayer {prayer_id} archive file not found: {text_file_path}")
+            continue
+
+        if entry.get('error'):
+            validation_results['inconsistencies'].append(f"Prayer {prayer_id} archive parsing failed: {entry['error']}")
+            continue
+        if entry.get('prayer_id') != str(prayer_id):
+            validation_results['inconsistencies'].append(f"Prayer {prayer_id} ID mismatch in archive")
+        if entry.get('text_sha256') != _sha256(text):
+            validation_results['inconsistencies'].append(f"Prayer {prayer_id} text mismatch in archive")
+
+    for display_name in users_without_archive:
+        validation_results['missing_archives'].append(f"User {display_name} ({display_name}) has no archive file reference")
+
+    validation_results.update(manifest.stats)
+    logger.info(
+        f"Incremental consistency check: {manifest.stats['files_parsed']} files parsed, "
+        f"{manifest.stats['files_reused']} reused from manifest"
+    )
+    return validation_results
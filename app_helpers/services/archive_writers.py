@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Any
 import logging
 
 from app_helpers.services.text_archive_service import TextArchiveService
+from app_helpers.utils.request_metrics import record_archive_write
 
 logger = logging.getLogger(__name__)
 
@@ -262,6 +263,7 @@ class AuthArchiveWriter:
                 f.write(content)
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
             
             os.rename(temp_path, file_path)
             
@@ -277,6 +279,7 @@ class AuthArchiveWriter:
                 f.write(content + '\n')
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
         except Exception as e:
             logger.error(f"Failed to append to auth archive {file_path}: {e}")
 
@@ -386,6 +389,7 @@ class RoleArchiveWriter:
                 f.write(content)
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
             
             os.rename(temp_path, file_path)
             
@@ -401,6 +405,7 @@ class RoleArchiveWriter:
                 f.write(content + '\n')
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
         except Exception as e:
             logger.error(f"Failed to append to role archive {file_path}: {e}")
 
@@ -542,6 +547,7 @@ class SystemArchiveWriter:
                 f.write(content)
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
             
             os.rename(temp_path, file_path)
             
@@ -557,6 +563,7 @@ class SystemArchiveWriter:
                 f.write(content + '\n')
                 f.flush()
                 os.fsync(f.fileno())
+                record_archive_write()
         except Exception as e:
             logger.error(f"Failed to append to system archive {file_path}: {e}")
 
@@ -8,15 +8,17 @@ plus the notification system. Extracted from auth_helpers.py for better maintain
 
 import uuid
 from datetime import datetime, timedelta
+from sqlalchemy import insert, update
 from sqlmodel import Session, select, func
 
 from models import (
     User, Session as SessionModel, AuthenticationRequest, AuthApproval, 
-    NotificationState, engine
+    AuthAuditLog, NotificationState, engine
 )
 
 # Constants
 PEER_APPROVAL_COUNT = 2
+EXPIRY_BATCH_SIZE = 500
 
 
 def create_auth_request(user_id: str, device_info: str = None, ip_address: str = None) -> str:
@@ -209,27 +211,70 @@ def get_pending_requests_for_approval(user_id: str) -> list:
         return requests
 
 
-def cleanup_expired_requests() -> None:
-    """Mark expired authentication requests as expired"""
-    from .validation_helpers import log_auth_action
+def is_request_expired(auth_req: AuthenticationRequest, now: datetime = None) -> bool:
+    """
+    Check expiry lazily from expires_at. Request paths use this instead of waiting
+    for the background expiry task to flip the stored status.
+    """
+    if auth_req.status == "expired":
+        return True
+    return auth_req.status == "pending" and auth_req.expires_at < (now or datetime.utcnow())
+
+
+def effective_request_status(auth_req: AuthenticationRequest, now: datetime = None) -> str:
+    """Status to display for a request, treating overdue pending requests as expired"""
+    return "expired" if is_request_expired(auth_req, now) else auth_req.status
+
+
+def cleanup_expired_requests(batch_size: int = EXPIRY_BATCH_SIZE) -> int:
+    """
+    Mark expired authentication requests as expired.
+    
+    Runs from the periodic background task in app.py. Requests are expired in
+    batches with one UPDATE and one bulk audit-log INSERT per batch.
+    
+    Returns:
+        Number of requests marked expired
+    """
+    now = datetime.utcnow()
+    total_expired = 0
     
     with Session(engine) as db:
-        expired_requests = db.exec(
-            select(AuthenticationRequest)
-            .where(AuthenticationRequest.status == "pending")
-            .where(AuthenticationRequest.expires_at < datetime.utcnow())
-        ).all()
-        
-        for auth_req in expired_requests:
-            auth_req.status = "expired"
-            log_auth_action(
-                auth_request_id=auth_req.id,
-                action="expired",
-                actor_type="system",
-                details="Request expired after 7 days"
+        while True:
+            expired_ids = db.exec(
+                select(AuthenticationRequest.id)
+                .where(AuthenticationRequest.status == "pending")
+                .where(AuthenticationRequest.expires_at < now)
+                .order_by(AuthenticationRequest.expires_at)
+                .limit(batch_size)
+            ).all()
+            if not expired_ids:
+                break
+            
+            db.execute(
+                update(AuthenticationRequest)
+                .where(AuthenticationRequest.id.in_(expired_ids))
+                .where(AuthenticationRequest.status == "pending")
+                .values(status="expired")
             )
-        
-        db.commit()
+            db.execute(insert(AuthAuditLog), [
+                {
+                    'id': uuid.uuid4().hex,
+                    'auth_request_id': request_id,
+                    'action': "expired",
+                    'actor_type': "system",
+                    'details': "Request expired after 7 days",
+                    'created_at': now
+                }
+                for request_id in expired_ids
+            ])
+            db.commit()
+            
+            total_expired += len(expired_ids)
+            if len(expired_ids) < batch_size:
+                break
+    
+    return total_expired
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -28,6 +28,8 @@ from .auth.token_helpers import (
     approve_auth_request,
     get_pending_requests_for_approval,
     cleanup_expired_requests,
+    is_request_expired,
+    effective_request_status,
     create_auth_notification,
     get_unread_auth_notifications,
     mark_notification_read,
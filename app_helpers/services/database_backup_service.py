@@ -0,0 +1,283 @@
+"""
+Database Backup Service
+
+Creates consistent backups of the live SQLite database without stopping the app.
+
+Copying thywill.db with cp/shutil misses anything still sitting in the -wal file and
+can capture a half-written page. Instead this service uses:
+- SQLite's online backup API, copied a few hundred pages per step with a short sleep
+  in between so writers are never blocked for long
+- VACUUM INTO as an alternative that also defragments the copy
+- PRAGMA integrity_check on the result rather than comparing file sizes
+
+Incremental snapshots store only the pages that changed since the previous snapshot:
+
+    backups/incremental/
+        snapshot_chain.json            # page size, page hashes of latest state, snapshot list
+        snapshot_0001_20240615_020000.pages
+        snapshot_0002_20240616_020000.pages
+
+Each .pages file is a small header followed by (page number, page bytes) records.
+The first snapshot in a chain contains every page; restoring snapshot N replays
+snapshots 1..N into a fresh file.
+"""
+
+import os
+import json
+import time
+import struct
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_STEP = 256
+DEFAULT_STEP_SLEEP = 0.01
+
+CHAIN_FILENAME = "snapshot_chain.json"
+SNAPSHOT_MAGIC = b"TWSNAP1\n"
+_SNAPSHOT_HEADER = struct.Struct(">II")    # page_size, page_count
+_PAGE_RECORD = struct.Struct(">I")          # 1-based page number
+
+
+def create_online_backup(db_path: str, backup_path: str, pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                         step_sleep: float = DEFAULT_STEP_SLEEP) -> Dict:
+    """
+    Copy a live database with the SQLite online backup API.
+
+    The copy is made in chunks of pages_per_step pages; the source is only read-locked
+    while a chunk is copied, so the app keeps serving writes during the backup.
+
+    Returns:
+        Dictionary with backup path, size and elapsed time
+    """
+    started = time.monotonic()
+    temp_path = f"{backup_path}.tmp"
+    if os.path.exists(temp_path):
+        os.unlink(temp_path)
+
+    source = sqlite3.connect(db_path)
+    try:
+        target = sqlite3.connect(temp_path)
+        try:
+            source.backup(target, pages=pages_per_step, sleep=step_sleep)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+    _fsync_file(temp_path)
+    os.replace(temp_path, backup_path)
+
+    return {
+        'backup_path': str(backup_path),
+        'size_bytes': os.path.getsize(backup_path),
+        'elapsed_seconds': round(time.monotonic() - started, 3)
+    }
+
+
+def vacuum_into_backup(db_path: str, backup_path: str) -> Dict:
+    """
+    Write a compacted copy of the database with VACUUM INTO.
+
+    Runs as a single read transaction, so it is consistent but holds a read snapshot
+    for the whole copy; prefer create_online_backup() for very large databases.
+    """
+    started = time.monotonic()
+    temp_path = f"{backup_path}.tmp"
+    if os.path.exists(temp_path):
+        os.unlink(temp_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("VACUUM INTO ?", (temp_path,))
+    finally:
+        conn.close()
+
+    _fsync_file(temp_path)
+    os.replace(temp_path, backup_path)
+
+    return {
+        'backup_path': str(backup_path),
+        'size_bytes': os.path.getsize(backup_path),
+        'elapsed_seconds': round(time.monotonic() - started, 3)
+    }
+
+
+def verify_database(db_path: str) -> Tuple[bool, List[str]]:
+    """
+    Run PRAGMA integrity_check against a database file.
+
+    Returns:
+        (ok, messages) - messages is ['ok'] for a healthy database
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            messages = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        return False, [str(e)]
+    return messages == ['ok'], messages
+
+
+def _fsync_file(path: str):
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def _page_digest(page: bytes) -> str:
+    return hashlib.blake2b(page, digest_size=16).hexdigest()
+
+
+class IncrementalSnapshotService:
+    """Page-level incremental snapshots of a SQLite database"""
+
+    def __init__(self, db_path: str, snapshot_dir: str, pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                 step_sleep: float = DEFAULT_STEP_SLEEP):
+        self.db_path = db_path
+        self.snapshot_dir = Path(snapshot_dir)
+        self.chain_path = self.snapshot_dir / CHAIN_FILENAME
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+
+    def load_chain(self) -> Dict:
+        if not self.chain_path.exists():
+            return {'page_size': None, 'page_hashes': [], 'snapshots': []}
+        return json.loads(self.chain_path.read_text(encoding='utf-8'))
+
+    def _save_chain(self, chain: Dict):
+        temp_path = f"{self.chain_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(chain, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.chain_path)
+
+    def create_snapshot(self) -> Dict:
+        """
+        Record the pages that changed since the previous snapshot.
+
+        A consistent copy is first taken with the online backup API into a temporary
+        file; its pages are then hashed and compared with the chain's page hashes.
+
+        Returns:
+            Snapshot metadata (file, page counts, size)
+        """
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        chain = self.load_chain()
+
+        with tempfile.TemporaryDirectory(dir=self.snapshot_dir) as temp_dir:
+            staging_path = os.path.join(temp_dir, "staging.db")
+            create_online_backup(self.db_path, staging_path, self.pages_per_step, self.step_sleep)
+
+            ok, messages = verify_database(staging_path)
+            if not ok:
+                raise sqlite3.DatabaseError(f"Source copy failed integrity check: {messages[:5]}")
+
+            conn = sqlite3.connect(staging_path)
+            try:
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                conn.close()
+
+            # A page size change invalidates every stored page - start over with a full set
+            previous_hashes = chain['page_hashes'] if chain['page_size'] == page_size else []
+
+            sequence = len(chain['snapshots']) + 1
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            snapshot_name = f"snapshot_{sequence:04d}_{timestamp}.pages"
+            snapshot_path = self.snapshot_dir / snapshot_name
+
+            page_hashes = []
+            pages_written = 0
+            with open(staging_path, 'rb') as source, open(f"{snapshot_path}.tmp", 'wb') as out:
+                page_count = os.fstat(source.fileno()).st_size // page_size
+                out.write(SNAPSHOT_MAGIC)
+                out.write(_SNAPSHOT_HEADER.pack(page_size, page_count))
+                for page_number in range(1, page_count + 1):
+                    page = source.read(page_size)
+                    digest = _page_digest(page)
+                    page_hashes.append(digest)
+                    if page_number > len(previous_hashes) or previous_hashes[page_number - 1] != digest:
+                        out.write(_PAGE_RECORD.pack(page_number))
+                        out.write(page)
+                        pages_written += 1
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(f"{snapshot_path}.tmp", snapshot_path)
+
+        snapshot = {
+            'sequence': sequence,
+            'file': snapshot_name,
+            'created_at': datetime.now().isoformat(),
+            'page_size': page_size,
+            'page_count': page_count,
+            'pages_written': pages_written,
+            'size_bytes': snapshot_path.stat().st_size
+        }
+        chain['page_size'] = page_size
+        chain['page_hashes'] = page_hashes
+        chain['snapshots'].append(snapshot)
+        self._save_chain(chain)
+
+        logger.info(f"Snapshot {sequence}: {pages_written}/{page_count} pages changed")
+        return snapshot
+
+    def restore_snapshot(self, output_path: str, sequence: Optional[int] = None) -> Dict:
+        """
+        Rebuild the database as of a snapshot by replaying the chain up to it.
+
+        Args:
+            output_path: Where to write the restored database
+            sequence: Snapshot number to restore (defaults to the latest)
+        """
+        chain = self.load_chain()
+        snapshots = chain['snapshots']
+        if not snapshots:
+            raise FileNotFoundError(f"No snapshots found in {self.snapshot_dir}")
+
+        sequence = sequence or snapshots[-1]['sequence']
+        to_apply = [s for s in snapshots if s['sequence'] <= sequence]
+        if not to_apply or to_apply[-1]['sequence'] != sequence:
+            raise ValueError(f"Snapshot {sequence} not found")
+
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, 'wb') as out:
+            for snapshot in to_apply:
+                page_size, page_count = self._apply_snapshot(self.snapshot_dir / snapshot['file'], out)
+            out.truncate(page_size * page_count)
+            out.flush()
+            os.fsync(out.fileno())
+
+        ok, messages = verify_database(temp_path)
+        if not ok:
+            os.unlink(temp_path)
+            raise sqlite3.DatabaseError(f"Restored snapshot failed integrity check: {messages[:5]}")
+        os.replace(temp_path, output_path)
+
+        return {'restored_path': str(output_path), 'sequence': sequence, 'snapshots_applied': len(to_apply)}
+
+    @staticmethod
+    def _apply_snapshot(snapshot_path: Path, out) -> Tuple[int, int]:
+        with open(snapshot_path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a snapshot file: {snapshot_path}")
+            page_size, page_count = _SNAPSHOT_HEADER.unpack(f.read(_SNAPSHOT_HEADER.size))
+            while True:
+                record = f.read(_PAGE_RECORD.size)
+                if not record:
+                    break
+                (page_number,) = _PAGE_RECORD.unpack(record)
+                page = f.read(page_size)
+                if len(page) != page_size:
+                    raise ValueError(f"Truncated snapshot file: {snapshot_path}")
+                out.seek((page_number - 1) * page_size)
+                out.write(page)
+        return page_size, page_count
@@ -0,0 +1,155 @@
+# app_helpers/services/database_maintenance_service.py
+"""
+SQLite housekeeping and lock-wait instrumentation.
+
+Writers serialize on SQLite's single write lock. With busy_timeout set (see
+models.SQLITE_PRAGMAS) a blocked writer waits inside SQLite instead of failing,
+which hides contention, so write statements are timed here: one that takes
+longer than DB_LOCK_WAIT_THRESHOLD_MS is almost always waiting for the lock.
+"database is locked" errors that outlast the timeout are counted too.
+
+The periodic maintenance task runs a PASSIVE WAL checkpoint (never blocks
+readers or writers) so the -wal file does not grow between automatic
+checkpoints under sustained read load, followed by PRAGMA optimize.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import event, text
+
+from models import engine
+
+
+DB_MAINTENANCE_INTERVAL_SECONDS = int(os.getenv('DB_MAINTENANCE_INTERVAL_SECONDS', '300'))
+DB_CHECKPOINT_MODE = os.getenv('DB_CHECKPOINT_MODE', 'PASSIVE').upper()
+DB_LOCK_WAIT_THRESHOLD_MS = float(os.getenv('DB_LOCK_WAIT_THRESHOLD_MS', '100'))
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+RECENT_WAITS_SIZE = 20
+
+
+class LockWaitMetrics:
+    """Process-wide counters for write-lock waits and busy errors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.since = datetime.utcnow()
+            self.writes = 0
+            self.slow_writes = 0
+            self.wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.busy_errors = 0
+            self.recent = deque(maxlen=RECENT_WAITS_SIZE)
+            self.last_checkpoint: Optional[Dict] = None
+
+    def record_write(self, statement: str, duration_ms: float):
+        with self._lock:
+            self.writes += 1
+            if duration_ms < DB_LOCK_WAIT_THRESHOLD_MS:
+                return
+            self.slow_writes += 1
+            self.wait_ms += duration_ms
+            self.max_wait_ms = max(self.max_wait_ms, duration_ms)
+            self.recent.appendleft({'at': datetime.utcnow(), 'ms': duration_ms, 'statement': statement[:120]})
+
+    def record_busy(self, statement: str):
+        with self._lock:
+            self.busy_errors += 1
+            self.recent.appendleft({'at': datetime.utcnow(), 'ms': None, 'statement': statement[:120]})
+
+    def record_checkpoint(self, result: Dict):
+        with self._lock:
+            self.last_checkpoint = result
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'since': self.since,
+                'writes': self.writes,
+                'slow_writes': self.slow_writes,
+                'wait_ms': self.wait_ms,
+                'max_wait_ms': self.max_wait_ms,
+                'busy_errors': self.busy_errors,
+                'threshold_ms': DB_LOCK_WAIT_THRESHOLD_MS,
+                'recent': list(self.recent),
+                'last_checkpoint': self.last_checkpoint
+            }
+
+
+lock_wait_metrics = LockWaitMetrics()
+
+
+# ───────── SQLAlchemy hooks ─────────
+
+def _is_write(statement: str) -> bool:
+    return statement.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+
+
+def _before_write(conn, cursor, statement, parameters, context, executemany):
+    if _is_write(statement):
+        conn.info.setdefault("lock_wait_start", []).append(time.perf_counter())
+
+
+def _after_write(conn, cursor, statement, parameters, context, executemany):
+    if _is_write(statement):
+        starts = conn.info.get("lock_wait_start")
+        if starts:
+            lock_wait_metrics.record_write(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+def _on_error(exception_context):
+    conn = exception_context.connection
+    statement = exception_context.statement or ''
+    if conn is not None and _is_write(statement):
+        starts = conn.info.get("lock_wait_start")
+        if starts:
+            starts.pop()
+    message = str(exception_context.original_exception).lower()
+    if 'database is locked' in message or 'database is busy' in message:
+        lock_wait_metrics.record_busy(statement)
+
+
+def install_lock_wait_hooks(target_engine) -> None:
+    """Attach write timing and busy-error listeners to an engine (idempotent)"""
+    if not event.contains(target_engine, "before_cursor_execute", _before_write):
+        event.listen(target_engine, "before_cursor_execute", _before_write)
+        event.listen(target_engine, "after_cursor_execute", _after_write)
+        event.listen(target_engine, "handle_error", _on_error)
+
+
+# ───────── Maintenance ─────────
+
+def run_database_maintenance(target_engine=None, mode: str = DB_CHECKPOINT_MODE) -> Dict:
+    """
+    Checkpoint the WAL and refresh query planner statistics.
+
+    Returns:
+        Dict with busy (1 if the checkpoint could not finish), wal_pages,
+        checkpointed_pages and duration_ms
+    """
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    started = time.perf_counter()
+    with (target_engine or engine).connect() as conn:
+        busy, wal_pages, checkpointed = conn.execute(text(f"PRAGMA wal_checkpoint({mode})")).one()
+        conn.execute(text("PRAGMA optimize"))
+        conn.commit()
+    result = {
+        'at': datetime.utcnow(),
+        'mode': mode,
+        'busy': busy,
+        'wal_pages': wal_pages,
+        'checkpointed_pages': checkpointed,
+        'duration_ms': (time.perf_counter() - started) * 1000
+    }
+    lock_wait_metrics.record_checkpoint(result)
+    return result
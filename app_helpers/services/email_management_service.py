@@ -3,11 +3,7 @@ Email Management Service - Handles email encryption, verification, and recovery
 """
 import os
 import uuid
-import smtplib
-import ssl
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from cryptography.fernet import Fernet
 import base64
 from sqlmodel import Session, select
@@ -325,31 +321,23 @@ The ThyWill Team
         return os.getenv('BASE_URL', 'http://localhost:8000')
     
     def _send_email(self, to_email: str, subject: str, body: str):
-        """Send email using configured SMTP settings"""
-        smtp_host = os.getenv('SMTP_HOST', 'localhost')
-        smtp_port = int(os.getenv('SMTP_PORT', '25'))
-        smtp_use_tls = os.getenv('SMTP_USE_TLS', 'false').lower() == 'true'
-        smtp_username = os.getenv('SMTP_USERNAME')
-        smtp_password = os.getenv('SMTP_PASSWORD')
-        from_email = os.getenv('SMTP_FROM_EMAIL', 'admin@thywill.live')
-        
-        msg = MIMEMultipart()
-        msg['From'] = from_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-        
-        if smtp_use_tls:
-            server = smtplib.SMTP(smtp_host, smtp_port)
-            server.starttls(context=ssl.create_default_context())
-        else:
-            server = smtplib.SMTP(smtp_host, smtp_port)
+        """
+        Queue email for background delivery through the outbox, or send it right
+        away over a one-off SMTP connection when the outbox can't be used
+        """
+        from app_helpers.services.email_outbox_service import (
+            SMTPConnection, get_email_outbox_service, outbox_delivery_enabled
+        )
         
-        if smtp_username and smtp_password:
-            server.login(smtp_username, smtp_password)
+        if outbox_delivery_enabled():
+            get_email_outbox_service().enqueue(to_email, subject, body)
+            return
         
-        server.sendmail(from_email, to_email, msg.as_string())
-        server.quit()
+        connection = SMTPConnection()
+        try:
+            connection.send(to_email, subject, body)
+        finally:
+            connection.close()
     
     def get_user_email(self, user_id: str) -> str | None:
         """Get decrypted email for user if exists and verified"""
@@ -0,0 +1,273 @@
+"""
+Email Outbox Service - Durable, batched delivery of outgoing email
+
+Requests only insert a row into the email_outbox table (in the isolated email
+database). A background task drains the outbox in batches over one reusable,
+authenticated SMTP connection and retries transient failures with exponential
+backoff, so a slow SMTP relay never blocks a request worker.
+"""
+import os
+import ssl
+import uuid
+import smtplib
+import logging
+import threading
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import update
+from sqlmodel import Session, select, func, or_
+
+from models_email import EmailOutbox, email_engine
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true").lower() == "true"
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = 3600
+EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS = 600  # Rows stuck in 'sending' after a crash are reclaimed
+SMTP_IDLE_TIMEOUT_SECONDS = int(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", "60"))
+SMTP_TIMEOUT_SECONDS = 30
+
+
+class SMTPConnection:
+    """A lazily opened SMTP connection that is reused across messages until idle or broken"""
+
+    def __init__(self):
+        self.host = os.getenv('SMTP_HOST', 'localhost')
+        self.port = int(os.getenv('SMTP_PORT', '25'))
+        self.use_tls = os.getenv('SMTP_USE_TLS', 'false').lower() == 'true'
+        self.username = os.getenv('SMTP_USERNAME')
+        self.password = os.getenv('SMTP_PASSWORD')
+        self.from_email = os.getenv('SMTP_FROM_EMAIL', 'admin@thywill.live')
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT_SECONDS)
+        if self.use_tls:
+            server.starttls(context=ssl.create_default_context())
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Return the open connection, reconnecting if it went idle or the server dropped it"""
+        if self._server is not None:
+            idle = (datetime.utcnow() - self._last_used).total_seconds()
+            if idle > SMTP_IDLE_TIMEOUT_SECONDS:
+                self._close_server()
+            else:
+                try:
+                    if self._server.noop()[0] != 250:
+                        self._close_server()
+                except (smtplib.SMTPException, OSError):
+                    self._close_server()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.from_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+
+    def send(self, to_email: str, subject: str, body: str):
+        """Send one message, opening the connection if needed. Broken connections are dropped."""
+        msg = self.build_message(to_email, subject, body)
+        with self._lock:
+            server = self._get_server()
+            try:
+                server.sendmail(self.from_email, to_email, msg.as_string())
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._close_server()
+                raise
+            self._last_used = datetime.utcnow()
+
+    def _close_server(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    def close(self):
+        with self._lock:
+            self._close_server()
+
+
+def outbox_delivery_enabled() -> bool:
+    """
+    Whether email should go through the outbox.
+
+    Needs email auth on (otherwise the sender task in app.py never runs) and a
+    configured EMAIL_ENCRYPTION_KEY (otherwise rows written by one process could
+    not be decrypted after a restart or by another worker). Callers send
+    directly when this is False.
+    """
+    return (
+        EMAIL_OUTBOX_ENABLED
+        and os.getenv('EMAIL_AUTH_ENABLED', 'false').lower() == 'true'
+        and bool(os.getenv('EMAIL_ENCRYPTION_KEY', '').strip())
+    )
+
+
+def _get_outbox_fernet() -> Fernet:
+    key = os.getenv('EMAIL_ENCRYPTION_KEY', '').strip()
+    if not key:
+        raise RuntimeError("EMAIL_ENCRYPTION_KEY must be set to queue email in the outbox")
+    return Fernet(key.encode('utf-8'))
+
+
+class EmailOutboxService:
+    """Service for queueing outgoing email and draining the queue in batches"""
+
+    def __init__(self, fernet: Optional[Fernet] = None, connection: Optional[SMTPConnection] = None):
+        self.fernet = fernet or _get_outbox_fernet()
+        self.connection = connection or SMTPConnection()
+
+    def enqueue(self, to_email: str, subject: str, body: str) -> str:
+        """
+        Queue an email for background delivery.
+
+        Returns:
+            The outbox entry id
+        """
+        entry = EmailOutbox(
+            recipient_encrypted=self.fernet.encrypt(to_email.encode()).decode(),
+            subject=subject,
+            body_encrypted=self.fernet.encrypt(body.encode()).decode()
+        )
+        with Session(email_engine) as email_session:
+            email_session.add(entry)
+            email_session.commit()
+            return entry.id
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        seconds = EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+        return timedelta(seconds=min(seconds, EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+    def _claim_batch(self, email_session: Session, batch_size: int) -> list:
+        """Mark up to batch_size due entries as ours so concurrent workers never send them twice"""
+        now = datetime.utcnow()
+        is_due = or_(
+            (EmailOutbox.status == "pending") & (EmailOutbox.next_attempt_at <= now),
+            (EmailOutbox.status == "sending")
+            & (EmailOutbox.claimed_at < now - timedelta(seconds=EMAIL_OUTBOX_CLAIM_TIMEOUT_SECONDS))
+        )
+        due_ids = email_session.exec(
+            select(EmailOutbox.id)
+            .where(is_due)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+        ).all()
+        if not due_ids:
+            return []
+
+        # Re-check the due condition so rows another worker claimed in between are skipped
+        claim_token = uuid.uuid4().hex
+        email_session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due_ids))
+            .where(is_due)
+            .values(status="sending", claim_token=claim_token, claimed_at=now)
+        )
+        email_session.commit()
+        return email_session.exec(
+            select(EmailOutbox).where(EmailOutbox.claim_token == claim_token)
+        ).all()
+
+    def process_outbox(self, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Send one batch of due emails over the shared SMTP connection.
+
+        Returns:
+            Dict with sent, retried and failed counts for the batch
+        """
+        stats = {'sent': 0, 'retried': 0, 'failed': 0}
+        with Session(email_engine) as email_session:
+            entries = self._claim_batch(email_session, batch_size)
+
+            for entry in entries:
+                entry.attempts += 1
+                entry.claim_token = None
+                try:
+                    to_email = self.fernet.decrypt(entry.recipient_encrypted.encode()).decode()
+                    body = self.fernet.decrypt(entry.body_encrypted.encode()).decode()
+                except InvalidToken:
+                    entry.status = "failed"
+                    entry.last_error = "Entry was encrypted with a different key"
+                    stats['failed'] += 1
+                    continue
+
+                try:
+                    self.connection.send(to_email, entry.subject, body)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    # The server rejected this message - retrying will not help
+                    entry.status = "failed"
+                    entry.last_error = str(e)[:500]
+                    stats['failed'] += 1
+                except Exception as e:
+                    entry.last_error = str(e)[:500]
+                    if entry.attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+                        entry.status = "failed"
+                        stats['failed'] += 1
+                    else:
+                        entry.status = "pending"
+                        entry.next_attempt_at = datetime.utcnow() + self._retry_delay(entry.attempts)
+                        stats['retried'] += 1
+                else:
+                    entry.status = "sent"
+                    entry.sent_at = datetime.utcnow()
+                    entry.body_encrypted = ""  # Don't keep login links around once delivered
+                    entry.last_error = None
+                    stats['sent'] += 1
+
+            email_session.commit()
+
+        if stats['failed']:
+            logger.error("Email outbox: %s message(s) permanently failed", stats['failed'])
+        return stats
+
+    def drain(self, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+        """Process batches until no due entries remain (or a batch makes no progress)"""
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        while True:
+            stats = self.process_outbox(batch_size)
+            for key in totals:
+                totals[key] += stats[key]
+            processed = sum(stats.values())
+            if processed < batch_size or stats['sent'] == 0:
+                return totals
+
+    def get_outbox_stats(self) -> Dict[str, int]:
+        """Count outbox entries by status"""
+        with Session(email_engine) as email_session:
+            rows = email_session.exec(
+                select(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status)
+            ).all()
+        return {status: count for status, count in rows}
+
+
+_email_outbox_service: Optional[EmailOutboxService] = None
+_service_lock = threading.Lock()
+
+
+def get_email_outbox_service() -> EmailOutboxService:
+    """Get the process-wide outbox service (shared encryption key and SMTP connection)"""
+    global _email_outbox_service
+    with _service_lock:
+        if _email_outbox_service is None:
+            _email_outbox_service = EmailOutboxService()
+        return _email_outbox_service
@@ -4,13 +4,19 @@ Export Service for ThyWill
 
 Handles complete database export to unified text archive structure.
 Replaces inline scripts with clean, maintainable code.
+
+Large tables are streamed: rows are fetched in batches of STREAM_BATCH_SIZE
+(yield_per) and written straight to buffered files, so memory stays flat no
+matter how much history the database holds.
 """
 
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, Iterable, List
 
 # Add current directory to path for imports
 sys.path.append('.')
@@ -18,6 +24,11 @@ sys.path.append('.')
 from models import *
 from sqlmodel import Session as DBSession, select
 
+# Rows fetched per round trip when streaming a table
+STREAM_BATCH_SIZE = 1000
+# Output buffer for export files
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 class ExportService:
     """Service for exporting all database data to text archives."""
@@ -25,9 +36,17 @@ class ExportService:
     def __init__(self, archives_dir: str = "text_archives"):
         self.archives_dir = Path(archives_dir)
         self.exported_counts = {}
+        self.table_timings = {}
+        
+    def export_all(self, parallel: bool = False, workers: int = None) -> bool:
+        """
+        Export all database data to unified text archive structure.
         
-    def export_all(self) -> bool:
-        """Export all database data to unified text archive structure."""
+        Args:
+            parallel: Export categories concurrently, each thread with its own session.
+                Categories are then read from separate snapshots rather than one.
+            workers: Thread count for parallel exports (defaults to one per category, max 4)
+        """
         print("📤 Exporting Complete Database to Text Archives")
         print("=" * 50)
         
@@ -36,117 +55,125 @@ class ExportService:
         # Ensure archives directory exists
         self.archives_dir.mkdir(exist_ok=True)
         
+        # Export all data categories
+        export_functions = [
+            self._export_prayer_data,
+            self._export_user_data,
+            self._export_user_attributes,
+            self._export_session_data,
+            self._export_authentication_data,
+            self._export_invite_data,
+            self._export_role_data,
+            self._export_security_data,
+            self._export_system_data
+        ]
+        
         try:
-            from models import engine
-            with DBSession(engine) as session:
-                success = True
-                
-                # Export all data categories
-                export_functions = [
-                    self._export_prayer_data,
-                    self._export_user_data,
-                    self._export_user_attributes,
-                    self._export_session_data,
-                    self._export_authentication_data,
-                    self._export_invite_data,
-                    self._export_role_data,
-                    self._export_security_data,
-                    self._export_system_data
-                ]
+            from models import read_engine
+            started = time.monotonic()
+            
+            if parallel:
+                def run_in_own_session(export_func: Callable) -> bool:
+                    with DBSession(read_engine) as session:
+                        return self._run_export(export_func, session)
                 
-                for export_func in export_functions:
-                    try:
-                        if not export_func(session):
-                            success = False
-                    except Exception as e:
-                        print(f"❌ Error in {export_func.__name__}: {e}")
-                        success = False
+                with ThreadPoolExecutor(max_workers=workers or 4) as pool:
+                    results = list(pool.map(run_in_own_session, export_functions))
+            else:
+                with DBSession(read_engine) as session:
+                    results = [self._run_export(export_func, session) for export_func in export_functions]
+            
+            success = all(results)
+            elapsed = time.monotonic() - started
+            
+            if success:
+                self._create_export_summary()
+                print(f"\n✅ Complete database export completed successfully! ({elapsed:.2f}s)")
+                self._print_export_summary()
+                return True
+            else:
+                print("\n❌ Database export completed with errors")
+                return False
                 
-                if success:
-                    self._create_export_summary()
-                    print("\n✅ Complete database export completed successfully!")
-                    self._print_export_summary()
-                    return True
-                else:
-                    print("\n❌ Database export completed with errors")
-                    return False
-                    
         except Exception as e:
             print(f"❌ Database connection error: {e}")
             return False
     
+    def _run_export(self, export_func: Callable, session: DBSession) -> bool:
+        """Run one export category, reporting rather than raising errors"""
+        try:
+            return export_func(session)
+        except Exception as e:
+            print(f"❌ Error in {export_func.__name__}: {e}")
+            return False
+    
+    @staticmethod
+    def _stream(session: DBSession, statement) -> Iterable:
+        """Iterate a query in batches instead of materializing every row"""
+        return session.exec(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+    
     def _export_prayer_data(self, session: DBSession) -> bool:
         """Export all prayer-related data to text_archives/prayers/"""
         print("  📄 Exporting prayer data...")
         
-        prayers = session.exec(select(Prayer)).all()
-        prayer_attributes = session.exec(select(PrayerAttribute)).all()
-        prayer_marks = session.exec(select(PrayerMark)).all()
-        prayer_skips = session.exec(select(PrayerSkip)).all()
-        prayer_activity_logs = session.exec(select(PrayerActivityLog)).all()
-        
-        if not any([prayers, prayer_attributes, prayer_marks, prayer_skips, prayer_activity_logs]):
-            print("    ⚠️  No prayer data found")
-            return True
-        
         prayer_dir = self.archives_dir / "prayers"
         prayer_dir.mkdir(exist_ok=True)
         
         total_exported = 0
         
         # Export additional prayer data (beyond what's already archived)
-        if prayer_attributes:
-            self._write_data_file(
-                prayer_dir / "prayer_attributes.txt",
-                "Prayer Attributes",
-                "id|created_at|prayer_id|attribute_name|attribute_value|created_by",
-                [(attr.id,
-                  attr.created_at.strftime("%B %d %Y at %H:%M"),
-                  attr.prayer_id,
-                  attr.attribute_name,
-                  (attr.attribute_value or "").replace('|', '\\|'),
-                  attr.created_by) for attr in prayer_attributes]
-            )
-            total_exported += len(prayer_attributes)
+        total_exported += self._write_data_file(
+            prayer_dir / "prayer_attributes.txt",
+            "Prayer Attributes",
+            "id|created_at|prayer_id|attribute_name|attribute_value|created_by",
+            ((attr.id,
+              attr.created_at.strftime("%B %d %Y at %H:%M"),
+              attr.prayer_id,
+              attr.attribute_name,
+              (attr.attribute_value or "").replace('|', '\\|'),
+              attr.created_by) for attr in self._stream(session, select(PrayerAttribute))),
+            skip_empty=True
+        )
         
-        if prayer_marks:
-            self._write_data_file(
-                prayer_dir / "prayer_marks.txt", 
-                "Prayer Marks",
-                "id|created_at|prayer_id|username",
-                [(mark.id,
-                  mark.created_at.strftime("%B %d %Y at %H:%M"),
-                  mark.prayer_id,
-                  mark.username) for mark in prayer_marks]
-            )
-            total_exported += len(prayer_marks)
+        total_exported += self._write_data_file(
+            prayer_dir / "prayer_marks.txt", 
+            "Prayer Marks",
+            "id|created_at|prayer_id|username",
+            ((mark.id,
+              mark.created_at.strftime("%B %d %Y at %H:%M"),
+              mark.prayer_id,
+              mark.username) for mark in self._stream(session, select(PrayerMark))),
+            skip_empty=True
+        )
         
-        if prayer_skips:
-            self._write_data_file(
-                prayer_dir / "prayer_skips.txt",
-                "Prayer Skips", 
-                "id|created_at|prayer_id|user_id",
-                [(skip.id,
-                  skip.created_at.strftime("%B %d %Y at %H:%M"),
-                  skip.prayer_id,
-                  skip.user_id) for skip in prayer_skips]
-            )
-            total_exported += len(prayer_skips)
+        total_exported += self._write_data_file(
+            prayer_dir / "prayer_skips.txt",
+            "Prayer Skips", 
+            "id|created_at|prayer_id|user_id",
+            ((skip.id,
+              skip.created_at.strftime("%B %d %Y at %H:%M"),
+              skip.prayer_id,
+              skip.user_id) for skip in self._stream(session, select(PrayerSkip))),
+            skip_empty=True
+        )
         
-        if prayer_activity_logs:
-            self._write_data_file(
-                prayer_dir / "prayer_activity_logs.txt",
-                "Prayer Activity Logs",
-                "id|created_at|prayer_id|user_id|action|old_value|new_value", 
-                [(log.id,
-                  log.created_at.strftime("%B %d %Y at %H:%M"),
-                  log.prayer_id,
-                  log.user_id,
-                  log.action,
-                  (log.old_value or "").replace('|', '\\|'),
-                  (log.new_value or "").replace('|', '\\|')) for log in prayer_activity_logs]
-            )
-            total_exported += len(prayer_activity_logs)
+        total_exported += self._write_data_file(
+            prayer_dir / "prayer_activity_logs.txt",
+            "Prayer Activity Logs",
+            "id|created_at|prayer_id|user_id|action|old_value|new_value", 
+            ((log.id,
+              log.created_at.strftime("%B %d %Y at %H:%M"),
+              log.prayer_id,
+              log.user_id,
+              log.action,
+              (log.old_value or "").replace('|', '\\|'),
+              (log.new_value or "").replace('|', '\\|')) for log in self._stream(session, select(PrayerActivityLog))),
+            skip_empty=True
+        )
+        
+        if not total_exported and session.exec(select(Prayer.id).limit(1)).first() is None:
+            print("    ⚠️  No prayer data found")
+            return True
         
         self.exported_counts['prayer_data'] = total_exported
         print(f"    ✅ Exported {total_exported} prayer-related records")
@@ -156,31 +183,31 @@ class ExportService:
         """Export all user-related data to text_archives/users/"""
         print("  📄 Exporting user data...")
         
-        notification_states = session.exec(select(NotificationState)).all()
-        
-        if not notification_states:
-            print("    ⚠️  No additional user data found")
-            return True
-        
         users_dir = self.archives_dir / "users"
         users_dir.mkdir(exist_ok=True)
         
         # Export notification states (users themselves are already archived)
-        self._write_data_file(
+        exported = self._write_data_file(
             users_dir / "notification_states.txt",
             "User Notification States",
             "id|created_at|user_id|auth_request_id|notification_type|is_read|read_at",
-            [(state.id,
+            ((state.id,
               state.created_at.strftime("%B %d %Y at %H:%M"),
               state.user_id,
               state.auth_request_id,
               state.notification_type,
               "yes" if state.is_read else "no",
-              state.read_at.strftime("%B %d %Y at %H:%M") if state.read_at else "never") for state in notification_states]
+              state.read_at.strftime("%B %d %Y at %H:%M") if state.read_at else "never")
+             for state in self._stream(session, select(NotificationState))),
+            skip_empty=True
         )
         
-        self.exported_counts['user_data'] = len(notification_states)
-        print(f"    ✅ Exported {len(notification_states)} notification states")
+        if not exported:
+            print("    ⚠️  No additional user data found")
+            return True
+        
+        self.exported_counts['user_data'] = exported
+        print(f"    ✅ Exported {exported} notification states")
         return True
     
     def _export_user_attributes(self, session: DBSession) -> bool:
@@ -232,104 +259,84 @@ class ExportService:
         """Export session data to text_archives/sessions/"""
         print("  📄 Exporting session data...")
         
-        sessions = session.exec(select(Session)).all()
-        
-        if not sessions:
-            print("    ⚠️  No session data found")
-            return True
-        
         sessions_dir = self.archives_dir / "sessions"
         sessions_dir.mkdir(exist_ok=True)
         
-        # Group sessions by month
-        sessions_by_month = {}
-        for sess in sessions:
-            month_key = sess.created_at.strftime("%Y_%m")
-            if month_key not in sessions_by_month:
-                sessions_by_month[month_key] = []
-            sessions_by_month[month_key].append(sess)
+        # One file per month, streamed in created_at order
+        total_exported, months = self._write_monthly_files(
+            sessions_dir,
+            "sessions",
+            "Sessions for {month}",
+            "created_at|session_id|username|expires_at|device_info|ip_address|is_fully_authenticated",
+            self._stream(session, select(Session).order_by(Session.created_at)),
+            lambda sess: (sess.created_at.strftime("%B %d %Y at %H:%M"),
+                          sess.id,
+                          sess.username,
+                          sess.expires_at.strftime("%B %d %Y at %H:%M"),
+                          sess.device_info or "unknown",
+                          sess.ip_address or "unknown",
+                          "yes" if sess.is_fully_authenticated else "no")
+        )
         
-        total_exported = 0
-        for month_key, month_sessions in sessions_by_month.items():
-            month_date = datetime.strptime(month_key, "%Y_%m")
-            file_path = sessions_dir / f"{month_key}_sessions.txt"
-            
-            self._write_data_file(
-                file_path,
-                f"Sessions for {month_date.strftime('%B %Y')}",
-                "created_at|session_id|username|expires_at|device_info|ip_address|is_fully_authenticated",
-                [(sess.created_at.strftime("%B %d %Y at %H:%M"),
-                  sess.id,
-                  sess.username,
-                  sess.expires_at.strftime("%B %d %Y at %H:%M"),
-                  sess.device_info or "unknown",
-                  sess.ip_address or "unknown",
-                  "yes" if sess.is_fully_authenticated else "no") for sess in month_sessions]
-            )
-            total_exported += len(month_sessions)
+        if not total_exported:
+            print("    ⚠️  No session data found")
+            return True
         
         self.exported_counts['sessions'] = total_exported
-        print(f"    ✅ Exported {total_exported} sessions across {len(sessions_by_month)} monthly files")
+        print(f"    ✅ Exported {total_exported} sessions across {months} monthly files")
         return True
     
     def _export_authentication_data(self, session: DBSession) -> bool:
         """Export authentication data to text_archives/authentication/"""
         print("  📄 Exporting authentication data...")
         
-        auth_requests = session.exec(select(AuthenticationRequest)).all()
-        auth_approvals = session.exec(select(AuthApproval)).all()
-        auth_audit_logs = session.exec(select(AuthAuditLog)).all()
-        
-        if not any([auth_requests, auth_approvals, auth_audit_logs]):
-            print("    ⚠️  No authentication data found")
-            return True
-        
         auth_dir = self.archives_dir / "authentication"
         auth_dir.mkdir(exist_ok=True)
         
         total_exported = 0
         
-        if auth_requests:
-            self._write_data_file(
-                auth_dir / "auth_requests.txt",
-                "Authentication Requests",
-                "id|created_at|user_id|device_info|ip_address|status|expires_at",
-                [(req.id,
-                  req.created_at.strftime("%B %d %Y at %H:%M"),
-                  req.user_id,
-                  req.device_info or "unknown",
-                  req.ip_address or "unknown",
-                  req.status,
-                  req.expires_at.strftime("%B %d %Y at %H:%M")) for req in auth_requests]
-            )
-            total_exported += len(auth_requests)
+        total_exported += self._write_data_file(
+            auth_dir / "auth_requests.txt",
+            "Authentication Requests",
+            "id|created_at|user_id|device_info|ip_address|status|expires_at",
+            ((req.id,
+              req.created_at.strftime("%B %d %Y at %H:%M"),
+              req.user_id,
+              req.device_info or "unknown",
+              req.ip_address or "unknown",
+              req.status,
+              req.expires_at.strftime("%B %d %Y at %H:%M")) for req in self._stream(session, select(AuthenticationRequest))),
+            skip_empty=True
+        )
         
-        if auth_approvals:
-            self._write_data_file(
-                auth_dir / "auth_approvals.txt",
-                "Authentication Approvals",
-                "created_at|auth_request_id|approver_user_id",
-                [(approval.created_at.strftime("%B %d %Y at %H:%M"),
-                  approval.auth_request_id,
-                  approval.approver_user_id) for approval in auth_approvals]
-            )
-            total_exported += len(auth_approvals)
+        total_exported += self._write_data_file(
+            auth_dir / "auth_approvals.txt",
+            "Authentication Approvals",
+            "created_at|auth_request_id|approver_user_id",
+            ((approval.created_at.strftime("%B %d %Y at %H:%M"),
+              approval.auth_request_id,
+              approval.approver_user_id) for approval in self._stream(session, select(AuthApproval))),
+            skip_empty=True
+        )
         
-        if auth_audit_logs:
-            self._write_data_file(
-                auth_dir / "auth_audit_logs.txt",
-                "Authentication Audit Logs",
-                "created_at|auth_request_id|action|actor_user_id|actor_type|details|ip_address|user_agent",
-                [(log.created_at.strftime("%B %d %Y at %H:%M"),
-                  log.auth_request_id,
-                  log.action,
-                  log.actor_user_id or "unknown",
-                  log.actor_type or "unknown",
-                  (log.details or "").replace('|', '\\|'),
-                  log.ip_address or "unknown",
-                  (log.user_agent or "unknown").replace('|', '\\|')) for log in auth_audit_logs]
-            )
-            total_exported += len(auth_audit_logs)
+        total_exported += self._write_data_file(
+            auth_dir / "auth_audit_logs.txt",
+            "Authentication Audit Logs",
+            "created_at|auth_request_id|action|actor_user_id|actor_type|details|ip_address|user_agent",
+            ((log.created_at.strftime("%B %d %Y at %H:%M"),
+              log.auth_request_id,
+              log.action,
+              log.actor_user_id or "unknown",
+              log.actor_type or "unknown",
+              (log.details or "").replace('|', '\\|'),
+              log.ip_address or "unknown",
+              (log.user_agent or "unknown").replace('|', '\\|')) for log in self._stream(session, select(AuthAuditLog))),
+            skip_empty=True
+        )
+        
+        if not total_exported:
+            print("    ⚠️  No authentication data found")
+            return True
         
         self.exported_counts['authentication'] = total_exported
         print(f"    ✅ Exported {total_exported} authentication records")
@@ -433,42 +440,29 @@ class ExportService:
         """Export security data to text_archives/security/ (existing location)"""
         print("  📄 Exporting security data...")
         
-        security_logs = session.exec(select(SecurityLog)).all()
-        
-        if not security_logs:
-            print("    ⚠️  No security data found")
-            return True
-        
         security_dir = self.archives_dir / "security"
         security_dir.mkdir(exist_ok=True)
         
         # Group logs by month (following existing pattern)
-        logs_by_month = {}
-        for log in security_logs:
-            month_key = log.created_at.strftime("%Y_%m")
-            if month_key not in logs_by_month:
-                logs_by_month[month_key] = []
-            logs_by_month[month_key].append(log)
+        total_exported, months = self._write_monthly_files(
+            security_dir,
+            "security_events",
+            "Security Events for {month}",
+            "timestamp|event_type|user_id|ip_address|details",
+            self._stream(session, select(SecurityLog).order_by(SecurityLog.created_at)),
+            lambda log: (log.created_at.strftime("%B %d %Y at %H:%M"),
+                         log.event_type,
+                         log.user_id or "anonymous",
+                         log.ip_address or "unknown",
+                         log.details or "")
+        )
         
-        total_exported = 0
-        for month_key, month_logs in logs_by_month.items():
-            month_date = datetime.strptime(month_key, "%Y_%m")
-            file_path = security_dir / f"{month_key}_security_events.txt"
-            
-            self._write_data_file(
-                file_path,
-                f"Security Events for {month_date.strftime('%B %Y')}",
-                "timestamp|event_type|user_id|ip_address|details",
-                [(log.created_at.strftime("%B %d %Y at %H:%M"),
-                  log.event_type,
-                  log.user_id or "anonymous",
-                  log.ip_address or "unknown",
-                  log.details or "") for log in month_logs]
-            )
-            total_exported += len(month_logs)
+        if not total_exported:
+            print("    ⚠️  No security data found")
+            return True
         
         self.exported_counts['security'] = total_exported
-        print(f"    ✅ Exported {total_exported} security events across {len(logs_by_month)} monthly files")
+        print(f"    ✅ Exported {total_exported} security events across {months} monthly files")
         return True
     
     def _export_system_data(self, session: DBSession) -> bool:
@@ -500,18 +494,82 @@ class ExportService:
         print(f"    ✅ Exported {len(changelog_entries)} system records")
         return True
     
-    def _write_data_file(self, file_path: Path, title: str, format_line: str, data: List[tuple]):
-        """Write data to a text archive file with proper formatting."""
+    def _write_data_file(self, file_path: Path, title: str, format_line: str, data: Iterable[tuple],
+                         skip_empty: bool = False) -> int:
+        """
+        Write data to a text archive file with proper formatting.
+        
+        Rows are written as they are produced, so data may be a generator over a
+        streamed query. With skip_empty the file is only created once a row arrives.
+        
+        Returns:
+            Number of rows written
+        """
+        started = time.monotonic()
         header = f"{title} (exported {datetime.utcnow().strftime('%B %d %Y at %H:%M')})\n"
         header += f"Format: {format_line}\n\n"
         
-        lines = [header]
-        for row in data:
-            line = "|".join(str(field) for field in row)
-            lines.append(line)
+        count = 0
+        f = None
+        try:
+            if not skip_empty:
+                f = open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+                f.write(header)
+            for row in data:
+                if f is None:
+                    f = open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+                    f.write(header)
+                f.write('\n')
+                f.write("|".join(str(field) for field in row))
+                count += 1
+        finally:
+            if f is not None:
+                f.close()
+        
+        if f is not None:
+            elapsed = time.monotonic() - started
+            self.table_timings[str(file_path.relative_to(self.archives_dir))] = (count, elapsed)
+            print(f"      • {file_path.name}: {count} rows in {elapsed:.2f}s")
+        return count
+    
+    def _write_monthly_files(self, directory: Path, suffix: str, title: str, format_line: str,
+                             records: Iterable, to_row: Callable) -> tuple:
+        """
+        Stream date-ordered records into YYYY_MM_<suffix>.txt files, one per month.
+        
+        Returns:
+            (rows written, number of monthly files)
+        """
+        total = 0
+        months = 0
+        current_month = None
+        month_rows = []
+        
+        def flush():
+            month_date = datetime.strptime(current_month, "%Y_%m")
+            return self._write_data_file(
+                directory / f"{current_month}_{suffix}.txt",
+                title.format(month=month_date.strftime('%B %Y')),
+                format_line,
+                month_rows
+            )
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        # Only one month of rows is held at a time
+        for record in records:
+            month_key = record.created_at.strftime("%Y_%m")
+            if month_key != current_month:
+                if month_rows:
+                    total += flush()
+                    months += 1
+                current_month = month_key
+                month_rows = []
+            month_rows.append(to_row(record))
+        
+        if month_rows:
+            total += flush()
+            months += 1
+        
+        return total, months
     
     def _create_export_summary(self):
         """Create export summary file."""
@@ -539,15 +597,20 @@ class ExportService:
             print(f"  • {category}: {count} records")
             total_records += count
         print(f"\nTotal: {total_records} records exported")
+        
+        if self.table_timings:
+            print("\nPer-table timing:")
+            for table, (count, elapsed) in sorted(self.table_timings.items(), key=lambda item: -item[1][1]):
+                print(f"  • {table}: {count} rows in {elapsed:.2f}s")
 
 
 # Convenience function for CLI usage
-def export_all_database_data() -> bool:
+def export_all_database_data(parallel: bool = False) -> bool:
     """Export all database data to text archives."""
     service = ExportService()
-    return service.export_all()
+    return service.export_all(parallel=parallel)
 
 
 if __name__ == "__main__":
-    success = export_all_database_data()
+    success = export_all_database_data(parallel="--parallel" in sys.argv)
     sys.exit(0 if success else 1)
\ No newline at end of file
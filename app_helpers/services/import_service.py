@@ -72,6 +72,13 @@ class ImportService:
                             session = DBSession(engine)
                 
                 if success:
+                    if not dry_run:
+                        from app_helpers.services.activity_timeline_service import rebuild_activity_timeline
+                        events = rebuild_activity_timeline(session)
+                        print(f"✅ Rebuilt activity timeline ({events} events)")
+                        from app_helpers.services.statistics_service import StatisticsService
+                        days = StatisticsService(session).rebuild_daily_rollups()
+                        print(f"✅ Rebuilt daily statistics ({days} days)")
                     print("\n✅ Complete database import completed successfully!")
                     self._print_import_summary(dry_run)
                     return True
@@ -4,7 +4,11 @@ This module contains invite tree management and statistics functions.
 """
 
 import os
+import threading
 from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session, select, func
 from models import User, InviteToken, engine
 
@@ -12,137 +16,176 @@ from models import User, InviteToken, engine
 from .token_service import TOKEN_EXP_H
 
 
-def get_invite_tree() -> dict:
-    """Build the complete invite tree starting from the root user (earliest created or admin), with orphaned users attached"""
-    with Session(engine) as s:
-        # Look for admin user first
-        admin_user = s.get(User, "admin")
-        
-        if not admin_user:
-            # If no admin user, use the earliest created user as root
-            earliest_user_stmt = select(User).order_by(User.created_at.asc()).limit(1)
-            earliest_user = s.exec(earliest_user_stmt).first()
-            if not earliest_user:
-                return {"tree": None, "stats": {"total_users": 0, "total_invites_sent": 0, "max_depth": 0}}
-            admin_user = earliest_user
-        
-        # Build the tree with admin/root user, treating orphaned users as children
-        tree = _build_user_tree_node_with_orphans(admin_user, s, depth=0)
-        
-        # Calculate statistics
-        stats = get_invite_stats()
-        
-        return {"tree": tree, "stats": stats}
+# Built invite tree, reused until an invite is claimed or the user/token tables change.
+# Keyed by (_invite_tree_version, _invite_tree_fingerprint()) so writes made outside the
+# claim flow (imports, admin repairs, other workers) are still picked up as long as they
+# go through the ORM.
+_invite_tree_cache = {"key": None, "value": None}
+_invite_tree_lock = threading.Lock()
+_invite_tree_version = 0
 
 
-def _get_all_descendants(user_id: str, db: Session) -> list[User]:
-    """Get all descendants of a user (for counting purposes)"""
-    descendants = []
-    _collect_descendants(user_id, db, descendants)
-    return descendants
+def invalidate_invite_tree_cache() -> None:
+    """Drop the cached invite tree (call after a user claims an invite)"""
+    global _invite_tree_version
+    with _invite_tree_lock:
+        _invite_tree_version += 1
+        _invite_tree_cache["key"] = None
+        _invite_tree_cache["value"] = None
 
 
-def _build_user_tree_node_with_orphans(user: User, db: Session, depth: int = 0) -> dict:
-    """Build a tree node for a user, with special handling for root user to include orphaned users"""
-    # Get all users directly invited by this user
-    descendants_stmt = (
-        select(User)
-        .where(User.invited_by_username == user.display_name)
-        .order_by(User.created_at.asc())
-    )
-    direct_descendants = db.exec(descendants_stmt).all()
-    
-    # If this is the root user (depth 0), also include orphaned users (users with no invited_by_username except root itself)
-    if depth == 0:
-        orphaned_users_stmt = (
-            select(User)
-            .where(User.invited_by_username.is_(None))
-            .where(User.display_name != user.display_name)  # Don't include root user itself
-            .order_by(User.created_at.asc())
-        )
-        orphaned_users = db.exec(orphaned_users_stmt).all()
-        direct_descendants.extend(orphaned_users)
-    
-    # Count total invites sent by this user
-    invites_sent = db.exec(
-        select(func.count(InviteToken.token))
-        .where(InviteToken.created_by_user == user.display_name)
-    ).first() or 0
-    
-    # Count successful invites (users that were actually invited vs orphaned)
-    actual_invites = len([d for d in direct_descendants if d.invited_by_username == user.display_name])
+def _invite_tree_fingerprint(db: Session) -> Optional[tuple]:
+    """
+    One indexed lookup that changes whenever the tree or its stats may have changed.
+
+    The 'invite_tree' content version is bumped at flush (models._bump_invite_tree_version)
+    by any session that adds/removes users or invites, re-parents a user or uses an invite.
+    The bump time guards against a restored database reusing an old version number, and
+    the date is included because the stats count users who joined in the last 30 days.
+
+    Returns:
+        Cache key part, or None when the version table is unavailable (no caching)
+    """
+    try:
+        row = db.execute(
+            text("SELECT version, updated_at FROM content_version WHERE scope = 'invite_tree'")
+        ).first()
+    except OperationalError:
+        return None
+    return (tuple(row) if row else None, datetime.utcnow().date())
+
+
+def get_invite_tree() -> dict:
+    """Build the complete invite tree starting from the root user (earliest created or admin), with orphaned users attached
     
-    # Build children nodes recursively
-    children = []
-    for descendant in direct_descendants:
-        child_node = _build_user_tree_node(descendant, db, depth + 1)
-        children.append(child_node)
+    The result is cached and shared between requests; treat it as read-only.
+    """
+    with Session(engine) as s:
+        fingerprint = _invite_tree_fingerprint(s)
+        key = (_invite_tree_version, fingerprint) if fingerprint is not None else None
+        with _invite_tree_lock:
+            if key is not None and _invite_tree_cache["key"] == key:
+                return _invite_tree_cache["value"]
+        
+        graph = _load_invite_graph(s)
+        root_id = _find_root_user_id(graph)
+        if root_id is None:
+            result = {"tree": None, "stats": get_invite_stats(max_depth=0)}
+        else:
+            # Build the tree with admin/root user, treating orphaned users as children
+            tree, max_depth = _build_tree_from_graph(graph, root_id, include_orphans=True)
+            
+            # Calculate statistics, reusing the depth from the traversal above
+            stats = get_invite_stats(max_depth=max_depth)
+            result = {"tree": tree, "stats": stats}
+        
+        with _invite_tree_lock:
+            _invite_tree_cache["key"] = key
+            _invite_tree_cache["value"] = result
+        return result
+
+
+def _load_invite_graph(db: Session) -> dict:
+    """Load every user and per-user invite counts in two queries and index them as an adjacency map"""
+    users = db.exec(
+        select(User.display_name, User.created_at, User.invited_by_username, User.invite_token_used)
+        .order_by(User.created_at.asc())
+    ).all()
+    invites_sent = dict(db.exec(
+        select(InviteToken.created_by_user, func.count(InviteToken.token))
+        .group_by(InviteToken.created_by_user)
+    ).all())
     
-    # Count total descendants (recursive)
-    total_descendants = len(direct_descendants)
-    for child in children:
-        total_descendants += child.get('total_descendants', 0)
+    # Users are loaded oldest first, so every child list is already in created_at order
+    by_id = {}
+    children = {}
+    for display_name, created_at, invited_by_username, invite_token_used in users:
+        by_id[display_name] = {
+            "id": display_name,
+            "display_name": display_name,
+            "created_at": created_at.isoformat(),
+            "invited_by_username": invited_by_username,
+            "invite_token_used": invite_token_used
+        }
+        children.setdefault(invited_by_username, []).append(display_name)
     
-    return {
-        "user": {
-            "id": user.display_name,
-            "display_name": user.display_name,
-            "created_at": user.created_at.isoformat(),
-            "invited_by_username": user.invited_by_username,
-            "invite_token_used": user.invite_token_used
-        },
-        "invites_sent": invites_sent,
-        "successful_invites": actual_invites,
-        "total_descendants": total_descendants,
-        "depth": depth,
-        "children": children
-    }
+    return {"users": by_id, "children": children, "invites_sent": invites_sent}
 
 
-def _build_user_tree_node(user: User, db: Session, depth: int = 0) -> dict:
-    """Recursively build a tree node for a user and their descendants"""
-    # Get all users directly invited by this user
-    descendants_stmt = (
-        select(User)
-        .where(User.invited_by_username == user.display_name)
-        .order_by(User.created_at.asc())
-    )
-    direct_descendants = db.exec(descendants_stmt).all()
+def _find_root_user_id(graph: dict) -> str | None:
+    """The admin user, or the earliest created user if there is no admin"""
+    if "admin" in graph["users"]:
+        return "admin"
+    return next(iter(graph["users"]), None)
+
+
+def _build_tree_from_graph(graph: dict, root_id: str, include_orphans: bool = False, depth: int = 0) -> tuple[dict, int]:
+    """Build nested tree nodes for root_id in a single iterative traversal.
     
-    # Count total invites sent by this user
-    invites_sent = db.exec(
-        select(func.count(InviteToken.token))
-        .where(InviteToken.created_by_user == user.display_name)
-    ).first() or 0
+    Depth, successful invites and descendant counts are filled in as nodes are finished,
+    and a visited set guards against invite cycles in inconsistent data.
+    Returns (tree, max_depth).
+    """
+    users, children_of, invites_sent = graph["users"], graph["children"], graph["invites_sent"]
     
-    # Count successful invites (used tokens that created users)
-    successful_invites = len(direct_descendants)
+    def make_node(user_id: str, node_depth: int) -> dict:
+        direct = children_of.get(user_id, [])
+        return {
+            "user": dict(users[user_id]),
+            "invites_sent": invites_sent.get(user_id, 0),
+            "successful_invites": len(direct),
+            "total_descendants": 0,
+            "depth": node_depth,
+            "children": []
+        }
     
-    # Build children nodes recursively
-    children = []
-    for descendant in direct_descendants:
-        child_node = _build_user_tree_node(descendant, db, depth + 1)
-        children.append(child_node)
+    root = make_node(root_id, depth)
+    visited = {root_id}
+    max_depth = depth
+    # Stack entries: (node, parent node, pending child ids) - children are expanded lazily
+    root_children = list(children_of.get(root_id, []))
+    if include_orphans:
+        # Orphaned users (no invited_by_username) hang directly under the root
+        root_children += [uid for uid in children_of.get(None, []) if uid != root_id]
+    stack = [(root, None, iter(root_children))]
     
-    # Count total descendants (recursive)
-    total_descendants = len(direct_descendants)
-    for child in children:
-        total_descendants += child.get('total_descendants', 0)
+    while stack:
+        node, parent, pending = stack[-1]
+        child_id = next(pending, None)
+        if child_id is None:
+            stack.pop()
+            if parent is not None:
+                parent["children"].append(node)
+                parent["total_descendants"] += 1 + node["total_descendants"]
+            continue
+        if child_id in visited:
+            continue
+        visited.add(child_id)
+        child = make_node(child_id, node["depth"] + 1)
+        max_depth = max(max_depth, child["depth"])
+        stack.append((child, node, iter(children_of.get(child_id, []))))
     
-    return {
-        "user": {
-            "id": user.display_name,
-            "display_name": user.display_name,
-            "created_at": user.created_at.isoformat(),
-            "invited_by_username": user.invited_by_username,
-            "invite_token_used": user.invite_token_used
-        },
-        "invites_sent": invites_sent,
-        "successful_invites": successful_invites,
-        "total_descendants": total_descendants,
-        "depth": depth,
-        "children": children
-    }
+    return root, max_depth - depth
+
+
+def _build_user_tree_node_with_orphans(user: User, db: Session, depth: int = 0) -> dict:
+    """Build a tree node for a user, with special handling for root user to include orphaned users"""
+    tree, _ = _build_tree_from_graph(_load_invite_graph(db), user.display_name,
+                                     include_orphans=(depth == 0), depth=depth)
+    return tree
+
+
+def _build_user_tree_node(user: User, db: Session, depth: int = 0) -> dict:
+    """Build a tree node for a user and their descendants"""
+    tree, _ = _build_tree_from_graph(_load_invite_graph(db), user.display_name, depth=depth)
+    return tree
+
+
+def _get_all_descendants(user_id: str, db: Session) -> list[User]:
+    """Get all descendants of a user (for counting purposes)"""
+    descendants = []
+    _collect_descendants(user_id, db, descendants)
+    return descendants
 
 
 def get_user_descendants(user_id: str) -> list[dict]:
@@ -253,8 +296,11 @@ def get_user_invite_path(user_id: str) -> list[dict]:
         return list(reversed(path))
 
 
-def get_invite_stats() -> dict:
-    """Calculate invite tree statistics"""
+def get_invite_stats(max_depth: int | None = None) -> dict:
+    """Calculate invite tree statistics
+    
+    Pass max_depth when the caller has already traversed the tree to skip a second walk.
+    """
     with Session(engine) as s:
         # Total users
         total_users = s.exec(select(func.count(User.display_name))).first() or 0
@@ -275,7 +321,8 @@ def get_invite_stats() -> dict:
         ).first() or 0
         
         # Calculate max depth by finding the longest invite chain
-        max_depth = _calculate_max_depth(s)
+        if max_depth is None:
+            max_depth = _calculate_max_depth(s)
         
         # Top inviters (users who have successfully invited the most people)
         # Get all users who have invited someone
@@ -318,50 +365,14 @@ def get_invite_stats() -> dict:
 
 def _calculate_max_depth(db: Session) -> int:
     """Calculate the maximum depth of the invite tree"""
-    # Find the root user (admin or earliest created)
-    admin_user = db.get(User, "admin")
-    if not admin_user:
-        earliest_user_stmt = select(User).order_by(User.created_at.asc()).limit(1)
-        admin_user = db.exec(earliest_user_stmt).first()
-    
-    if not admin_user:
+    graph = _load_invite_graph(db)
+    root_id = _find_root_user_id(graph)
+    if root_id is None:
         return 0
     
-    def get_depth(user_id: str, visited: set = None, current_depth: int = 0) -> int:
-        if visited is None:
-            visited = set()
-        
-        if user_id in visited:
-            return current_depth
-        
-        visited.add(user_id)
-        
-        # Get all users invited by this user
-        descendants = db.exec(
-            select(User.display_name).where(User.invited_by_username == user_id)
-        ).all()
-        
-        if not descendants:
-            return current_depth
-        
-        max_child_depth = current_depth
-        for descendant_id in descendants:
-            child_depth = get_depth(descendant_id, visited.copy(), current_depth + 1)
-            max_child_depth = max(max_child_depth, child_depth)
-        
-        return max_child_depth
-    
-    # Since orphaned users are treated as depth 1 under root, the minimum depth is 1 if there are orphaned users
-    depth = get_depth(admin_user.display_name)
-    
-    # Check if there are orphaned users (if so, min depth is 1)
-    orphaned_count = db.exec(
-        select(func.count(User.display_name))
-        .where(User.invited_by_username.is_(None))
-        .where(User.display_name != admin_user.display_name)
-    ).first() or 0
-    
-    return max(depth, 1 if orphaned_count > 0 else 0)
+    # Orphaned users sit at depth 1 under the root, so they are part of the traversal
+    _, max_depth = _build_tree_from_graph(graph, root_id, include_orphans=True)
+    return max_depth
 
 
 # Intent-Based Authentication Functions
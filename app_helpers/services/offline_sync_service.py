@@ -0,0 +1,117 @@
+# app_helpers/services/offline_sync_service.py
+"""
+Delta sync for the offline prayer store kept by static/js/offline-data.js.
+
+Every commit that touches a prayer, its attributes or its marks stamps the
+prayer with the next value of a global sequence (prayer_sync_version, see
+models._stamp_prayer_sync_versions). A client keeps the last version it has
+seen as its cursor and asks for prayers stamped after it, so a refresh costs
+one index range scan plus a few grouped lookups for the changed prayers only.
+Prayers that left the feed (flagged, archived or deleted) come back as
+tombstones so the client can drop them.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy import case
+from sqlmodel import Session, select, func
+
+from models import Prayer, PrayerAttribute, PrayerMark, PrayerSyncVersion
+
+
+SYNC_PAGE_SIZE = 200
+MAX_SYNC_PAGE_SIZE = 1000
+SYNC_ATTRIBUTES = ('archived', 'answered', 'answer_date')
+
+
+def decode_sync_cursor(cursor: Optional[str]) -> int:
+    """Parse a client cursor; anything unreadable means 'from the beginning'"""
+    try:
+        return max(int(cursor), 0) if cursor else 0
+    except ValueError:
+        return 0
+
+
+def get_prayer_delta(
+    session: Session,
+    username: str,
+    since: int = 0,
+    limit: int = SYNC_PAGE_SIZE
+) -> Dict:
+    """
+    Get prayers changed after the `since` version, oldest change first.
+
+    Returns:
+        Dict with 'prayers' (current state of changed feed prayers), 'removed'
+        (ids to drop), 'cursor' (pass back as since), 'has_more' and 'reset'
+        (True when the cursor was ahead of the server, e.g. after a restore,
+        and the client must discard its store)
+    """
+    latest = session.exec(select(func.max(PrayerSyncVersion.version))).first() or 0
+    reset = since > latest
+    if reset:
+        since = 0
+
+    rows = session.exec(
+        select(PrayerSyncVersion.prayer_id, PrayerSyncVersion.version)
+        .where(PrayerSyncVersion.version > since)
+        .order_by(PrayerSyncVersion.version)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    prayer_ids = [prayer_id for prayer_id, _ in rows]
+
+    prayers, attributes, counts = {}, {}, {}
+    if prayer_ids:
+        prayers = {
+            prayer.id: prayer
+            for prayer in session.exec(select(Prayer).where(Prayer.id.in_(prayer_ids))).all()
+        }
+        for prayer_id, name, value in session.exec(
+            select(PrayerAttribute.prayer_id, PrayerAttribute.attribute_name, PrayerAttribute.attribute_value)
+            .where(PrayerAttribute.prayer_id.in_(prayer_ids))
+            .where(PrayerAttribute.attribute_name.in_(SYNC_ATTRIBUTES))
+        ).all():
+            attributes.setdefault(prayer_id, {})[name] = value
+        for prayer_id, total, people, mine in session.exec(
+            select(
+                PrayerMark.prayer_id,
+                func.count(PrayerMark.id),
+                func.count(func.distinct(PrayerMark.username)),
+                func.sum(case((PrayerMark.username == username, 1), else_=0))
+            )
+            .where(PrayerMark.prayer_id.in_(prayer_ids))
+            .group_by(PrayerMark.prayer_id)
+        ).all():
+            counts[prayer_id] = (total, people, mine)
+
+    changed, removed = [], []
+    for prayer_id in prayer_ids:
+        prayer = prayers.get(prayer_id)
+        prayer_attributes = attributes.get(prayer_id, {})
+        if prayer is None or prayer.flagged or 'archived' in prayer_attributes:
+            removed.append(prayer_id)
+            continue
+        total, people, mine = counts.get(prayer_id, (0, 0, 0))
+        changed.append({
+            'id': prayer.id,
+            'text': prayer.text,
+            'generated_prayer': prayer.generated_prayer,
+            'author_username': prayer.author_username,
+            'project_tag': prayer.project_tag,
+            'created_at': prayer.created_at.isoformat(),
+            'is_answered': 'answered' in prayer_attributes,
+            'answer_date': prayer_attributes.get('answer_date'),
+            'mark_count': total,
+            'distinct_user_count': people,
+            'user_mark_count': mine or 0
+        })
+
+    return {
+        'prayers': changed,
+        'removed': removed,
+        'cursor': str(rows[-1][1] if rows else since),
+        'has_more': has_more,
+        'reset': reset
+    }
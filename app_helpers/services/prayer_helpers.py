@@ -217,11 +217,14 @@ def generate_prayer(prompt: str) -> dict:
     """Generate a prayer from a prompt using the configured AI provider."""
 
     provider = get_prayer_generation_provider()
+    prompt_hash = None
 
     try:
         # Use dynamic prompt composition based on feature flags
         from app_helpers.services.prompt_composition_service import prompt_composition_service
-        system_prompt = prompt_composition_service.build_prayer_generation_prompt()
+        composed_prompt = prompt_composition_service.get_composed_prompt()
+        system_prompt = composed_prompt.text
+        prompt_hash = composed_prompt.prompt_hash
 
         # Determine max tokens based on categorization features
         try:
@@ -241,13 +244,14 @@ def generate_prayer(prompt: str) -> dict:
 
         ai_response = result.text.strip()
 
-        logger.debug("Prayer generated via %s provider", result.provider)
+        logger.info("Prayer generated via %s provider with prompt %s", result.provider, prompt_hash)
 
         return {
             'prayer': ai_response,
             'full_response': result.raw_response or ai_response,
             'service_status': 'normal',
             'provider': result.provider,
+            'prompt_hash': prompt_hash,
         }
     except (PrayerGenerationError, Exception) as e:
         logger.exception("Prayer generation failed via %s provider", getattr(provider, 'name', 'unknown'))
@@ -260,6 +264,8 @@ def generate_prayer(prompt: str) -> dict:
             'full_response': fallback_prayer,
             'service_status': 'degraded',
             'provider': getattr(provider, 'name', 'unknown'),
+            # The fallback text was not produced from the composed prompt
+            'prompt_hash': None,
         }
 
 
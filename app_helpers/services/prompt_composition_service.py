@@ -3,11 +3,18 @@ Prompt Composition Service - Dynamic Prayer Generation Prompt Building
 
 Composes prayer generation prompts from modular text files based on feature flags.
 Maintains auditability by keeping all prompt text in version-controlled files.
+Fragments are read once, composed prompts are cached per feature flag combination
+and reloaded when a prompt file's mtime changes. Each composed prompt carries a
+short hash so generated prayers can be traced to the prompt version that produced them.
 """
 
+import hashlib
+import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 try:
     from app import (
@@ -21,25 +28,44 @@ except ImportError:
     AI_CATEGORIZATION_ENABLED = os.getenv("AI_CATEGORIZATION_ENABLED", "false").lower() == "true"
     SAFETY_SCORING_ENABLED = os.getenv("SAFETY_SCORING_ENABLED", "false").lower() == "true"
 
+logger = logging.getLogger(__name__)
+
+
+PROMPT_FILES = (
+    "prayer_generation_system.txt",
+    "prayer_categorization_request_analysis.txt",
+    "prayer_categorization_verification.txt",
+    "prayer_categorization_output_format.txt",
+    "prayer_person_differentiation.txt"
+)
+
+# How often (seconds) prompt file mtimes are re-checked for hot reload
+PROMPT_RELOAD_CHECK_SECONDS = float(os.getenv("PROMPT_RELOAD_CHECK_SECONDS", "2"))
+
+
+class ComposedPrompt(NamedTuple):
+    """An immutable composed system prompt and the version hash that identifies it"""
+    text: str
+    prompt_hash: str
+    components: Tuple[str, ...]
+
 
 class PromptCompositionService:
     """Service for composing dynamic prayer generation prompts from modular text files"""
     
-    def __init__(self):
-        self.prompts_dir = Path(__file__).parent.parent.parent / "prompts"
+    def __init__(self, prompts_dir: Optional[Path] = None):
+        self.prompts_dir = Path(prompts_dir) if prompts_dir else Path(__file__).parent.parent.parent / "prompts"
         self._validate_prompt_files()
+        self._lock = threading.Lock()
+        self._fragments: Dict[str, Tuple[int, str]] = {}  # filename -> (mtime_ns, content)
+        self._composed: Dict[Tuple[bool, ...], ComposedPrompt] = {}  # feature flags -> prompt
+        self._last_reload_check = 0.0
+        for filename in PROMPT_FILES:
+            self._fragments[filename] = self._load_fragment(filename)
     
     def _validate_prompt_files(self):
         """Ensure all required prompt files exist"""
-        required_files = [
-            "prayer_generation_system.txt",
-            "prayer_categorization_request_analysis.txt",
-            "prayer_categorization_verification.txt", 
-            "prayer_categorization_output_format.txt",
-            "prayer_person_differentiation.txt"
-        ]
-        
-        for filename in required_files:
+        for filename in PROMPT_FILES:
             file_path = self.prompts_dir / filename
             if not file_path.exists():
                 raise FileNotFoundError(f"Required prompt file missing: {file_path}")
@@ -55,34 +81,69 @@ class PromptCompositionService:
         except Exception as e:
             raise Exception(f"Error reading prompt file {file_path}: {e}")
     
-    def build_prayer_generation_prompt(self) -> str:
+    def _load_fragment(self, filename: str) -> Tuple[int, str]:
+        mtime_ns = (self.prompts_dir / filename).stat().st_mtime_ns
+        return mtime_ns, self._read_prompt_file(filename)
+    
+    def _reload_changed_fragments(self, force: bool = False):
         """
-        Build complete prayer generation system prompt based on active feature flags.
-        
-        Returns:
-            Complete system prompt string composed from modular text files
+        Re-read prompt files whose mtime changed so operators can edit prompts
+        without a restart. Checks are throttled to PROMPT_RELOAD_CHECK_SECONDS.
+        A file that disappears keeps its last loaded content.
         """
+        now = time.monotonic()
+        if not force and now - self._last_reload_check < PROMPT_RELOAD_CHECK_SECONDS:
+            return
+        self._last_reload_check = now
+        
+        changed = False
+        for filename, (mtime_ns, _) in list(self._fragments.items()):
+            try:
+                current_mtime = (self.prompts_dir / filename).stat().st_mtime_ns
+                if current_mtime != mtime_ns:
+                    self._fragments[filename] = self._load_fragment(filename)
+                    changed = True
+            except OSError as e:
+                logger.warning("Could not reload prompt file %s: %s", filename, e)
+        
+        if changed:
+            self._composed.clear()
+            logger.info("Prompt files changed on disk, composed prompts reloaded")
+    
+    @staticmethod
+    def _feature_flags() -> Tuple[bool, bool, bool, bool]:
+        """Re-read feature flags at runtime for testing flexibility"""
+        return (
+            os.getenv("PRAYER_CATEGORIZATION_ENABLED", "false").lower() == "true",
+            os.getenv("AI_CATEGORIZATION_ENABLED", "false").lower() == "true",
+            os.getenv("SAFETY_SCORING_ENABLED", "false").lower() == "true",
+            os.getenv("PRAYER_PERSON_DIFFERENTIATION_ENABLED", "false").lower() == "true"
+        )
+    
+    def _compose(self, flags: Tuple[bool, bool, bool, bool]) -> ComposedPrompt:
+        prayer_categorization_enabled, ai_categorization_enabled, \
+            safety_scoring_enabled, person_differentiation_enabled = flags
         
-        # Re-read feature flags at runtime for testing flexibility
-        prayer_categorization_enabled = os.getenv("PRAYER_CATEGORIZATION_ENABLED", "false").lower() == "true"
-        ai_categorization_enabled = os.getenv("AI_CATEGORIZATION_ENABLED", "false").lower() == "true"
-        safety_scoring_enabled = os.getenv("SAFETY_SCORING_ENABLED", "false").lower() == "true"
-        person_differentiation_enabled = os.getenv("PRAYER_PERSON_DIFFERENTIATION_ENABLED", "false").lower() == "true"
+        def fragment(filename: str) -> str:
+            components.append(filename)
+            return self._fragments[filename][1]
+        
+        components: List[str] = []
         
         # Always start with base prayer generation prompt
-        prompt_parts = [self._read_prompt_file("prayer_generation_system.txt")]
+        prompt_parts = [fragment("prayer_generation_system.txt")]
         
         # Add person differentiation instructions if enabled
         if person_differentiation_enabled:
             prompt_parts.append("")  # Blank line for readability
-            prompt_parts.append(self._read_prompt_file("prayer_person_differentiation.txt"))
+            prompt_parts.append(fragment("prayer_person_differentiation.txt"))
         
         # Add categorization components only if enabled
         if prayer_categorization_enabled and ai_categorization_enabled:
             
             # Add request analysis instructions
             prompt_parts.append("")  # Blank line for readability
-            prompt_parts.append(self._read_prompt_file("prayer_categorization_request_analysis.txt"))
+            prompt_parts.append(fragment("prayer_categorization_request_analysis.txt"))
             
             # Add instruction to generate prayer
             prompt_parts.append("")
@@ -90,14 +151,15 @@ class PromptCompositionService:
             
             # Add verification instructions
             prompt_parts.append("")
-            prompt_parts.append(self._read_prompt_file("prayer_categorization_verification.txt"))
+            prompt_parts.append(fragment("prayer_categorization_verification.txt"))
             
             # Add structured output format
             prompt_parts.append("")
-            prompt_parts.append(self._read_prompt_file("prayer_categorization_output_format.txt"))
+            prompt_parts.append(fragment("prayer_categorization_output_format.txt"))
         
         elif prayer_categorization_enabled and safety_scoring_enabled:
             # Safety-only mode (minimal categorization)
+            components.append("inline_safety_analysis")
             prompt_parts.append("")
             prompt_parts.append("After generating the prayer, evaluate:")
             prompt_parts.append("- Safety: Rate from 0.0 (concerning) to 1.0 (positive)")
@@ -107,7 +169,44 @@ class PromptCompositionService:
             prompt_parts.append("SAFETY_SCORE: [0.0-1.0]")
             prompt_parts.append("SAFETY_FLAGS: [array of concerns]")
         
-        return "\n".join(prompt_parts)
+        text = "\n".join(prompt_parts)
+        prompt_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        return ComposedPrompt(text=text, prompt_hash=prompt_hash, components=tuple(components))
+    
+    def get_composed_prompt(self, force_reload: bool = False) -> ComposedPrompt:
+        """
+        Get the composed prompt for the active feature flags.
+        
+        Prompts are composed once per feature flag combination and reused until
+        a prompt file changes on disk.
+        
+        Args:
+            force_reload: Check prompt file mtimes now instead of waiting for the throttle
+        
+        Returns:
+            ComposedPrompt with text, prompt_hash and components
+        """
+        flags = self._feature_flags()
+        with self._lock:
+            self._reload_changed_fragments(force=force_reload)
+            composed = self._composed.get(flags)
+            if composed is None:
+                composed = self._compose(flags)
+                self._composed[flags] = composed
+            return composed
+    
+    def build_prayer_generation_prompt(self) -> str:
+        """
+        Build complete prayer generation system prompt based on active feature flags.
+        
+        Returns:
+            Complete system prompt string composed from modular text files
+        """
+        return self.get_composed_prompt().text
+    
+    def get_prompt_hash(self) -> str:
+        """Get the version hash of the prompt the active feature flags would produce"""
+        return self.get_composed_prompt().prompt_hash
     
     def get_prompt_composition_info(self) -> dict:
         """
@@ -116,36 +215,20 @@ class PromptCompositionService:
         Returns:
             Dictionary with composition details and feature flag states
         """
-        
-        # Re-read feature flags at runtime
-        prayer_categorization_enabled = os.getenv("PRAYER_CATEGORIZATION_ENABLED", "false").lower() == "true"
-        ai_categorization_enabled = os.getenv("AI_CATEGORIZATION_ENABLED", "false").lower() == "true"
-        safety_scoring_enabled = os.getenv("SAFETY_SCORING_ENABLED", "false").lower() == "true"
-        person_differentiation_enabled = os.getenv("PRAYER_PERSON_DIFFERENTIATION_ENABLED", "false").lower() == "true"
-        
-        components = ["prayer_generation_system.txt"]
-        
-        if person_differentiation_enabled:
-            components.append("prayer_person_differentiation.txt")
-        
-        if prayer_categorization_enabled and ai_categorization_enabled:
-            components.extend([
-                "prayer_categorization_request_analysis.txt",
-                "prayer_categorization_verification.txt",
-                "prayer_categorization_output_format.txt"
-            ])
-        elif prayer_categorization_enabled and safety_scoring_enabled:
-            components.append("inline_safety_analysis")
+        prayer_categorization_enabled, ai_categorization_enabled, \
+            safety_scoring_enabled, person_differentiation_enabled = self._feature_flags()
+        composed = self.get_composed_prompt()
         
         return {
-            "components": components,
+            "components": list(composed.components),
             "feature_flags": {
                 "PRAYER_CATEGORIZATION_ENABLED": prayer_categorization_enabled,
                 "AI_CATEGORIZATION_ENABLED": ai_categorization_enabled,
                 "SAFETY_SCORING_ENABLED": safety_scoring_enabled,
                 "PRAYER_PERSON_DIFFERENTIATION_ENABLED": person_differentiation_enabled
             },
-            "total_components": len(components)
+            "total_components": len(composed.components),
+            "prompt_hash": composed.prompt_hash
         }
 
 
@@ -4,9 +4,105 @@ Public prayer service for handling prayers accessible to non-authenticated users
 Provides filtering, pagination, and data retrieval for public prayer display.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as ORMSession
 from sqlmodel import Session, select, func
-from models import Prayer, PrayerAttribute, User, PrayerMark, engine
+from models import Prayer, PrayerAttribute, User, PrayerMark, read_engine
+
+
+# Micro-cache for anonymous public payloads. Entries are shared by every visitor,
+# dropped whenever a write changes what the public can see (new, flagged or
+# deleted prayers, archive/answered attributes) and otherwise expire after
+# PUBLIC_CACHE_SECONDS so prayer counts and other workers' writes catch up.
+PUBLIC_CACHE_SECONDS = int(os.getenv("PUBLIC_CACHE_SECONDS", "30"))
+PUBLIC_CACHE_MAX_ENTRIES = 256
+PUBLIC_VISIBILITY_ATTRIBUTES = ('archived', 'answered')
+
+_public_cache = {}
+_public_cache_lock = threading.Lock()
+_public_cache_version = 0
+
+
+def invalidate_public_prayer_cache() -> None:
+    """Drop every cached public payload"""
+    global _public_cache_version
+    with _public_cache_lock:
+        _public_cache_version += 1
+        _public_cache.clear()
+
+
+def get_cached_public_payload(key: tuple, build: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    Return the cached JSON payload for key, building it with build() on a miss.
+
+    Returns:
+        Dict with 'body' (serialized JSON bytes), 'etag' and 'last_modified'
+    """
+    now = time.monotonic()
+    with _public_cache_lock:
+        entry = _public_cache.get(key)
+        if entry and entry['expires'] > now:
+            return entry
+        version = _public_cache_version
+
+    body = json.dumps(build(), separators=(',', ':')).encode()
+    entry = {
+        'body': body,
+        'etag': f'W/"{hashlib.sha1(body).hexdigest()[:20]}"',
+        'last_modified': datetime.utcnow().replace(microsecond=0),
+        'expires': now + PUBLIC_CACHE_SECONDS
+    }
+    with _public_cache_lock:
+        previous = _public_cache.get(key)
+        if previous and previous['etag'] == entry['etag']:
+            # Unchanged content keeps its original timestamp for If-Modified-Since
+            entry['last_modified'] = previous['last_modified']
+        # A write that landed while building invalidated the cache; don't store stale data
+        if version == _public_cache_version:
+            if len(_public_cache) >= PUBLIC_CACHE_MAX_ENTRIES:
+                _public_cache.clear()
+            _public_cache[key] = entry
+    return entry
+
+
+def _changes_public_visibility(session) -> bool:
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Prayer):
+            return True
+        if isinstance(obj, PrayerAttribute) and obj.attribute_name in PUBLIC_VISIBILITY_ATTRIBUTES:
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, Prayer) and inspect(obj).attrs.flagged.history.has_changes():
+            return True
+    return False
+
+
+def _note_public_changes(session, flush_context) -> None:
+    if _changes_public_visibility(session):
+        session.info['public_prayers_changed'] = True
+
+
+def _invalidate_after_commit(session) -> None:
+    if session.info.pop('public_prayers_changed', False):
+        invalidate_public_prayer_cache()
+
+
+def _discard_after_rollback(session) -> None:
+    session.info.pop('public_prayers_changed', None)
+
+
+# Flushes mark the session; the cache is only dropped once the change is committed
+# so a concurrent rebuild can't cache the pre-commit view under the new version
+event.listen(ORMSession, "after_flush", _note_public_changes)
+event.listen(ORMSession, "after_commit", _invalidate_after_commit)
+event.listen(ORMSession, "after_rollback", _discard_after_rollback)
 
 
 class PublicPrayerService:
@@ -36,7 +132,7 @@ class PublicPrayerService:
         """
         should_close_session = session is None
         if session is None:
-            session = Session(engine)
+            session = Session(read_engine)
             
         try:
             offset = (page - 1) * page_size
@@ -150,7 +246,7 @@ class PublicPrayerService:
         """
         should_close_session = session is None
         if session is None:
-            session = Session(engine)
+            session = Session(read_engine)
             
         try:
             # Get the prayer
@@ -221,7 +317,7 @@ class PublicPrayerService:
         """
         should_close_session = session is None
         if session is None:
-            session = Session(engine)
+            session = Session(read_engine)
             
         try:
             prayer = PublicPrayerService.get_public_prayer_by_id(prayer_id, session)
@@ -259,7 +355,7 @@ class PublicPrayerService:
         """
         should_close_session = session is None
         if session is None:
-            session = Session(engine)
+            session = Session(read_engine)
             
         try:
             # Get all prayer marks for this prayer
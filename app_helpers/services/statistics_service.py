@@ -4,59 +4,136 @@ Statistics service for calculating prayer and user metrics
 
 from sqlmodel import Session, select, func, text
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from models import Prayer, User, PrayerMark, PrayerAttribute
 
 
+# Grouping expression (applied to the rollup's YYYY-MM-DD day column) and key format per period
+PERIODS = {
+    "daily": ("day", "%Y-%m-%d"),
+    "weekly": ("date(day, 'weekday 0', '-6 days')", "%Y-W%W"),  # Start of week (Monday)
+    "monthly": ("date(day, 'start of month')", "%Y-%m"),
+    "yearly": ("date(day, 'start of year')", "%Y"),
+}
+
+# Rebuild the rollup tables from the source tables for days on or after :from_day
+REBUILD_ROLLUP_STATEMENTS = [
+    "DELETE FROM daily_stats WHERE day >= :from_day",
+    "DELETE FROM daily_prayer_user WHERE day >= :from_day",
+    """INSERT INTO daily_prayer_user (day, username)
+       SELECT DISTINCT date(created_at), username FROM prayermark WHERE created_at >= :from_day""",
+    """INSERT INTO daily_stats (day, prayers, marks, prayer_users, registrations, answered)
+       SELECT day, SUM(prayers), SUM(marks), SUM(prayer_users), SUM(registrations), SUM(answered) FROM (
+           SELECT date(created_at) AS day, COUNT(*) AS prayers, 0 AS marks, 0 AS prayer_users,
+                  0 AS registrations, 0 AS answered
+           FROM prayer WHERE created_at >= :from_day GROUP BY 1
+           UNION ALL
+           SELECT date(created_at), 0, COUNT(*), 0, 0, 0
+           FROM prayermark WHERE created_at >= :from_day GROUP BY 1
+           UNION ALL
+           SELECT day, 0, 0, COUNT(*), 0, 0
+           FROM daily_prayer_user WHERE day >= :from_day GROUP BY 1
+           UNION ALL
+           SELECT date(created_at), 0, 0, 0, COUNT(*), 0
+           FROM user WHERE created_at >= :from_day GROUP BY 1
+           UNION ALL
+           SELECT date(created_at), 0, 0, 0, 0, COUNT(*)
+           FROM prayer_attributes WHERE attribute_name = 'answered' AND created_at >= :from_day GROUP BY 1
+       ) GROUP BY day""",
+]
+
+
 class StatisticsService:
+    """
+    Admin analytics. Period counts and totals read the daily_stats rollup, which
+    models.py keeps current on every ORM write; rebuild_daily_rollups() refills it
+    from the source tables (after bulk imports or to backfill history).
+    """
+
     def __init__(self, session: Session):
         self.session = session
-    
-    def get_prayer_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
-        """Get prayer counts grouped by time period"""
-        
-        # Define the date format and grouping based on period
-        if period == "daily":
-            date_format = "%Y-%m-%d"
-            date_trunc = "date(created_at)"
-        elif period == "weekly":
-            date_format = "%Y-W%W"  # Year-Week format
-            date_trunc = "date(created_at, 'weekday 0', '-6 days')"  # Start of week (Monday)
-        elif period == "monthly":
-            date_format = "%Y-%m"
-            date_trunc = "date(created_at, 'start of month')"
-        elif period == "yearly":
-            date_format = "%Y"
-            date_trunc = "date(created_at, 'start of year')"
-        else:
+
+    def _rollup_counts(self, column: str, period: str, start_date: date, end_date: date) -> Dict[str, int]:
+        """Sum one rollup column per period between two dates (inclusive), omitting empty periods"""
+        if period not in PERIODS:
             raise ValueError(f"Unsupported period: {period}")
-        
-        # Build the SQL query
-        query = text(f"""
-            SELECT {date_trunc} as period_date, COUNT(*) as count
-            FROM prayer 
-            WHERE date(created_at) >= :start_date AND date(created_at) <= :end_date
-            GROUP BY {date_trunc}
+        date_trunc, date_format = PERIODS[period]
+
+        result = self.session.execute(text(f"""
+            SELECT {date_trunc} as period_date, SUM({column}) as count
+            FROM daily_stats
+            WHERE day >= :start_date AND day <= :end_date
+            GROUP BY period_date
+            HAVING SUM({column}) > 0
             ORDER BY period_date
-        """)
-        
-        result = self.session.execute(query, {
+        """), {
             "start_date": start_date.strftime("%Y-%m-%d"),
             "end_date": end_date.strftime("%Y-%m-%d")
         })
-        
+
         # Convert results to dictionary with formatted dates
         counts = {}
         for row in result:
             period_date = datetime.strptime(row[0], "%Y-%m-%d").date()
-            formatted_date = period_date.strftime(date_format)
-            counts[formatted_date] = row[1]
-        
+            counts[period_date.strftime(date_format)] = row[1]
         return counts
-    
+
+    def get_prayer_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
+        """Get prayer counts grouped by time period"""
+        return self._rollup_counts("prayers", period, start_date, end_date)
+
+    def get_answered_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
+        """Get counts of prayers marked answered, grouped by time period"""
+        return self._rollup_counts("answered", period, start_date, end_date)
+
+    def get_active_prayer_user_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
+        """Get distinct users who marked a prayer, grouped by time period"""
+        if period not in PERIODS:
+            raise ValueError(f"Unsupported period: {period}")
+        if period == "daily":
+            return self._rollup_counts("prayer_users", period, start_date, end_date)
+        date_trunc, date_format = PERIODS[period]
+
+        # Daily distinct counts don't add up across days, so count users per period
+        result = self.session.execute(text(f"""
+            SELECT {date_trunc} as period_date, COUNT(DISTINCT username) as count
+            FROM daily_prayer_user
+            WHERE day >= :start_date AND day <= :end_date
+            GROUP BY period_date
+            ORDER BY period_date
+        """), {
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "end_date": end_date.strftime("%Y-%m-%d")
+        })
+        return {
+            datetime.strptime(row[0], "%Y-%m-%d").date().strftime(date_format): row[1]
+            for row in result
+        }
+
+    def _rollup_total(self, column: str) -> int:
+        return self.session.execute(text(f"SELECT COALESCE(SUM({column}), 0) FROM daily_stats")).scalar()
+
+    def rebuild_daily_rollups(self, from_day: Optional[date] = None) -> int:
+        """
+        Recompute the rollup tables from prayers, marks, users and answers.
+
+        Args:
+            from_day: Only rebuild days on or after this date (default: all history)
+
+        Returns:
+            Number of days written
+        """
+        params = {"from_day": from_day.strftime("%Y-%m-%d") if from_day else "0000-00-00"}
+        for statement in REBUILD_ROLLUP_STATEMENTS:
+            self.session.execute(text(statement), params)
+        self.session.commit()
+        return self.session.execute(
+            text("SELECT COUNT(*) FROM daily_stats WHERE day >= :from_day"), params
+        ).scalar()
+
     def get_total_prayers(self) -> int:
         """Get total count of all prayers"""
-        return self.session.exec(select(func.count(Prayer.id))).first()
+        return self._rollup_total("prayers")
     
     def get_active_prayers_count(self) -> int:
         """Get count of prayers that are not archived"""
@@ -91,89 +168,19 @@ class StatisticsService:
     
     def get_user_registration_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
         """Get user registration counts grouped by time period"""
-        
-        if period == "daily":
-            date_format = "%Y-%m-%d"
-            date_trunc = "date(created_at)"
-        elif period == "weekly":
-            date_format = "%Y-W%W"
-            date_trunc = "date(created_at, 'weekday 0', '-6 days')"
-        elif period == "monthly":
-            date_format = "%Y-%m"
-            date_trunc = "date(created_at, 'start of month')"
-        elif period == "yearly":
-            date_format = "%Y"
-            date_trunc = "date(created_at, 'start of year')"
-        else:
-            raise ValueError(f"Unsupported period: {period}")
-        
-        query = text(f"""
-            SELECT {date_trunc} as period_date, COUNT(*) as count
-            FROM user 
-            WHERE date(created_at) >= :start_date AND date(created_at) <= :end_date
-            GROUP BY {date_trunc}
-            ORDER BY period_date
-        """)
-        
-        result = self.session.execute(query, {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d")
-        })
-        
-        counts = {}
-        for row in result:
-            period_date = datetime.strptime(row[0], "%Y-%m-%d").date()
-            formatted_date = period_date.strftime(date_format)
-            counts[formatted_date] = row[1]
-        
-        return counts
+        return self._rollup_counts("registrations", period, start_date, end_date)
     
     def get_total_users(self) -> int:
         """Get total count of all users"""
-        return self.session.exec(select(func.count(User.display_name))).first()
+        return self._rollup_total("registrations")
     
     def get_total_prayer_marks(self) -> int:
         """Get total count of all prayer marks"""
-        return self.session.exec(select(func.count(PrayerMark.id))).first()
+        return self._rollup_total("marks")
     
     def get_prayer_marks_counts_by_period(self, period: str, start_date: date, end_date: date) -> Dict[str, int]:
         """Get prayer marks counts grouped by time period"""
-        
-        if period == "daily":
-            date_format = "%Y-%m-%d"
-            date_trunc = "date(created_at)"
-        elif period == "weekly":
-            date_format = "%Y-W%W"
-            date_trunc = "date(created_at, 'weekday 0', '-6 days')"
-        elif period == "monthly":
-            date_format = "%Y-%m"
-            date_trunc = "date(created_at, 'start of month')"
-        elif period == "yearly":
-            date_format = "%Y"
-            date_trunc = "date(created_at, 'start of year')"
-        else:
-            raise ValueError(f"Unsupported period: {period}")
-        
-        query = text(f"""
-            SELECT {date_trunc} as period_date, COUNT(*) as count
-            FROM prayermark 
-            WHERE date(created_at) >= :start_date AND date(created_at) <= :end_date
-            GROUP BY {date_trunc}
-            ORDER BY period_date
-        """)
-        
-        result = self.session.execute(query, {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d")
-        })
-        
-        counts = {}
-        for row in result:
-            period_date = datetime.strptime(row[0], "%Y-%m-%d").date()
-            formatted_date = period_date.strftime(date_format)
-            counts[formatted_date] = row[1]
-        
-        return counts
+        return self._rollup_counts("marks", period, start_date, end_date)
     
     def get_summary_statistics(self) -> Dict[str, int]:
         """Get summary statistics for dashboard overview"""
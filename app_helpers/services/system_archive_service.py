@@ -276,7 +276,8 @@ class SystemArchiveService:
                 # Get pending auth requests
                 pending_requests = session.exec(
                     select(AuthenticationRequest).where(
-                        AuthenticationRequest.status == 'pending'
+                        AuthenticationRequest.status == 'pending',
+                        AuthenticationRequest.expires_at > datetime.utcnow()
                     )
                 ).all()
                 
@@ -19,6 +19,11 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import logging
 
+from app_helpers.services.archive_compression_service import (
+    archive_exists, read_archive_text, restore_from_bundle
+)
+from app_helpers.utils.request_metrics import record_archive_write
+
 logger = logging.getLogger(__name__)
 
 # Import configuration (will be set when app starts)
@@ -55,9 +60,10 @@ class TextArchiveService:
         
         file_path = year_month_dir / f"{base_name}.txt"
         
-        # Handle conflicts by appending number
+        # Handle conflicts by appending number (names already packed into the
+        # month's compressed bundle are taken too)
         counter = 2
-        while file_path.exists():
+        while archive_exists(file_path):
             conflict_name = f"{base_name}_{counter}"
             file_path = year_month_dir / f"{conflict_name}.txt"
             counter += 1
@@ -125,14 +131,13 @@ class TextArchiveService:
     
     def parse_prayer_archive_categorization(self, archive_path: str) -> Dict:
         """Parse categorization metadata from prayer archive file"""
-        if not self.enabled or not archive_path or not Path(archive_path).exists():
+        if not self.enabled or not archive_path or not archive_exists(archive_path):
             # Return defaults for missing archives
             from app_helpers.services.prayer_categorization_service import DEFAULT_CATEGORIZATION
             return DEFAULT_CATEGORIZATION.copy()
         
         try:
-            with open(archive_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_archive_text(archive_path)
             
             lines = content.split('\n')
             categorization = {}
@@ -194,8 +199,26 @@ class TextArchiveService:
         
         self._append_activity_with_timestamp(file_path, action, user, timestamp, extra, old_value, new_value)
     
+    def append_prayer_marks_with_timestamps(self, file_path: str, user: str, activity_timestamps: list):
+        """Append several 'prayed' lines to one prayer archive in a single locked write"""
+        if not self.enabled or not file_path or not activity_timestamps:
+            return
+        
+        lines = [
+            self._format_activity_line("prayed", user, timestamp.strftime("%B %d %Y at %H:%M"))
+            for timestamp in activity_timestamps
+        ]
+        self._append_to_file(file_path, "\n".join(lines))
+        logger.info(f"Added {len(lines)} prayed activities to {file_path} by {user}")
+    
     def _append_activity_with_timestamp(self, file_path: str, action: str, user: str, timestamp: str, extra: str = "", old_value: str = None, new_value: str = None):
         """Internal method to append activity with formatted timestamp"""
+        activity_line = self._format_activity_line(action, user, timestamp, extra, old_value, new_value)
+        self._append_to_file(file_path, activity_line)
+        logger.info(f"Added activity to {file_path}: {action} by {user}")
+    
+    def _format_activity_line(self, action: str, user: str, timestamp: str, extra: str = "", old_value: str = None, new_value: str = None) -> str:
+        """Format one activity line for a prayer archive"""
         
         # Format activity line based on action type
         if action == "prayed":
@@ -225,8 +248,7 @@ class TextArchiveService:
             if extra:
                 activity_line += f": {extra}"
         
-        self._append_to_file(file_path, activity_line)
-        logger.info(f"Added activity to {file_path}: {action} by {user}")
+        return activity_line
     
     def append_user_registration(self, user_name: str, invite_source: str = ""):
         """Append user registration to monthly user file"""
@@ -262,7 +284,14 @@ class TextArchiveService:
     
     def append_monthly_activity(self, action: str, user: str, prayer_id: int = None, tag: str = ""):
         """Append activity to monthly activity file, adding date header if needed"""
-        if not self.enabled:
+        return self.append_monthly_activities(user, [(action, prayer_id, tag)])
+    
+    def append_monthly_activities(self, user: str, activities: list):
+        """
+        Append (action, prayer_id, tag) activities by one user to the monthly
+        activity file in a single write, adding the date header if needed
+        """
+        if not self.enabled or not activities:
             return ""
             
         now = datetime.now()
@@ -283,30 +312,30 @@ class TextArchiveService:
             if f"\n{activity_date}\n" in content or content.endswith(f"{activity_date}\n"):
                 needs_date_header = False
         
-        # Build activity line
-        activity_parts = [timestamp, "-", user]
-        
-        # Format action with prayer ID if provided
-        if prayer_id and "prayer" not in action:
-            action_with_prayer = action.replace(f" {prayer_id}", f" prayer {prayer_id}")
-        else:
-            action_with_prayer = action
-            
-        activity_parts.append(action_with_prayer)
-        
-        if tag:
-            activity_parts.append(f"({tag})")
-        
-        activity_line = " ".join(activity_parts)
-        
-        # Append with date header if needed
         lines_to_add = []
         if needs_date_header:
             lines_to_add.append(f"\n{activity_date}")
-        lines_to_add.append(activity_line)
         
+        for action, prayer_id, tag in activities:
+            # Build activity line
+            activity_parts = [timestamp, "-", user]
+            
+            # Format action with prayer ID if provided
+            if prayer_id and "prayer" not in action:
+                action_with_prayer = action.replace(f" {prayer_id}", f" prayer {prayer_id}")
+            else:
+                action_with_prayer = action
+                
+            activity_parts.append(action_with_prayer)
+            
+            if tag:
+                activity_parts.append(f"({tag})")
+            
+            lines_to_add.append(" ".join(activity_parts))
+        
+        # Append with date header if needed
         self._append_to_file(str(monthly_file), '\n'.join(lines_to_add))
-        logger.info(f"Added monthly activity: {action} by {user}")
+        logger.info(f"Added {len(activities)} monthly activities by {user}")
         
         return str(monthly_file)
     
@@ -395,6 +424,7 @@ class TextArchiveService:
                 f.write(content)
                 f.flush()
                 os.fsync(f.fileno())  # Force write to disk
+                record_archive_write()
             
             # Atomic rename
             os.rename(temp_path, file_path)
@@ -408,11 +438,29 @@ class TextArchiveService:
     def _append_to_file(self, file_path: str, content: str):
         """Thread-safe append operation with file locking"""
         try:
-            with open(file_path, 'a', encoding='utf-8') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock
-                f.write(content + '\n')
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
+            for _ in range(3):
+                # Old prayer files may have been packed into their monthly bundle;
+                # restore them first so the new line lands after their history
+                create = not os.path.exists(file_path) and not restore_from_bundle(file_path)
+                flags = os.O_WRONLY | os.O_APPEND | (os.O_CREAT if create else 0)
+                try:
+                    fd = os.open(file_path, flags, 0o666)
+                except FileNotFoundError:
+                    if create:
+                        raise
+                    continue  # Compacted between the check and the open
+                
+                with os.fdopen(fd, 'a', encoding='utf-8') as f:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock
+                    if os.fstat(f.fileno()).st_nlink == 0:
+                        continue  # Compacted while waiting for the lock
+                    f.write(content + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())  # Force write to disk
+                    record_archive_write()
+                    return
+            
+            raise FileNotFoundError(f"Archive file kept disappearing during append: {file_path}")
                 
         except FileNotFoundError:
             logger.error(f"Archive file not found: {file_path}")
@@ -422,10 +470,9 @@ class TextArchiveService:
             # Don't raise - archive failures shouldn't break the main application
     
     def read_archive_file(self, file_path: str) -> str:
-        """Read archive file content"""
+        """Read archive file content (from its compressed bundle if it has been packed)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return read_archive_text(file_path)
         except FileNotFoundError:
             logger.error(f"Archive file not found: {file_path}")
             raise
@@ -25,6 +25,9 @@ from models import (
     PrayerActivityLog, InviteToken
 )
 from app_helpers.services.text_archive_service import TextArchiveService
+from app_helpers.services.archive_compression_service import (
+    archive_exists, list_month_prayer_files, list_prayer_archive_files
+)
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +94,15 @@ class TextImporterService:
             # Import monthly activity logs
             self._import_monthly_activities(archive_path, dry_run)
             
+            # Imported marks and answers bypass the activity path, so regenerate the
+            # timeline and the analytics rollup from the imported rows
+            if not dry_run:
+                from app_helpers.services.activity_timeline_service import rebuild_activity_timeline
+                from app_helpers.services.statistics_service import StatisticsService
+                with Session(engine) as session:
+                    rebuild_activity_timeline(session)
+                    StatisticsService(session).rebuild_daily_rollups()
+            
             return {
                 'success': True,
                 'stats': self.import_stats,
@@ -360,13 +372,8 @@ class TextImporterService:
         if not prayers_dir.exists():
             return
         
-        # Find all prayer archive files
-        prayer_files = []
-        for year_dir in prayers_dir.iterdir():
-            if year_dir.is_dir():
-                for month_dir in year_dir.iterdir():
-                    if month_dir.is_dir():
-                        prayer_files.extend(month_dir.glob("*.txt"))
+        # Find all prayer archive files (including ones packed into monthly bundles)
+        prayer_files = list_prayer_archive_files(prayers_dir)
         
         logger.info(f"Found {len(prayer_files)} prayer archive files")
         
@@ -662,16 +669,27 @@ class TextImporterService:
             logger.warning(f"Failed to parse timestamp: {timestamp_str}")
             return datetime.now()
     
-    def validate_import_consistency(self, archive_dir: str = None) -> Dict:
+    def validate_import_consistency(self, archive_dir: str = None, incremental: bool = False,
+                                    workers: int = None) -> Dict:
         """
         Validate consistency between archive files and database records
         
+        Args:
+            archive_dir: Archive directory to validate against
+            incremental: Only re-parse archive files changed since the last run,
+                using the content-hash manifest stored alongside the archive
+            workers: Parallel parser threads for incremental mode
+        
         Returns:
             Dictionary with validation results and any inconsistencies found
         """
         if not archive_dir:
             archive_dir = str(self.archive_service.base_dir)
         
+        if incremental:
+            from app_helpers.services.archive_manifest_service import validate_incremental_consistency
+            return validate_incremental_consistency(archive_dir, self.archive_service, workers=workers)
+        
         archive_path = Path(archive_dir)
         validation_results = {
             'prayers_checked': 0,
@@ -691,7 +709,7 @@ class TextImporterService:
                     validation_results['missing_archives'].append(f"Prayer {prayer.id} has no archive file reference")
                     continue
                 
-                if not Path(prayer.text_file_path).exists():
+                if not archive_exists(prayer.text_file_path):
                     validation_results['missing_archives'].append(f"Prayer {prayer.id} archive file not found: {prayer.text_file_path}")
                     continue
                 
@@ -770,15 +788,14 @@ class TextImporterService:
         # Search in the year/month directory structure
         year_month_dir = prayers_dir / str(created_at.year) / f"{created_at.month:02d}"
         
-        if year_month_dir.exists():
-            # Look for files that might contain this prayer
-            for archive_file in year_month_dir.glob("*.txt"):
-                try:
-                    parsed_data, _ = self.archive_service.parse_prayer_archive(str(archive_file))
-                    if str(parsed_data.get('id')) == str(prayer_id):
-                        return archive_file
-                except Exception:
-                    continue
+        # Look for files that might contain this prayer
+        for archive_file in list_month_prayer_files(year_month_dir):
+            try:
+                parsed_data, _ = self.archive_service.parse_prayer_archive(str(archive_file))
+                if str(parsed_data.get('id')) == str(prayer_id):
+                    return archive_file
+            except Exception:
+                continue
         
         return None
 
@@ -0,0 +1,172 @@
+# app_helpers/services/user_directory_service.py
+"""
+User directory service for the /users and /admin/users pages.
+Builds per-user activity summaries with a handful of grouped queries per page
+instead of several queries per user.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from sqlmodel import Session, select, func, or_
+from models import User, Prayer, PrayerMark, Role, UserRole
+
+
+DIRECTORY_PAGE_SIZE = 48
+
+
+class UserDirectoryService:
+    """Service for paginated, searchable member listings with activity stats"""
+
+    @staticmethod
+    def _active_role_members(role_name: str):
+        """Subquery of user ids holding a non-expired role"""
+        return (
+            select(UserRole.user_id)
+            .join(Role, UserRole.role_id == Role.id)
+            .where(Role.name == role_name)
+            .where((UserRole.expires_at.is_(None)) | (UserRole.expires_at > datetime.utcnow()))
+        )
+
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def get_directory_page(
+        session: Session,
+        viewer_id: str,
+        page: int = 1,
+        per_page: int = DIRECTORY_PAGE_SIZE,
+        search: Optional[str] = None,
+        include_deactivated: bool = False,
+        include_deactivation_info: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of users (newest first) with their activity summaries.
+
+        Deactivated users are hidden unless include_deactivated is set, except
+        for the viewer themselves.
+
+        Returns:
+            Tuple of (user_entries, total_count)
+        """
+        conditions = []
+        if not include_deactivated:
+            conditions.append(or_(
+                User.display_name.not_in(UserDirectoryService._active_role_members("deactivated")),
+                User.display_name == viewer_id
+            ))
+        if search and search.strip():
+            pattern = f"%{UserDirectoryService._escape_like(search.strip())}%"
+            conditions.append(User.display_name.like(pattern, escape='\\'))
+
+        total_count = session.exec(select(func.count(User.display_name)).where(*conditions)).first() or 0
+
+        users = session.exec(
+            select(User)
+            .where(*conditions)
+            .order_by(User.created_at.desc(), User.display_name)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+        ).all()
+
+        summaries = UserDirectoryService.get_activity_summaries(
+            session, [u.display_name for u in users], include_deactivation_info
+        )
+
+        entries = []
+        for profile_user in users:
+            entry = {'user': profile_user, 'is_me': profile_user.display_name == viewer_id}
+            entry.update(summaries[profile_user.display_name])
+            entries.append(entry)
+        return entries, total_count
+
+    @staticmethod
+    def get_activity_summaries(
+        session: Session,
+        usernames: List[str],
+        include_deactivation_info: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get prayers authored, marks, distinct prayers marked, last activity,
+        deactivated and admin flags for a batch of users in three grouped queries.
+        """
+        summaries = {
+            name: {
+                'prayers_authored': 0,
+                'prayers_marked': 0,
+                'distinct_prayers_marked': 0,
+                'last_activity': None,
+                'is_deactivated': False,
+                'is_admin': False,
+                'deactivation_info': None
+            }
+            for name in usernames
+        }
+        if not usernames:
+            return summaries
+
+        authored = session.exec(
+            select(Prayer.author_username, func.count(Prayer.id), func.max(Prayer.created_at))
+            .where(Prayer.author_username.in_(usernames))
+            .where(Prayer.flagged == False)
+            .group_by(Prayer.author_username)
+        ).all()
+        for username, count, last_prayer in authored:
+            summaries[username]['prayers_authored'] = count
+            summaries[username]['last_activity'] = last_prayer
+
+        marked = session.exec(
+            select(
+                PrayerMark.username,
+                func.count(PrayerMark.id),
+                func.count(func.distinct(PrayerMark.prayer_id)),
+                func.max(PrayerMark.created_at)
+            )
+            .where(PrayerMark.username.in_(usernames))
+            .group_by(PrayerMark.username)
+        ).all()
+        for username, count, distinct_count, last_mark in marked:
+            summary = summaries[username]
+            summary['prayers_marked'] = count
+            summary['distinct_prayers_marked'] = distinct_count
+            if last_mark and (summary['last_activity'] is None or last_mark > summary['last_activity']):
+                summary['last_activity'] = last_mark
+
+        roles = session.exec(
+            select(UserRole, Role.name)
+            .join(Role, UserRole.role_id == Role.id)
+            .where(UserRole.user_id.in_(usernames))
+            .where(Role.name.in_(["admin", "deactivated"]))
+            .where((UserRole.expires_at.is_(None)) | (UserRole.expires_at > datetime.utcnow()))
+        ).all()
+        for user_role, role_name in roles:
+            summary = summaries[user_role.user_id]
+            if role_name == "admin":
+                summary['is_admin'] = True
+            else:
+                summary['is_deactivated'] = True
+                if include_deactivation_info:
+                    summary['deactivation_info'] = {
+                        'deactivated_at': user_role.granted_at,
+                        'deactivated_by': user_role.granted_by,
+                        'expires_at': user_role.expires_at
+                    }
+
+        return summaries
+
+    @staticmethod
+    def get_community_totals(session: Session, include_deactivated: bool = False) -> Dict[str, int]:
+        """Community-wide totals for the directory overview (independent of paging and search)"""
+        members_stmt = select(func.count(User.display_name))
+        if not include_deactivated:
+            members_stmt = members_stmt.where(
+                User.display_name.not_in(UserDirectoryService._active_role_members("deactivated"))
+            )
+        return {
+            'total_members': session.exec(members_stmt).first() or 0,
+            'total_prayers_marked': session.exec(select(func.count(PrayerMark.id))).first() or 0,
+            'total_prayers_authored': session.exec(
+                select(func.count(Prayer.id)).where(Prayer.flagged == False)
+            ).first() or 0
+        }
@@ -3,90 +3,198 @@ Username Display Service for ThyWill
 
 Provides centralized functionality for displaying usernames with supporter badges
 consistently across all templates and routes.
+
+Supporter data is kept in a bounded LRU cache. Committing a write to a user's
+supporter fields (or a user being added/removed) bumps a module-level version,
+which makes every service instance drop its cache on next use. Routes that
+render many usernames can call preload() so a whole page costs one query.
 """
 
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session as ORMSession
 from sqlmodel import Session, select
-from models import User, engine
+from models import User
+
+
+USERNAME_CACHE_SIZE = 2048
+SUPPORTER_FIELDS = ('is_supporter', 'supporter_since', 'supporter_type')
+
+_display_version = 0
+
+
+def invalidate_username_display_cache() -> None:
+    """Invalidate cached supporter data in every UsernameDisplayService instance."""
+    global _display_version
+    _display_version += 1
+
+
+def _changes_supporter_display(session) -> bool:
+    for obj in session.new | session.deleted:
+        if isinstance(obj, User):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = sa_inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in SUPPORTER_FIELDS):
+                return True
+    return False
+
+
+def _note_user_changes(session, flush_context) -> None:
+    if _changes_supporter_display(session):
+        session.info['username_display_changed'] = True
+
+
+def _invalidate_after_commit(session) -> None:
+    if session.info.pop('username_display_changed', False):
+        invalidate_username_display_cache()
+
+
+def _discard_after_rollback(session) -> None:
+    session.info.pop('username_display_changed', None)
+
+
+# Flushes mark the session; caches are only dropped once the change is committed
+# so a concurrent lookup can't cache the pre-commit row under the new version
+event.listen(ORMSession, "after_flush", _note_user_changes)
+event.listen(ORMSession, "after_commit", _invalidate_after_commit)
+event.listen(ORMSession, "after_rollback", _discard_after_rollback)
 
 
 class UsernameDisplayService:
     """Service for centralized username display with supporter badges."""
-    
-    def __init__(self):
-        self._user_cache = {}  # Simple in-memory cache for performance
-    
-    def get_user_display_data(self, username: str, session: Session) -> Dict:
+
+    def __init__(self, max_entries: int = USERNAME_CACHE_SIZE):
+        self._user_cache = OrderedDict()  # Bounded LRU of username -> display data
+        self._max_entries = max_entries
+        self._cache_version = _display_version
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_display_data(username: str, user: Optional[User]) -> Dict:
+        """Snapshot the fields needed for display so no ORM object outlives its session."""
+        if not user:
+            return {
+                'username': username,
+                'is_supporter': False,
+                'supporter_since': None,
+                'user_object': None
+            }
+        return {
+            'username': user.display_name,
+            'is_supporter': user.is_supporter,
+            'supporter_since': user.supporter_since,
+            'user_object': SimpleNamespace(
+                display_name=user.display_name,
+                is_supporter=user.is_supporter,
+                supporter_since=user.supporter_since,
+                supporter_type=user.supporter_type
+            )
+        }
+
+    def _cache_get(self, username: str) -> Optional[Dict]:
+        with self._lock:
+            if self._cache_version != _display_version:
+                self._user_cache.clear()
+                self._cache_version = _display_version
+            user_data = self._user_cache.get(username)
+            if user_data is not None:
+                self._user_cache.move_to_end(username)
+            return user_data
+
+    def _cache_put(self, username: str, user_data: Dict) -> None:
+        with self._lock:
+            self._user_cache[username] = user_data
+            self._user_cache.move_to_end(username)
+            while len(self._user_cache) > self._max_entries:
+                self._user_cache.popitem(last=False)
+
+    def preload(self, usernames: Iterable[str], session: Session) -> None:
+        """
+        Load display data for every uncached username with a single query.
+
+        Args:
+            usernames: Usernames about to be rendered
+            session: Database session
+        """
+        missing = {name for name in usernames if name and self._cache_get(name) is None}
+        if not missing:
+            return
+
+        users = session.exec(select(User).where(User.display_name.in_(missing))).all()
+        found = {user.display_name: user for user in users}
+        for name in missing:
+            self._cache_put(name, self._build_display_data(name, found.get(name)))
+
+    def get_user_display_data(self, username: str, session: Optional[Session] = None) -> Dict:
         """
         Get complete user display data including supporter status.
-        
+
         Args:
             username: The username to look up
-            session: Database session
-            
+            session: Database session (a short-lived one is opened on a cache miss if omitted)
+
         Returns:
             Dict with user data including supporter status
         """
         if not username:
             return {'username': '', 'is_supporter': False, 'supporter_since': None}
-        
+
         # Check cache first
-        if username in self._user_cache:
-            return self._user_cache[username]
-        
+        user_data = self._cache_get(username)
+        if user_data is not None:
+            return user_data
+
         # Query database
-        user = session.exec(select(User).where(User.display_name == username)).first()
-        
-        if user:
-            user_data = {
-                'username': user.display_name,
-                'is_supporter': user.is_supporter,
-                'supporter_since': user.supporter_since,
-                'user_object': user
-            }
+        if session is None:
+            from models import engine  # Resolved at call time so a swapped engine is honoured
+            with Session(engine) as own_session:
+                user = own_session.exec(select(User).where(User.display_name == username)).first()
+                user_data = self._build_display_data(username, user)
         else:
-            user_data = {
-                'username': username,
-                'is_supporter': False,
-                'supporter_since': None,
-                'user_object': None
-            }
-        
+            user = session.exec(select(User).where(User.display_name == username)).first()
+            user_data = self._build_display_data(username, user)
+
         # Cache the result
-        self._user_cache[username] = user_data
+        self._cache_put(username, user_data)
         return user_data
-    
-    def render_username_with_badge(self, username: str, session: Session) -> str:
+
+    def render_username_with_badge(self, username: str, session: Optional[Session] = None) -> str:
         """
         Render username with supporter badge HTML.
-        
+
         Args:
             username: The username to render
-            session: Database session
-            
+            session: Database session (optional, only used on a cache miss)
+
         Returns:
             HTML string with username and supporter badge if applicable
         """
         user_data = self.get_user_display_data(username, session)
-        
+
         if user_data['is_supporter'] and user_data['user_object']:
             from app_helpers.services.supporter_badge_service import supporter_badge_service
             badge_html = supporter_badge_service.generate_user_badge_html(user_data['user_object'])
             return f'{username}{badge_html}'
-        
+
         return username
-    
+
     def add_user_objects_to_prayers(self, prayers: List[Dict], session: Session) -> List[Dict]:
         """
         Add user objects to prayer dictionaries for badge support.
-        
+
         Args:
             prayers: List of prayer dictionaries
             session: Database session
-            
+
         Returns:
             Updated prayer dictionaries with user objects and display HTML
         """
+        self.preload((prayer.get('author_name') for prayer in prayers), session)
         for prayer in prayers:
             if 'author_name' in prayer:
                 user_data = self.get_user_display_data(prayer['author_name'], session)
@@ -94,13 +202,14 @@ class UsernameDisplayService:
                 prayer['author_display_html'] = self.render_username_with_badge(
                     prayer['author_name'], session
                 )
-        
+
         return prayers
-    
+
     def clear_cache(self):
         """Clear the user cache - useful for testing or when user data changes."""
-        self._user_cache.clear()
+        with self._lock:
+            self._user_cache.clear()
 
 
 # Global instance for use throughout the application
-username_display_service = UsernameDisplayService()
\ No newline at end of file
+username_display_service = UsernameDisplayService()
@@ -5,9 +5,12 @@ This ensures all route modules use the same Jinja2Templates instance with filter
 
 import os
 from fastapi.templating import Jinja2Templates
+from app_helpers.utils.request_metrics import TimedTemplate
 
 # Create the shared templates instance
 templates = Jinja2Templates(directory="templates")
+# Top-level renders report their time to the request metrics middleware
+templates.env.template_class = TimedTemplate
 
 # Register custom template filters
 from app_helpers.template_filters import register_filters
@@ -26,8 +26,10 @@ def timezone_format_filter(dt: datetime, timezone_str: str = None) -> str:
         timezone_str: Target timezone string
         
     Returns:
-        Formatted timestamp string
+        Formatted timestamp string (memoized per timestamp and timezone)
     """
+    if dt is None:
+        return ""
     return format_timestamp_for_timezone(dt, timezone_str)
 
 
@@ -101,11 +103,9 @@ def username_display_filter(username: str) -> str:
     
     # Import here to avoid circular imports
     from app_helpers.services.username_display_service import username_display_service
-    from models import engine
-    from sqlmodel import Session
     
-    with Session(engine) as session:
-        return username_display_service.render_username_with_badge(username, session)
+    # Served from the shared cache (routes preload it per page); only a miss touches the database
+    return username_display_service.render_username_with_badge(username)
 
 
 def prayer_file_url_filter(prayer) -> Optional[str]:
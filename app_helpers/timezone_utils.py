@@ -1,8 +1,47 @@
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo, available_timezones
 from typing import Optional
 
 
+# Rendered timestamps are memoized per (datetime, timezone); a feed page re-renders the
+# same few hundred timestamps for every visitor in the same timezone.
+FORMATTED_TIMESTAMP_CACHE_SIZE = 8192
+
+_UTC = ZoneInfo("UTC")
+
+
+@lru_cache(maxsize=1)
+def get_available_timezones() -> frozenset:
+    """
+    Get the set of timezone names known to the system.
+    
+    available_timezones() walks the tzdata directories on every call, so the
+    result is computed once per process.
+    """
+    return frozenset(available_timezones())
+
+
+@lru_cache(maxsize=256)
+def get_zoneinfo(timezone_str: str) -> ZoneInfo:
+    """
+    Get a shared ZoneInfo instance for a timezone string.
+    
+    Raises:
+        ZoneInfoNotFoundError/ValueError if the timezone is not recognized
+    """
+    return ZoneInfo(timezone_str)
+
+
+@lru_cache(maxsize=FORMATTED_TIMESTAMP_CACHE_SIZE)
+def _format_timestamp_cached(dt: datetime, timezone_str: str) -> str:
+    try:
+        local_dt = dt.replace(tzinfo=_UTC).astimezone(get_zoneinfo(timezone_str))
+        return local_dt.strftime("%Y-%m-%d %H:%M:%S %Z")
+    except Exception:
+        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
 def format_timestamp_for_timezone(dt: datetime, timezone_str: Optional[str] = None) -> str:
     """
     Format a datetime object for display in a specific timezone.
@@ -17,12 +56,7 @@ def format_timestamp_for_timezone(dt: datetime, timezone_str: Optional[str] = No
     if not timezone_str:
         return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
     
-    try:
-        user_tz = ZoneInfo(timezone_str)
-        local_dt = dt.replace(tzinfo=ZoneInfo("UTC")).astimezone(user_tz)
-        return local_dt.strftime("%Y-%m-%d %H:%M:%S %Z")
-    except Exception:
-        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+    return _format_timestamp_cached(dt, timezone_str)
 
 
 def get_timezone_display_name(timezone_str: str) -> str:
@@ -36,7 +70,7 @@ def get_timezone_display_name(timezone_str: str) -> str:
         Friendly timezone name or the original string if conversion fails
     """
     try:
-        tz = ZoneInfo(timezone_str)
+        tz = get_zoneinfo(timezone_str)
         now = datetime.now(tz)
         return now.strftime("%Z")
     except Exception:
@@ -57,7 +91,7 @@ def validate_timezone(timezone_str: str) -> bool:
         return False
     
     try:
-        return timezone_str in available_timezones()
+        return timezone_str in get_available_timezones()
     except Exception:
         return False
 
@@ -84,4 +118,10 @@ def get_user_timezone_from_request(request) -> Optional[str]:
     if timezone_str and validate_timezone(timezone_str):
         return timezone_str
     
-    return None
\ No newline at end of file
+    return None
+
+def clear_timezone_caches() -> None:
+    """Clear the memoized timezone registry, ZoneInfo objects and formatted timestamps."""
+    get_available_timezones.cache_clear()
+    get_zoneinfo.cache_clear()
+    _format_timestamp_cached.cache_clear()
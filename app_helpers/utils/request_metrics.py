@@ -0,0 +1,218 @@
+# app_helpers/utils/request_metrics.py
+"""
+Per-request instrumentation: SQL statement count and time, archive file
+writes/fsyncs and template render time.
+
+The middleware installs a RequestMetrics object in a context variable for the
+duration of each request; SQLAlchemy cursor events, archive writers and the
+shared Jinja2 environment add to whichever object is current. Results are sent
+back as a Server-Timing header and aggregated per route for /admin/debug/requests.
+"""
+
+import os
+import re
+import time
+import threading
+from collections import Counter, OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from jinja2 import Template
+from sqlalchemy import event
+
+
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "true").lower() == "true"
+REQUEST_METRICS_RECENT_SIZE = 50
+REQUEST_METRICS_MAX_ROUTES = 500
+REPEATED_STATEMENT_THRESHOLD = 5  # Same statement this many times in one request suggests an N+1
+
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+_whitespace = re.compile(r"\s+")
+
+
+class RequestMetrics:
+    """Counters for a single request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = path
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.archive_writes = 0
+        self.archive_fsyncs = 0
+        self.template_time = 0.0
+        self.template_count = 0
+        self.statements = Counter()
+        self._lock = threading.Lock()
+
+    def record_query(self, statement: str, duration: float):
+        key = _whitespace.sub(" ", statement).strip()[:300]
+        with self._lock:
+            self.query_count += 1
+            self.db_time += duration
+            self.statements[key] += 1
+
+    def repeated_statements(self, threshold: int = REPEATED_STATEMENT_THRESHOLD) -> List[tuple]:
+        return [(stmt, count) for stmt, count in self.statements.most_common(5) if count >= threshold]
+
+    def server_timing(self, total: float) -> str:
+        """Format as a Server-Timing header value (durations in milliseconds)"""
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f};desc="{self.template_count} templates"',
+            f'archive;desc="{self.archive_writes} writes, {self.archive_fsyncs} fsyncs"',
+            f'total;dur={total * 1000:.1f}'
+        ])
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current_metrics.get()
+
+
+def record_archive_write(fsync: bool = True) -> None:
+    """Count an archive file write (and its fsync) against the current request"""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.archive_writes += 1
+        if fsync:
+            metrics.archive_fsyncs += 1
+
+
+# ───────── SQLAlchemy hooks ─────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_metrics.get() is not None:
+        conn.info.setdefault("request_metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    starts = conn.info.get("request_metrics_start")
+    if starts:
+        metrics.record_query(statement, time.perf_counter() - starts.pop())
+
+
+def install_query_hooks(engine) -> None:
+    """Attach statement counting/timing listeners to an engine (idempotent)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ───────── Template timing ─────────
+
+class TimedTemplate(Template):
+    """Jinja2 template that adds its top-level render time to the current request"""
+
+    def render(self, *args, **kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super().render(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.template_count += 1
+
+
+# ───────── Aggregation ─────────
+
+class RequestMetricsRegistry:
+    """Per-route aggregates plus the most recent requests, kept in memory"""
+
+    def __init__(self):
+        self._routes: "OrderedDict[str, Dict]" = OrderedDict()
+        self._recent = deque(maxlen=REQUEST_METRICS_RECENT_SIZE)
+        self._lock = threading.Lock()
+        self.since = datetime.utcnow()
+
+    def record(self, metrics: RequestMetrics, status_code: int, total: float):
+        key = f"{metrics.method} {metrics.route}"
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = {
+                    'route': key, 'requests': 0, 'queries': 0, 'max_queries': 0,
+                    'db_ms': 0.0, 'template_ms': 0.0, 'archive_writes': 0,
+                    'archive_fsyncs': 0, 'total_ms': 0.0, 'max_total_ms': 0.0
+                }
+                while len(self._routes) > REQUEST_METRICS_MAX_ROUTES:
+                    self._routes.popitem(last=False)
+            stats['requests'] += 1
+            stats['queries'] += metrics.query_count
+            stats['max_queries'] = max(stats['max_queries'], metrics.query_count)
+            stats['db_ms'] += metrics.db_time * 1000
+            stats['template_ms'] += metrics.template_time * 1000
+            stats['archive_writes'] += metrics.archive_writes
+            stats['archive_fsyncs'] += metrics.archive_fsyncs
+            stats['total_ms'] += total * 1000
+            stats['max_total_ms'] = max(stats['max_total_ms'], total * 1000)
+
+            self._recent.appendleft({
+                'at': datetime.utcnow(),
+                'method': metrics.method,
+                'path': metrics.path,
+                'status': status_code,
+                'queries': metrics.query_count,
+                'db_ms': metrics.db_time * 1000,
+                'template_ms': metrics.template_time * 1000,
+                'archive_writes': metrics.archive_writes,
+                'archive_fsyncs': metrics.archive_fsyncs,
+                'total_ms': total * 1000,
+                'repeated_statements': metrics.repeated_statements()
+            })
+
+    def route_summaries(self) -> List[Dict]:
+        """Per-route averages, busiest (most queries per request) first"""
+        with self._lock:
+            summaries = []
+            for stats in self._routes.values():
+                count = stats['requests']
+                summaries.append({
+                    **stats,
+                    'avg_queries': stats['queries'] / count,
+                    'avg_db_ms': stats['db_ms'] / count,
+                    'avg_template_ms': stats['template_ms'] / count,
+                    'avg_total_ms': stats['total_ms'] / count
+                })
+        return sorted(summaries, key=lambda s: s['avg_queries'], reverse=True)
+
+    def recent_requests(self) -> List[Dict]:
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._recent.clear()
+            self.since = datetime.utcnow()
+
+
+request_metrics_registry = RequestMetricsRegistry()
+
+
+async def request_metrics_middleware(request, call_next):
+    """HTTP middleware recording per-request metrics and emitting Server-Timing"""
+    if not REQUEST_METRICS_ENABLED or request.url.path.startswith("/static"):
+        return await call_next(request)
+
+    metrics = RequestMetrics(request.method, request.url.path)
+    token = _current_metrics.set(metrics)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_metrics.reset(token)
+
+    route = request.scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        metrics.route = route.path
+    total = time.perf_counter() - metrics.started
+    response.headers["Server-Timing"] = metrics.server_timing(total)
+    request_metrics_registry.record(metrics, response.status_code, total)
+    return response
@@ -115,34 +115,78 @@ def validate_username(username: Optional[str]) -> tuple[bool, Optional[str]]:
         
     return True, normalized
 
-# For backward compatibility and migration
 def find_users_with_equivalent_usernames(session, target_username: str):
     """
     Find all users with usernames equivalent to the target username.
-    Used for migration and duplicate detection.
+    Used for login, invite claims, migration and duplicate detection.
+    
+    Resolves through the unique normalized_name index, plus the (rare) users whose
+    normalized_name is still NULL because they are legacy duplicates or have not
+    been backfilled yet.
     
     Args:
         session: Database session
         target_username: Username to find equivalents for
         
     Returns:
-        List of User objects with equivalent usernames
+        List of User objects with equivalent usernames, canonical account first
     """
-    from sqlmodel import select
+    from sqlmodel import select, or_
     from models import User
     
     normalized_target = normalize_username_for_lookup(target_username)
     if not normalized_target:
         return []
     
-    # Get all users and filter by normalized username
-    # Note: This is not the most efficient approach for large datasets,
-    # but it's reliable for finding all variations
-    all_users = session.exec(select(User)).all()
+    candidates = session.exec(
+        select(User).where(or_(User.normalized_name == normalized_target,
+                               User.normalized_name.is_(None)))
+    ).all()
+    
+    equivalent_users = [
+        user for user in candidates
+        if user.normalized_name == normalized_target
+        or normalize_username_for_lookup(user.display_name) == normalized_target
+    ]
+    # The indexed holder is the account logins resolve to; unindexed duplicates follow
+    equivalent_users.sort(key=lambda u: (u.normalized_name is None, u.created_at))
+    return equivalent_users
+
+def backfill_normalized_names(session) -> int:
+    """
+    Fill in normalized_name for users the SQL migration could not normalize.
+    
+    The oldest account of each equivalent group claims the key; accounts whose
+    key is already taken stay NULL and are reported as duplicates.
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        Number of users updated
+    """
+    from sqlmodel import select
+    from models import User
+    
+    pending = session.exec(
+        select(User).where(User.normalized_name.is_(None)).order_by(User.created_at)
+    ).all()
+    if not pending:
+        return 0
+    
+    keys = {normalize_username_for_lookup(user.display_name) for user in pending} - {None}
+    taken = set(session.exec(select(User.normalized_name).where(User.normalized_name.in_(keys))).all()) if keys else set()
     
-    equivalent_users = []
-    for user in all_users:
-        if usernames_are_equivalent(user.display_name, target_username):
-            equivalent_users.append(user)
+    updated = 0
+    for user in pending:
+        normalized = normalize_username_for_lookup(user.display_name)
+        if normalized is None or normalized in taken:
+            continue
+        user.normalized_name = normalized
+        session.add(user)
+        taken.add(normalized)
+        updated += 1
     
-    return equivalent_users
\ No newline at end of file
+    if updated:
+        session.commit()
+    return updated
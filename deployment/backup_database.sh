@@ -53,19 +53,21 @@ if [ ! -r "$DB_PATH" ]; then
     exit 1
 fi
 
-# Create the backup using cp (simple and reliable)
-if cp "$DB_PATH" "$BACKUP_PATH"; then
+# Create the backup with SQLite's online backup API - unlike cp this includes
+# changes still in the -wal file and never captures a half-written page
+if sqlite3 "$DB_PATH" ".backup '$BACKUP_PATH'"; then
     echo "Backup created successfully!"
     
-    # Verify backup file size matches original
-    ORIGINAL_SIZE=$(stat -c%s "$DB_PATH" 2>/dev/null || echo "0")
+    # Verify backup with SQLite's integrity check rather than file size
+    INTEGRITY=$(sqlite3 "$BACKUP_PATH" "PRAGMA integrity_check;" 2>&1)
     BACKUP_SIZE=$(stat -c%s "$BACKUP_PATH" 2>/dev/null || echo "0")
     
-    if [ "$ORIGINAL_SIZE" -eq "$BACKUP_SIZE" ] && [ "$ORIGINAL_SIZE" -gt "0" ]; then
-        echo "Backup verification successful (size: $BACKUP_SIZE bytes)"
+    if [ "$INTEGRITY" = "ok" ]; then
+        echo "Backup verification successful (integrity ok, size: $BACKUP_SIZE bytes)"
     else
-        echo "WARNING: Backup size verification failed"
-        echo "Original: $ORIGINAL_SIZE bytes, Backup: $BACKUP_SIZE bytes"
+        echo "WARNING: Backup integrity check failed"
+        echo "$INTEGRITY" | head -10
+        rm -f "$BACKUP_PATH"
         exit 1
     fi
     
@@ -0,0 +1,7 @@
+-- Remove normalized username lookup index
+-- Migration 013 rollback: normalized_username
+
+DROP INDEX IF EXISTS ix_user_normalized_name;
+
+-- Note: SQLite doesn't support DROP COLUMN on older versions, so normalized_name remains.
+-- The column is nullable and is ignored by code that predates this migration.
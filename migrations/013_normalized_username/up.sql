@@ -0,0 +1,30 @@
+-- Add a persisted lookup key for case/whitespace-insensitive username resolution
+-- Migration 013: normalized_username
+
+ALTER TABLE user ADD COLUMN normalized_name VARCHAR;
+
+-- Backfill plain printable-ASCII names here, where lower(trim()) matches the Python normalizer.
+-- Only the oldest account of each equivalent group gets the key so the unique index can be built.
+-- Remaining names are filled in by the startup duplicate user migration, and accounts whose
+-- key is already taken are left NULL and reported as duplicates.
+UPDATE user SET normalized_name = lower(trim(display_name))
+WHERE display_name IN (
+    SELECT display_name FROM (
+        SELECT display_name,
+               ROW_NUMBER() OVER (
+                   PARTITION BY lower(trim(display_name))
+                   ORDER BY created_at, display_name
+               ) AS group_rank
+        FROM user
+        WHERE normalized_name IS NULL
+          AND display_name NOT GLOB '*[^ -~]*'
+          AND display_name NOT LIKE '%  %'
+          AND length(trim(display_name)) BETWEEN 1 AND 100
+    )
+    WHERE group_rank = 1
+)
+AND lower(trim(display_name)) NOT IN (
+    SELECT normalized_name FROM user WHERE normalized_name IS NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_user_normalized_name ON user(normalized_name);
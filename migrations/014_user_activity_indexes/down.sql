@@ -0,0 +1,5 @@
+-- Remove user activity summary indexes
+-- Migration 014 rollback: user_activity_indexes
+
+DROP INDEX IF EXISTS idx_prayermark_username_activity;
+DROP INDEX IF EXISTS idx_prayer_author_activity;
@@ -0,0 +1,8 @@
+-- Covering indexes for per-user activity summaries on the /users directory
+-- Migration 014: user_activity_indexes
+
+-- Marks per user: count, distinct prayers and last mark come straight from the index
+CREATE INDEX IF NOT EXISTS idx_prayermark_username_activity ON prayermark(username, prayer_id, created_at);
+
+-- Prayers per author: flagged filter and last request date without touching the table
+CREATE INDEX IF NOT EXISTS idx_prayer_author_activity ON prayer(author_username, flagged, created_at);
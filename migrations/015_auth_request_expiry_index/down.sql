@@ -0,0 +1,4 @@
+-- Remove authentication request expiry index
+-- Migration 015 rollback: auth_request_expiry_index
+
+DROP INDEX IF EXISTS idx_authrequest_status_expires;
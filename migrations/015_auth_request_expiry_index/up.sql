@@ -0,0 +1,5 @@
+-- Index for expiring authentication requests in batches
+-- Migration 015: auth_request_expiry_index
+
+-- The expiry task and pending-request listings filter on status and compare expires_at
+CREATE INDEX IF NOT EXISTS idx_authrequest_status_expires ON authenticationrequest(status, expires_at);
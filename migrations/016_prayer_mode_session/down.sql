@@ -0,0 +1,4 @@
+-- Drop prayer mode sessions and the skip history index
+
+DROP INDEX IF EXISTS idx_prayerskip_user_prayer;
+DROP TABLE IF EXISTS prayer_mode_session;
@@ -0,0 +1,15 @@
+-- Server-side prayer mode sessions so navigation reuses a scored queue
+-- Migration 016: prayer_mode_session
+
+CREATE TABLE IF NOT EXISTS prayer_mode_session (
+    user_id TEXT PRIMARY KEY,
+    queue TEXT NOT NULL DEFAULT '[]',
+    candidates TEXT NOT NULL DEFAULT '[]',
+    cursor INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    expires_at DATETIME NOT NULL
+);
+
+-- Per-user skip history is aggregated in one grouped query when scoring
+CREATE INDEX IF NOT EXISTS idx_prayerskip_user_prayer ON prayerskip(user_id, prayer_id, created_at);
@@ -0,0 +1,5 @@
+-- Drop the community activity timeline
+
+DROP INDEX IF EXISTS idx_activity_timeline_created;
+DROP INDEX IF EXISTS idx_activity_timeline_prayer;
+DROP TABLE IF EXISTS activity_timeline;
@@ -0,0 +1,47 @@
+-- Append-only community activity timeline read by /activity with keyset pagination
+-- Migration 017: activity_timeline
+
+CREATE TABLE IF NOT EXISTS activity_timeline (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type VARCHAR(20) NOT NULL,
+    prayer_id TEXT NOT NULL,
+    actor_username TEXT NOT NULL,
+    author_username TEXT NOT NULL,
+    snippet TEXT NOT NULL DEFAULT '',
+    snippet_is_prayer BOOLEAN NOT NULL DEFAULT 0,
+    hidden BOOLEAN NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_timeline_created ON activity_timeline(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_activity_timeline_prayer ON activity_timeline(prayer_id);
+
+-- Backfill from existing prayers, marks and answer attributes (the table may already exist empty)
+DELETE FROM activity_timeline;
+
+INSERT INTO activity_timeline
+    (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+    SELECT 'prayer', p.id, p.author_username, p.author_username, substr(COALESCE(NULLIF(p.generated_prayer, ''), p.text), 1, 150) || CASE WHEN length(COALESCE(NULLIF(p.generated_prayer, ''), p.text)) > 150 THEN '...' ELSE '' END,
+           NULLIF(p.generated_prayer, '') IS NOT NULL, p.flagged, p.created_at
+    FROM prayer p;
+
+INSERT INTO activity_timeline
+    (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+    SELECT 'prayed', p.id, m.username, p.author_username, substr(COALESCE(NULLIF(p.generated_prayer, ''), p.text), 1, 150) || CASE WHEN length(COALESCE(NULLIF(p.generated_prayer, ''), p.text)) > 150 THEN '...' ELSE '' END,
+           NULLIF(p.generated_prayer, '') IS NOT NULL, p.flagged, m.created_at
+    FROM prayermark m JOIN prayer p ON p.id = m.prayer_id;
+
+INSERT INTO activity_timeline
+    (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+    SELECT 'answered', p.id, COALESCE(a.created_by, p.author_username), p.author_username,
+           substr(COALESCE(NULLIF(p.generated_prayer, ''), p.text), 1, 150) || CASE WHEN length(COALESCE(NULLIF(p.generated_prayer, ''), p.text)) > 150 THEN '...' ELSE '' END, NULLIF(p.generated_prayer, '') IS NOT NULL,
+           p.flagged, a.created_at
+    FROM prayer_attributes a JOIN prayer p ON p.id = a.prayer_id
+    WHERE a.attribute_name = 'answered';
+
+INSERT INTO activity_timeline
+    (event_type, prayer_id, actor_username, author_username, snippet, snippet_is_prayer, hidden, created_at)
+    SELECT 'testimony', p.id, COALESCE(a.created_by, p.author_username), p.author_username,
+           substr(a.attribute_value, 1, 150) || CASE WHEN length(a.attribute_value) > 150 THEN '...' ELSE '' END, 0, p.flagged, a.created_at
+    FROM prayer_attributes a JOIN prayer p ON p.id = a.prayer_id
+    WHERE a.attribute_name = 'answer_testimony';
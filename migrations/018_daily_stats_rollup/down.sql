@@ -0,0 +1,4 @@
+-- Drop the daily statistics rollup
+
+DROP TABLE IF EXISTS daily_prayer_user;
+DROP TABLE IF EXISTS daily_stats;
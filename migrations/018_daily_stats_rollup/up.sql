@@ -0,0 +1,42 @@
+-- Per-day rollup for admin analytics, backfilled from existing prayers, marks, users and answers
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day VARCHAR(10) NOT NULL PRIMARY KEY,
+    prayers INTEGER NOT NULL DEFAULT 0,
+    marks INTEGER NOT NULL DEFAULT 0,
+    prayer_users INTEGER NOT NULL DEFAULT 0,
+    registrations INTEGER NOT NULL DEFAULT 0,
+    answered INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS daily_prayer_user (
+    day VARCHAR(10) NOT NULL,
+    username VARCHAR NOT NULL,
+    PRIMARY KEY (day, username)
+);
+
+DELETE FROM daily_stats;
+
+DELETE FROM daily_prayer_user;
+
+INSERT INTO daily_prayer_user (day, username)
+SELECT DISTINCT date(created_at), username FROM prayermark WHERE created_at IS NOT NULL;
+
+INSERT INTO daily_stats (day, prayers, marks, prayer_users, registrations, answered)
+SELECT day, SUM(prayers), SUM(marks), SUM(prayer_users), SUM(registrations), SUM(answered) FROM (
+    SELECT date(created_at) AS day, COUNT(*) AS prayers, 0 AS marks, 0 AS prayer_users,
+           0 AS registrations, 0 AS answered
+    FROM prayer WHERE created_at IS NOT NULL GROUP BY 1
+    UNION ALL
+    SELECT date(created_at), 0, COUNT(*), 0, 0, 0
+    FROM prayermark WHERE created_at IS NOT NULL GROUP BY 1
+    UNION ALL
+    SELECT day, 0, 0, COUNT(*), 0, 0
+    FROM daily_prayer_user GROUP BY 1
+    UNION ALL
+    SELECT date(created_at), 0, 0, 0, COUNT(*), 0
+    FROM user WHERE created_at IS NOT NULL GROUP BY 1
+    UNION ALL
+    SELECT date(created_at), 0, 0, 0, 0, COUNT(*)
+    FROM prayer_attributes WHERE attribute_name = 'answered' AND created_at IS NOT NULL GROUP BY 1
+) GROUP BY day;
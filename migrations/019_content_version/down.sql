@@ -0,0 +1,3 @@
+-- Drop the content version counters
+
+DROP TABLE IF EXISTS content_version;
@@ -0,0 +1,9 @@
+-- Change counters used to build ETags for conditional GETs on the feed
+
+CREATE TABLE IF NOT EXISTS content_version (
+    scope VARCHAR NOT NULL PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL
+);
+
+INSERT OR IGNORE INTO content_version (scope, version, updated_at) VALUES ('feed', 1, CURRENT_TIMESTAMP);
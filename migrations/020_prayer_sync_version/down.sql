@@ -0,0 +1,4 @@
+-- Drop the offline sync versions
+
+DROP INDEX IF EXISTS ix_prayer_sync_version_version;
+DROP TABLE IF EXISTS prayer_sync_version;
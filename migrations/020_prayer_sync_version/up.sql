@@ -0,0 +1,16 @@
+-- Per-prayer change sequence for offline delta sync, seeded for existing prayers
+
+CREATE TABLE IF NOT EXISTS prayer_sync_version (
+    prayer_id VARCHAR NOT NULL PRIMARY KEY,
+    version INTEGER NOT NULL,
+    changed_at DATETIME NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_prayer_sync_version_version ON prayer_sync_version(version);
+
+INSERT INTO prayer_sync_version (prayer_id, version, changed_at)
+SELECT id,
+       (SELECT COALESCE(MAX(version), 0) FROM prayer_sync_version) + ROW_NUMBER() OVER (ORDER BY created_at, id),
+       CURRENT_TIMESTAMP
+FROM prayer
+WHERE id NOT IN (SELECT prayer_id FROM prayer_sync_version);
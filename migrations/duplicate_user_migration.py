@@ -17,31 +17,36 @@ from app_helpers.utils.username_helpers import (
     normalize_username, 
     normalize_username_for_lookup, 
     usernames_are_equivalent,
-    find_users_with_equivalent_usernames
+    find_users_with_equivalent_usernames,
+    backfill_normalized_names
 )
 
-def find_duplicate_usernames(session: Session):
-    """Find all usernames that have duplicates after normalization"""
-    # Get all users and group by normalized username
-    all_users = session.exec(select(User)).all()
-    
-    # Group users by normalized username
-    normalized_groups = {}
-    for user in all_users:
+def find_duplicate_groups(session: Session):
+    """Group equivalent accounts using the normalized_name index.
+
+    Accounts holding a normalized_name are unique by construction, so duplicates are
+    the accounts left with a NULL key whose normalized form is held or shared.
+    Returns {normalized_name: [users]} with the indexed (canonical) account first.
+    """
+    groups = {}
+    for user in session.exec(select(User).where(User.normalized_name.is_(None))).all():
         normalized = normalize_username_for_lookup(user.display_name)
         if normalized:
-            if normalized not in normalized_groups:
-                normalized_groups[normalized] = []
-            normalized_groups[normalized].append(user)
+            groups.setdefault(normalized, []).append(user)
     
-    # Find groups with more than one user
-    duplicates = []
-    for normalized_name, users in normalized_groups.items():
-        if len(users) > 1:
-            # Use the display name of the first user as representative
-            duplicates.append((users[0].display_name, len(users)))
+    if groups:
+        holders = session.exec(select(User).where(User.normalized_name.in_(list(groups)))).all()
+        for holder in holders:
+            groups[holder.normalized_name].insert(0, holder)
     
-    return duplicates
+    for users in groups.values():
+        users.sort(key=lambda u: (u.normalized_name is None, u.created_at))
+    return {normalized: users for normalized, users in groups.items() if len(users) > 1}
+
+def find_duplicate_usernames(session: Session):
+    """Find all usernames that have duplicates after normalization"""
+    # Use the display name of the canonical user as representative
+    return [(users[0].display_name, len(users)) for users in find_duplicate_groups(session).values()]
 
 def get_users_by_username(session: Session, username: str):
     """Get all users with equivalent usernames (normalized)"""
@@ -253,6 +258,11 @@ def run_duplicate_user_migration():
     print("🔄 Checking for duplicate users...")
     
     with Session(engine) as session:
+        # Give every account the migration could not normalize in SQL its lookup key
+        backfilled = backfill_normalized_names(session)
+        if backfilled:
+            print(f"✅ Backfilled normalized names for {backfilled} users")
+        
         # Find duplicate usernames BEFORE normalization (to catch equivalent names)
         duplicates = find_duplicate_usernames(session)
         
@@ -308,25 +318,22 @@ def run_duplicate_user_migration():
 def check_duplicates_only():
     """Check and display duplicate users without merging"""
     with Session(engine) as session:
-        duplicates = find_duplicate_usernames(session)
+        backfill_normalized_names(session)
+        groups = find_duplicate_groups(session)
         
-        if not duplicates:
+        if not groups:
             print('✅ No duplicate usernames found')
             return
         
-        print(f'⚠️  Found {len(duplicates)} usernames with duplicates:')
-        for username, count in duplicates:
-            print(f'   "{username}": {count} users')
+        print(f'⚠️  Found {len(groups)} usernames with duplicates:')
+        for normalized, users in groups.items():
+            print(f'   "{users[0].display_name}": {len(users)} users (key "{normalized}")')
         
-        # Get specific user IDs for each duplicate
-        for username, count in duplicates:
-            users = get_users_by_username(session, username)
-            
-            print(f'\n📋 Users with username "{username}":')
-            sorted_users = sorted(users, key=lambda u: u.created_at)
-            for i, user in enumerate(sorted_users):
+        for normalized, users in groups.items():
+            print(f'\n📋 Users with username "{users[0].display_name}":')
+            for i, user in enumerate(users):
                 marker = '👑 PRIMARY' if i == 0 else '🔄 DUPLICATE'
-                print(f'   {marker}: {user.id} (created: {user.created_at})')
+                print(f'   {marker}: "{user.display_name}" (created: {user.created_at})')
 
 def interactive_merge():
     """Run migration with user confirmation"""
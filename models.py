@@ -1,9 +1,14 @@
 from sqlmodel import Field, SQLModel, create_engine, Session, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session as ORMSession
 from datetime import datetime
 import uuid
 import secrets
 import sys
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 class User(SQLModel, table=True):
     display_name: str = Field(primary_key=True)
@@ -19,6 +24,8 @@ class User(SQLModel, table=True):
     is_supporter: bool = Field(default=False)  # Manual supporter flag
     supporter_since: datetime | None = Field(default=None)  # When they became a supporter
     supporter_type: str | None = Field(default=None)  # Type of supporter: 'financial', 'prayer_warrior', 'advisor', 'community_leader' (comma-separated for multiple types)
+    # Case/whitespace-insensitive lookup key, maintained by the listeners below (NULL for legacy duplicates)
+    normalized_name: str | None = Field(default=None, index=True, unique=True)
     
     def has_role(self, role_name: str, session: Session) -> bool:
         """Check if user has a specific role"""
@@ -75,6 +82,58 @@ class User(SQLModel, table=True):
             # This property is mainly for templates, actual auth should use is_admin() function
             return False
 
+def _assign_normalized_names(session, flush_context, instances):
+    """Keep User.normalized_name in step with display_name for new and renamed users.
+
+    Runs once per flush so a batch of users costs a single index lookup. If an
+    equivalent username already owns the key (a legacy duplicate), the column is left
+    NULL instead of failing the write; such accounts show up in the duplicate report.
+    """
+    from sqlalchemy import inspect as sa_inspect
+    from app_helpers.utils.username_helpers import normalize_username_for_lookup
+
+    pending = [obj for obj in session.new if isinstance(obj, User)]
+    own_names = set()
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        history = sa_inspect(obj).attrs.display_name.history
+        if history.has_changes() or obj.normalized_name is None:
+            pending.append(obj)
+            own_names.update(history.deleted)
+    if not pending:
+        return
+
+    keys = [(user, normalize_username_for_lookup(user.display_name)) for user in pending]
+    own_names.update(user.display_name for user in pending)
+    wanted = {normalized for _, normalized in keys} - {None}
+    taken = {}
+    if wanted:
+        columns = User.__table__.c
+        with session.no_autoflush:
+            rows = session.execute(
+                select(columns.normalized_name, columns.display_name).where(
+                    columns.normalized_name.in_(wanted),
+                    columns.display_name.not_in(own_names)
+                )
+            ).all()
+        taken = {normalized: holder for normalized, holder in rows}
+
+    for user, normalized in keys:
+        if normalized is not None and normalized in taken:
+            logger.warning(
+                "Username %r is equivalent to existing user %r; leaving normalized_name unset",
+                user.display_name, taken[normalized]
+            )
+            normalized = None
+        elif normalized is not None:
+            taken[normalized] = user.display_name
+        if user.normalized_name != normalized:
+            user.normalized_name = normalized
+
+
+event.listen(ORMSession, "before_flush", _assign_normalized_names)
+
 class Role(SQLModel, table=True):
     """Roles define different permission levels in the system"""
     id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True)
@@ -231,6 +290,17 @@ class PrayerSkip(SQLModel, table=True):
     prayer_id: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class PrayerModeSession(SQLModel, table=True):
+    __tablename__ = 'prayer_mode_session'
+
+    user_id: str = Field(primary_key=True)  # One active prayer mode session per user
+    queue: str = "[]"  # JSON list of prayer ids in display order
+    candidates: str = "[]"  # JSON list of [prayer_id, score] ranked after the queue (refill source)
+    cursor: int = 0  # Position the user last viewed
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
 class AuthenticationRequest(SQLModel, table=True):
     id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True)
     user_id: str  # User requesting authentication
@@ -304,6 +374,20 @@ class PrayerActivityLog(SQLModel, table=True):
     # Text archive tracking
     text_file_path: str | None = Field(default=None)  # Path to the text archive file where this activity is logged
 
+class ActivityEvent(SQLModel, table=True):
+    __tablename__ = 'activity_timeline'
+
+    # Append-only community timeline with display fields copied in, read by /activity
+    id: int | None = Field(default=None, primary_key=True)
+    event_type: str = Field(max_length=20)  # 'prayer', 'prayed', 'answered', 'testimony'
+    prayer_id: str
+    actor_username: str  # Who did it
+    author_username: str  # Who wrote the prayer
+    snippet: str = ""  # Shortened prayer (or testimony) text for display
+    snippet_is_prayer: bool = Field(default=False)  # Snippet comes from the generated prayer
+    hidden: bool = Field(default=False)  # Prayer is flagged
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
 class InviteToken(SQLModel, table=True):
     token: str = Field(primary_key=True)
     created_by_user: str
@@ -353,6 +437,212 @@ class MembershipApplication(SQLModel, table=True):
     invite_token: str | None = None  # Generated invite token if approved
     text_file_path: str | None = None  # Path to text archive file (archive-first)
 
+
+class DailyStats(SQLModel, table=True):
+    __tablename__ = 'daily_stats'
+
+    # Per-day rollup behind admin analytics, kept current by _update_daily_stats below
+    day: str = Field(primary_key=True, max_length=10)  # YYYY-MM-DD of created_at
+    prayers: int = Field(default=0)
+    marks: int = Field(default=0)
+    prayer_users: int = Field(default=0)  # Distinct users who marked a prayer that day
+    registrations: int = Field(default=0)
+    answered: int = Field(default=0)
+
+
+class DailyPrayerUser(SQLModel, table=True):
+    __tablename__ = 'daily_prayer_user'
+
+    # Who prayed on which day; feeds prayer_users and distinct counts over longer periods
+    day: str = Field(primary_key=True, max_length=10)
+    username: str = Field(primary_key=True)
+
+
+_DAILY_STATS_UPSERT = (
+    "INSERT INTO daily_stats (day, prayers, marks, prayer_users, registrations, answered) "
+    "VALUES (:day, :prayers, :marks, :prayer_users, :registrations, :answered) "
+    "ON CONFLICT(day) DO UPDATE SET "
+    "prayers = prayers + excluded.prayers, marks = marks + excluded.marks, "
+    "prayer_users = prayer_users + excluded.prayer_users, "
+    "registrations = registrations + excluded.registrations, answered = answered + excluded.answered"
+)
+
+
+def _update_daily_stats(session, flush_context):
+    """Fold inserted/deleted prayers, marks, users and answers into the daily rollup"""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    deltas = {}
+    prayed = set()
+
+    def bump(created_at, column, amount):
+        if created_at is None:
+            return
+        day = created_at.strftime("%Y-%m-%d")
+        row = deltas.setdefault(day, {'day': day, 'prayers': 0, 'marks': 0, 'prayer_users': 0,
+                                      'registrations': 0, 'answered': 0})
+        row[column] += amount
+
+    for objects, amount in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            if isinstance(obj, Prayer):
+                bump(obj.created_at, 'prayers', amount)
+            elif isinstance(obj, PrayerMark):
+                bump(obj.created_at, 'marks', amount)
+                if amount > 0 and obj.created_at is not None:
+                    prayed.add((obj.created_at.strftime("%Y-%m-%d"), obj.username))
+            elif isinstance(obj, User):
+                bump(obj.created_at, 'registrations', amount)
+            elif isinstance(obj, PrayerAttribute) and obj.attribute_name == 'answered':
+                bump(obj.created_at, 'answered', amount)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    try:
+        for day, username in prayed:
+            inserted = connection.execute(
+                text("INSERT OR IGNORE INTO daily_prayer_user (day, username) VALUES (:day, :username)"),
+                {'day': day, 'username': username}
+            )
+            if inserted.rowcount == 1:
+                deltas[day]['prayer_users'] += 1
+        connection.execute(text(_DAILY_STATS_UPSERT), list(deltas.values()))
+    except OperationalError as e:
+        # Tables missing until migrations run; the rollup can be rebuilt afterwards
+        logger.warning("Daily statistics rollup not updated: %s", e)
+
+
+event.listen(ORMSession, "after_flush", _update_daily_stats)
+
+
+class ContentVersion(SQLModel, table=True):
+    __tablename__ = 'content_version'
+
+    # Change counter per scope, bumped at flush by the listeners below: 'feed' is
+    # folded into ETags so unchanged pages can be answered with 304 Not Modified,
+    # 'invite_tree' keys the cached invite tree in app_helpers.services.invite_helpers
+    scope: str = Field(primary_key=True)
+    version: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+_CONTENT_VERSION_BUMP = (
+    "INSERT INTO content_version (scope, version, updated_at) VALUES (:scope, 1, :now) "
+    "ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at"
+)
+
+# User columns the invite tree is built from
+INVITE_TREE_USER_FIELDS = ('display_name', 'created_at', 'invited_by_username', 'invite_token_used')
+
+
+def _bump_feed_version(session, flush_context):
+    """Advance the feed version when a flush touches anything the feed renders"""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    feed_types = (Prayer, PrayerAttribute, PrayerMark, User)
+    changed = any(isinstance(obj, feed_types) for obj in session.new) or \
+        any(isinstance(obj, feed_types) for obj in session.deleted) or \
+        any(isinstance(obj, feed_types) and session.is_modified(obj) for obj in session.dirty)
+    if not changed:
+        return
+    try:
+        session.connection().execute(text(_CONTENT_VERSION_BUMP), {'scope': 'feed', 'now': datetime.utcnow()})
+    except OperationalError as e:
+        # Table missing until migrations run; ETags then fall back to full renders
+        logger.warning("Feed version not updated: %s", e)
+
+
+def _bump_invite_tree_version(session, flush_context):
+    """Advance the invite tree version when users join/leave, are re-parented, or invites change"""
+    from sqlalchemy import inspect as sa_inspect, text
+    from sqlalchemy.exc import OperationalError
+
+    changed = any(isinstance(obj, (User, InviteToken)) for obj in session.new | session.deleted) or \
+        any(isinstance(obj, InviteToken) and session.is_modified(obj) for obj in session.dirty) or \
+        any(
+            isinstance(obj, User)
+            and any(sa_inspect(obj).attrs[field].history.has_changes() for field in INVITE_TREE_USER_FIELDS)
+            for obj in session.dirty
+        )
+    if not changed:
+        return
+    try:
+        session.connection().execute(text(_CONTENT_VERSION_BUMP), {'scope': 'invite_tree', 'now': datetime.utcnow()})
+    except OperationalError as e:
+        # Table missing until migrations run; the tree is then rebuilt on every request
+        logger.warning("Invite tree version not updated: %s", e)
+
+
+event.listen(ORMSession, "after_flush", _bump_feed_version)
+event.listen(ORMSession, "after_flush", _bump_invite_tree_version)
+
+
+class PrayerSyncVersion(SQLModel, table=True):
+    __tablename__ = 'prayer_sync_version'
+
+    # Latest change sequence per prayer, stamped at commit by _stamp_prayer_sync_versions below.
+    # Offline clients ask for prayers with version > their cursor (see offline_sync_service)
+    prayer_id: str = Field(primary_key=True)
+    version: int = Field(index=True, unique=True)
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+_PRAYER_SYNC_STAMP = (
+    "INSERT INTO prayer_sync_version (prayer_id, version, changed_at) "
+    "VALUES (:prayer_id, (SELECT COALESCE(MAX(version), 0) + 1 FROM prayer_sync_version), :now) "
+    "ON CONFLICT(prayer_id) DO UPDATE SET version = excluded.version, changed_at = excluded.changed_at"
+)
+
+
+def _collect_prayer_sync_changes(session, flush_context):
+    """Remember every prayer touched by this flush (itself, its attributes or marks)"""
+    prayer_ids = set()
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        if isinstance(obj, Prayer):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            prayer_ids.add(obj.id)
+        elif isinstance(obj, (PrayerAttribute, PrayerMark)) and obj.prayer_id:
+            prayer_ids.add(obj.prayer_id)
+    if prayer_ids:
+        session.info.setdefault('prayer_sync_pending', set()).update(prayer_ids)
+
+
+def _stamp_prayer_sync_versions(session):
+    """Give the prayers changed in this transaction one new sync version each, however many flushes it took"""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    # Pick up anything the commit's own flush would write
+    session.flush()
+    prayer_ids = session.info.pop('prayer_sync_pending', None)
+    if not prayer_ids:
+        return
+
+    now = datetime.utcnow()
+    try:
+        # Sorted so versions are assigned deterministically within a commit
+        session.connection().execute(
+            text(_PRAYER_SYNC_STAMP),
+            [{'prayer_id': prayer_id, 'now': now} for prayer_id in sorted(prayer_ids)]
+        )
+    except OperationalError as e:
+        # Table missing until migrations run; clients fall back to a full resync
+        logger.warning("Prayer sync versions not updated: %s", e)
+
+
+def _discard_prayer_sync_changes(session):
+    session.info.pop('prayer_sync_pending', None)
+
+
+event.listen(ORMSession, "after_flush", _collect_prayer_sync_changes)
+event.listen(ORMSession, "before_commit", _stamp_prayer_sync_versions)
+event.listen(ORMSession, "after_rollback", _discard_prayer_sync_changes)
+
+
 # Database engine configuration with intelligent path detection
 def get_database_path():
     """
@@ -385,6 +675,36 @@ engine = create_engine(
     pool_pre_ping=True if DATABASE_PATH != ':memory:' else False
 )
 
+# Per-connection SQLite settings. Apart from journal_mode these PRAGMAs only last
+# for the connection that runs them, so they are applied to every pooled
+# connection as it is opened rather than once at startup.
+SQLITE_PRAGMAS = {
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'cache_size': os.getenv('SQLITE_CACHE_SIZE', '10000'),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'memory'),
+    'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+    'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'wal_autocheckpoint': os.getenv('SQLITE_WAL_AUTOCHECKPOINT', '1000'),
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Engine "connect" listener applying SQLITE_PRAGMAS to a new DBAPI connection"""
+    import re
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            # Values come from the environment and are interpolated, so only allow plain words/numbers
+            if not re.fullmatch(r"-?\w+", str(value)):
+                logger.warning(f"Ignoring invalid SQLite PRAGMA value {name}={value!r}")
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+event.listen(engine, "connect", apply_sqlite_pragmas)
+
 # Database initialization is now handled by standalone script only
 # No automatic table creation on import to prevent accidental data loss
 
@@ -394,10 +714,8 @@ if DATABASE_PATH != ':memory:':
     with engine.connect() as conn:
         # Import text here to avoid top-level SQLAlchemy imports
         from sqlalchemy import text
+        # journal_mode is stored in the database file; the rest is set per connection above
         conn.execute(text("PRAGMA journal_mode=WAL"))
-        conn.execute(text("PRAGMA synchronous=NORMAL")) 
-        conn.execute(text("PRAGMA cache_size=10000"))
-        conn.execute(text("PRAGMA temp_store=memory"))
         
         # Create indexes for invite tree integrity (only if tables exist)
         try:
@@ -418,3 +736,36 @@ if DATABASE_PATH != ':memory:':
         
         conn.commit()
 
+
+
+# Read-only engine for read-heavy GET handlers and reporting services. Under WAL
+# readers never block the writer (or each other), so long listings, statistics
+# and exports run on their own pool instead of holding connections the write
+# path needs. mode=ro plus query_only makes an accidental write fail loudly.
+# In-memory databases cannot be shared between engines, so tests and the
+# disabled case read through the main engine.
+READ_ENGINE_ENABLED = os.getenv("READ_ENGINE_ENABLED", "true").lower() == "true"
+
+
+def apply_read_only_pragmas(dbapi_connection, connection_record=None):
+    """Engine "connect" listener for read-only connections"""
+    apply_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=1")
+    finally:
+        cursor.close()
+
+
+if DATABASE_PATH != ':memory:' and READ_ENGINE_ENABLED:
+    read_engine = create_engine(
+        f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        pool_size=int(os.getenv("READ_POOL_SIZE", "8")),
+        max_overflow=int(os.getenv("READ_POOL_MAX_OVERFLOW", "8")),
+        pool_pre_ping=True
+    )
+    event.listen(read_engine, "connect", apply_read_only_pragmas)
+else:
+    read_engine = engine
@@ -25,6 +25,26 @@ class UserEmail(SQLModel, table=True, metadata=email_metadata):
     def __repr__(self):
         return f"<UserEmail(user_id={self.user_id}, verified={self.email_verified})>"
 
+class EmailOutbox(SQLModel, table=True, metadata=email_metadata):
+    """Durable queue of outgoing emails, drained by the background sender"""
+    __tablename__ = "email_outbox"
+    
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True)
+    recipient_encrypted: str  # Encrypted like UserEmail.email_encrypted
+    subject: str
+    body_encrypted: str  # Bodies carry login links, so they are encrypted too and cleared once sent
+    status: str = Field(default="pending", index=True)  # pending, sending, sent, failed
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    claim_token: str | None = Field(default=None, index=True)
+    claimed_at: datetime | None = Field(default=None)
+    last_error: str | None = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: datetime | None = Field(default=None)
+    
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, status={self.status}, attempts={self.attempts})>"
+
 # Database path configuration for email database
 def get_email_database_path():
     """
@@ -55,4 +75,5 @@ email_engine = create_engine(
 )
 
 # Create only email tables in the email database
-UserEmail.__table__.create(email_engine, checkfirst=True)
\ No newline at end of file
+UserEmail.__table__.create(email_engine, checkfirst=True)
+EmailOutbox.__table__.create(email_engine, checkfirst=True)
\ No newline at end of file
@@ -2,24 +2,39 @@
 """
 Database backup utility for ThyWill
 Creates timestamped backups of the production database
+
+Backups use SQLite's online backup API (or VACUUM INTO), so they are consistent
+even while the app is writing to the WAL, and are verified with PRAGMA integrity_check.
 """
 
 import os
-import shutil
+import sys
+import sqlite3
 import time
 from pathlib import Path
 from datetime import datetime
 
-def create_backup():
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app_helpers.services.database_backup_service import (
+    create_online_backup, vacuum_into_backup, verify_database, IncrementalSnapshotService
+)
+
+DB_PATH = Path(os.getenv("DATABASE_PATH", "thywill.db"))
+BACKUP_DIR = Path("backups")
+SNAPSHOT_DIR = BACKUP_DIR / "incremental"
+
+def create_backup(use_vacuum: bool = False):
     """Create a timestamped backup of the database"""
-    db_path = Path("thywill.db")
+    db_path = DB_PATH
     
     if not db_path.exists():
-        print("❌ Database file not found: thywill.db")
+        print(f"❌ Database file not found: {db_path}")
         return False
     
     # Create backups directory if it doesn't exist
-    backup_dir = Path("backups")
+    backup_dir = BACKUP_DIR
     backup_dir.mkdir(exist_ok=True)
     
     # Create timestamped backup filename
@@ -27,19 +42,22 @@ def create_backup():
     backup_path = backup_dir / f"thywill_backup_{timestamp}.db"
     
     try:
-        # Copy database file
-        shutil.copy2(db_path, backup_path)
-        
-        # Get file sizes for verification
-        original_size = db_path.stat().st_size
-        backup_size = backup_path.stat().st_size
+        # Copy through SQLite so pages still in the -wal file are included
+        if use_vacuum:
+            result = vacuum_into_backup(str(db_path), str(backup_path))
+        else:
+            result = create_online_backup(str(db_path), str(backup_path))
         
-        if original_size == backup_size:
+        ok, messages = verify_database(str(backup_path))
+        if ok:
             print(f"✅ Backup created successfully: {backup_path}")
-            print(f"   Database size: {original_size:,} bytes")
+            print(f"   Backup size: {result['size_bytes']:,} bytes ({result['elapsed_seconds']}s)")
+            print(f"   Integrity check: ok")
             return True
         else:
-            print(f"❌ Backup verification failed (size mismatch)")
+            print(f"❌ Backup verification failed (integrity_check)")
+            for message in messages[:10]:
+                print(f"   {message}")
             backup_path.unlink()  # Delete failed backup
             return False
             
@@ -47,9 +65,25 @@ def create_backup():
         print(f"❌ Backup failed: {e}")
         return False
 
+def create_snapshot():
+    """Create an incremental snapshot holding only pages changed since the last one"""
+    if not DB_PATH.exists():
+        print(f"❌ Database file not found: {DB_PATH}")
+        return False
+    
+    try:
+        snapshot = IncrementalSnapshotService(str(DB_PATH), str(SNAPSHOT_DIR)).create_snapshot()
+        print(f"✅ Snapshot {snapshot['sequence']} created: {SNAPSHOT_DIR / snapshot['file']}")
+        print(f"   Changed pages: {snapshot['pages_written']:,} of {snapshot['page_count']:,}")
+        print(f"   Snapshot size: {snapshot['size_bytes']:,} bytes")
+        return True
+    except Exception as e:
+        print(f"❌ Snapshot failed: {e}")
+        return False
+
 def list_backups():
     """List all available backups"""
-    backup_dir = Path("backups")
+    backup_dir = BACKUP_DIR
     
     if not backup_dir.exists():
         print("No backups directory found")
@@ -67,25 +101,52 @@ def list_backups():
         mtime = datetime.fromtimestamp(backup.stat().st_mtime)
         print(f"  {backup.name} ({size:,} bytes, {mtime.strftime('%Y-%m-%d %H:%M:%S')})")
 
+def list_snapshots():
+    """List the incremental snapshot chain"""
+    snapshots = IncrementalSnapshotService(str(DB_PATH), str(SNAPSHOT_DIR)).load_chain()['snapshots']
+    if snapshots:
+        print("Incremental snapshots:")
+        for snapshot in reversed(snapshots):
+            print(f"  #{snapshot['sequence']} {snapshot['file']} "
+                  f"({snapshot['pages_written']:,}/{snapshot['page_count']:,} pages, {snapshot['size_bytes']:,} bytes)")
+
+def _restore_from_file(source_path: Path):
+    """Overwrite the live database through SQLite so its WAL stays consistent"""
+    db_path = DB_PATH
+    
+    # Create backup of current database before restore
+    if db_path.exists():
+        current_backup = f"thywill_before_restore_{int(time.time())}.db"
+        create_online_backup(str(db_path), str(BACKUP_DIR / current_backup))
+        print(f"📁 Current database backed up as: {current_backup}")
+    
+    source = sqlite3.connect(str(source_path))
+    try:
+        target = sqlite3.connect(str(db_path))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
 def restore_backup(backup_filename: str):
     """Restore from a backup file"""
-    backup_path = Path("backups") / backup_filename
+    backup_path = BACKUP_DIR / backup_filename
     
     if not backup_path.exists():
         print(f"❌ Backup file not found: {backup_path}")
         return False
     
-    db_path = Path("thywill.db")
-    
-    # Create backup of current database before restore
-    if db_path.exists():
-        current_backup = f"thywill_before_restore_{int(time.time())}.db"
-        shutil.copy2(db_path, Path("backups") / current_backup)
-        print(f"📁 Current database backed up as: {current_backup}")
+    ok, messages = verify_database(str(backup_path))
+    if not ok:
+        print(f"❌ Backup failed integrity check: {backup_path}")
+        for message in messages[:10]:
+            print(f"   {message}")
+        return False
     
     try:
-        # Restore the backup
-        shutil.copy2(backup_path, db_path)
+        _restore_from_file(backup_path)
         print(f"✅ Database restored from: {backup_filename}")
         return True
         
@@ -93,24 +154,53 @@ def restore_backup(backup_filename: str):
         print(f"❌ Restore failed: {e}")
         return False
 
-if __name__ == "__main__":
-    import sys
+def restore_snapshot(sequence: int = None):
+    """Rebuild the database from the incremental snapshot chain and restore it"""
+    restored_path = BACKUP_DIR / f"thywill_snapshot_restore_{int(time.time())}.db"
     
+    try:
+        result = IncrementalSnapshotService(str(DB_PATH), str(SNAPSHOT_DIR)).restore_snapshot(
+            str(restored_path), sequence
+        )
+        _restore_from_file(restored_path)
+        print(f"✅ Database restored from snapshot #{result['sequence']} "
+              f"({result['snapshots_applied']} snapshot files applied)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Snapshot restore failed: {e}")
+        return False
+    finally:
+        if restored_path.exists():
+            restored_path.unlink()
+
+if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python backup_database.py create       # Create new backup")
+        print("  python backup_database.py create       # Create new backup (online backup API)")
+        print("  python backup_database.py create --vacuum  # Create compacted backup with VACUUM INTO")
+        print("  python backup_database.py snapshot     # Incremental snapshot of changed pages")
         print("  python backup_database.py list         # List all backups")
         print("  python backup_database.py restore <filename>  # Restore from backup")
+        print("  python backup_database.py restore-snapshot [n]  # Restore from snapshot n (default latest)")
         sys.exit(1)
     
     command = sys.argv[1]
     
     if command == "create":
-        create_backup()
+        success = create_backup(use_vacuum="--vacuum" in sys.argv)
+    elif command == "snapshot":
+        success = create_snapshot()
     elif command == "list":
         list_backups()
+        list_snapshots()
+        success = True
     elif command == "restore" and len(sys.argv) >= 3:
-        restore_backup(sys.argv[2])
+        success = restore_backup(sys.argv[2])
+    elif command == "restore-snapshot":
+        success = restore_snapshot(int(sys.argv[2]) if len(sys.argv) >= 3 else None)
     else:
         print("Invalid command or missing filename for restore")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    
+    sys.exit(0 if success else 1)
\ No newline at end of file
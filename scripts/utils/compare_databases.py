@@ -8,22 +8,55 @@ Compares two SQLite database files and reports differences in:
 - Data content (with sampling for large tables)
 - Index structures
 
+With --checksum, data content is compared exactly instead of sampled: each table
+is split into primary-key ranges of --chunk-size rows, both databases compute a
+row-order-independent checksum per range, and only mismatched ranges are split
+further until the differing rows are found.
+
 Usage:
     python scripts/utils/compare_databases.py db1.db db2.db [--detailed] [--sample-size N]
+    python scripts/utils/compare_databases.py db1.db db2.db --checksum [--chunk-size N]
 """
 
 import sqlite3
 import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import hashlib
 
+# Sub-ranges a mismatched range is split into when drilling down
+DRILL_DOWN_FANOUT = 16
+# Ranges at or below this many rows are diffed row by row
+LEAF_RANGE_ROWS = 64
+# Example keys reported per difference type
+MAX_REPORTED_KEYS = 20
+
+
+class _RowChecksum:
+    """SQL aggregate: count and order-independent checksum of the rows it sees"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+    
+    def step(self, *values):
+        digest = hashlib.blake2b(repr(values).encode(), digest_size=8).digest()
+        self.total = (self.total + int.from_bytes(digest, 'big')) % (1 << 64)
+        self.count += 1
+    
+    def finalize(self):
+        return f"{self.count}:{self.total:016x}"
+
+
 class DatabaseComparator:
-    def __init__(self, db1_path: str, db2_path: str, sample_size: int = 100):
+    def __init__(self, db1_path: str, db2_path: str, sample_size: int = 100,
+                 checksum: bool = False, chunk_size: int = 1000):
         self.db1_path = db1_path
         self.db2_path = db2_path
         self.sample_size = sample_size
+        self.checksum = checksum
+        self.chunk_size = chunk_size
         self.differences = []
         
     def connect_databases(self):
@@ -33,6 +66,8 @@ class DatabaseComparator:
             self.conn1.row_factory = sqlite3.Row
             self.conn2 = sqlite3.connect(self.db2_path)
             self.conn2.row_factory = sqlite3.Row
+            for conn in (self.conn1, self.conn2):
+                conn.create_aggregate("tw_row_checksum", -1, _RowChecksum)
         except sqlite3.Error as e:
             print(f"Error connecting to databases: {e}")
             sys.exit(1)
@@ -85,6 +120,115 @@ class DatabaseComparator:
         data_str = str(sorted(data_tuples))
         return hashlib.md5(data_str.encode()).hexdigest()
     
+    def get_primary_key(self, conn: sqlite3.Connection, table_name: str) -> List[str]:
+        """Primary key columns in key order, or rowid for tables without one"""
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA table_info(`{table_name}`)")
+        pk_columns = sorted((row[5], row[1]) for row in cursor.fetchall() if row[5] > 0)
+        return [name for _, name in pk_columns] or ['rowid']
+    
+    def _range_clause(self, key: List[str], lo: Optional[tuple], hi: Optional[tuple]) -> Tuple[str, list]:
+        """WHERE clause selecting keys in [lo, hi); None means unbounded"""
+        key_expr = f"({', '.join(f'`{col}`' for col in key)})" if len(key) > 1 else f"`{key[0]}`"
+        placeholders = f"({', '.join('?' for _ in key)})" if len(key) > 1 else "?"
+        conditions, params = [], []
+        if lo is not None:
+            conditions.append(f"{key_expr} >= {placeholders}")
+            params.extend(lo)
+        if hi is not None:
+            conditions.append(f"{key_expr} < {placeholders}")
+            params.extend(hi)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+    
+    def range_checksum(self, conn: sqlite3.Connection, table_name: str, columns: List[str],
+                       key: List[str], lo: Optional[tuple], hi: Optional[tuple]) -> Tuple[int, str]:
+        """Row count and checksum for one key range"""
+        where, params = self._range_clause(key, lo, hi)
+        column_list = ', '.join(f'`{col}`' for col in columns)
+        cursor = conn.execute(f"SELECT tw_row_checksum({column_list}) FROM `{table_name}`{where}", params)
+        result = cursor.fetchone()[0]
+        return int(result.split(':', 1)[0]), result
+    
+    def _range_boundaries(self, conn: sqlite3.Connection, table_name: str, key: List[str],
+                          lo: Optional[tuple], hi: Optional[tuple], step: int) -> List[tuple]:
+        """Every step-th key in [lo, hi), read from the primary key index only"""
+        where, params = self._range_clause(key, lo, hi)
+        key_list = ', '.join(f'`{col}`' for col in key)
+        cursor = conn.execute(f"SELECT {key_list} FROM `{table_name}`{where} ORDER BY {key_list}", params)
+        boundaries = []
+        for position, row in enumerate(cursor):
+            if position and position % step == 0:
+                boundaries.append(tuple(row))
+        return boundaries
+    
+    def checksum_compare_table(self, table_name: str) -> Dict[str, Any]:
+        """
+        Compare a table exactly using primary-key range checksums.
+        
+        Returns:
+            Chunk statistics plus keys only in DB1, only in DB2, and present in both with different values
+        """
+        columns = self.get_table_columns(self.conn1, table_name)
+        key = self.get_primary_key(self.conn1, table_name)
+        if key == ['rowid']:
+            columns = ['rowid'] + columns
+        
+        result = {
+            'key': key,
+            'chunks_checked': 0,
+            'chunks_mismatched': 0,
+            'only_in_db1': [],
+            'only_in_db2': [],
+            'changed': []
+        }
+        counts = (self.get_table_count(self.conn1, table_name), self.get_table_count(self.conn2, table_name))
+        self._compare_range(table_name, columns, key, None, None, self.chunk_size, counts, result, top_level=True)
+        return result
+    
+    def _compare_range(self, table_name: str, columns: List[str], key: List[str], lo: Optional[tuple],
+                       hi: Optional[tuple], step: int, counts: Tuple[int, int], result: Dict,
+                       top_level: bool = False):
+        """Checksum [lo, hi) split into step-sized ranges, descending into mismatched ones"""
+        # Split on whichever side has more rows so no range grows unbounded
+        boundary_conn = self.conn1 if counts[0] >= counts[1] else self.conn2
+        boundaries = self._range_boundaries(boundary_conn, table_name, key, lo, hi, step)
+        edges = [lo] + boundaries + [hi]
+        
+        for range_lo, range_hi in zip(edges, edges[1:]):
+            count1, checksum1 = self.range_checksum(self.conn1, table_name, columns, key, range_lo, range_hi)
+            count2, checksum2 = self.range_checksum(self.conn2, table_name, columns, key, range_lo, range_hi)
+            if top_level:
+                result['chunks_checked'] += 1
+            if checksum1 == checksum2:
+                continue
+            if top_level:
+                result['chunks_mismatched'] += 1
+            
+            if max(count1, count2) <= LEAF_RANGE_ROWS or step <= 1:
+                self._diff_rows(table_name, columns, key, range_lo, range_hi, result)
+            else:
+                sub_step = max(1, min(step, max(count1, count2)) // DRILL_DOWN_FANOUT)
+                self._compare_range(table_name, columns, key, range_lo, range_hi, sub_step,
+                                    (count1, count2), result)
+    
+    def _diff_rows(self, table_name: str, columns: List[str], key: List[str], lo: Optional[tuple],
+                   hi: Optional[tuple], result: Dict):
+        """Row-level diff of a small key range"""
+        where, params = self._range_clause(key, lo, hi)
+        column_list = ', '.join(f'`{col}`' for col in columns)
+        key_positions = [columns.index(col) for col in key]
+        
+        def rows_by_key(conn):
+            cursor = conn.execute(f"SELECT {column_list} FROM `{table_name}`{where}", params)
+            return {tuple(row[i] for i in key_positions): tuple(row) for row in cursor}
+        
+        rows1 = rows_by_key(self.conn1)
+        rows2 = rows_by_key(self.conn2)
+        
+        result['only_in_db1'].extend(sorted(set(rows1) - set(rows2)))
+        result['only_in_db2'].extend(sorted(set(rows2) - set(rows1)))
+        result['changed'].extend(sorted(k for k in set(rows1) & set(rows2) if rows1[k] != rows2[k]))
+    
     def compare_tables(self) -> Dict[str, Any]:
         """Compare tables between databases"""
         tables1 = set(self.get_table_names(self.conn1))
@@ -96,7 +240,8 @@ class DatabaseComparator:
             'common_tables': tables1 & tables2,
             'schema_differences': {},
             'count_differences': {},
-            'data_differences': {}
+            'data_differences': {},
+            'checksum_stats': {}
         }
         
         # Compare common tables
@@ -120,8 +265,18 @@ class DatabaseComparator:
                     'difference': count1 - count2
                 }
             
+            # Exact range-checksum comparison (if schemas match)
+            if self.checksum and table not in comparison['schema_differences']:
+                table_result = self.checksum_compare_table(table)
+                comparison['checksum_stats'][table] = {
+                    'chunks_checked': table_result['chunks_checked'],
+                    'chunks_mismatched': table_result['chunks_mismatched']
+                }
+                if table_result['only_in_db1'] or table_result['only_in_db2'] or table_result['changed']:
+                    comparison['data_differences'][table] = table_result
+            
             # Data comparison (if schemas match)
-            if table not in comparison['schema_differences']:
+            elif table not in comparison['schema_differences']:
                 columns = self.get_table_columns(self.conn1, table)
                 if columns:  # Only if table has columns
                     data1 = self.sample_table_data(self.conn1, table, columns)
@@ -227,6 +382,11 @@ class DatabaseComparator:
         if table_comp['data_differences']:
             print(f"❌ Data differences detected in {len(table_comp['data_differences'])} tables:")
             for table in table_comp['data_differences']:
+                if self.checksum:
+                    self._print_checksum_differences(table, table_comp['data_differences'][table],
+                                                     table_comp['checksum_stats'][table], detailed)
+                    continue
+                
                 sample_size = table_comp['data_differences'][table]['sample_size']
                 print(f"  - {table} (sampled {sample_size} records)")
                 
@@ -234,6 +394,12 @@ class DatabaseComparator:
                     # Show actual data differences
                     self._show_data_differences(table)
         
+        if self.checksum:
+            chunks = sum(stats['chunks_checked'] for stats in table_comp['checksum_stats'].values())
+            mismatched = sum(stats['chunks_mismatched'] for stats in table_comp['checksum_stats'].values())
+            print(f"🔢 Checksummed {len(table_comp['checksum_stats'])} tables in {chunks} key ranges "
+                  f"({mismatched} mismatched)")
+        
         # Index differences
         if index_comp:
             print(f"❌ Index differences in {len(index_comp)} tables:")
@@ -261,6 +427,23 @@ class DatabaseComparator:
             if not detailed:
                 print("   Use --detailed flag for more information")
     
+    def _print_checksum_differences(self, table: str, diff: Dict, stats: Dict, detailed: bool):
+        """Print row-level differences found by range checksums"""
+        print(f"  - {table}: {len(diff['only_in_db1'])} only in DB1, {len(diff['only_in_db2'])} only in DB2, "
+              f"{len(diff['changed'])} changed ({stats['chunks_mismatched']}/{stats['chunks_checked']} ranges mismatched)")
+        
+        if detailed:
+            key_name = ', '.join(diff['key'])
+            for label, keys in (('Only in DB1', diff['only_in_db1']),
+                                ('Only in DB2', diff['only_in_db2']),
+                                ('Changed', diff['changed'])):
+                if not keys:
+                    continue
+                shown = [k[0] if len(k) == 1 else k for k in keys[:MAX_REPORTED_KEYS]]
+                print(f"    {label} ({key_name}): {shown}")
+                if len(keys) > MAX_REPORTED_KEYS:
+                    print(f"      ... and {len(keys) - MAX_REPORTED_KEYS} more")
+    
     def _show_data_differences(self, table: str):
         """Show actual data differences for a table"""
         try:
@@ -319,6 +502,9 @@ def main():
     parser.add_argument('db2', help='Path to second database file')
     parser.add_argument('--detailed', action='store_true', help='Show detailed differences')
     parser.add_argument('--sample-size', type=int, default=100, help='Number of records to sample for data comparison')
+    parser.add_argument('--checksum', action='store_true',
+                        help='Compare all rows exactly using primary-key range checksums instead of sampling')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per checksum range in --checksum mode')
     
     args = parser.parse_args()
     
@@ -332,7 +518,8 @@ def main():
         sys.exit(1)
     
     # Run comparison
-    comparator = DatabaseComparator(args.db1, args.db2, args.sample_size)
+    comparator = DatabaseComparator(args.db1, args.db2, args.sample_size,
+                                    checksum=args.checksum, chunk_size=args.chunk_size)
     results = comparator.run_comparison(args.detailed)
     
     # Exit with non-zero if differences found
@@ -16,6 +16,7 @@ sys.path.append('.')
 
 from models import engine, Prayer, User, PrayerMark, PrayerAttribute, PrayerActivityLog
 from app_helpers.services.text_archive_service import text_archive_service
+from app_helpers.services.archive_compression_service import archive_exists, archive_mtime
 from datetime import datetime
 
 def check_database_tables():
@@ -51,7 +52,8 @@ def collect_prayer_activity_data(prayer_id: str, session: Session) -> dict:
 
 def verify_archive_completeness(prayer, archive_path: str, session: Session) -> bool:
     """Verify archive contains all current database activity"""
-    if not os.path.exists(archive_path):
+    # Prayer files may have been packed into their monthly bundle by compress-archives
+    if not archive_exists(archive_path):
         return False
     
     # Get current database activity count (using only activity logs as single source of truth)
@@ -64,7 +66,7 @@ def verify_archive_completeness(prayer, archive_path: str, session: Session) ->
     if current_activities_count > 0:
         try:
             # Check if archive file was modified after the latest activity
-            file_mtime = datetime.fromtimestamp(os.path.getmtime(archive_path))
+            file_mtime = datetime.fromtimestamp(archive_mtime(archive_path))
             
             # Get latest activity timestamp from activity logs only
             latest_activity_log = session.exec(
@@ -112,7 +114,7 @@ def heal_prayer_archives():
             if not prayer.text_file_path:
                 needs_healing = True
                 reason = "No archive path in database"
-            elif not os.path.exists(prayer.text_file_path):
+            elif not archive_exists(prayer.text_file_path):
                 needs_healing = True
                 reason = "Archive file missing from filesystem"
             elif not verify_archive_completeness(prayer, prayer.text_file_path, session):
@@ -10,18 +10,26 @@
       enqueuePrayerMark: function () { return Promise.resolve(); },
       getQueuedMarks: function () { return Promise.resolve([]); },
       removeQueuedMark: function () { return Promise.resolve(); },
-      flushQueuedMarks: function () { return Promise.resolve(); }
+      removeQueuedMarks: function () { return Promise.resolve(); },
+      flushQueuedMarks: function () { return Promise.resolve(); },
+      syncPrayerDeltas: function () { return Promise.resolve(); },
+      getOfflinePrayers: function () { return Promise.resolve([]); }
     };
     return;
   }
 
   var DB_NAME = 'thywill-offline';
-  var DB_VERSION = 2;
+  var DB_VERSION = 3;
   var FEED_STORE = 'feeds';
   var SETTINGS_STORE = 'settings';
   var MARK_QUEUE_STORE = 'markQueue';
+  var PRAYER_STORE = 'prayers';
+  var SYNC_ENDPOINT = '/api/sync/prayers';
+  var SYNC_CURSOR_KEY = 'syncCursor';
 
   var dbPromise;
+  // Set by seedFeedData; the prayer store and its cursor belong to this user
+  var syncUsername = null;
 
   function openDb() {
     if (!dbPromise) {
@@ -42,6 +50,10 @@
           if (!db.objectStoreNames.contains(MARK_QUEUE_STORE)) {
             db.createObjectStore(MARK_QUEUE_STORE, { keyPath: 'id' });
           }
+
+          if (!db.objectStoreNames.contains(PRAYER_STORE)) {
+            db.createObjectStore(PRAYER_STORE, { keyPath: 'id' });
+          }
         };
 
         request.onsuccess = function () {
@@ -158,6 +170,13 @@
     });
   }
 
+  // Synced prayers keep the server's field names
+  function sortPrayersByCreatedAt(records) {
+    return records.sort(function (a, b) {
+      return Date.parse(a.created_at || 0) - Date.parse(b.created_at || 0);
+    });
+  }
+
   function saveFeedSnapshot(feedType, html) {
     if (!feedType || !html) {
       return Promise.resolve();
@@ -196,6 +215,94 @@
     });
   }
 
+  function escapeHtml(value) {
+    var div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML;
+  }
+
+  // A cursor saved for another account is treated as no cursor at all
+  function loadSyncCursor(username) {
+    return runStore(SETTINGS_STORE, 'readonly', function (store) {
+      return store.get(SYNC_CURSOR_KEY);
+    }).then(function (record) {
+      return record && record.username === username ? record.cursor : null;
+    });
+  }
+
+  function applyPrayerDelta(delta, username, clearFirst) {
+    return runStore(PRAYER_STORE, 'readwrite', function (store) {
+      if (delta.reset || clearFirst) {
+        store.clear();
+      }
+      (delta.prayers || []).forEach(function (prayer) {
+        store.put(prayer);
+      });
+      (delta.removed || []).forEach(function (id) {
+        store.delete(id);
+      });
+    }).then(function () {
+      return runStore(SETTINGS_STORE, 'readwrite', function (store) {
+        return store.put({
+          key: SYNC_CURSOR_KEY,
+          cursor: delta.cursor,
+          username: username,
+          updatedAt: nowIso()
+        });
+      });
+    });
+  }
+
+  // Pull only the prayers changed since the stored cursor into PRAYER_STORE
+  function syncPrayerDeltas() {
+    var username = syncUsername;
+    if (!navigator.onLine || !username) {
+      return Promise.resolve();
+    }
+
+    return loadSyncCursor(username).then(async function (cursor) {
+      // Without a cursor for this user, drop whatever another account left behind
+      var clearFirst = !cursor;
+      var hasMore = true;
+      while (hasMore) {
+        var url = SYNC_ENDPOINT + (cursor ? '?since=' + encodeURIComponent(cursor) : '');
+        var response = await fetch(url, {
+          credentials: 'same-origin',
+          headers: { 'Accept': 'application/json' }
+        });
+        if (!response.ok) {
+          return;
+        }
+        var delta = await response.json();
+        await applyPrayerDelta(delta, username, clearFirst);
+        clearFirst = false;
+        cursor = delta.cursor;
+        hasMore = Boolean(delta.has_more);
+      }
+    });
+  }
+
+  function getOfflinePrayers() {
+    return runStore(PRAYER_STORE, 'readonly', function (store) {
+      return store.getAll();
+    }).then(function (records) {
+      if (!records) {
+        return [];
+      }
+      return sortPrayersByCreatedAt(records).reverse();
+    });
+  }
+
+  function renderOfflinePrayers(prayers) {
+    return prayers.map(function (prayer) {
+      return '<div class="prayer-card" data-prayer-id="' + escapeHtml(prayer.id) + '">' +
+        '<p class="prayer-text">' + escapeHtml(prayer.generated_prayer || prayer.text) + '</p>' +
+        '<p class="prayer-meta">' + escapeHtml(prayer.author_username) +
+        ' · ' + escapeHtml(prayer.mark_count) + ' prayers</p>' +
+        '</div>';
+    }).join('');
+  }
+
   function hydrateFeedList(feedType, listElement) {
     if (!listElement) {
       return Promise.resolve();
@@ -211,7 +318,14 @@
         if (window.htmx && typeof window.htmx.process === 'function') {
           window.htmx.process(listElement);
         }
+        return;
       }
+
+      return getOfflinePrayers().then(function (prayers) {
+        if (prayers.length > 0) {
+          listElement.innerHTML = renderOfflinePrayers(prayers);
+        }
+      });
     });
   }
 
@@ -248,6 +362,9 @@
     var feedType = options.feedType;
     var listElement = options.listElement;
     var filterElement = options.filterElement;
+    if (options.username) {
+      syncUsername = options.username;
+    }
 
     if (!navigator.onLine) {
       return Promise.resolve();
@@ -266,6 +383,10 @@
       }
     }
 
+    tasks.push(syncPrayerDeltas().catch(function (error) {
+      console.warn('[Offline] Prayer delta sync failed:', error);
+    }));
+
     return Promise.all(tasks);
   }
 
@@ -319,6 +440,18 @@
     });
   }
 
+  function removeQueuedMarks(ids) {
+    if (!ids || !ids.length) {
+      return Promise.resolve();
+    }
+
+    return runStore(MARK_QUEUE_STORE, 'readwrite', function (store) {
+      ids.forEach(function (id) {
+        store.delete(id);
+      });
+    });
+  }
+
   function flushQueuedMarks(processor) {
     if (typeof processor !== 'function') {
       return Promise.resolve();
@@ -339,13 +472,27 @@
     enqueuePrayerMark: enqueuePrayerMark,
     getQueuedMarks: getQueuedMarks,
     removeQueuedMark: removeQueuedMark,
+    removeQueuedMarks: removeQueuedMarks,
     flushQueuedMarks: flushQueuedMarks,
+    syncPrayerDeltas: syncPrayerDeltas,
+    getOfflinePrayers: getOfflinePrayers,
     openDb: openDb,
     hasFeedSnapshot: function (feedType) {
       return loadFeedSnapshot(feedType).then(function (record) {
-        return Boolean(record && record.html);
+        if (record && record.html) {
+          return true;
+        }
+        return getOfflinePrayers().then(function (prayers) {
+          return prayers.length > 0;
+        });
       });
     },
     getFeedSnapshot: loadFeedSnapshot
   };
+
+  window.addEventListener('online', function () {
+    syncPrayerDeltas().catch(function (error) {
+      console.warn('[Offline] Prayer delta sync failed:', error);
+    });
+  });
 })();
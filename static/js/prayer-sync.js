@@ -6,6 +6,8 @@
   }
 
   var MARK_TARGET_PREFIX = 'prayer-marks-';
+  var BATCH_ENDPOINT = '/api/marks/batch';
+  var BATCH_SIZE = 200;
 
   function pathFromDetail(detail) {
     if (!detail) {
@@ -199,39 +201,79 @@
     });
   }
 
-  async function sendQueuedMark(record) {
-    var url = record.url || '/mark/' + record.prayerId;
-    var absoluteUrl = new URL(url, window.location.origin).toString();
-    var body = JSON.stringify({ prayed_at: record.prayedAt });
+  // Same wording as the stats line in prayer_card.html / mark_prayer
+  function describePrayerStats(markCount, distinctUserCount) {
+    if (distinctUserCount === 1) {
+      return markCount === 1 ? '🙏 1 person prayed this once' : '🙏 1 person prayed this ' + markCount + ' times';
+    }
+    return '🙏 ' + distinctUserCount + ' people prayed this ' + markCount + ' times';
+  }
 
-    var response = await fetch(absoluteUrl, {
-      method: record.method || 'POST',
+  function applyPrayerStats(prayerId, counts) {
+    var section = document.getElementById('prayer-marks-' + prayerId);
+    var stats = section ? section.firstElementChild : null;
+    if (!stats || typeof counts.mark_count !== 'number' || typeof counts.distinct_user_count !== 'number') {
+      return;
+    }
+    stats.textContent = '';
+    if (counts.mark_count > 0) {
+      var link = document.createElement('a');
+      link.href = '/prayer/' + encodeURIComponent(prayerId) + '/marks';
+      link.className = 'text-purple-600 dark:text-purple-300 hover:text-purple-800 dark:hover:text-purple-200 hover:underline';
+      link.textContent = describePrayerStats(counts.mark_count, counts.distinct_user_count);
+      stats.appendChild(link);
+    }
+  }
+
+  function applyPrayerCounts(prayerId, counts) {
+    if (!counts) {
+      return;
+    }
+    var button = document.querySelector('form[action="/mark/' + prayerId + '"] button');
+    var badge = button ? button.querySelector('span:last-child') : null;
+    if (badge && typeof counts.user_mark_count === 'number') {
+      badge.textContent = counts.user_mark_count.toString();
+    }
+    applyPrayerStats(prayerId, counts);
+  }
+
+  async function sendQueuedBatch(records) {
+    var response = await fetch(new URL(BATCH_ENDPOINT, window.location.origin).toString(), {
+      method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        'Accept': 'text/html',
-        'HX-Request': 'true',
+        'Accept': 'application/json',
         'X-Thywill-Offline': 'foreground'
       },
-      body: body,
+      body: JSON.stringify({
+        marks: records.map(function (record) {
+          return { prayer_id: record.prayerId, prayed_at: record.prayedAt };
+        })
+      }),
       credentials: 'same-origin'
     });
 
     if (!response.ok) {
-      throw new Error('Failed to sync prayer mark');
+      throw new Error('Failed to sync prayer marks');
     }
 
-    var html = await response.text();
-    var targetId = (record.metadata && record.metadata.targetId) || (MARK_TARGET_PREFIX + record.prayerId);
-    var target = document.getElementById(targetId);
-    if (target) {
-      target.innerHTML = html;
-      if (window.htmx && typeof window.htmx.process === 'function') {
-        window.htmx.process(target);
-      }
-    }
+    var data = await response.json();
+    var prayerCounts = data.prayers || {};
+    records.forEach(function (record) {
+      applyPrayerCounts(record.prayerId, prayerCounts[record.prayerId]);
+      clearQueuedState(record.prayerId);
+    });
+    recordTelemetry('sync_success', { count: records.length, source: 'foreground' });
+  }
 
-    clearQueuedState(record.prayerId);
-    recordTelemetry('sync_success', { prayerId: record.prayerId, source: 'foreground' });
+  async function flushQueuedBatches() {
+    var records = await window.ThywillOffline.getQueuedMarks();
+    // Every status (recorded, duplicate, not_found) is final, so a delivered batch leaves the queue
+    for (var i = 0; i < records.length; i += BATCH_SIZE) {
+      var batch = records.slice(i, i + BATCH_SIZE);
+      await sendQueuedBatch(batch);
+      await window.ThywillOffline.removeQueuedMarks(batch.map(function (record) { return record.id; }));
+    }
   }
 
   function flushQueue() {
@@ -244,7 +286,7 @@
       return;
     }
 
-    window.ThywillOffline.flushQueuedMarks(sendQueuedMark)
+    flushQueuedBatches()
       .then(function () {
         updateConnectivityBanner();
       })
@@ -327,7 +369,10 @@
           return;
         }
 
+        applyPrayerCounts(data.prayerId, data.counts);
+
         var targetId = (data.metadata && data.metadata.targetId) || (MARK_TARGET_PREFIX + data.prayerId);
+        // Service workers from before batch sync send the rendered mark section instead
         if (data.html) {
           var target = document.getElementById(targetId);
           if (target) {
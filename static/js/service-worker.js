@@ -1,4 +1,4 @@
-const CACHE_VERSION = 'v2';
+const CACHE_VERSION = 'v4';
 const SHELL_CACHE = `thywill-shell-${CACHE_VERSION}`;
 const PRECACHE_ASSETS = [
   '/',
@@ -14,8 +14,12 @@ const PRECACHE_ASSETS = [
 ];
 
 const DB_NAME = 'thywill-offline';
-const DB_VERSION = 2;
+const DB_VERSION = 3;
 const MARK_QUEUE_STORE = 'markQueue';
+// Stores owned by offline-data.js; whichever side opens first runs the upgrade
+const PAGE_STORE_KEYS = { feeds: 'feedType', settings: 'key', prayers: 'id' };
+const BATCH_ENDPOINT = '/api/marks/batch';
+const BATCH_SIZE = 200;
 
 let queueProcessing = false;
 
@@ -144,6 +148,11 @@ function openQueueDb() {
       if (!db.objectStoreNames.contains(MARK_QUEUE_STORE)) {
         db.createObjectStore(MARK_QUEUE_STORE, { keyPath: 'id' });
       }
+      Object.entries(PAGE_STORE_KEYS).forEach(([name, keyPath]) => {
+        if (!db.objectStoreNames.contains(name)) {
+          db.createObjectStore(name, { keyPath });
+        }
+      });
     };
 
     request.onsuccess = () => resolve(request.result);
@@ -172,41 +181,37 @@ async function getQueuedPrayerMarks() {
   });
 }
 
-async function removeQueuedPrayerMark(id) {
+async function removeQueuedPrayerMarks(ids) {
   const db = await openQueueDb();
   return new Promise((resolve, reject) => {
     const tx = db.transaction(MARK_QUEUE_STORE, 'readwrite');
     const store = tx.objectStore(MARK_QUEUE_STORE);
-    const request = store.delete(id);
+    ids.forEach((id) => store.delete(id));
 
-    request.onsuccess = () => resolve();
-    request.onerror = () => reject(request.error);
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
   });
 }
 
-async function sendQueuedPrayerMark(record) {
-  const url = record.url || `/mark/${record.prayerId}`;
-  const absoluteUrl = new URL(url, self.location.origin).toString();
-
-  const response = await fetch(absoluteUrl, {
-    method: record.method || 'POST',
+async function sendQueuedPrayerBatch(records) {
+  const response = await fetch(new URL(BATCH_ENDPOINT, self.location.origin).toString(), {
+    method: 'POST',
     headers: {
       'Content-Type': 'application/json',
-      'Accept': 'text/html',
-      'HX-Request': 'true',
+      'Accept': 'application/json',
       'X-Thywill-Offline': 'background'
     },
-    body: JSON.stringify({ prayed_at: record.prayedAt }),
+    body: JSON.stringify({
+      marks: records.map((record) => ({ prayer_id: record.prayerId, prayed_at: record.prayedAt }))
+    }),
     credentials: 'include'
   });
 
   if (!response.ok) {
-    throw new Error('Failed to sync queued prayer mark');
+    throw new Error('Failed to sync queued prayer marks');
   }
 
-  const html = await response.text();
-
-  return { html };
+  return response.json();
 }
 
 async function processPrayerQueue() {
@@ -217,19 +222,26 @@ async function processPrayerQueue() {
   queueProcessing = true;
   try {
     const records = await getQueuedPrayerMarks();
-    for (const record of records) {
+    for (let i = 0; i < records.length; i += BATCH_SIZE) {
+      const batch = records.slice(i, i + BATCH_SIZE);
+      let result;
       try {
-        const result = await sendQueuedPrayerMark(record);
-        await removeQueuedPrayerMark(record.id);
+        result = await sendQueuedPrayerBatch(batch);
+      } catch (error) {
+        console.warn('[PWA] Prayer mark sync failed, will retry later:', error);
+        break;
+      }
+
+      // Every status (recorded, duplicate, not_found) is final, so a delivered batch leaves the queue
+      await removeQueuedPrayerMarks(batch.map((record) => record.id));
+      const prayerCounts = result.prayers || {};
+      for (const record of batch) {
         await broadcastPrayerSync({
           type: 'offline-prayer-sync',
           prayerId: record.prayerId,
-          html: result.html,
+          counts: prayerCounts[record.prayerId] || null,
           metadata: record.metadata || {}
         });
-      } catch (error) {
-        console.warn('[PWA] Prayer mark sync failed, will retry later:', error);
-        break;
       }
     }
   } catch (error) {
@@ -0,0 +1,196 @@
+"""
+Fixtures for the performance benchmark suite.
+
+Benchmarks are skipped unless RUN_BENCHMARKS=true. They run the real app against
+a synthetic community database (see synthetic_community.py) with every module's
+engine pointed at it, so timings include the production query paths.
+
+Environment:
+    RUN_BENCHMARKS                true to run the suite
+    BENCHMARK_SCALE               small | medium | full (default small)
+    BENCHMARK_SEED                generator seed (default 42)
+    BENCHMARK_DB_DIR              where generated databases are cached
+    BENCHMARK_ITERATIONS          timed runs per scenario (default 5)
+    BENCHMARK_TOLERANCE           allowed slowdown factor vs baseline (default 1.5)
+    BENCHMARK_UPDATE_BASELINES    true to record results as the new baselines
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from tests.benchmarks.synthetic_community import build_community, create_benchmark_engine
+
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINES_PATH = BENCHMARK_DIR / "baselines.json"
+REPORT_PATH = BENCHMARK_DIR / "report.md"
+
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS", "false").lower() == "true"
+BENCHMARK_SCALE = os.getenv("BENCHMARK_SCALE", "small")
+BENCHMARK_SEED = int(os.getenv("BENCHMARK_SEED", "42"))
+BENCHMARK_DB_DIR = Path(os.getenv("BENCHMARK_DB_DIR", str(BENCHMARK_DIR / ".cache")))
+BENCHMARK_ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "5"))
+BENCHMARK_TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "1.5"))
+BENCHMARK_SLACK_MS = 10.0  # Absolute headroom so very fast scenarios don't flap on noise
+BENCHMARK_UPDATE_BASELINES = os.getenv("BENCHMARK_UPDATE_BASELINES", "false").lower() == "true"
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with RUN_BENCHMARKS=true")
+    for item in items:
+        if BENCHMARK_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+class BenchmarkResults:
+    """Collects scenario timings and compares them with the stored baselines"""
+
+    def __init__(self, scale: str):
+        self.scale = scale
+        self.results = {}
+        all_baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+        self.baselines = all_baselines.get(scale, {})
+
+    def allowed_ms(self, name: str):
+        baseline = self.baselines.get(name)
+        if baseline is None:
+            return None
+        return baseline["median_ms"] * BENCHMARK_TOLERANCE + BENCHMARK_SLACK_MS
+
+    def record(self, name: str, median_ms: float, max_ms: float, queries: int = None):
+        self.results[name] = {"median_ms": round(median_ms, 2), "max_ms": round(max_ms, 2), "queries": queries}
+
+    def check(self, name: str):
+        """Fail the calling test when a scenario regressed beyond tolerance"""
+        allowed = self.allowed_ms(name)
+        result = self.results[name]
+        if allowed is None or BENCHMARK_UPDATE_BASELINES:
+            return
+        baseline = self.baselines[name]
+        if result["median_ms"] > allowed:
+            pytest.fail(
+                f"PERFORMANCE REGRESSION in {name}: median {result['median_ms']:.1f} ms "
+                f"vs baseline {baseline['median_ms']:.1f} ms (allowed {allowed:.1f} ms)",
+                pytrace=False
+            )
+        # Query counts are deterministic, so any growth beyond tolerance is a regression
+        if baseline.get("queries") and result["queries"] and result["queries"] > baseline["queries"] * BENCHMARK_TOLERANCE:
+            pytest.fail(
+                f"QUERY COUNT REGRESSION in {name}: {result['queries']} queries "
+                f"vs baseline {baseline['queries']}",
+                pytrace=False
+            )
+
+    def report(self) -> str:
+        lines = [
+            f"# Benchmark report ({self.scale})",
+            "",
+            "| Scenario | Median ms | Max ms | Queries | Baseline ms | Change | Status |",
+            "|---|---:|---:|---:|---:|---:|---|",
+        ]
+        for name, result in sorted(self.results.items()):
+            baseline = self.baselines.get(name)
+            if baseline is None:
+                baseline_ms, change, status = "-", "-", "new"
+            else:
+                baseline_ms = f"{baseline['median_ms']:.1f}"
+                change = f"{(result['median_ms'] / max(baseline['median_ms'], 0.01) - 1) * 100:+.0f}%"
+                status = "REGRESSION" if result["median_ms"] > self.allowed_ms(name) else "ok"
+            queries = "-" if result["queries"] is None else str(result["queries"])
+            lines.append(
+                f"| {name} | {result['median_ms']:.1f} | {result['max_ms']:.1f} | {queries} "
+                f"| {baseline_ms} | {change} | {status} |"
+            )
+        return "\n".join(lines) + "\n"
+
+    def save_baselines(self):
+        all_baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+        # Merge so a partial run (-k) only replaces the scenarios it measured
+        scale_baselines = all_baselines.setdefault(self.scale, {})
+        for name, r in self.results.items():
+            scale_baselines[name] = {"median_ms": r["median_ms"], "queries": r["queries"]}
+        BASELINES_PATH.write_text(json.dumps(all_baselines, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def community():
+    return build_community(BENCHMARK_DB_DIR, scale=BENCHMARK_SCALE, seed=BENCHMARK_SEED)
+
+
+@pytest.fixture(scope="session")
+def bench_engine(community, tmp_path_factory):
+    import models
+    import app  # noqa: F401  Import every route module before rebinding engines
+    from app_helpers.utils.request_metrics import install_query_hooks
+    from app_helpers.services.activity_timeline_service import rebuild_activity_timeline
+    from app_helpers.services.statistics_service import StatisticsService
+
+    # Write scenarios run against a copy so the cached community stays pristine
+    working_copy = tmp_path_factory.mktemp("benchmark") / community.db_path.name
+    shutil.copyfile(community.db_path, working_copy)
+    engine = create_benchmark_engine(working_copy)
+    SQLModel.metadata.create_all(engine)  # Tables added since the cached community was built
+    with Session(engine) as db:
+        rebuild_activity_timeline(db)  # Derived from marks/prayers, which bulk inserts bypass
+        StatisticsService(db).rebuild_daily_rollups()
+    install_query_hooks(engine)
+
+    # Modules bind `engine`/`read_engine` at import time, so rebind every copy of the default one
+    original = models.engine
+    patches = [
+        patch.object(module, name, engine)
+        for module in list(sys.modules.values())
+        for name in ("engine", "read_engine")
+        if module is not None and getattr(module, name, None) is original
+    ]
+    patches.extend([
+        patch('app_helpers.services.text_archive_service.TEXT_ARCHIVE_ENABLED', False),
+        patch('app_helpers.services.archive_first_service.text_archive_service.enabled', False),
+    ])
+    for p in patches:
+        p.start()
+    yield engine
+    for p in reversed(patches):
+        p.stop()
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def bench_client(bench_engine):
+    from app import app
+    # No context manager: startup tasks (migrations, background loops) stay off
+    with patch('app.TEXT_ARCHIVE_ENABLED', False):
+        yield TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    results = BenchmarkResults(BENCHMARK_SCALE)
+    request.config._benchmark_results = results
+    yield results
+    if not results.results:
+        return
+    REPORT_PATH.write_text(results.report())
+    REPORT_PATH.with_suffix(".json").write_text(json.dumps(
+        {"scale": BENCHMARK_SCALE, "results": results.results}, indent=2, sort_keys=True) + "\n")
+    if BENCHMARK_UPDATE_BASELINES:
+        results.save_baselines()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = getattr(config, "_benchmark_results", None)
+    if results is None or not results.results:
+        return
+    terminalreporter.section("benchmarks")
+    for line in results.report().splitlines():
+        terminalreporter.write_line(line)
@@ -0,0 +1,259 @@
+"""
+Synthetic community generator for the benchmark suite.
+
+Builds a file-backed WAL SQLite database shaped like a long-running community:
+an invite tree rooted at admin, prolific and occasional authors, marks skewed
+toward recent and popular prayers, archived/answered attributes and sessions.
+Objects come from tests/factories.py and are written with bulk inserts.
+
+The database is cached next to the suite (see BENCHMARK_DB_DIR) and rebuilt only
+when the scale, seed or generator version changes.
+"""
+
+import os
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from sqlalchemy import event, text
+from sqlmodel import SQLModel, create_engine
+
+from app_helpers.utils.username_helpers import normalize_username_for_lookup
+from models import User, Prayer, PrayerMark, PrayerAttribute, Session as SessionModel, InviteToken
+from tests.factories import (
+    UserFactory, PrayerFactory, PrayerMarkFactory, PrayerAttributeFactory,
+    SessionFactory, InviteTokenFactory
+)
+
+
+GENERATOR_VERSION = "1"
+INSERT_CHUNK_SIZE = 10_000
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"users": 500, "prayers": 5_000, "marks": 50_000, "extra_sessions": 100},
+    "medium": {"users": 2_000, "prayers": 20_000, "marks": 200_000, "extra_sessions": 400},
+    "full": {"users": 10_000, "prayers": 100_000, "marks": 1_000_000, "extra_sessions": 2_000},
+}
+
+ARCHIVED_RATE = 0.10
+ANSWERED_RATE = 0.05
+FLAGGED_RATE = 0.02
+HISTORY_DAYS = 730
+
+
+@dataclass
+class Community:
+    """Handles into a generated community used to drive the scenarios"""
+    db_path: Path
+    scale: str
+    counts: Dict[str, int]
+    usernames: List[str] = field(default_factory=list)
+    prayer_ids: List[str] = field(default_factory=list)
+    viewer: str = ""
+
+
+def create_benchmark_engine(db_path: Path):
+    """File-backed engine with the production PRAGMAs applied to every connection"""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=10000")
+        cursor.execute("PRAGMA temp_store=memory")
+        cursor.close()
+
+    return engine
+
+
+def _rows(objects: Iterable[SQLModel]) -> List[dict]:
+    rows = []
+    for obj in objects:
+        rows.append({column.name: getattr(obj, column.name) for column in obj.__table__.columns})
+    return rows
+
+
+def _insert(conn, model, objects: List[SQLModel]):
+    for start in range(0, len(objects), INSERT_CHUNK_SIZE):
+        conn.execute(model.__table__.insert(), _rows(objects[start:start + INSERT_CHUNK_SIZE]))
+
+
+def _apply_migration_indexes(conn):
+    """Create the indexes production gets from migrations, so query plans match"""
+    pattern = re.compile(r"CREATE\s+(UNIQUE\s+)?INDEX[^;]*", re.IGNORECASE)
+    for up_sql in sorted(MIGRATIONS_DIR.glob("*/up.sql")):
+        for match in pattern.finditer(up_sql.read_text()):
+            try:
+                conn.execute(text(match.group(0)))
+            except Exception:
+                pass  # Index targets a column this schema no longer has
+
+
+def _generate(conn, scale: str, seed: int) -> Community:
+    sizes = SCALES[scale]
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    start = now - timedelta(days=HISTORY_DAYS)
+
+    def hex_id() -> str:
+        return uuid.UUID(int=rng.getrandbits(128)).hex
+
+    # Users form an invite tree rooted at admin; earlier members invite more people
+    users = [UserFactory.create_admin()]
+    users[0].created_at = start
+    tokens = []
+    for i in range(1, sizes["users"]):
+        inviter = users[int(len(users) * rng.random() ** 2)]
+        token = InviteTokenFactory.create(
+            token=hex_id(), created_by_user=inviter.display_name,
+            expires_at=start + timedelta(days=HISTORY_DAYS + 7),
+            used_by_user_id=f"Member{i:05d}", usage_count=1, max_uses=1
+        )
+        tokens.append(token)
+        users.append(UserFactory.create(
+            display_name=f"Member{i:05d}",
+            created_at=start + timedelta(days=HISTORY_DAYS * i / sizes["users"]),
+            invited_by_username=inviter.display_name,
+            invite_token_used=token.token
+        ))
+    for user in users:
+        user.normalized_name = normalize_username_for_lookup(user.display_name)
+    usernames = [u.display_name for u in users]
+
+    # A minority of members write most prayer requests
+    author_weights = [rng.paretovariate(1.2) for _ in users]
+    authors = rng.choices(usernames, weights=author_weights, k=sizes["prayers"])
+    prayers = []
+    for i, author in enumerate(authors):
+        prayers.append(PrayerFactory.create(
+            id=hex_id(), author_username=author,
+            text=f"Please pray for situation {i} in my family and community",
+            created_at=start + timedelta(seconds=HISTORY_DAYS * 86400 * i / sizes["prayers"]),
+            flagged=rng.random() < FLAGGED_RATE
+        ))
+
+    attributes = []
+    for prayer in prayers:
+        roll = rng.random()
+        if roll < ARCHIVED_RATE:
+            attributes.append(PrayerAttributeFactory.create_archived(prayer.id, prayer.author_username))
+        elif roll < ARCHIVED_RATE + ANSWERED_RATE:
+            attributes.extend(PrayerAttributeFactory.create_answered(
+                prayer.id, prayer.author_username, testimony="God answered this prayer"
+            ))
+    for attribute in attributes:
+        attribute.id = hex_id()[:16]
+
+    # Marks lean toward recent prayers and active members
+    mark_user_weights = [rng.paretovariate(1.5) for _ in users]
+    marks = []
+    prayer_count = len(prayers)
+    for _ in range(sizes["marks"]):
+        prayer = prayers[min(prayer_count - 1, int(prayer_count * (1 - rng.random() ** 3)))]
+        marked_at = prayer.created_at + timedelta(seconds=rng.randint(0, max(1, int((now - prayer.created_at).total_seconds()))))
+        marks.append(PrayerMarkFactory.create(
+            id=hex_id(),
+            username=rng.choices(usernames, weights=mark_user_weights)[0],
+            prayer_id=prayer.id,
+            created_at=marked_at
+        ))
+
+    sessions = [
+        SessionFactory.create(id=hex_id(), username=name, created_at=now - timedelta(days=1),
+                              expires_at=now + timedelta(days=13))
+        for name in usernames
+    ]
+    sessions.extend(
+        SessionFactory.create(id=hex_id(), username=rng.choice(usernames), created_at=now - timedelta(days=2),
+                              expires_at=now + timedelta(days=12))
+        for _ in range(sizes["extra_sessions"])
+    )
+
+    _insert(conn, User, users)
+    _insert(conn, InviteToken, tokens)
+    _insert(conn, Prayer, prayers)
+    _insert(conn, PrayerAttribute, attributes)
+    _insert(conn, PrayerMark, marks)
+    _insert(conn, SessionModel, sessions)
+
+    counts = {"users": len(users), "prayers": len(prayers), "marks": len(marks),
+              "attributes": len(attributes), "sessions": len(sessions)}
+    # The most active marker is the viewer, so personal feeds have real work to do
+    viewer = max(usernames[1:], key=lambda name: mark_user_weights[usernames.index(name)])
+    return Community(db_path=Path(), scale=scale, counts=counts, usernames=usernames,
+                     prayer_ids=[p.id for p in prayers if not p.flagged], viewer=viewer)
+
+
+def _meta_key(scale: str, seed: int) -> str:
+    return f"{GENERATOR_VERSION}:{scale}:{seed}"
+
+
+def build_community(db_dir: Path, scale: str = "small", seed: int = 42) -> Community:
+    """
+    Build (or reuse) the synthetic community database for a scale.
+
+    Returns:
+        Community describing the database, its members and visible prayers
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown benchmark scale {scale!r}; choose from {', '.join(SCALES)}")
+
+    db_dir.mkdir(parents=True, exist_ok=True)
+    db_path = db_dir / f"community_{scale}.db"
+    key = _meta_key(scale, seed)
+
+    if db_path.exists():
+        engine = create_benchmark_engine(db_path)
+        try:
+            with engine.connect() as conn:
+                stored = conn.execute(text("SELECT value FROM benchmark_meta WHERE key = 'generator'")).scalar()
+                if stored == key:
+                    usernames = [row[0] for row in conn.execute(
+                        text("SELECT display_name FROM user ORDER BY created_at"))]
+                    prayer_ids = [row[0] for row in conn.execute(
+                        text("SELECT id FROM prayer WHERE flagged = 0 ORDER BY created_at"))]
+                    viewer = conn.execute(text(
+                        "SELECT username FROM prayermark WHERE username != 'admin' "
+                        "GROUP BY username ORDER BY COUNT(*) DESC LIMIT 1")).scalar()
+                    counts = {table: conn.execute(text(f"SELECT COUNT(*) FROM {name}")).scalar()
+                              for table, name in [("users", "user"), ("prayers", "prayer"),
+                                                  ("marks", "prayermark"), ("attributes", "prayer_attributes"),
+                                                  ("sessions", "session")]}
+                    return Community(db_path=db_path, scale=scale, counts=counts,
+                                     usernames=usernames, prayer_ids=prayer_ids, viewer=viewer)
+        except Exception:
+            pass
+        finally:
+            engine.dispose()
+
+    # Build into a temporary file so an interrupted run is never reused
+    build_path = db_path.with_suffix(".building")
+    for stale in (build_path, Path(f"{build_path}-wal"), Path(f"{build_path}-shm")):
+        if stale.exists():
+            stale.unlink()
+
+    engine = create_benchmark_engine(build_path)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        community = _generate(conn, scale, seed)
+        conn.execute(text("CREATE TABLE benchmark_meta (key TEXT PRIMARY KEY, value TEXT)"))
+        conn.execute(text("INSERT INTO benchmark_meta VALUES ('generator', :key)"), {"key": key})
+    with engine.begin() as conn:
+        _apply_migration_indexes(conn)
+        conn.execute(text("ANALYZE"))
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    engine.dispose()
+
+    for stale in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if stale.exists():
+            stale.unlink()
+    os.replace(build_path, db_path)
+    community.db_path = db_path
+    return community
@@ -0,0 +1,147 @@
+"""
+Performance regression benchmarks for the hot pages and write paths.
+
+Each scenario runs once to warm caches, then BENCHMARK_ITERATIONS timed runs;
+the median is compared with tests/benchmarks/baselines.json for the current
+scale. Run with:
+
+    RUN_BENCHMARKS=true pytest tests/benchmarks -o addopts=""
+
+and record new baselines after an intentional change with
+BENCHMARK_UPDATE_BASELINES=true. A report is written to tests/benchmarks/report.md.
+"""
+
+import re
+import statistics
+import time
+
+import pytest
+from sqlmodel import Session, select
+
+from models import Session as SessionModel
+from tests.benchmarks.conftest import BENCHMARK_ITERATIONS
+
+
+pytestmark = pytest.mark.benchmark
+
+FEED_TYPES = [
+    "all", "new_unprayed", "most_prayed", "my_prayers", "my_unprayed", "my_requests",
+    "recent_activity", "prayers_needing_attention", "daily_prayer", "answered", "archived",
+]
+
+_query_count = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def _session_cookie(engine, username: str) -> dict:
+    with Session(engine) as db:
+        session = db.exec(
+            select(SessionModel)
+            .where(SessionModel.username == username)
+            .where(SessionModel.is_fully_authenticated == True)
+        ).first()
+    return {"sid": session.id}
+
+
+def _run(benchmark_results, name, call, iterations=BENCHMARK_ITERATIONS):
+    """Warm up, time `iterations` calls of call(i), record and check the result"""
+    call(0)
+    timings, queries = [], None
+    for i in range(1, iterations + 1):
+        started = time.perf_counter()
+        response = call(i)
+        timings.append((time.perf_counter() - started) * 1000)
+        if hasattr(response, "status_code"):
+            assert response.status_code < 400, f"{name} returned {response.status_code}"
+            match = _query_count.search(response.headers.get("Server-Timing", ""))
+            if match:
+                queries = int(match.group(1))
+    benchmark_results.record(name, statistics.median(timings), max(timings), queries)
+    benchmark_results.check(name)
+
+
+@pytest.fixture(scope="module")
+def viewer_cookies(bench_engine, community):
+    return _session_cookie(bench_engine, community.viewer)
+
+
+@pytest.fixture(scope="module")
+def admin_cookies(bench_engine):
+    return _session_cookie(bench_engine, "admin")
+
+
+class TestReadPaths:
+    """Pages members load most often."""
+
+    @pytest.mark.parametrize("feed_type", FEED_TYPES)
+    def test_feed(self, bench_client, viewer_cookies, benchmark_results, feed_type):
+        _run(benchmark_results, f"feed:{feed_type}",
+             lambda i: bench_client.get(f"/feed?feed_type={feed_type}", cookies=viewer_cookies))
+
+    def test_feed_revalidate(self, bench_client, viewer_cookies, benchmark_results):
+        etag = bench_client.get("/feed", cookies=viewer_cookies).headers["etag"]
+        _run(benchmark_results, "feed:revalidate",
+             lambda i: bench_client.get("/feed", cookies=viewer_cookies, headers={"If-None-Match": etag}))
+
+    def test_feed_counts(self, bench_engine, community, benchmark_results):
+        from app_helpers.services.prayer_helpers import get_feed_counts
+        _run(benchmark_results, "get_feed_counts", lambda i: get_feed_counts(community.viewer))
+
+    def test_prayer_mode_start(self, bench_client, viewer_cookies, benchmark_results):
+        _run(benchmark_results, "prayer_mode:start",
+             lambda i: bench_client.get("/prayer-mode?restart=true", cookies=viewer_cookies))
+
+    def test_prayer_mode_next(self, bench_client, viewer_cookies, benchmark_results):
+        bench_client.get("/prayer-mode?restart=true", cookies=viewer_cookies)
+        _run(benchmark_results, "prayer_mode:next",
+             lambda i: bench_client.get(f"/prayer-mode?position={i % 5 + 1}", cookies=viewer_cookies))
+
+    def test_activity(self, bench_client, viewer_cookies, benchmark_results):
+        _run(benchmark_results, "activity", lambda i: bench_client.get("/activity", cookies=viewer_cookies))
+
+    def test_users_page(self, bench_client, viewer_cookies, benchmark_results):
+        _run(benchmark_results, "users", lambda i: bench_client.get("/users", cookies=viewer_cookies))
+
+    def test_invite_tree_cold(self, bench_client, admin_cookies, benchmark_results):
+        from app_helpers.services.invite_helpers import invalidate_invite_tree_cache
+
+        def call(i):
+            invalidate_invite_tree_cache()
+            return bench_client.get("/invite-tree", cookies=admin_cookies)
+
+        _run(benchmark_results, "invite_tree:cold", call)
+
+    @pytest.mark.parametrize("period", ["daily", "monthly"])
+    def test_admin_statistics(self, bench_client, admin_cookies, benchmark_results, period):
+        _run(benchmark_results, f"statistics:{period}",
+             lambda i: bench_client.get(f"/api/statistics/prayers?period={period}", cookies=admin_cookies))
+
+
+class TestWritePaths:
+    """Writes that contend with readers on the shared database."""
+
+    def test_login_request(self, bench_client, community, benchmark_results):
+        # A different member each time keeps clear of per-user login rate limits
+        members = community.usernames[-(BENCHMARK_ITERATIONS + 1):]
+
+        def call(i):
+            response = bench_client.post("/login", data={"username": members[i]}, follow_redirects=False)
+            bench_client.cookies.clear()
+            return response
+
+        _run(benchmark_results, "login", call)
+
+    def test_mark_prayer(self, bench_client, viewer_cookies, community, benchmark_results):
+        prayers = community.prayer_ids[:BENCHMARK_ITERATIONS + 1]
+        _run(benchmark_results, "mark_prayer",
+             lambda i: bench_client.post(f"/mark/{prayers[i]}", cookies=viewer_cookies, follow_redirects=False))
+
+    def test_mark_batch(self, bench_client, viewer_cookies, community, benchmark_results):
+        # A reconnecting member replaying 50 queued offline marks
+        prayers = community.prayer_ids[-50:]
+
+        def call(i):
+            marks = [{"prayer_id": prayer_id, "prayed_at": f"2025-06-{i + 1:02d}T08:{n:02d}:00Z"}
+                     for n, prayer_id in enumerate(prayers)]
+            return bench_client.post("/api/marks/batch", json={"marks": marks}, cookies=viewer_cookies)
+
+        _run(benchmark_results, "mark_batch:50", call)
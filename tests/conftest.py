@@ -73,6 +73,7 @@ def client(test_session):
         patch('app_helpers.services.archive_first_service.text_archive_service.enabled', False),
         patch('app.Session', mock_session),
         patch('models.engine', test_session.bind),
+        patch('models.read_engine', test_session.bind),
         patch('app_helpers.services.text_importer_service.engine', test_session.bind),
         patch('app_helpers.services.archive_first_service.engine', test_session.bind),
         patch('app_helpers.services.archive_download_service.engine', test_session.bind),
@@ -88,6 +89,7 @@ def client(test_session):
         patch('app_helpers.routes.prayer.prayer_operations.Session', mock_session),
         patch('app_helpers.routes.prayer.prayer_status.Session', mock_session),
         patch('app_helpers.routes.prayer.prayer_moderation.Session', mock_session),
+        patch('app_helpers.routes.prayer.offline_sync.Session', mock_session),
         patch('app_helpers.routes.auth_routes.Session', mock_session),
         patch('app_helpers.routes.admin_routes.Session', mock_session),
         patch('app_helpers.routes.admin.dashboard.Session', mock_session),
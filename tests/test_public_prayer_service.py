@@ -3,7 +3,7 @@ Tests for PublicPrayerService
 """
 
 import pytest
-from sqlmodel import Session
+from sqlmodel import Session, select
 from models import Prayer, PrayerAttribute, User, engine
 from app_helpers.services.public_prayer_service import PublicPrayerService
 import uuid
@@ -176,4 +176,69 @@ def test_get_public_prayer_by_id():
             # Cleanup
             session.delete(prayer)
             session.delete(test_user)
-            session.commit()
\ No newline at end of file
+            session.commit()
+
+@pytest.fixture
+def public_cache(test_session):
+    """Point the public routes at the test database with an empty payload cache"""
+    from unittest.mock import patch
+    from app_helpers.services.public_prayer_service import invalidate_public_prayer_cache
+
+    invalidate_public_prayer_cache()
+    with patch('app_helpers.services.public_prayer_service.read_engine', test_session.bind), \
+         patch('app_helpers.routes.public_routes.engine', test_session.bind), \
+         patch('app_helpers.routes.public_routes.read_engine', test_session.bind):
+        yield
+    invalidate_public_prayer_cache()
+
+
+@pytest.mark.unit
+def test_public_payload_cache_invalidated_by_visibility_changes(test_session, public_cache):
+    """Cached payloads are reused until a prayer is added or flagged"""
+    from app_helpers.services.public_prayer_service import get_cached_public_payload
+
+    builds = []
+    build = lambda: builds.append(1) or {"built": len(builds)}
+
+    first = get_cached_public_payload(("prayers", 1, 20), build)
+    assert get_cached_public_payload(("prayers", 1, 20), build) is first
+    assert len(builds) == 1
+
+    prayer = Prayer(author_username="someone", text="New prayer")
+    test_session.add(prayer)
+    test_session.commit()
+    get_cached_public_payload(("prayers", 1, 20), build)
+    assert len(builds) == 2
+
+    # Unrelated edits keep the cache, flagging drops it
+    prayer.project_tag = "tag"
+    test_session.commit()
+    get_cached_public_payload(("prayers", 1, 20), build)
+    assert len(builds) == 2
+    prayer.flagged = True
+    test_session.commit()
+    get_cached_public_payload(("prayers", 1, 20), build)
+    assert len(builds) == 3
+
+
+@pytest.mark.unit
+def test_public_prayers_api_conditional_get(client, test_session, public_cache):
+    """The listing carries validators and answers 304 while nothing changed"""
+    test_session.add_all([User(display_name="author"), Prayer(author_username="author", text="Public prayer")])
+    test_session.commit()
+
+    response = client.get("/api/public/prayers")
+    assert response.status_code == 200
+    assert response.json()["prayers"][0]["text"] == "Public prayer"
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert client.get("/api/public/prayers", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/public/prayers", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    prayer = test_session.exec(select(Prayer)).first()
+    test_session.add(PrayerAttribute(prayer_id=prayer.id, attribute_name="archived", attribute_value="true"))
+    test_session.commit()
+
+    response = client.get("/api/public/prayers", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["prayers"] == []
@@ -4,7 +4,9 @@ Tests for statistics service
 
 import pytest
 from datetime import datetime, date, timedelta
-from sqlmodel import Session
+from pathlib import Path
+from sqlalchemy import text
+from sqlmodel import Session, select
 from app_helpers.services.statistics_service import StatisticsService
 from models import Prayer, User, PrayerMark, PrayerAttribute
 
@@ -181,4 +183,70 @@ def test_get_summary_statistics(test_session):
     assert summary["total_users"] == 1
     assert summary["total_prayer_marks"] == 1
     assert summary["active_prayers"] == 1
-    assert summary["answered_prayers"] == 0
\ No newline at end of file
+    assert summary["answered_prayers"] == 0
+
+def _seed_rollup_activity(test_session):
+    """Two members praying across two days of one week, plus an answer"""
+    day1, day2 = datetime(2025, 1, 14, 9), datetime(2025, 1, 15, 21)
+    prayer = Prayer(author_username="author", text="Test prayer", created_at=day1)
+    test_session.add_all([User(display_name="author", created_at=day1), prayer])
+    test_session.commit()
+    test_session.add_all([
+        PrayerMark(username="alice", prayer_id=prayer.id, created_at=day1),
+        PrayerMark(username="alice", prayer_id=prayer.id, created_at=day1),
+        PrayerMark(username="bob", prayer_id=prayer.id, created_at=day1),
+        PrayerMark(username="alice", prayer_id=prayer.id, created_at=day2),
+        PrayerAttribute(prayer_id=prayer.id, attribute_name="answered", attribute_value="true", created_at=day2),
+    ])
+    test_session.commit()
+    return prayer
+
+
+@pytest.mark.unit
+def test_rollup_tracks_writes_incrementally(test_session):
+    """Inserts and deletes keep daily_stats current, with distinct pray-ers per period"""
+    service = StatisticsService(test_session)
+    _seed_rollup_activity(test_session)
+    start, end = date(2025, 1, 1), date(2025, 1, 31)
+
+    assert service.get_prayer_marks_counts_by_period("daily", start, end) == {"2025-01-14": 3, "2025-01-15": 1}
+    assert service.get_active_prayer_user_counts_by_period("daily", start, end) == {"2025-01-14": 2, "2025-01-15": 1}
+    assert service.get_active_prayer_user_counts_by_period("weekly", start, end) == {"2025-W02": 2}
+    assert service.get_answered_counts_by_period("monthly", start, end) == {"2025-01": 1}
+    assert service.get_user_registration_counts_by_period("yearly", start, end) == {"2025": 1}
+
+    mark = test_session.exec(select(PrayerMark).where(PrayerMark.username == "bob")).first()
+    test_session.delete(mark)
+    test_session.commit()
+    assert service.get_prayer_marks_counts_by_period("weekly", start, end) == {"2025-W02": 3}
+    assert service.get_total_prayer_marks() == 3
+
+
+@pytest.mark.unit
+def test_rebuild_matches_incremental_rollup(test_session):
+    """A rebuild from source tables reproduces what the write hook maintained"""
+    service = StatisticsService(test_session)
+    _seed_rollup_activity(test_session)
+    incremental = test_session.execute(text("SELECT * FROM daily_stats ORDER BY day")).all()
+
+    test_session.execute(text("UPDATE daily_stats SET marks = 99"))
+    assert service.rebuild_daily_rollups() == 2
+    assert test_session.execute(text("SELECT * FROM daily_stats ORDER BY day")).all() == incremental
+
+    assert service.rebuild_daily_rollups(from_day=date(2025, 1, 15)) == 1
+    assert test_session.execute(text("SELECT * FROM daily_stats ORDER BY day")).all() == incremental
+
+
+@pytest.mark.unit
+def test_rollup_migration_backfills(test_session):
+    """The migration's backfill agrees with the incrementally maintained rollup"""
+    _seed_rollup_activity(test_session)
+    incremental = test_session.execute(text("SELECT * FROM daily_stats ORDER BY day")).all()
+
+    up_sql = (Path(__file__).resolve().parents[1] / "migrations/018_daily_stats_rollup/up.sql").read_text()
+    for statement in up_sql.split(';'):
+        if statement.strip():
+            test_session.execute(text(statement))
+    test_session.commit()
+
+    assert test_session.execute(text("SELECT * FROM daily_stats ORDER BY day")).all() == incremental
@@ -0,0 +1,91 @@
+"""
+Tests for the materialized community activity timeline behind /activity.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import text
+from sqlmodel import select
+
+from models import ActivityEvent
+from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory, PrayerAttributeFactory
+from app_helpers.services.activity_timeline_service import (
+    record_activity, get_activity_page, set_prayer_activity_hidden, rebuild_activity_timeline
+)
+
+
+@pytest.mark.unit
+class TestActivityTimeline:
+    """Test suite for timeline recording and keyset pagination."""
+
+    @pytest.fixture
+    def prayer(self, test_session):
+        author = UserFactory.create(display_name="author")
+        prayer = PrayerFactory.create(author_username="author", generated_prayer="G" * 200)
+        test_session.add_all([author, prayer])
+        test_session.commit()
+        return prayer
+
+    def test_pages_follow_cursor_without_gaps(self, test_session, prayer):
+        start = datetime(2025, 1, 1)
+        for i in range(7):
+            # Pairs share a timestamp so the id tiebreaker is exercised
+            record_activity(test_session, "prayed", prayer, f"member{i}", created_at=start + timedelta(minutes=i // 2))
+        test_session.commit()
+
+        seen, cursor = [], None
+        while True:
+            events, cursor = get_activity_page(test_session, before=cursor, limit=3)
+            seen.extend(e.actor_username for e in events)
+            if cursor is None:
+                break
+
+        assert seen == ["member6", "member5", "member4", "member3", "member2", "member1", "member0"]
+
+    def test_snippet_and_flag_hiding(self, test_session, prayer):
+        record_activity(test_session, "prayed", prayer, "member")
+        record_activity(test_session, "testimony", prayer, "author", snippet_text="It was answered")
+        test_session.commit()
+
+        events, _ = get_activity_page(test_session)
+        testimony, prayed = events
+        assert prayed.snippet == "G" * 150 + "..." and prayed.snippet_is_prayer
+        assert testimony.snippet == "It was answered" and not testimony.snippet_is_prayer
+
+        set_prayer_activity_hidden(test_session, prayer.id, True)
+        test_session.commit()
+        assert get_activity_page(test_session) == ([], None)
+
+    def test_rebuild_matches_source_rows(self, test_session, prayer):
+        test_session.add(PrayerMarkFactory.create(username="member", prayer_id=prayer.id))
+        test_session.add_all(PrayerAttributeFactory.create_answered(prayer.id, "author", testimony="Thanks"))
+        test_session.commit()
+
+        assert rebuild_activity_timeline(test_session) == 4
+        events = test_session.exec(select(ActivityEvent)).all()
+        assert sorted(e.event_type for e in events) == ["answered", "prayed", "prayer", "testimony"]
+        assert all(e.snippet == "G" * 150 + "..." for e in events if e.event_type != "testimony")
+
+    def test_migration_backfill(self, test_session, prayer):
+        test_session.add(PrayerMarkFactory.create(username="member", prayer_id=prayer.id))
+        test_session.commit()
+
+        up_sql = (Path(__file__).resolve().parents[2] / "migrations/017_activity_timeline/up.sql").read_text()
+        for statement in up_sql.split(';'):
+            if statement.strip():
+                test_session.execute(text(statement))
+        test_session.commit()
+
+        assert sorted(e.event_type for e in test_session.exec(select(ActivityEvent)).all()) == ["prayed", "prayer"]
+
+    def test_marking_records_event_and_page_renders(self, client, mock_authenticated_user, test_session, prayer):
+        response = client.post(f"/mark/{prayer.id}", follow_redirects=False)
+        assert response.status_code in (200, 303)
+
+        events = test_session.exec(select(ActivityEvent)).all()
+        assert [(e.event_type, e.actor_username) for e in events] == [("prayed", "testuser")]
+
+        page = client.get("/activity")
+        assert page.status_code == 200
+        assert "You prayed this" in page.text
@@ -253,14 +253,11 @@ class TestAdminUtilityFunctions:
         """Test cleanup of expired authentication requests"""
         user, session = mock_admin_user
         
-        with patch('app_helpers.routes.admin_routes.cleanup_expired_requests') as mock_cleanup:
-            mock_cleanup.return_value = 3  # 3 requests cleaned up
-            
-            # Cleanup should be called when accessing admin routes
+        with patch('app_helpers.services.auth_helpers.cleanup_expired_requests') as mock_cleanup:
             response = client.get("/admin")
             
-            # Verify cleanup was called (implementation dependent)
-            # This test structure can be adapted based on actual implementation
+            # Expiry runs from the periodic task in app.py, not on page loads
+            mock_cleanup.assert_not_called()
     
     def test_auth_action_logging(self, client, mock_admin_user, test_session, clean_db):
         """Test authentication action logging"""
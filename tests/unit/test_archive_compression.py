@@ -0,0 +1,144 @@
+"""
+Tests for the archive compression tier.
+Validates monthly bundle compaction, transparent reads and restore-on-append.
+"""
+
+import os
+import time
+import zipfile
+import tempfile
+import pytest
+from pathlib import Path
+from datetime import datetime
+
+from app_helpers.services.archive_compression_service import (
+    ArchiveCompressionService, archive_exists, archive_mtime, read_archive_text,
+    list_prayer_archive_files, bundle_path_for
+)
+from app_helpers.services.text_archive_service import TextArchiveService
+
+
+def _age_file(path: Path, days: int):
+    """Backdate a file's mtime so it falls past the compression threshold"""
+    old = time.time() - days * 86400
+    os.utime(path, (old, old))
+
+
+class TestArchiveCompression:
+    """Test suite for prayer archive compaction and bundled reads."""
+
+    @pytest.fixture
+    def archive_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    @pytest.fixture
+    def archive_service(self, archive_dir):
+        service = TextArchiveService(base_dir=str(archive_dir))
+        service.enabled = True
+        return service
+
+    def _create_prayer(self, archive_service, prayer_id: str, created_at: datetime) -> Path:
+        file_path = archive_service.create_prayer_archive({
+            'id': prayer_id,
+            'author': 'TestUser',
+            'text': f'Please pray for request {prayer_id}',
+            'generated_prayer': 'Lord, we lift this request to you.',
+            'created_at': created_at
+        })
+        return Path(file_path)
+
+    def test_compacts_old_files_into_monthly_bundle(self, archive_dir, archive_service):
+        old_prayer = self._create_prayer(archive_service, 'old1', datetime(2023, 3, 5, 9, 30))
+        recent_prayer = self._create_prayer(archive_service, 'new1', datetime(2023, 3, 6, 9, 30))
+        _age_file(old_prayer, 400)
+
+        stats = ArchiveCompressionService(str(archive_dir), compress_after_days=365).compact()
+
+        assert stats['files_compressed'] == 1
+        assert not old_prayer.exists()
+        assert recent_prayer.exists()
+
+        bundle = archive_dir / "prayers" / "2023" / "03_prayers.zip"
+        assert bundle == bundle_path_for(old_prayer)
+        with zipfile.ZipFile(bundle) as zf:
+            assert zf.namelist() == [old_prayer.name]
+
+        # Reads resolve through the bundle using the original path
+        assert archive_exists(old_prayer)
+        assert "Prayer old1 by TestUser" in read_archive_text(old_prayer)
+        parsed, _ = archive_service.parse_prayer_archive(str(old_prayer))
+        assert parsed['id'] == 'old1'
+
+    def test_dry_run_leaves_files_in_place(self, archive_dir, archive_service):
+        prayer = self._create_prayer(archive_service, 'dry1', datetime(2023, 4, 1, 8, 0))
+        _age_file(prayer, 400)
+
+        stats = ArchiveCompressionService(str(archive_dir), compress_after_days=365).compact(dry_run=True)
+
+        assert stats['files_compressed'] == 1
+        assert prayer.exists()
+        assert not bundle_path_for(prayer).exists()
+
+    def test_zero_threshold_disables_compression(self, archive_dir, archive_service):
+        prayer = self._create_prayer(archive_service, 'off1', datetime(2023, 4, 1, 8, 0))
+        _age_file(prayer, 4000)
+
+        stats = ArchiveCompressionService(str(archive_dir), compress_after_days=0).compact()
+
+        assert stats['files_compressed'] == 0
+        assert prayer.exists()
+
+    def test_append_restores_bundled_prayer(self, archive_dir, archive_service):
+        prayer = self._create_prayer(archive_service, 'app1', datetime(2023, 5, 2, 7, 15))
+        _age_file(prayer, 400)
+        compressor = ArchiveCompressionService(str(archive_dir), compress_after_days=365)
+        compressor.compact()
+        assert not prayer.exists()
+
+        archive_service.append_prayer_activity(str(prayer), "prayed", "LateUser")
+
+        content = prayer.read_text(encoding='utf-8')
+        assert "Prayer app1 by TestUser" in content
+        assert "LateUser prayed this prayer" in content
+
+        # Once it ages again the updated copy replaces the bundled one
+        _age_file(prayer, 400)
+        compressor.compact()
+        assert not prayer.exists()
+        assert "LateUser prayed this prayer" in read_archive_text(prayer)
+        with zipfile.ZipFile(bundle_path_for(prayer)) as zf:
+            assert zf.namelist() == [prayer.name]
+
+    def test_new_filenames_skip_bundled_names(self, archive_dir, archive_service):
+        created_at = datetime(2023, 6, 9, 12, 0)
+        first = self._create_prayer(archive_service, 'dup1', created_at)
+        _age_file(first, 400)
+        ArchiveCompressionService(str(archive_dir), compress_after_days=365).compact()
+
+        second = self._create_prayer(archive_service, 'dup2', created_at)
+
+        assert second != first
+        assert "Prayer dup1 by TestUser" in read_archive_text(first)
+        assert "Prayer dup2 by TestUser" in read_archive_text(second)
+
+    def test_listing_includes_loose_and_bundled_files(self, archive_dir, archive_service):
+        bundled = self._create_prayer(archive_service, 'list1', datetime(2023, 7, 1, 6, 0))
+        loose = self._create_prayer(archive_service, 'list2', datetime(2023, 7, 2, 6, 0))
+        _age_file(bundled, 400)
+        ArchiveCompressionService(str(archive_dir), compress_after_days=365).compact()
+
+        files = list_prayer_archive_files(archive_dir / "prayers")
+
+        assert set(files) == {bundled, loose}
+
+    def test_mtime_survives_bundling(self, archive_dir, archive_service):
+        prayer = self._create_prayer(archive_service, 'mtime1', datetime(2023, 8, 1, 6, 0))
+        _age_file(prayer, 400)
+        loose_mtime = archive_mtime(prayer)
+        ArchiveCompressionService(str(archive_dir), compress_after_days=365).compact()
+
+        assert not prayer.exists()
+        # Zip timestamps have two-second resolution
+        assert abs(archive_mtime(prayer) - loose_mtime) <= 2
+        assert archive_mtime(archive_dir / "prayers" / "2023" / "08" / "missing.txt") is None
@@ -0,0 +1,103 @@
+"""
+Tests for the incremental archive consistency manifest.
+Validates that unchanged files are reused and changed files are re-parsed.
+"""
+
+import json
+import tempfile
+import pytest
+from pathlib import Path
+from datetime import datetime
+from unittest.mock import patch
+
+from models import Prayer, User
+from app_helpers.services.archive_manifest_service import (
+    ArchiveManifest, validate_incremental_consistency, MANIFEST_FILENAME
+)
+from app_helpers.services.text_archive_service import TextArchiveService
+
+
+class TestArchiveManifest:
+    """Test suite for the content-hash consistency manifest."""
+
+    @pytest.fixture
+    def archive_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    @pytest.fixture
+    def archive_service(self, archive_dir):
+        service = TextArchiveService(base_dir=str(archive_dir))
+        service.enabled = True
+        return service
+
+    def _create_prayer(self, archive_service, test_session, prayer_id: str, text: str) -> Path:
+        file_path = archive_service.create_prayer_archive({
+            'id': prayer_id,
+            'author': 'ManifestUser',
+            'text': text,
+            'generated_prayer': 'Lord, hear this prayer.',
+            'created_at': datetime(2024, 2, 10, 9, 0)
+        })
+        test_session.add(Prayer(
+            id=prayer_id, author_username='ManifestUser', text=text,
+            generated_prayer='Lord, hear this prayer.', text_file_path=file_path
+        ))
+        test_session.commit()
+        return Path(file_path)
+
+    def _validate(self, archive_dir, archive_service, test_session):
+        with patch('app_helpers.services.archive_manifest_service.engine', test_session.bind):
+            return validate_incremental_consistency(str(archive_dir), archive_service, workers=2)
+
+    def test_second_run_reuses_unchanged_files(self, archive_dir, archive_service, test_session):
+        test_session.add(User(display_name='ManifestUser', text_file_path='users.txt'))
+        self._create_prayer(archive_service, test_session, 'man1', 'Pray for rain')
+        self._create_prayer(archive_service, test_session, 'man2', 'Pray for healing')
+
+        first = self._validate(archive_dir, archive_service, test_session)
+        assert first['files_parsed'] == 2
+        assert first['files_reused'] == 0
+        assert first['prayers_checked'] == 2
+        assert first['inconsistencies'] == []
+        assert first['archive_authors'] == {'ManifestUser'}
+        assert (archive_dir / MANIFEST_FILENAME).exists()
+
+        second = self._validate(archive_dir, archive_service, test_session)
+        assert second['files_parsed'] == 0
+        assert second['files_reused'] == 2
+        assert second['inconsistencies'] == []
+
+    def test_changed_file_is_reparsed_and_mismatch_reported(self, archive_dir, archive_service, test_session):
+        prayer_file = self._create_prayer(archive_service, test_session, 'man3', 'Pray for peace')
+        self._validate(archive_dir, archive_service, test_session)
+
+        content = prayer_file.read_text(encoding='utf-8')
+        prayer_file.write_text(content.replace('Pray for peace', 'Pray for patience'), encoding='utf-8')
+
+        results = self._validate(archive_dir, archive_service, test_session)
+        assert results['files_parsed'] == 1
+        assert results['inconsistencies'] == ["Prayer man3 text mismatch in archive"]
+
+    def test_deleted_file_reported_and_dropped_from_manifest(self, archive_dir, archive_service, test_session):
+        prayer_file = self._create_prayer(archive_service, test_session, 'man4', 'Pray for wisdom')
+        self._validate(archive_dir, archive_service, test_session)
+
+        prayer_file.unlink()
+        results = self._validate(archive_dir, archive_service, test_session)
+
+        assert results['files_removed'] == 1
+        assert results['missing_archives'] == [f"Prayer man4 archive file not found: {prayer_file}"]
+        manifest = json.loads((archive_dir / MANIFEST_FILENAME).read_text())
+        assert manifest['files'] == {}
+
+    def test_corrupt_manifest_forces_full_parse(self, archive_dir, archive_service, test_session):
+        self._create_prayer(archive_service, test_session, 'man5', 'Pray for strength')
+        (archive_dir / MANIFEST_FILENAME).write_text("{not json")
+
+        manifest = ArchiveManifest(str(archive_dir), archive_service)
+        manifest.load()
+
+        assert manifest.entries == {}
+        results = self._validate(archive_dir, archive_service, test_session)
+        assert results['files_parsed'] == 1
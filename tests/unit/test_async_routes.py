@@ -0,0 +1,113 @@
+"""
+Lint for blocking I/O inside async route handlers.
+
+FastAPI runs `def` endpoints in a worker thread but `async def` endpoints on
+the event loop, so a synchronous database query, archive write or file read in
+an async handler stalls every other request until it finishes. Async handlers
+must await their I/O or hand the blocking part to a thread
+(`await asyncio.to_thread(...)`); otherwise they should be plain `def`.
+
+The check walks each async endpoint's source (and same-module helpers it calls)
+looking for direct SQLModel/SQLite calls, file opens, sleeps and calls into the
+service layer, which does database and archive I/O.
+"""
+
+import ast
+import asyncio
+import builtins
+import inspect
+import textwrap
+
+import pytest
+from fastapi.routing import APIRoute
+
+
+BLOCKING_NAMES = {'Session', 'DBSession', 'open', 'connect'}
+BLOCKING_METHODS = {
+    'exec', 'execute', 'commit', 'flush', 'refresh', 'query', 'scalar', 'scalars',
+    'read_text', 'write_text', 'read_bytes', 'write_bytes', 'sleep'
+}
+BLOCKING_MODULES = ('models', 'app_helpers.services', 'app_helpers.utils.database_helpers')
+# Service functions that only read configuration or format values
+NON_BLOCKING_CALLS = {'get_token_expiration_config', 'is_admin'}
+
+
+def _resolve(node, namespace):
+    """Resolve a Name/Attribute chain against a function's globals"""
+    if isinstance(node, ast.Name):
+        return namespace.get(node.id, getattr(builtins, node.id, None))
+    if isinstance(node, ast.Attribute):
+        base = _resolve(node.value, namespace)
+        return getattr(base, node.attr, None) if base is not None else None
+    return None
+
+
+def blocking_calls(func, depth: int = 2, seen=None):
+    """Describe the non-awaited blocking calls made by func"""
+    seen = seen if seen is not None else set()
+    if func in seen:
+        return []
+    seen.add(func)
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError):
+        return []
+
+    awaited = {id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Await)}
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or id(node) in awaited:
+            continue
+        callee = node.func
+        name = callee.id if isinstance(callee, ast.Name) else getattr(callee, 'attr', None)
+        if name in NON_BLOCKING_CALLS:
+            continue
+        if (isinstance(callee, ast.Name) and name in BLOCKING_NAMES) or \
+                (isinstance(callee, ast.Attribute) and name in BLOCKING_METHODS):
+            found.append(f"{func.__name__}: {ast.unparse(callee)}()")
+            continue
+
+        target = _resolve(callee, func.__globals__)
+        target = getattr(target, '__func__', target)
+        if not inspect.isfunction(target) or inspect.iscoroutinefunction(target):
+            continue
+        if target.__module__.startswith(BLOCKING_MODULES):
+            found.append(f"{func.__name__}: {ast.unparse(callee)}()")
+        elif target.__module__ == func.__module__ and depth > 0:
+            found.extend(blocking_calls(target, depth - 1, seen))
+    return found
+
+
+def test_async_routes_do_not_block_the_event_loop():
+    from app import app
+
+    offenders = {}
+    for route in app.routes:
+        if isinstance(route, APIRoute) and asyncio.iscoroutinefunction(route.endpoint):
+            calls = blocking_calls(route.endpoint)
+            if calls:
+                offenders[f"{','.join(sorted(route.methods))} {route.path}"] = calls
+
+    assert not offenders, (
+        "Blocking I/O in async handlers (make them `def` or use asyncio.to_thread):\n"
+        + "\n".join(f"  {route}: {calls}" for route, calls in offenders.items())
+    )
+
+
+def test_lint_flags_blocking_calls():
+    from models import engine
+    from sqlmodel import Session
+
+    async def blocking():
+        with Session(engine) as s:
+            s.commit()
+
+    async def offloaded():
+        await asyncio.to_thread(sync_helper)
+
+    def sync_helper():
+        with Session(engine) as s:
+            s.commit()
+
+    assert blocking_calls(blocking)
+    assert blocking_calls(offloaded) == []
@@ -0,0 +1,73 @@
+"""
+Tests for exact database comparison with primary-key range checksums.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import pytest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'utils'))
+from compare_databases import DatabaseComparator
+
+
+def _create_db(path: Path):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE user (display_name TEXT PRIMARY KEY, points INTEGER)")
+    conn.execute("CREATE TABLE note (body TEXT)")
+    conn.executemany("INSERT INTO user VALUES (?, ?)", [(f"user{i:05d}", i) for i in range(3000)])
+    conn.executemany("INSERT INTO note VALUES (?)", [(f"note {i}",) for i in range(500)])
+    conn.commit()
+    return conn
+
+
+class TestChecksumComparison:
+    """Test suite for range-checksum drill-down."""
+
+    @pytest.fixture
+    def db_pair(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db1, db2 = Path(temp_dir) / "prod.db", Path(temp_dir) / "recovered.db"
+            _create_db(db1).close()
+            conn = _create_db(db2)
+            yield db1, db2, conn
+            conn.close()
+
+    def _compare(self, db1, db2):
+        comparator = DatabaseComparator(str(db1), str(db2), checksum=True, chunk_size=200)
+        comparator.connect_databases()
+        try:
+            return comparator.compare_tables()
+        finally:
+            comparator.conn1.close()
+            comparator.conn2.close()
+
+    def test_identical_databases_have_no_differences(self, db_pair):
+        db1, db2, _ = db_pair
+
+        result = self._compare(db1, db2)
+
+        assert result['data_differences'] == {}
+        assert result['checksum_stats']['user']['chunks_checked'] == 15
+        assert result['checksum_stats']['user']['chunks_mismatched'] == 0
+
+    def test_drill_down_finds_exact_rows(self, db_pair):
+        db1, db2, conn = db_pair
+        conn.execute("UPDATE user SET points = -1 WHERE display_name = 'user01234'")
+        conn.execute("DELETE FROM user WHERE display_name = 'user00042'")
+        conn.execute("INSERT INTO user VALUES ('user99999', 1)")
+        conn.execute("UPDATE note SET body = 'edited' WHERE rowid = 321")
+        conn.commit()
+
+        result = self._compare(db1, db2)
+
+        user_diff = result['data_differences']['user']
+        assert user_diff['only_in_db1'] == [('user00042',)]
+        assert user_diff['only_in_db2'] == [('user99999',)]
+        assert user_diff['changed'] == [('user01234',)]
+        assert result['checksum_stats']['user']['chunks_mismatched'] == 3
+        assert result['data_differences']['note']['changed'] == [(321,)]
+        # Same row count on both sides, so only the checksums reveal the edits
+        assert 'user' not in result['count_differences']
@@ -0,0 +1,102 @@
+"""
+Tests for online SQLite backups and incremental page snapshots.
+"""
+
+import sqlite3
+import tempfile
+import pytest
+from pathlib import Path
+
+from app_helpers.services.database_backup_service import (
+    create_online_backup, vacuum_into_backup, verify_database, IncrementalSnapshotService
+)
+
+
+def _rows(db_path) -> list:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT id, body FROM note ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+class TestDatabaseBackup:
+    """Test suite for WAL-safe backups and snapshot chains."""
+
+    @pytest.fixture
+    def work_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    @pytest.fixture
+    def live_db(self, work_dir):
+        """A WAL-mode database with an open writer, so recent commits live in the -wal file"""
+        db_path = work_dir / "live.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        conn.execute("CREATE TABLE note (id INTEGER PRIMARY KEY, body TEXT)")
+        conn.executemany("INSERT INTO note (body) VALUES (?)", [(f"note {i}" * 20,) for i in range(500)])
+        conn.commit()
+        yield db_path, conn
+        conn.close()
+
+    def test_online_backup_includes_wal_contents(self, work_dir, live_db):
+        db_path, conn = live_db
+        assert Path(f"{db_path}-wal").stat().st_size > 0
+
+        backup_path = work_dir / "backup.db"
+        result = create_online_backup(str(db_path), str(backup_path), pages_per_step=8, step_sleep=0)
+
+        assert result['size_bytes'] > 0
+        assert verify_database(str(backup_path)) == (True, ['ok'])
+        assert _rows(backup_path) == _rows(db_path)
+
+    def test_vacuum_into_backup(self, work_dir, live_db):
+        db_path, _ = live_db
+        backup_path = work_dir / "vacuum.db"
+
+        vacuum_into_backup(str(db_path), str(backup_path))
+
+        assert verify_database(str(backup_path))[0]
+        assert len(_rows(backup_path)) == 500
+
+    def test_verify_rejects_non_database(self, work_dir):
+        bogus = work_dir / "bogus.db"
+        bogus.write_bytes(b"not a database" * 100)
+
+        ok, messages = verify_database(str(bogus))
+
+        assert not ok
+        assert messages
+
+    def test_incremental_snapshots_store_changed_pages_only(self, work_dir, live_db):
+        db_path, conn = live_db
+        service = IncrementalSnapshotService(str(db_path), str(work_dir / "snapshots"), step_sleep=0)
+
+        first = service.create_snapshot()
+        assert first['pages_written'] == first['page_count']
+
+        conn.execute("UPDATE note SET body = 'changed' WHERE id = 1")
+        conn.commit()
+        second = service.create_snapshot()
+        assert 0 < second['pages_written'] < second['page_count']
+        assert second['size_bytes'] < first['size_bytes']
+
+        unchanged = service.create_snapshot()
+        assert unchanged['pages_written'] == 0
+
+        restored_latest = work_dir / "restored_latest.db"
+        service.restore_snapshot(str(restored_latest))
+        assert _rows(restored_latest) == _rows(db_path)
+
+        restored_first = work_dir / "restored_first.db"
+        service.restore_snapshot(str(restored_first), sequence=1)
+        assert _rows(restored_first)[0] == (1, "note 0" * 20)
+
+    def test_restore_without_snapshots_fails(self, work_dir, live_db):
+        db_path, _ = live_db
+        service = IncrementalSnapshotService(str(db_path), str(work_dir / "empty"))
+
+        with pytest.raises(FileNotFoundError):
+            service.restore_snapshot(str(work_dir / "out.db"))
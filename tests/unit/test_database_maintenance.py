@@ -0,0 +1,94 @@
+"""
+Tests for per-connection SQLite PRAGMAs, lock-wait metrics and WAL maintenance.
+"""
+
+import sqlite3
+import pytest
+from sqlalchemy import event, text
+from sqlmodel import create_engine
+
+import models
+from app_helpers.services import database_maintenance_service as maintenance
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuning.db'}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", models.apply_sqlite_pragmas)
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def metrics():
+    maintenance.lock_wait_metrics.reset()
+    yield maintenance.lock_wait_metrics
+    maintenance.lock_wait_metrics.reset()
+
+
+@pytest.mark.unit
+class TestDatabaseMaintenance:
+    """Test suite for SQLite tuning and maintenance."""
+
+    def test_pragmas_apply_to_every_pooled_connection(self, file_engine, monkeypatch):
+        monkeypatch.setitem(models.SQLITE_PRAGMAS, 'busy_timeout', '1234')
+        file_engine.dispose()
+        first = file_engine.connect()
+        second = file_engine.connect()
+        try:
+            for conn in (first, second):
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert conn.execute(text("PRAGMA wal_autocheckpoint")).scalar() == 1000
+        finally:
+            first.close()
+            second.close()
+
+    def test_invalid_pragma_values_are_skipped(self, monkeypatch):
+        monkeypatch.setitem(models.SQLITE_PRAGMAS, 'cache_size', '1; DROP TABLE user')
+        conn = sqlite3.connect(":memory:")
+        models.apply_sqlite_pragmas(conn)
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] != 1
+        conn.close()
+
+    def test_slow_writes_and_busy_errors_are_recorded(self, file_engine, metrics, monkeypatch):
+        maintenance.install_lock_wait_hooks(file_engine)
+        monkeypatch.setitem(models.SQLITE_PRAGMAS, 'busy_timeout', '0')
+        monkeypatch.setattr(maintenance, 'DB_LOCK_WAIT_THRESHOLD_MS', 0)
+        file_engine.dispose()
+
+        with file_engine.connect() as conn:
+            conn.execute(text("INSERT INTO item (name) VALUES ('a')"))
+            conn.execute(text("SELECT * FROM item")).all()
+            conn.commit()
+        assert metrics.snapshot()['writes'] == 1
+        assert metrics.snapshot()['slow_writes'] == 1
+
+        holder = file_engine.connect()
+        holder.execute(text("INSERT INTO item (name) VALUES ('held')"))
+        try:
+            with file_engine.connect() as conn:
+                with pytest.raises(Exception):
+                    conn.execute(text("INSERT INTO item (name) VALUES ('blocked')"))
+        finally:
+            holder.rollback()
+            holder.close()
+        snapshot = metrics.snapshot()
+        assert snapshot['busy_errors'] == 1
+        assert snapshot['recent'][0]['ms'] is None
+
+    def test_maintenance_checkpoints_wal(self, file_engine, metrics):
+        with file_engine.connect() as conn:
+            conn.execute(text("INSERT INTO item (name) VALUES ('a')"))
+            conn.commit()
+
+        result = maintenance.run_database_maintenance(file_engine, mode='TRUNCATE')
+        assert result['busy'] == 0
+        assert metrics.snapshot()['last_checkpoint'] is result
+
+        with pytest.raises(ValueError):
+            maintenance.run_database_maintenance(file_engine, mode='BOGUS')
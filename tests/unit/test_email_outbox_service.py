@@ -0,0 +1,166 @@
+"""
+Tests for the email outbox and its reusable SMTP connection, against a local debugging SMTP server.
+"""
+
+import socketserver
+import threading
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+from sqlmodel import Session, select, delete
+
+from models_email import EmailOutbox, email_engine
+from app_helpers.services.email_outbox_service import EmailOutboxService, SMTPConnection, outbox_delivery_enabled
+
+
+class _DebugSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail; rejects recipients at rejected.example"""
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self._reply("220 debug ESMTP")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                self._reply("250 debug")
+            elif command == "MAIL":
+                recipients = []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                if "rejected.example" in line:
+                    self._reply("550 No such user")
+                else:
+                    recipients.append(line.split(":", 1)[1].strip("<> "))
+                    self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline().decode()
+                    if data_line in (".\r\n", ""):
+                        break
+                    data.append(data_line)
+                server.messages.append((recipients, "".join(data)))
+                self._reply("250 Queued")
+            elif command in ("NOOP", "RSET"):
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Not implemented")
+
+    def _reply(self, text):
+        self.wfile.write(f"{text}\r\n".encode())
+
+
+class _DebugSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _DebugSMTPHandler)
+        self.connections = 0
+        self.messages = []
+
+
+@pytest.mark.unit
+class TestEmailOutbox:
+    """Test suite for queued, batched email delivery."""
+
+    @pytest.fixture
+    def smtp_server(self):
+        server = _DebugSMTPServer()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def outbox(self, smtp_server):
+        with Session(email_engine) as email_session:
+            email_session.exec(delete(EmailOutbox))
+            email_session.commit()
+        env = {'SMTP_HOST': '127.0.0.1', 'SMTP_PORT': str(smtp_server.server_address[1])}
+        with patch.dict('os.environ', env):
+            service = EmailOutboxService(fernet=Fernet(Fernet.generate_key()), connection=SMTPConnection())
+        yield service
+        service.connection.close()
+
+    def _entries(self):
+        with Session(email_engine) as email_session:
+            return {entry.id: entry for entry in email_session.exec(select(EmailOutbox)).all()}
+
+    def test_enqueue_encrypts_and_defers_sending(self, outbox, smtp_server):
+        entry_id = outbox.enqueue("alice@example.com", "Verify", "https://example.com/claim/abc")
+
+        entry = self._entries()[entry_id]
+        assert entry.status == "pending"
+        assert "alice@example.com" not in entry.recipient_encrypted
+        assert "claim/abc" not in entry.body_encrypted
+        assert smtp_server.connections == 0
+
+    def test_batch_is_sent_over_one_connection(self, outbox, smtp_server):
+        for i in range(5):
+            outbox.enqueue(f"user{i}@example.com", "Recovery", f"link {i}")
+
+        stats = outbox.drain(batch_size=2)
+
+        assert stats == {'sent': 5, 'retried': 0, 'failed': 0}
+        assert smtp_server.connections == 1
+        assert sorted(rcpt[0] for rcpt, _ in smtp_server.messages) == [f"user{i}@example.com" for i in range(5)]
+        assert all(e.status == "sent" and e.body_encrypted == "" for e in self._entries().values())
+
+    def test_rejected_recipient_fails_without_retry(self, outbox, smtp_server):
+        entry_id = outbox.enqueue("nobody@rejected.example", "Verify", "link")
+
+        stats = outbox.process_outbox()
+
+        assert stats['failed'] == 1
+        assert self._entries()[entry_id].status == "failed"
+
+    def test_unreachable_server_retries_with_backoff(self, outbox, smtp_server):
+        entry_id = outbox.enqueue("bob@example.com", "Verify", "link")
+        outbox.connection.port = 1  # Nothing listens here
+
+        stats = outbox.process_outbox()
+
+        entry = self._entries()[entry_id]
+        assert stats['retried'] == 1
+        assert entry.status == "pending" and entry.attempts == 1
+        assert entry.next_attempt_at > datetime.utcnow() + timedelta(seconds=20)
+        # Not due yet, so the next pass leaves it alone
+        assert outbox.process_outbox() == {'sent': 0, 'retried': 0, 'failed': 0}
+
+    def test_outbox_needs_email_auth_and_a_configured_key(self):
+        key = Fernet.generate_key().decode()
+        with patch.dict('os.environ', {'EMAIL_AUTH_ENABLED': 'true', 'EMAIL_ENCRYPTION_KEY': key}):
+            assert outbox_delivery_enabled()
+        # No sender task runs without email auth
+        with patch.dict('os.environ', {'EMAIL_AUTH_ENABLED': 'false', 'EMAIL_ENCRYPTION_KEY': key}):
+            assert not outbox_delivery_enabled()
+        # A process-local key would strand queued rows after a restart
+        with patch.dict('os.environ', {'EMAIL_AUTH_ENABLED': 'true', 'EMAIL_ENCRYPTION_KEY': ''}):
+            assert not outbox_delivery_enabled()
+            with pytest.raises(RuntimeError):
+                EmailOutboxService(connection=SMTPConnection())
+
+    def test_email_is_sent_directly_without_a_key(self, outbox, smtp_server):
+        from app_helpers.services.email_management_service import EmailManagementService
+
+        env = {
+            'EMAIL_AUTH_ENABLED': 'true', 'EMAIL_ENCRYPTION_KEY': '',
+            'SMTP_HOST': '127.0.0.1', 'SMTP_PORT': str(smtp_server.server_address[1])
+        }
+        with patch.dict('os.environ', env):
+            EmailManagementService()._send_email("carol@example.com", "Verify", "link")
+
+        assert self._entries() == {}
+        assert [rcpt for rcpt, _ in smtp_server.messages] == [["carol@example.com"]]
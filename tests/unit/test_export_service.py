@@ -0,0 +1,78 @@
+"""
+Tests for the streaming database export.
+"""
+
+import tempfile
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from models import User, Prayer, PrayerMark, SecurityLog
+from app_helpers.services.export_service import ExportService
+
+
+class TestExportService:
+    """Test suite for ExportService streaming writers."""
+
+    @pytest.fixture
+    def archives_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    @pytest.fixture
+    def populated_session(self, test_session):
+        test_session.add(User(display_name="Exporter"))
+        test_session.add(Prayer(id="p1", author_username="Exporter", text="Pray", generated_prayer="Amen"))
+        for i in range(25):
+            test_session.add(PrayerMark(id=f"m{i:02d}", username="Exporter", prayer_id="p1",
+                                        created_at=datetime(2024, 1, 1, 8, 0) + timedelta(minutes=i)))
+        test_session.add(SecurityLog(id="s1", event_type="failed_login", details="bad code",
+                                     created_at=datetime(2024, 2, 3, 9, 0)))
+        test_session.add(SecurityLog(id="s2", event_type="rate_limit",
+                                     created_at=datetime(2024, 1, 5, 9, 0)))
+        test_session.commit()
+        return test_session
+
+    def _export(self, archives_dir, session, **kwargs):
+        service = ExportService(str(archives_dir))
+        with patch('models.read_engine', session.bind), \
+             patch('app_helpers.services.export_service.STREAM_BATCH_SIZE', 10):
+            assert service.export_all(**kwargs)
+        return service
+
+    def test_streams_rows_in_existing_file_format(self, archives_dir, populated_session):
+        service = self._export(archives_dir, populated_session)
+
+        lines = (archives_dir / "prayers" / "prayer_marks.txt").read_text(encoding='utf-8').split('\n')
+        assert lines[0].startswith("Prayer Marks (exported ")
+        assert lines[1] == "Format: id|created_at|prayer_id|username"
+        assert lines[2:4] == ["", ""]
+        assert lines[4] == "m00|January 01 2024 at 08:00|p1|Exporter"
+        assert len(lines) == 4 + 25
+
+        assert service.exported_counts['prayer_data'] == 25
+        assert service.table_timings["prayers/prayer_marks.txt"][0] == 25
+
+    def test_empty_tables_do_not_create_files(self, archives_dir, populated_session):
+        self._export(archives_dir, populated_session)
+
+        assert not (archives_dir / "prayers" / "prayer_skips.txt").exists()
+        assert not (archives_dir / "authentication" / "auth_requests.txt").exists()
+
+    def test_monthly_files_split_streamed_rows(self, archives_dir, populated_session):
+        service = self._export(archives_dir, populated_session)
+
+        january = (archives_dir / "security" / "2024_01_security_events.txt").read_text(encoding='utf-8')
+        february = (archives_dir / "security" / "2024_02_security_events.txt").read_text(encoding='utf-8')
+        assert january.startswith("Security Events for January 2024")
+        assert january.endswith("January 05 2024 at 09:00|rate_limit|anonymous|unknown|")
+        assert february.endswith("February 03 2024 at 09:00|failed_login|anonymous|unknown|bad code")
+        assert service.exported_counts['security'] == 2
+
+    def test_parallel_export_matches_sequential(self, archives_dir, populated_session):
+        sequential = self._export(archives_dir / "seq", populated_session)
+        parallel = self._export(archives_dir / "par", populated_session, parallel=True, workers=3)
+
+        assert parallel.exported_counts == sequential.exported_counts
+        assert set(parallel.table_timings) == set(sequential.table_timings)
@@ -0,0 +1,60 @@
+"""
+Tests for feed versions, ETags and 304 responses on the authenticated feed.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory
+from app_helpers.services.feed_version_service import get_feed_version
+
+
+def _global_version(test_session):
+    return test_session.execute(text("SELECT version FROM content_version WHERE scope = 'feed'")).scalar()
+
+
+@pytest.mark.unit
+class TestFeedVersion:
+    """Test suite for the feed version counter and conditional GETs."""
+
+    @pytest.fixture
+    def prayer(self, test_session):
+        prayer = PrayerFactory.create(author_username="author")
+        test_session.add_all([UserFactory.create(display_name="author"), prayer])
+        test_session.commit()
+        return prayer
+
+    def test_version_follows_feed_relevant_writes(self, test_session, prayer):
+        before = _global_version(test_session)
+        member_version = get_feed_version(test_session, "member")
+
+        test_session.add(PrayerMarkFactory.create(username="member", prayer_id=prayer.id))
+        test_session.commit()
+        assert _global_version(test_session) == before + 1
+        assert get_feed_version(test_session, "member") != member_version
+
+        prayer.flagged = True
+        test_session.commit()
+        assert _global_version(test_session) == before + 2
+
+        # Re-saving an unchanged prayer is not a change
+        test_session.add(prayer)
+        test_session.commit()
+        assert _global_version(test_session) == before + 2
+
+    def test_feed_answers_304_until_something_changes(self, client, mock_authenticated_user, test_session, prayer):
+        response = client.get("/feed")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        assert client.get("/feed", headers={"If-None-Match": etag}).status_code == 304
+        # Different view of the same data gets its own validator
+        other = client.get("/feed?feed_type=my_prayers", headers={"If-None-Match": etag})
+        assert other.status_code == 200 and other.headers["etag"] != etag
+
+        test_session.add(PrayerMarkFactory.create(username="someone", prayer_id=prayer.id))
+        test_session.commit()
+        response = client.get("/feed", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
@@ -427,4 +427,110 @@ class TestInviteTreeFactoryExtension:
         token = InviteTokenFactory.create(used_by_user_id="user123")
         
         assert hasattr(token, 'used_by_user_id')
-        assert token.used_by_user_id == "user123" 
\ No newline at end of file
+        assert token.used_by_user_id == "user123" 
+
+@pytest.mark.unit
+class TestInviteTreeBulkBuild:
+    """Test the adjacency-map tree build and its cache"""
+    
+    def _get_tree(self, test_session):
+        with patch('app_helpers.services.invite_helpers.Session') as mock_session:
+            mock_session.return_value.__enter__.return_value = test_session
+            return get_invite_tree()
+    
+    def test_tree_query_count_is_independent_of_size(self, test_session):
+        """Test that building the tree does not issue per-user queries"""
+        from sqlalchemy import event
+        from app_helpers.services.invite_helpers import invalidate_invite_tree_cache
+        
+        admin = UserFactory.create_admin()
+        users = [UserFactory.create(display_name=f"U{i}", invited_by_username="admin" if i < 5 else f"U{i - 5}")
+                 for i in range(30)]
+        test_session.add_all([admin, *users])
+        test_session.commit()
+        invalidate_invite_tree_cache()
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            result = self._get_tree(test_session)
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+        
+        assert result['tree']['total_descendants'] == 30
+        assert result['stats']['max_depth'] == 6
+        assert len(statements) < len(users)
+        assert not any("invited_by_username = " in sql for sql in statements)
+    
+    def test_tree_is_cached_until_invite_claimed(self, test_session):
+        """Test that the cached tree is reused and dropped on invalidation"""
+        from app_helpers.services.invite_helpers import invalidate_invite_tree_cache
+        
+        test_session.add_all([UserFactory.create_admin(),
+                              UserFactory.create(display_name="User1", invited_by_username="admin")])
+        test_session.commit()
+        invalidate_invite_tree_cache()
+        
+        first = self._get_tree(test_session)
+        assert self._get_tree(test_session) is first
+        
+        invalidate_invite_tree_cache()
+        assert self._get_tree(test_session) is not first
+    
+    def test_cache_hit_costs_one_lookup(self, test_session):
+        """Test that serving the cached tree does not scan the user table"""
+        from sqlalchemy import event
+        
+        test_session.add_all([UserFactory.create_admin(),
+                              *[UserFactory.create(display_name=f"U{i}", invited_by_username="admin") for i in range(10)]])
+        test_session.commit()
+        first = self._get_tree(test_session)
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            assert self._get_tree(test_session) is first
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+        
+        assert len(statements) == 1
+        assert "content_version" in statements[0]
+    
+    def test_tree_is_rebuilt_after_inviter_repair(self, test_session):
+        """Test that editing invited_by_username outside the claim flow refreshes the cache"""
+        from app_helpers.services.invite_helpers import invalidate_invite_tree_cache
+        
+        user1 = UserFactory.create(display_name="User1", invited_by_username="admin")
+        user2 = UserFactory.create(display_name="User2", invited_by_username="admin")
+        test_session.add_all([UserFactory.create_admin(), user1, user2])
+        test_session.commit()
+        invalidate_invite_tree_cache()
+        
+        first = self._get_tree(test_session)
+        assert len(first['tree']['children']) == 2
+        
+        user2.invited_by_username = "User1"
+        test_session.add(user2)
+        test_session.commit()
+        
+        repaired = self._get_tree(test_session)
+        assert repaired is not first
+        assert [child['user']['display_name'] for child in repaired['tree']['children']] == ["User1"]
+    
+    def test_tree_tolerates_invite_cycles(self, test_session):
+        """Test that cyclic invite data does not loop forever"""
+        admin = UserFactory.create_admin()
+        user1 = UserFactory.create(display_name="User1", invited_by_username="admin")
+        user2 = UserFactory.create(display_name="User2", invited_by_username="User1")
+        test_session.add_all([admin, user1, user2])
+        test_session.commit()
+        admin.invited_by_username = "User2"
+        test_session.add(admin)
+        test_session.commit()
+        
+        node = _build_user_tree_node(admin, test_session)
+        
+        assert node['total_descendants'] == 2
+        assert _calculate_max_depth(test_session) == 2
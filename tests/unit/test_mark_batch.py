@@ -0,0 +1,73 @@
+"""
+Tests for replaying offline prayer-mark queues through /api/marks/batch.
+"""
+
+import pytest
+from datetime import datetime
+from sqlmodel import select
+
+from models import PrayerMark, PrayerActivityLog
+from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory
+from app_helpers.services.text_archive_service import TextArchiveService
+
+
+@pytest.mark.unit
+class TestMarkBatch:
+    """Test suite for batched offline prayer marks."""
+
+    @pytest.fixture
+    def prayers(self, test_session):
+        prayers = [PrayerFactory.create(author_username="author") for _ in range(2)]
+        test_session.add_all([UserFactory.create(display_name="author"), *prayers])
+        test_session.commit()
+        # Routes close the shared test session, so hand out ids rather than instances
+        return [prayer.id for prayer in prayers]
+
+    def test_batch_records_and_dedupes_offline_marks(self, client, mock_authenticated_user, test_session, prayers):
+        first, second = prayers
+        # Already delivered before the connection dropped
+        test_session.add(PrayerMarkFactory.create(
+            username="testuser", prayer_id=first, created_at=datetime(2025, 3, 1, 8, 0)
+        ))
+        test_session.commit()
+
+        response = client.post("/api/marks/batch", json={"marks": [
+            {"prayer_id": first, "prayed_at": "2025-03-01T08:00:00Z"},
+            {"prayer_id": first, "prayed_at": "2025-03-01T09:00:00Z"},
+            {"prayer_id": first, "prayed_at": "2025-03-01T09:00:00Z"},
+            {"prayer_id": second, "prayed_at": "2025-03-02T07:30:00Z"},
+            {"prayer_id": "missing", "prayed_at": "2025-03-02T07:31:00Z"},
+        ]})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == [
+            "duplicate", "recorded", "duplicate", "recorded", "not_found"
+        ]
+        assert data["prayers"][first] == {"mark_count": 2, "distinct_user_count": 1, "user_mark_count": 2}
+        assert data["prayers"][second]["user_mark_count"] == 1
+
+        marks = test_session.exec(select(PrayerMark).where(PrayerMark.username == "testuser")).all()
+        assert len(marks) == 3
+        logs = test_session.exec(select(PrayerActivityLog).where(PrayerActivityLog.action == "prayed")).all()
+        assert len(logs) == 2
+
+    def test_batch_size_is_limited(self, client, mock_authenticated_user, prayers):
+        from app_helpers.routes.prayer.prayer_status import MAX_MARK_BATCH
+        marks = [{"prayer_id": prayers[0]}] * (MAX_MARK_BATCH + 1)
+        assert client.post("/api/marks/batch", json={"marks": marks}).status_code == 400
+
+    def test_archive_lines_written_in_one_append(self, tmp_path):
+        service = TextArchiveService(base_dir=str(tmp_path))
+        service.enabled = True
+        archive = tmp_path / "prayer.txt"
+        archive.write_text("Prayer 1 by author\n")
+
+        service.append_prayer_marks_with_timestamps(
+            str(archive), "member", [datetime(2025, 3, 1, 8, 0), datetime(2025, 3, 1, 9, 15)]
+        )
+
+        assert archive.read_text().splitlines()[1:] == [
+            "March 01 2025 at 08:00 - member prayed this prayer",
+            "March 01 2025 at 09:15 - member prayed this prayer",
+        ]
@@ -77,14 +77,14 @@ class TestMultiDeviceAuthWorkflows:
         
         # Create expired request
         expired_req = AuthenticationRequestFactory.create(
-            username=user.display_name,
+            user_id=user.display_name,
             status="pending",
             expires_at=datetime.utcnow() - timedelta(hours=1)
         )
         
         # Create valid request
         valid_req = AuthenticationRequestFactory.create(
-            username=user.display_name,
+            user_id=user.display_name,
             status="pending",
             expires_at=datetime.utcnow() + timedelta(days=1)
         )
@@ -93,21 +93,63 @@ class TestMultiDeviceAuthWorkflows:
         test_session.commit()
         
         # Run cleanup
-        with patch('app_helpers.services.auth.token_helpers.Session') as mock_session_class, \
-             patch('app_helpers.services.auth.validation_helpers.log_auth_action') as mock_log:
+        with patch('app_helpers.services.auth.token_helpers.Session') as mock_session_class:
             mock_session_class.return_value.__enter__.return_value = test_session
             
-            cleanup_expired_requests()
+            expired_count = cleanup_expired_requests()
         
         # Check that expired request was marked as expired
         updated_expired = test_session.get(AuthenticationRequest, expired_req.id)
         updated_valid = test_session.get(AuthenticationRequest, valid_req.id)
         
+        assert expired_count == 1
         assert updated_expired.status == "expired"
         assert updated_valid.status == "pending"
         
-        # Verify audit log was called
-        mock_log.assert_called()
+        # Verify audit rows were bulk inserted
+        audit_logs = test_session.exec(
+            select(AuthAuditLog).where(AuthAuditLog.action == "expired")
+        ).all()
+        assert [log.auth_request_id for log in audit_logs] == [expired_req.id]
+        assert audit_logs[0].actor_type == "system"
+    
+    def test_cleanup_expired_requests_in_batches(self, test_session):
+        """Test expiry issues one UPDATE per batch rather than one per request"""
+        from sqlalchemy import event
+        from app_helpers.services.auth_helpers import effective_request_status
+        
+        user = UserFactory.create()
+        test_session.add(user)
+        requests = [
+            AuthenticationRequestFactory.create(
+                user_id=user.display_name,
+                status="pending",
+                expires_at=datetime.utcnow() - timedelta(hours=i + 1)
+            )
+            for i in range(7)
+        ]
+        test_session.add_all(requests)
+        test_session.commit()
+        
+        # Request paths see expiry lazily before the background task runs
+        assert effective_request_status(requests[0]) == "expired"
+        
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            with patch('app_helpers.services.auth.token_helpers.Session') as mock_session_class:
+                mock_session_class.return_value.__enter__.return_value = test_session
+                
+                expired_count = cleanup_expired_requests(batch_size=3)
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+        
+        assert expired_count == 7
+        assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 3
+        assert test_session.exec(
+            select(func.count(AuthAuditLog.id)).where(AuthAuditLog.action == "expired")
+        ).one() == 7
 
 
 @pytest.mark.unit
@@ -0,0 +1,82 @@
+"""
+Tests for indexed normalized-username resolution and duplicate detection.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlmodel import select, text
+
+from models import User
+from app_helpers.utils.username_helpers import (
+    find_users_with_equivalent_usernames, backfill_normalized_names
+)
+from migrations.duplicate_user_migration import find_duplicate_groups, find_duplicate_usernames
+
+
+class TestNormalizedUsername:
+    """Test suite for the normalized_name column and its consumers."""
+
+    def test_insert_and_rename_maintain_normalized_name(self, test_session):
+        user = User(display_name="  Mary   Jane ")
+        test_session.add(user)
+        test_session.commit()
+        assert user.normalized_name == "mary jane"
+
+        user.display_name = "Mary Ann"
+        test_session.add(user)
+        test_session.commit()
+        assert test_session.get(User, "Mary Ann").normalized_name == "mary ann"
+
+    def test_case_only_rename_keeps_key(self, test_session):
+        user = User(display_name="bob")
+        test_session.add(user)
+        test_session.commit()
+
+        user.display_name = "Bob"
+        test_session.add(user)
+        test_session.commit()
+
+        assert test_session.get(User, "Bob").normalized_name == "bob"
+
+    def test_equivalent_user_is_left_unindexed(self, test_session):
+        test_session.add(User(display_name="Alice", created_at=datetime(2024, 1, 1)))
+        test_session.commit()
+        test_session.add(User(display_name="alice ", created_at=datetime(2024, 2, 1)))
+        test_session.commit()
+
+        assert test_session.get(User, "alice ").normalized_name is None
+
+        users = find_users_with_equivalent_usernames(test_session, "ALICE")
+        assert [u.display_name for u in users] == ["Alice", "alice "]
+        assert find_users_with_equivalent_usernames(test_session, "nobody") == []
+
+    def test_lookup_is_an_index_seek(self, test_session):
+        test_session.add(User(display_name="Carol"))
+        test_session.commit()
+
+        plan = test_session.exec(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM user WHERE normalized_name = 'carol' OR normalized_name IS NULL"
+        )).all()
+
+        assert any("ix_user_normalized_name" in row[-1] for row in plan)
+        assert not any(row[-1].startswith("SCAN") for row in plan)
+        assert [u.display_name for u in find_users_with_equivalent_usernames(test_session, " CAROL")] == ["Carol"]
+
+    def test_backfill_assigns_oldest_and_reports_duplicates(self, test_session):
+        base = datetime(2024, 1, 1)
+        for offset, name in enumerate(["Dave", "dave", "DAVE", "Erin"]):
+            test_session.add(User(display_name=name, created_at=base + timedelta(days=offset)))
+        test_session.commit()
+        # Simulate a pre-migration database with no keys populated
+        test_session.exec(text("UPDATE user SET normalized_name = NULL"))
+        test_session.commit()
+        test_session.expire_all()
+
+        assert backfill_normalized_names(test_session) == 2
+        keys = {u.display_name: u.normalized_name for u in test_session.exec(select(User)).all()}
+        assert keys == {"Dave": "dave", "dave": None, "DAVE": None, "Erin": "erin"}
+
+        groups = find_duplicate_groups(test_session)
+        assert list(groups) == ["dave"]
+        assert [u.display_name for u in groups["dave"]] == ["Dave", "dave", "DAVE"]
+        assert find_duplicate_usernames(test_session) == [("Dave", 3)]
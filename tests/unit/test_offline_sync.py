@@ -0,0 +1,109 @@
+"""
+Tests for the offline prayer delta sync (prayer_sync_version + /api/sync/prayers).
+"""
+
+import pytest
+from pathlib import Path
+from sqlalchemy import text
+from sqlmodel import select
+
+from models import PrayerAttribute, PrayerSyncVersion
+from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory
+from app_helpers.services.offline_sync_service import get_prayer_delta, decode_sync_cursor
+
+
+def _versions(session):
+    return {row.prayer_id: row.version for row in session.exec(select(PrayerSyncVersion)).all()}
+
+
+@pytest.mark.unit
+class TestOfflineSync:
+    """Test suite for offline delta sync."""
+
+    @pytest.fixture
+    def prayers(self, test_session):
+        prayers = [PrayerFactory.create(author_username="author") for _ in range(3)]
+        test_session.add_all([UserFactory.create(display_name="author"), *prayers])
+        test_session.commit()
+        # Routes close the shared test session, so hand out ids rather than instances
+        return [prayer.id for prayer in prayers]
+
+    def test_writes_stamp_increasing_versions(self, test_session, prayers):
+        first, second, third = prayers
+        created = _versions(test_session)
+        assert sorted(created.values()) == [1, 2, 3]
+
+        test_session.add(PrayerMarkFactory.create(username="reader", prayer_id=second))
+        test_session.commit()
+        after_mark = _versions(test_session)
+        assert after_mark[second] == 4
+        assert after_mark[first] == created[first]
+
+        test_session.add(PrayerAttribute(prayer_id=first, attribute_name="archived", attribute_value="true"))
+        test_session.commit()
+        assert _versions(test_session)[first] == 5
+
+    def test_one_stamp_per_commit(self, test_session, prayers):
+        first = prayers[0]
+        latest = max(_versions(test_session).values())
+
+        # Two flushes in one transaction still assign a single new version
+        test_session.add(PrayerMarkFactory.create(username="reader", prayer_id=first))
+        test_session.flush()
+        test_session.add(PrayerAttribute(prayer_id=first, attribute_name="answered", attribute_value="true"))
+        test_session.commit()
+        assert max(_versions(test_session).values()) == latest + 1
+        assert _versions(test_session)[first] == latest + 1
+
+        # Rolled-back changes are not stamped
+        test_session.add(PrayerMarkFactory.create(username="reader", prayer_id=first))
+        test_session.flush()
+        test_session.rollback()
+        test_session.commit()
+        assert max(_versions(test_session).values()) == latest + 1
+
+    def test_delta_returns_only_changes_since_cursor(self, test_session, prayers):
+        first, second, third = prayers
+        cursor = int(get_prayer_delta(test_session, "reader")["cursor"])
+
+        test_session.add(PrayerMarkFactory.create(username="reader", prayer_id=second))
+        test_session.add(PrayerAttribute(prayer_id=third, attribute_name="archived", attribute_value="true"))
+        test_session.commit()
+
+        delta = get_prayer_delta(test_session, "reader", cursor)
+        assert [p["id"] for p in delta["prayers"]] == [second]
+        assert delta["prayers"][0]["user_mark_count"] == 1
+        assert delta["prayers"][0]["mark_count"] == 1
+        assert delta["removed"] == [third]
+        assert not delta["has_more"] and not delta["reset"]
+
+        assert get_prayer_delta(test_session, "reader", int(delta["cursor"]))["prayers"] == []
+
+    def test_delta_pages_and_resets(self, test_session, prayers):
+        page = get_prayer_delta(test_session, "reader", 0, limit=2)
+        assert len(page["prayers"]) == 2 and page["has_more"]
+        rest = get_prayer_delta(test_session, "reader", int(page["cursor"]), limit=2)
+        assert len(rest["prayers"]) == 1 and not rest["has_more"]
+
+        ahead = get_prayer_delta(test_session, "reader", 999)
+        assert ahead["reset"] and len(ahead["prayers"]) == 3
+        assert decode_sync_cursor("bogus") == 0
+
+    def test_migration_seeds_existing_prayers(self, test_session, prayers):
+        test_session.exec(text("DELETE FROM prayer_sync_version"))
+        up_sql = Path("migrations/020_prayer_sync_version/up.sql").read_text()
+        seed = [stmt for stmt in up_sql.split(";") if "INSERT INTO" in stmt][0]
+        test_session.exec(text(seed))
+        test_session.commit()
+        assert sorted(_versions(test_session).values()) == [1, 2, 3]
+
+    def test_sync_endpoint(self, client, mock_authenticated_user, prayers):
+        response = client.get("/api/sync/prayers?limit=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["prayers"]) == 2 and data["has_more"]
+        assert response.headers["cache-control"] == "private, no-store"
+
+        first_page = {p["id"] for p in data["prayers"]}
+        response = client.get(f"/api/sync/prayers?since={data['cursor']}")
+        assert [p["id"] for p in response.json()["prayers"]] == [i for i in prayers if i not in first_page]
@@ -4,7 +4,7 @@ from datetime import date, datetime, timedelta
 from unittest.mock import Mock, patch
 from sqlmodel import Session, select, func
 
-from models import User, Prayer, PrayerMark
+from models import User, Prayer, PrayerMark, PrayerAttribute
 from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory, PrayerAttributeFactory
 from app import generate_prayer, get_feed_counts, todays_prompt
 from app_helpers.services.ai_providers import (
@@ -54,6 +54,29 @@ class TestPrayerGeneration:
         assert "Amen." in result['prayer']
         assert result['service_status'] == 'degraded'
         assert result['provider'] == 'anthropic'
+        assert result['prompt_hash'] is None
+
+    def test_submitted_prayer_records_prompt_hash(self, test_session, tmp_path):
+        """The prompt hash a prayer was generated with is stored as an attribute"""
+        from app_helpers.services.archive_first_service import submit_prayer_archive_first
+        from app_helpers.services.text_archive_service import TextArchiveService
+
+        author = UserFactory.create(display_name="hash_author")
+        test_session.add(author)
+        test_session.commit()
+
+        with patch('app_helpers.services.archive_first_service.engine', test_session.bind), \
+                patch('app_helpers.services.archive_first_service.text_archive_service',
+                      TextArchiveService(base_dir=str(tmp_path))):
+            prayer = submit_prayer_archive_first("Please pray for me", author,
+                                                 generated_prayer="Lord, hear us. Amen.",
+                                                 prompt_hash="0123456789abcdef")
+
+        assert test_session.exec(
+            select(PrayerAttribute.attribute_value)
+            .where(PrayerAttribute.prayer_id == prayer.id)
+            .where(PrayerAttribute.attribute_name == 'prompt_hash')
+        ).first() == "0123456789abcdef"
 
     def test_generate_prayer_system_prompt_content(self):
         """Test that system prompt emphasizes community prayer"""
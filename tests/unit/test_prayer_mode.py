@@ -1,4 +1,5 @@
 """Tests for prayer mode functionality"""
+import json
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch
@@ -7,7 +8,10 @@ from sqlmodel import Session, select
 
 from models import User, Prayer, PrayerMark, PrayerSkip, PrayerAttribute, engine
 from tests.factories import UserFactory, PrayerFactory, SessionFactory
-from app_helpers.routes.prayer.prayer_mode import initialize_prayer_queue, get_prayer_age_text
+from app_helpers.routes.prayer.prayer_mode import (
+    initialize_prayer_queue, get_prayer_age_text, start_prayer_mode_session,
+    get_prayer_mode_session, move_prayer_mode_cursor, PRAYER_MODE_SESSION_MINUTES
+)
 
 
 # Using test_session fixture from conftest.py
@@ -210,6 +214,30 @@ class TestSmartSorting:
         assert newest_pos <= oldest_pos or len(queue) <= 2
 
 
+class TestPrayerModeSession:
+    """Test prayer mode session expiry"""
+
+    def test_moving_the_cursor_extends_expiry(self, test_session, test_user, test_prayers):
+        """A session in use stays alive past its original expiry"""
+        mode_session = start_prayer_mode_session(test_session, test_user)
+        # About to lapse
+        mode_session.expires_at = datetime.utcnow() + timedelta(minutes=1)
+
+        move_prayer_mode_cursor(mode_session, 2)
+        test_session.commit()
+
+        assert mode_session.cursor == 2
+        assert mode_session.expires_at > datetime.utcnow() + timedelta(minutes=PRAYER_MODE_SESSION_MINUTES - 1)
+        assert get_prayer_mode_session(test_session, test_user) is mode_session
+
+    def test_idle_session_expires(self, test_session, test_user, test_prayers):
+        mode_session = start_prayer_mode_session(test_session, test_user)
+        mode_session.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        test_session.commit()
+
+        assert get_prayer_mode_session(test_session, test_user) is None
+
+
 class TestPrayerAgeText:
     """Test prayer age text generation"""
     
@@ -318,6 +346,37 @@ class TestPrayerModeRoutes:
             assert skip is not None
 
 
+    def test_resume_returns_to_the_same_prayer(self, test_session, test_user, test_prayers):
+        """Reloading the first page must not replace the queue the resume prompt points into"""
+        import re
+        from app import app
+        from app_helpers.services.auth_helpers import current_user
+        
+        def shown_prayer(response):
+            assert response.status_code == 200
+            return re.search(r'currentPrayerId = "([^"]*)"', response.text).group(1)
+        
+        app.dependency_overrides[current_user] = lambda: (test_user, SessionFactory.create(username=test_user.display_name))
+        try:
+            with patch('app_helpers.routes.prayer.prayer_mode.Session', lambda engine_arg: test_session):
+                client = TestClient(app)
+                client.get("/prayer-mode?restart=true")
+                prayed = [shown_prayer(client.get(f"/prayer-mode?position={i}")) for i in range(2)]
+                before = shown_prayer(client.get("/prayer-mode?position=2"))
+                # Praying changes the scores, so a re-scored queue would be ordered differently
+                test_session.add_all([PrayerMark(username=test_user.display_name, prayer_id=pid) for pid in prayed])
+                test_session.commit()
+                
+                client.get("/prayer-mode")  # Reload the page that offers "Resume"
+                assert shown_prayer(client.get("/prayer-mode?position=2")) == before
+                
+                # Only an explicit restart scores a new queue
+                client.get("/prayer-mode?restart=true")
+                assert shown_prayer(client.get("/prayer-mode?position=2")) != before
+        finally:
+            app.dependency_overrides.pop(current_user, None)
+
+
 class TestPrayerModeIntegration:
     """Integration tests for prayer mode functionality"""
     
@@ -391,4 +450,67 @@ class TestPrayerModeIntegration:
         queue = initialize_prayer_queue(test_session, test_user)
         
         # Archived prayer should not be in queue
-        assert prayer_to_archive.id not in queue
\ No newline at end of file
+        assert prayer_to_archive.id not in queue
+
+class TestPrayerModeSession:
+    """Test the server-side prayer mode session queue"""
+
+    @pytest.fixture
+    def many_prayers(self, test_session, test_user):
+        prayers = [
+            PrayerFactory.create(author_username=test_user.display_name, text=f"Request {i}",
+                                 created_at=datetime.utcnow() - timedelta(days=i))
+            for i in range(30)
+        ]
+        test_session.add_all(prayers)
+        test_session.commit()
+        return prayers
+
+    def test_scoring_uses_grouped_queries(self, test_session, test_user, many_prayers):
+        """Scoring cost does not grow with the number of prayers"""
+        from sqlalchemy import event
+        test_session.refresh(test_user)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            initialize_prayer_queue(test_session, test_user)
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+
+        assert len(statements) == 4
+
+    def test_navigation_reuses_stored_queue(self, test_session, test_user, many_prayers):
+        from app_helpers.routes.prayer.prayer_mode import (
+            start_prayer_mode_session, get_prayer_mode_session, refill_prayer_queue
+        )
+        mode_session = start_prayer_mode_session(test_session, test_user)
+        first_queue = refill_prayer_queue(test_session, test_user, mode_session, 1)
+
+        with patch('app_helpers.routes.prayer.prayer_mode.score_prayer_candidates') as rescore:
+            stored = get_prayer_mode_session(test_session, test_user)
+            assert refill_prayer_queue(test_session, test_user, stored, 2) == first_queue
+            rescore.assert_not_called()
+
+    def test_queue_refills_from_snapshot_when_low(self, test_session, test_user, many_prayers):
+        from app_helpers.routes.prayer.prayer_mode import (
+            start_prayer_mode_session, refill_prayer_queue, PRAYER_MODE_QUEUE_SIZE
+        )
+        mode_session = start_prayer_mode_session(test_session, test_user)
+
+        with patch('app_helpers.routes.prayer.prayer_mode.score_prayer_candidates') as rescore:
+            queue = refill_prayer_queue(test_session, test_user, mode_session, PRAYER_MODE_QUEUE_SIZE - 2)
+            rescore.assert_not_called()
+
+        assert len(queue) == 2 * PRAYER_MODE_QUEUE_SIZE
+        assert len(set(queue)) == len(queue)
+        assert json.loads(mode_session.queue) == queue
+
+    def test_expired_session_is_not_reused(self, test_session, test_user, many_prayers):
+        from app_helpers.routes.prayer.prayer_mode import start_prayer_mode_session, get_prayer_mode_session
+        mode_session = start_prayer_mode_session(test_session, test_user)
+        mode_session.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        test_session.add(mode_session)
+        test_session.commit()
+
+        assert get_prayer_mode_session(test_session, test_user) is None
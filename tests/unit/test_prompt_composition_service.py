@@ -140,4 +140,52 @@ class TestPromptCompositionService:
         
         # Should have formatting instructions
         assert "FOR COLLECTIVE REQUESTS" in content
-        assert "FOR INDIVIDUAL/THIRD-PARTY REQUESTS" in content
\ No newline at end of file
+        assert "FOR INDIVIDUAL/THIRD-PARTY REQUESTS" in content
+
+@pytest.mark.unit
+class TestPromptCache:
+    """Test composed prompt caching, hot reload and prompt hashes"""
+
+    @pytest.fixture
+    def prompts_copy(self, tmp_path):
+        source = Path(PromptCompositionService().prompts_dir)
+        for file_path in source.glob("*.txt"):
+            (tmp_path / file_path.name).write_text(file_path.read_text(encoding='utf-8'), encoding='utf-8')
+        return tmp_path
+
+    def test_prompt_files_read_once(self, prompts_copy):
+        service = PromptCompositionService(prompts_copy)
+
+        with patch.object(service, '_read_prompt_file', wraps=service._read_prompt_file) as reader:
+            first = service.build_prayer_generation_prompt()
+            second = service.build_prayer_generation_prompt()
+
+        assert first == second
+        assert reader.call_count == 0
+
+    def test_hash_tracks_feature_flags(self, prompts_copy):
+        service = PromptCompositionService(prompts_copy)
+
+        with patch.dict('os.environ', {'PRAYER_PERSON_DIFFERENTIATION_ENABLED': 'false'}):
+            base = service.get_composed_prompt()
+        with patch.dict('os.environ', {'PRAYER_PERSON_DIFFERENTIATION_ENABLED': 'true'}):
+            differentiated = service.get_composed_prompt()
+            assert service.get_prompt_composition_info()["prompt_hash"] == differentiated.prompt_hash
+
+        assert base.prompt_hash != differentiated.prompt_hash
+        assert "prayer_person_differentiation.txt" in differentiated.components
+
+    @patch.dict('os.environ', {'PRAYER_PERSON_DIFFERENTIATION_ENABLED': 'false'})
+    def test_edited_prompt_file_is_hot_reloaded(self, prompts_copy):
+        service = PromptCompositionService(prompts_copy)
+        before = service.get_composed_prompt()
+
+        system_file = prompts_copy / "prayer_generation_system.txt"
+        system_file.write_text("Edited system prompt", encoding='utf-8')
+        stat = system_file.stat()
+        os.utime(system_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        after = service.get_composed_prompt(force_reload=True)
+
+        assert after.text == "Edited system prompt"
+        assert after.prompt_hash != before.prompt_hash
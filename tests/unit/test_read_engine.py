@@ -0,0 +1,40 @@
+"""
+Tests for the read-only connection profile used by models.read_engine.
+"""
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine
+
+import models
+
+
+@pytest.mark.unit
+def test_read_only_connections_see_committed_writes_and_reject_their_own(tmp_path):
+    db_path = tmp_path / "split.db"
+    writer = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(writer, "connect", models.apply_sqlite_pragmas)
+    reader = create_engine(f"sqlite:///file:{db_path}?mode=ro&uri=true", connect_args={"check_same_thread": False})
+    event.listen(reader, "connect", models.apply_read_only_pragmas)
+    try:
+        with writer.connect() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL"))
+            conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO item DEFAULT VALUES"))
+            conn.commit()
+
+        with reader.connect() as conn:
+            assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+            assert conn.execute(text("SELECT COUNT(*) FROM item")).scalar() == 1
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO item DEFAULT VALUES"))
+    finally:
+        reader.dispose()
+        writer.dispose()
+
+
+@pytest.mark.unit
+def test_in_memory_database_reads_through_main_engine():
+    assert models.DATABASE_PATH == ':memory:'
+    assert models.read_engine is models.engine
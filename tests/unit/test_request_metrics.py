@@ -0,0 +1,78 @@
+"""
+Tests for per-request query/archive/template instrumentation and its admin page.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+from jinja2 import Environment
+from sqlmodel import Session, select
+
+from models import User
+from app_helpers.utils.request_metrics import (
+    TimedTemplate, RequestMetricsRegistry, install_query_hooks,
+    record_archive_write, request_metrics_middleware
+)
+
+
+@pytest.mark.unit
+class TestRequestMetricsMiddleware:
+    """Test suite for the request metrics middleware and hooks."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = RequestMetricsRegistry()
+        monkeypatch.setattr('app_helpers.utils.request_metrics.request_metrics_registry', registry)
+        return registry
+
+    @pytest.fixture
+    def instrumented_client(self, test_session, registry):
+        install_query_hooks(test_session.bind)
+        env = Environment()
+        env.template_class = TimedTemplate
+        template = env.from_string("{% for u in users %}{{ u }}{% endfor %}")
+
+        app = FastAPI()
+        app.middleware("http")(request_metrics_middleware)
+
+        @app.get("/users/{page}", response_class=HTMLResponse)
+        def users(page: int):
+            with Session(test_session.bind) as db:
+                names = [u.display_name for u in db.exec(select(User)).all()]
+                for name in names:  # Deliberate N+1
+                    db.exec(select(User).where(User.display_name == name)).first()
+            record_archive_write()
+            return template.render(users=names)
+
+        return TestClient(app)
+
+    def test_server_timing_reports_queries_archive_and_templates(self, instrumented_client, test_session, registry):
+        test_session.add_all([User(display_name=f"member{i}") for i in range(6)])
+        test_session.commit()
+
+        response = instrumented_client.get("/users/1")
+
+        timing = response.headers["Server-Timing"]
+        assert 'desc="7 queries"' in timing
+        assert 'desc="1 templates"' in timing
+        assert 'archive;desc="1 writes, 1 fsyncs"' in timing
+
+        recent = registry.recent_requests()[0]
+        assert recent['queries'] == 7
+        assert recent['repeated_statements'][0][1] == 6
+
+    def test_routes_are_aggregated_by_path_template(self, instrumented_client, registry):
+        instrumented_client.get("/users/1")
+        instrumented_client.get("/users/2")
+
+        routes = registry.route_summaries()
+        assert [r['route'] for r in routes] == ["GET /users/{page}"]
+        assert routes[0]['requests'] == 2
+
+    def test_admin_debug_page(self, client, mock_admin_user):
+        response = client.get("/admin/debug/requests")
+
+        assert response.status_code == 200
+        assert "Request Metrics" in response.text
+        assert "Server-Timing" in response.headers
@@ -0,0 +1,55 @@
+"""
+Tests for memoized timezone validation and timestamp formatting.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from app_helpers import timezone_utils
+from app_helpers.timezone_utils import (
+    format_timestamp_for_timezone,
+    validate_timezone,
+    get_zoneinfo,
+    clear_timezone_caches
+)
+from app_helpers.template_filters import timezone_format_filter
+
+
+@pytest.mark.unit
+class TestTimezoneCaching:
+    """Test suite for the cached timezone registry and formatters."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_caches(self):
+        clear_timezone_caches()
+        yield
+        clear_timezone_caches()
+
+    def test_formats_in_user_timezone(self):
+        dt = datetime(2025, 1, 15, 17, 30, 0)
+
+        assert format_timestamp_for_timezone(dt, "America/New_York") == "2025-01-15 12:30:00 EST"
+        assert format_timestamp_for_timezone(dt, None) == "2025-01-15 17:30:00 UTC"
+        assert format_timestamp_for_timezone(dt, "Not/AZone") == "2025-01-15 17:30:00 UTC"
+        assert timezone_format_filter(None, "America/New_York") == ""
+
+    def test_registry_is_scanned_once(self):
+        with patch.object(timezone_utils, 'available_timezones',
+                          wraps=timezone_utils.available_timezones) as scan:
+            assert validate_timezone("Europe/London")
+            assert validate_timezone("America/Chicago")
+            assert not validate_timezone("Mars/Olympus_Mons")
+
+        assert scan.call_count == 1
+
+    def test_zoneinfo_and_formatted_timestamps_are_reused(self):
+        dt = datetime(2025, 6, 1, 12, 0, 0)
+
+        assert get_zoneinfo("Asia/Tokyo") is get_zoneinfo("Asia/Tokyo")
+        for _ in range(5):
+            format_timestamp_for_timezone(dt, "Asia/Tokyo")
+
+        info = timezone_utils._format_timestamp_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 4
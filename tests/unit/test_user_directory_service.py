@@ -0,0 +1,101 @@
+"""Unit tests for the bulk user directory service"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import select
+
+from models import Role, UserRole
+from tests.factories import UserFactory, PrayerFactory, PrayerMarkFactory
+from app_helpers.services.user_directory_service import UserDirectoryService
+
+
+def _grant(test_session, user_id: str, role_name: str, expires_at=None):
+    role = test_session.exec(select(Role).where(Role.name == role_name)).first()
+    if role is None:
+        role = Role(name=role_name)
+        test_session.add(role)
+        test_session.flush()
+    test_session.add(UserRole(user_id=user_id, role_id=role.id, expires_at=expires_at))
+
+
+@pytest.mark.unit
+class TestUserDirectoryService:
+    """Test grouped per-user statistics, search and pagination"""
+    
+    @pytest.fixture
+    def community(self, test_session):
+        base = datetime(2024, 1, 1)
+        for i, name in enumerate(["alice", "bob", "carol", "dave"]):
+            test_session.add(UserFactory.create(display_name=name, created_at=base + timedelta(days=i)))
+        prayer1 = PrayerFactory.create(author_username="alice", created_at=base + timedelta(days=10))
+        prayer2 = PrayerFactory.create(author_username="alice", created_at=base + timedelta(days=11))
+        flagged = PrayerFactory.create(author_username="alice", flagged=True, created_at=base + timedelta(days=30))
+        test_session.add_all([prayer1, prayer2, flagged])
+        test_session.add_all([
+            PrayerMarkFactory.create(username="bob", prayer_id=prayer1.id, created_at=base + timedelta(days=12)),
+            PrayerMarkFactory.create(username="bob", prayer_id=prayer1.id, created_at=base + timedelta(days=13)),
+            PrayerMarkFactory.create(username="bob", prayer_id=prayer2.id, created_at=base + timedelta(days=14)),
+            PrayerMarkFactory.create(username="alice", prayer_id=prayer2.id, created_at=base + timedelta(days=20)),
+        ])
+        _grant(test_session, "carol", "admin")
+        _grant(test_session, "dave", "deactivated")
+        _grant(test_session, "bob", "admin", expires_at=base)  # Expired role is ignored
+        test_session.commit()
+        return base
+    
+    def test_activity_summaries(self, test_session, community):
+        summaries = UserDirectoryService.get_activity_summaries(
+            test_session, ["alice", "bob", "carol", "dave"], include_deactivation_info=True
+        )
+        
+        assert summaries["alice"]["prayers_authored"] == 2
+        assert summaries["alice"]["last_activity"] == community + timedelta(days=20)
+        assert summaries["bob"]["prayers_marked"] == 3
+        assert summaries["bob"]["distinct_prayers_marked"] == 2
+        assert summaries["bob"]["last_activity"] == community + timedelta(days=14)
+        assert summaries["bob"]["is_admin"] is False
+        assert summaries["carol"]["is_admin"] is True
+        assert summaries["carol"]["last_activity"] is None
+        assert summaries["dave"]["is_deactivated"] is True
+        assert summaries["dave"]["deactivation_info"]["expires_at"] is None
+    
+    def test_directory_hides_deactivated_users_except_viewer(self, test_session, community):
+        entries, total = UserDirectoryService.get_directory_page(test_session, "alice")
+        assert [e["user"].display_name for e in entries] == ["carol", "bob", "alice"]
+        assert total == 3
+        
+        entries, total = UserDirectoryService.get_directory_page(test_session, "dave")
+        assert total == 4
+        assert entries[0]["is_me"] and entries[0]["is_deactivated"]
+    
+    def test_search_and_pagination(self, test_session, community):
+        entries, total = UserDirectoryService.get_directory_page(
+            test_session, "alice", include_deactivated=True, per_page=3, page=2
+        )
+        assert total == 4
+        assert [e["user"].display_name for e in entries] == ["alice"]
+        
+        entries, total = UserDirectoryService.get_directory_page(test_session, "alice", search="CAR")
+        assert total == 1
+        assert entries[0]["user"].display_name == "carol"
+        
+        _, total = UserDirectoryService.get_directory_page(test_session, "alice", search="%")
+        assert total == 0
+    
+    def test_query_count_is_constant_per_page(self, test_session, community):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            UserDirectoryService.get_directory_page(test_session, "alice", include_deactivated=True)
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+        
+        # count + page + authored + marked + roles
+        assert len(statements) == 5
+    
+    def test_community_totals(self, test_session, community):
+        totals = UserDirectoryService.get_community_totals(test_session)
+        
+        assert totals == {'total_members': 3, 'total_prayers_marked': 4, 'total_prayers_authored': 2}
+        assert UserDirectoryService.get_community_totals(test_session, include_deactivated=True)['total_members'] == 4
@@ -0,0 +1,88 @@
+"""Unit tests for cached username display with supporter badges"""
+import pytest
+from sqlalchemy import event
+
+from tests.factories import UserFactory
+from app_helpers.services.username_display_service import UsernameDisplayService
+
+
+@pytest.mark.unit
+class TestUsernameDisplayService:
+    """Test the bounded, version-invalidated supporter cache"""
+    
+    def _count_statements(self, test_session, fn):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(test_session.bind, "before_cursor_execute", listener)
+        try:
+            fn()
+        finally:
+            event.remove(test_session.bind, "before_cursor_execute", listener)
+        return len(statements)
+    
+    def test_preload_renders_page_with_one_query(self, test_session):
+        users = [UserFactory.create(display_name=f"author{i}") for i in range(20)]
+        users[3].is_supporter = True
+        test_session.add_all(users)
+        test_session.commit()
+        service = UsernameDisplayService()
+        names = [u.display_name for u in users] + ["ghost"]
+        
+        assert self._count_statements(test_session, lambda: service.preload(names, test_session)) == 1
+        
+        rendered = []
+        assert self._count_statements(
+            test_session, lambda: rendered.extend(service.render_username_with_badge(n, test_session) for n in names)
+        ) == 0
+        assert 'supporter-badge' in rendered[3]
+        assert rendered[0] == "author0"
+        assert rendered[-1] == "ghost"
+    
+    def test_cache_is_bounded(self, test_session):
+        test_session.add_all([UserFactory.create(display_name=f"user{i}") for i in range(5)])
+        test_session.commit()
+        service = UsernameDisplayService(max_entries=3)
+        
+        for i in range(5):
+            service.get_user_display_data(f"user{i}", test_session)
+        
+        assert list(service._user_cache) == ["user2", "user3", "user4"]
+    
+    def test_supporter_change_invalidates_cache(self, test_session):
+        user = UserFactory.create(display_name="helper")
+        test_session.add(user)
+        test_session.commit()
+        service = UsernameDisplayService()
+        assert service.render_username_with_badge("helper", test_session) == "helper"
+        
+        user.welcome_message_dismissed = True
+        test_session.add(user)
+        test_session.commit()
+        assert "helper" in service._user_cache  # Unrelated fields keep the cache
+        
+        user.is_supporter = True
+        test_session.add(user)
+        test_session.commit()
+        
+        assert 'supporter-badge' in service.render_username_with_badge("helper", test_session)
+    
+    def test_cache_is_kept_until_commit(self, test_session):
+        from app_helpers.services import username_display_service as module
+        user = UserFactory.create(display_name="pending")
+        test_session.add(user)
+        test_session.commit()
+        version = module._display_version
+        
+        user.is_supporter = True
+        test_session.add(user)
+        test_session.flush()
+        assert module._display_version == version  # Uncommitted change can't be seen by other sessions
+        
+        test_session.rollback()
+        test_session.commit()
+        assert module._display_version == version  # Rolled-back change leaves nothing behind
+        
+        user.is_supporter = True
+        test_session.add(user)
+        test_session.commit()
+        assert module._display_version == version + 1
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Timezone Rendering Micro-Benchmark
+
+Renders a feed-like Jinja2 template containing a few hundred timestamps through
+the timezone_format filter and compares the memoized implementation in
+app_helpers/timezone_utils.py against the previous per-call implementation
+(new ZoneInfo objects and a full available_timezones() scan on every request).
+
+Usage:
+    python benchmark_timezone_rendering.py                      # 500 timestamps, 50 renders
+    python benchmark_timezone_rendering.py --timestamps 300 --iterations 200
+    python benchmark_timezone_rendering.py --timezone Europe/London
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo, available_timezones
+
+from jinja2 import Environment
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app_helpers.template_filters import register_filters
+from app_helpers.timezone_utils import validate_timezone, clear_timezone_caches
+
+
+FEED_TEMPLATE = """
+{% for item in items %}
+<article><span>{{ item.created_at|timezone_format(user_timezone) }}</span>
+<span>prayed {{ item.last_marked|timezone_format(user_timezone) }}</span></article>
+{% endfor %}
+"""
+
+
+def _legacy_validate(timezone_str: str) -> bool:
+    return timezone_str in available_timezones()
+
+
+def _legacy_format(dt: datetime, timezone_str: str = None) -> str:
+    if not timezone_str:
+        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+    try:
+        user_tz = ZoneInfo(timezone_str)
+        local_dt = dt.replace(tzinfo=ZoneInfo("UTC")).astimezone(user_tz)
+        return local_dt.strftime("%Y-%m-%d %H:%M:%S %Z")
+    except Exception:
+        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def build_items(count: int):
+    """Half the timestamps, like a feed: one created_at and one last_marked per card."""
+    start = datetime(2025, 1, 1, 8, 0)
+    return [
+        {
+            'created_at': start + timedelta(minutes=17 * i),
+            'last_marked': start + timedelta(minutes=17 * i + 5),
+        }
+        for i in range(max(1, count // 2))
+    ]
+
+
+def time_renders(template, validate, items, timezone_str: str, iterations: int):
+    """Time full request-style renders: validate the timezone header, then render the feed."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        user_timezone = timezone_str if validate(timezone_str) else None
+        template.render(items=items, user_timezone=user_timezone)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _summary(label: str, samples):
+    return (f"{label:<22} median {statistics.median(samples):8.2f} ms   "
+            f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.2f} ms   "
+            f"first {samples[0]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feed timestamp rendering")
+    parser.add_argument('--timestamps', type=int, default=500, help='Timestamps per rendered page')
+    parser.add_argument('--iterations', type=int, default=50, help='Number of renders per variant')
+    parser.add_argument('--timezone', default='America/New_York', help='Viewer timezone')
+    args = parser.parse_args()
+
+    items = build_items(args.timestamps)
+
+    legacy_env = Environment()
+    legacy_env.filters['timezone_format'] = _legacy_format
+    legacy_template = legacy_env.from_string(FEED_TEMPLATE)
+
+    cached_env = Environment()
+    register_filters(SimpleNamespace(env=cached_env))
+    cached_template = cached_env.from_string(FEED_TEMPLATE)
+
+    assert legacy_template.render(items=items, user_timezone=args.timezone) == \
+        cached_template.render(items=items, user_timezone=args.timezone), "Rendered output differs"
+
+    clear_timezone_caches()
+    legacy = time_renders(legacy_template, _legacy_validate, items, args.timezone, args.iterations)
+    cached = time_renders(cached_template, validate_timezone, items, args.timezone, args.iterations)
+
+    print(f"Feed render with {len(items) * 2} timestamps in {args.timezone}, {args.iterations} renders")
+    print(_summary("per-call (legacy)", legacy))
+    print(_summary("memoized", cached))
+    print(f"Speedup (median): {statistics.median(legacy) / statistics.median(cached):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
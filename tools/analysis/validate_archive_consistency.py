@@ -14,10 +14,15 @@ Key Validation Checks:
 - Archive paths point to existing files
 - Database relationships match archive content
 
+Incremental mode keeps a content-hash manifest next to the archives
+(consistency_manifest.json) and only re-parses prayer files whose size or
+mtime changed since the previous run; changed files are parsed in parallel.
+
 Usage:
     python validate_archive_consistency.py              # Full validation
     python validate_archive_consistency.py --summary    # Summary only
     python validate_archive_consistency.py --fix        # Fix minor issues found
+    python validate_archive_consistency.py --incremental  # Only re-parse archives changed since last run
 """
 
 import os
@@ -36,6 +41,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from models import engine, User, Prayer, PrayerMark, PrayerAttribute
 from app_helpers.services.text_archive_service import TextArchiveService
+from app_helpers.services.archive_compression_service import archive_exists, list_prayer_archive_files
+from app_helpers.services.archive_manifest_service import validate_incremental_consistency
 from app_helpers.utils.username_helpers import normalize_username_for_lookup, usernames_are_equivalent
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -45,8 +52,12 @@ logger = logging.getLogger(__name__)
 class ArchiveConsistencyValidator:
     """Validates consistency between text archives and database"""
     
-    def __init__(self, archive_service: TextArchiveService = None):
+    def __init__(self, archive_service: TextArchiveService = None, incremental: bool = False,
+                 workers: int = None):
         self.archive_service = archive_service or TextArchiveService()
+        self.incremental = incremental
+        self.workers = workers
+        self.manifest_results = None
         self.validation_results = {
             'total_users_in_db': 0,
             'total_users_in_archives': 0,
@@ -61,7 +72,9 @@ class ArchiveConsistencyValidator:
             'users_only_in_archives': [],
             'consistency_score': 0.0,
             'issues_found': [],
-            'archive_path_issues': []
+            'archive_path_issues': [],
+            'archive_content_issues': [],
+            'manifest_stats': None
         }
     
     def validate_consistency(self, archive_dir: str = None, summary_only: bool = False) -> Dict:
@@ -85,6 +98,10 @@ class ArchiveConsistencyValidator:
             return {'error': f'Archive directory not found: {archive_dir}'}
         
         try:
+            if self.incremental:
+                logger.info("Refreshing archive manifest (incremental mode)...")
+                self._validate_archive_content(archive_dir)
+            
             with Session(engine) as session:
                 # Step 1: Validate user consistency
                 logger.info("Step 1: Validating user consistency...")
@@ -119,6 +136,27 @@ class ArchiveConsistencyValidator:
                 'error': str(e)
             }
     
+    def _validate_archive_content(self, archive_dir: str):
+        """Compare prayer records with their archive files via the content-hash manifest"""
+        self.manifest_results = validate_incremental_consistency(
+            archive_dir, self.archive_service, workers=self.workers
+        )
+        
+        content_issues = self.manifest_results['inconsistencies']
+        self.validation_results['archive_content_issues'] = content_issues
+        self.validation_results['manifest_stats'] = {
+            key: self.manifest_results[key] for key in ('files_parsed', 'files_reused', 'files_removed')
+        }
+        if content_issues:
+            self.validation_results['issues_found'].append(
+                f"Prayers not matching their archive content: {len(content_issues)}"
+            )
+        
+        logger.info(
+            f"Manifest: {self.manifest_results['files_parsed']} files parsed, "
+            f"{self.manifest_results['files_reused']} unchanged"
+        )
+    
     def _validate_user_consistency(self, session: Session, archive_path: Path):
         """Validate user consistency between database and archives"""
         # Get all users from database
@@ -216,7 +254,7 @@ class ArchiveConsistencyValidator:
         for prayer in prayers_with_paths:
             if not prayer.text_file_path:
                 missing_paths += 1
-            elif not Path(prayer.text_file_path).exists():
+            elif not archive_exists(prayer.text_file_path):
                 broken_paths += 1
                 self.validation_results['archive_path_issues'].append(
                     f"Prayer {prayer.id}: Missing file {prayer.text_file_path}"
@@ -291,7 +329,10 @@ class ArchiveConsistencyValidator:
         
         # Scan prayer archives
         prayers_dir = archive_path / "prayers"
-        if prayers_dir.exists():
+        if self.manifest_results is not None:
+            for username in self.manifest_results['archive_authors']:
+                users_found[username] = {'source': 'prayer'}
+        elif prayers_dir.exists():
             for year_dir in prayers_dir.iterdir():
                 if year_dir.is_dir():
                     for month_dir in year_dir.iterdir():
@@ -330,18 +371,11 @@ class ArchiveConsistencyValidator:
     
     def _count_prayers_in_archives(self, archive_path: Path) -> int:
         """Count total prayers in archive files"""
-        prayer_count = 0
-        prayers_dir = archive_path / "prayers"
+        if self.manifest_results is not None:
+            return self.manifest_results['archive_prayer_files']
         
-        if prayers_dir.exists():
-            for year_dir in prayers_dir.iterdir():
-                if year_dir.is_dir():
-                    for month_dir in year_dir.iterdir():
-                        if month_dir.is_dir():
-                            prayer_files = list(month_dir.glob("*.txt"))
-                            prayer_count += len(prayer_files)
-        
-        return prayer_count
+        # Includes prayer files packed into compressed monthly bundles
+        return len(list_prayer_archive_files(archive_path / "prayers"))
 
 
 def print_validation_report(results: Dict, summary_only: bool = False):
@@ -403,6 +437,16 @@ def print_validation_report(results: Dict, summary_only: bool = False):
             print(f"\\n🔗 ARCHIVE PATH ISSUES:")
             for issue in r['archive_path_issues']:
                 print(f"   - {issue}")
+        
+        if r['archive_content_issues']:
+            print(f"\\n📄 ARCHIVE CONTENT ISSUES:")
+            for issue in r['archive_content_issues']:
+                print(f"   - {issue}")
+    
+    if r['manifest_stats']:
+        m = r['manifest_stats']
+        print(f"\\n🗂️  INCREMENTAL: {m['files_parsed']} archive files parsed, "
+              f"{m['files_reused']} unchanged, {m['files_removed']} removed since last run")
     
     print("\\n" + "="*60)
 
@@ -416,10 +460,14 @@ def main():
                        help='Override default archive directory')
     parser.add_argument('--fix', action='store_true',
                        help='Attempt to fix minor issues found (not implemented yet)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only re-parse archive files changed since the last run (uses consistency_manifest.json)')
+    parser.add_argument('--workers', type=int,
+                       help='Parallel parser threads for --incremental')
     
     args = parser.parse_args()
     
-    validator = ArchiveConsistencyValidator()
+    validator = ArchiveConsistencyValidator(incremental=args.incremental, workers=args.workers)
     results = validator.validate_consistency(
         archive_dir=args.archive_dir,
         summary_only=args.summary
@@ -14,6 +14,7 @@ from sqlmodel import Session, select
 # Database path is now configured automatically in models.py
 
 from models import engine, User, Prayer, PrayerMark, PrayerAttribute
+from app_helpers.services.archive_compression_service import archive_exists, list_prayer_archive_files
 
 def find_actual_archive_file(expected_path: str) -> str:
     """
@@ -34,10 +35,13 @@ def find_actual_archive_file(expected_path: str) -> str:
     # Search for this filename in text_archives/
     text_archives_base = Path("text_archives")
     
-    # Search in prayers subdirectories
+    # Search everywhere for loose files, then inside monthly prayer bundles
     for prayer_file in text_archives_base.rglob("*.txt"):
         if prayer_file.name == expected_filename:
             return str(prayer_file)
+    for prayer_file in list_prayer_archive_files(text_archives_base / "prayers"):
+        if prayer_file.name == expected_filename:
+            return str(prayer_file)
     
     return ""
 
@@ -96,7 +100,8 @@ def fix_archive_paths(dry_run: bool = False) -> dict:
         for prayer in prayers:
             results['total_examined'] += 1
             
-            if prayer.text_file_path and not os.path.exists(prayer.text_file_path):
+            # Prayer files may have been packed into their monthly bundle by compress-archives
+            if prayer.text_file_path and not archive_exists(prayer.text_file_path):
                 actual_path = find_actual_archive_file(prayer.text_file_path)
                 
                 if actual_path:
@@ -121,7 +126,7 @@ def fix_archive_paths(dry_run: bool = False) -> dict:
         for prayer_mark in prayer_marks:
             results['total_examined'] += 1
             
-            if prayer_mark.text_file_path and not os.path.exists(prayer_mark.text_file_path):
+            if prayer_mark.text_file_path and not archive_exists(prayer_mark.text_file_path):
                 actual_path = find_actual_archive_file(prayer_mark.text_file_path)
                 
                 if actual_path:
@@ -146,7 +151,7 @@ def fix_archive_paths(dry_run: bool = False) -> dict:
         for prayer_attr in prayer_attributes:
             results['total_examined'] += 1
             
-            if prayer_attr.text_file_path and not os.path.exists(prayer_attr.text_file_path):
+            if prayer_attr.text_file_path and not archive_exists(prayer_attr.text_file_path):
                 actual_path = find_actual_archive_file(prayer_attr.text_file_path)
                 
                 if actual_path:
@@ -34,6 +34,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from models import engine, User, Prayer, PrayerMark, PrayerAttribute
 from app_helpers.services.text_archive_service import TextArchiveService
+from app_helpers.services.archive_compression_service import (
+    archive_exists, read_archive_text, list_prayer_archive_files
+)
 from app_helpers.utils.username_helpers import normalize_username_for_lookup, usernames_are_equivalent
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -134,17 +137,12 @@ class ArchiveReconstructor:
         users_found = {}
         
         # Scan prayer archives for author names
-        prayers_dir = archive_path / "prayers"
-        if prayers_dir.exists():
-            for year_dir in prayers_dir.iterdir():
-                if year_dir.is_dir():
-                    for month_dir in year_dir.iterdir():
-                        if month_dir.is_dir():
-                            for prayer_file in month_dir.glob("*.txt"):
-                                try:
-                                    self._extract_users_from_prayer_file(prayer_file, users_found)
-                                except Exception as e:
-                                    logger.warning(f"Failed to parse prayer file {prayer_file}: {e}")
+        # (loose files and those packed into monthly bundles)
+        for prayer_file in list_prayer_archive_files(archive_path / "prayers"):
+            try:
+                self._extract_users_from_prayer_file(prayer_file, users_found)
+            except Exception as e:
+                logger.warning(f"Failed to parse prayer file {prayer_file}: {e}")
         
         # Scan user registration files
         users_dir = archive_path / "users"
@@ -171,7 +169,7 @@ class ArchiveReconstructor:
     
     def _extract_users_from_prayer_file(self, prayer_file: Path, users_found: Dict):
         """Extract username from a prayer archive file"""
-        content = prayer_file.read_text(encoding='utf-8')
+        content = read_archive_text(prayer_file)
         
         # Look for prayer header: "Prayer <id> by <username>"
         header_match = re.search(r'Prayer\s+[a-f0-9]+\s+by\s+(.+)', content)
@@ -347,10 +345,10 @@ class ArchiveReconstructor:
         logger.info(f"Found {len(orphaned_prayers)} orphaned prayers")
         
         for prayer in orphaned_prayers:
-            if prayer.text_file_path and Path(prayer.text_file_path).exists():
+            if archive_exists(prayer.text_file_path):
                 try:
                     # Parse author from archive file
-                    content = Path(prayer.text_file_path).read_text(encoding='utf-8')
+                    content = read_archive_text(prayer.text_file_path)
                     header_match = re.search(r'Prayer\s+[a-f0-9]+\s+by\s+(.+)', content)
                     
                     if header_match: